@@ -141,9 +141,6 @@ Output format (JSON):
   ]
 }}
 
-FORBIDDEN ACTIONS (FATAL ERROR IF REPEATED):
-{forbidden_actions}
-
 """
 
 def get_meta_planner_prompt(task_context: str, preferred_language: str = "en"):
@@ -153,18 +150,29 @@ def get_meta_planner_prompt(task_context: str, preferred_language: str = "en"):
         HumanMessage(content=task_context),
     ])
 
-def get_atlas_plan_prompt(task_description: str, tools_desc: str = "", context: str = "", preferred_language: str = "en", forbidden_actions: str = "", vision_context: str = ""):
+def get_atlas_plan_prompt(task_description: str, tools_desc: str = "", context: str = "", preferred_language: str = "en", forbidden_actions: str = "", vision_context: str = "", stable_context: str = ""):
+    """
+    Build the Atlas planning prompt.
+
+    The system message only holds content that is stable across steps
+    (instructions, tool catalog, `stable_context`), so it forms a cacheable
+    prompt prefix. Per-step content (task state, `context`, vision,
+    `forbidden_actions`, which grows on every failure) goes into the human
+    message.
+    """
     formatted_prompt = ATLAS_PLANNING_PROMPT.format(
         preferred_language=preferred_language,
         tools_desc=tools_desc,
-        forbidden_actions=forbidden_actions or "None"
     )
-    if vision_context:
-        formatted_prompt += f"\n\nVISION CONTEXT SUMMARY:\n{vision_context}\n"
+    if stable_context:
+        formatted_prompt += f"\n\n{stable_context}"
 
     msg = f"Task: {task_description}"
     if context:
         msg += f"\n\nContext/RAG: {context}"
+    if vision_context:
+        msg += f"\n\nVISION CONTEXT SUMMARY:\n{vision_context}\n"
+    msg += f"\n\nFORBIDDEN ACTIONS (FATAL ERROR IF REPEATED):\n{forbidden_actions or 'None'}"
     return ChatPromptTemplate.from_messages([
         SystemMessage(content=formatted_prompt),
         HumanMessage(content=msg),
@@ -8,33 +8,80 @@ Enhanced with:
 - Sliding window for step-aware context management
 - Priority weighting for context sections
 - Token metrics for monitoring
+- Tokenizer-based budgets (core.tokenizer) with memoized per-section counts
+  and truncation on line/sentence boundaries
+- Stable-prefix assembly: deterministic prefix (policy, task, structure)
+  followed by a volatile suffix (recent steps, RAG), with a prefix hash
+  recorded per call so provider-side prefix caching can hit
 """
 
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
+import hashlib
 import json
 
+from core.tokenizer import TokenCounter, truncate_to_tokens
+
 
 @dataclass
 class ContextMetrics:
     """Metrics for context usage tracking."""
     total_chars: int = 0
-    estimated_tokens: int = 0
+    estimated_tokens: int = 0  # chars / CHARS_PER_TOKEN
+    counted_tokens: int = 0    # from the tokenizer
+    tokenizer: str = ""
+    tokenizer_exact: bool = False
+    section_tokens: Dict[str, int] = field(default_factory=dict)
     sections_included: List[str] = field(default_factory=list)
-    truncations: Dict[str, int] = field(default_factory=dict)
+    truncations: Dict[str, int] = field(default_factory=dict)  # tokens removed per section
+    prefix_hash: str = ""
+    prefix_tokens: int = 0
     timestamp: datetime = field(default_factory=datetime.now)
+
+    @property
+    def estimate_ratio(self) -> Optional[float]:
+        """Character-based estimate divided by the tokenizer count."""
+        if not self.counted_tokens:
+            return None
+        return round(self.estimated_tokens / self.counted_tokens, 3)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "total_chars": self.total_chars,
             "estimated_tokens": self.estimated_tokens,
+            "counted_tokens": self.counted_tokens,
+            "tokenizer": self.tokenizer,
+            "tokenizer_exact": self.tokenizer_exact,
+            "estimate_ratio": self.estimate_ratio,
+            "section_tokens": self.section_tokens,
             "sections_included": self.sections_included,
             "truncations": self.truncations,
+            "prefix_hash": self.prefix_hash,
+            "prefix_tokens": self.prefix_tokens,
             "timestamp": self.timestamp.isoformat()
         }
 
 
+def prefix_hash(text: str) -> str:
+    """Short, stable hash of a prompt prefix."""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+
+
+@dataclass
+class PromptParts:
+    """Context split into a byte-stable prefix and a per-step suffix."""
+    prefix: str
+    suffix: str
+    prefix_hash: str
+
+    @property
+    def text(self) -> str:
+        if self.prefix and self.suffix:
+            return f"{self.prefix}\n\n{self.suffix}"
+        return self.prefix or self.suffix
+
+
 class Context7:
     """Manages context assembly and policy injection for Trinity agents.
     
@@ -57,14 +104,22 @@ class Context7:
         "structure": 0.15       # Project structure
     }
 
-    def __init__(self, verbose: bool = False):
+    # Sections that only change when the policy, task or repo change go
+    # first, in this order, so the prompt prefix is byte-stable across steps.
+    STABLE_SECTIONS = ("policy", "original_task", "structure")
+    VOLATILE_SECTIONS = ("recent_steps", "rag_context")
+
+    def __init__(self, verbose: bool = False, tokenizer: Any = None):
         self.verbose = verbose
-        # Token estimation constants
+        # Token budgeting
         self.MAX_CONTEXT_TOKENS = 32000  # Conservative adjustment space
-        self.CHARS_PER_TOKEN = 4
+        self.CHARS_PER_TOKEN = 4  # Only used for the legacy estimate in metrics
+        self.token_counter = TokenCounter(tokenizer)
         # Metrics storage
         self._last_metrics: Optional[ContextMetrics] = None
         self._metrics_history: List[ContextMetrics] = []
+        self._last_prefix_hash: Optional[str] = None
+        self._prefix_reuse = 0
         # Simple in-memory document store for optional local Context7 usage
         self._documents: List[Dict[str, Any]] = []
 
@@ -94,6 +149,17 @@ class Context7:
                     break
         return results
 
+    def warm_up(self) -> None:
+        """Load the tokenizer ahead of the first count (BackgroundWarmup stage)."""
+        self.token_counter.warm_up()
+
+    def count_tokens(self, text: str) -> int:
+        """Token count of `text` (memoized per content hash)."""
+        return self.token_counter.count(text)
+
+    def _truncate(self, text: str, max_tokens: int, keep: str = "head") -> tuple:
+        return truncate_to_tokens(text, max_tokens, self.token_counter, keep=keep)
+
     def prepare(self, 
                 rag_context: str, 
                 project_structure: str, 
@@ -110,32 +176,31 @@ class Context7:
         # 1. Apply Policy (High Priority)
         policy_block = self._format_policy(meta_config)
         
-        # 2. Budget Characters
-        # Conservative token count: 16k tokens -> ~48k chars (using 3 chars/token for safety)
-        TOTAL_BUDGET = 16000 * 3 
+        # 2. Budget Tokens
+        TOTAL_BUDGET = 16000
         
-        policy_len = len(policy_block)
-        msg_len = len(last_msg)
+        policy_tokens = self.count_tokens(policy_block)
+        msg_tokens = self.count_tokens(last_msg)
         
         # Remaining budget for Structure and RAG
-        remaining = TOTAL_BUDGET - (policy_len + msg_len + 500) # 500 for headers/overhead
+        remaining = TOTAL_BUDGET - (policy_tokens + msg_tokens + 150) # 150 for headers/overhead
         
-        # Budget for structure (max 50% of remaining or 20k chars)
-        structure_budget = min(int(remaining * 0.5), 20000)
-        final_structure = project_structure
-        if len(project_structure) > structure_budget:
+        # Budget for structure (max 50% of remaining or 5k tokens)
+        structure_budget = max(0, min(int(remaining * 0.5), 5000))
+        final_structure, cut = self._truncate(project_structure, structure_budget)
+        if cut:
             if self.verbose:
-                 print(f"[Context7] Truncating structure: {len(project_structure)} -> {structure_budget}")
-            final_structure = project_structure[:structure_budget] + "\n...[Structure Truncated]..."
+                 print(f"[Context7] Truncating structure: -{cut} tokens (budget {structure_budget})")
+            final_structure += "\n...[Structure Truncated]..."
             
-        remaining -= len(final_structure)
+        remaining -= self.count_tokens(final_structure)
         
         # Final budget for RAG
-        final_rag = rag_context
-        if len(rag_context) > remaining:
+        final_rag, cut = self._truncate(rag_context, max(0, remaining))
+        if cut:
             if self.verbose:
-                print(f"[Context7] Budgeting RAG context: {len(rag_context)} -> {max(0, remaining)} chars")
-            final_rag = rag_context[:max(0, remaining)] + "\n...[Context Truncated by Context7]..."
+                print(f"[Context7] Budgeting RAG context: -{cut} tokens (budget {max(0, remaining)})")
+            final_rag += "\n...[Context Truncated by Context7]..."
             
         # 3. Assemble
         sections = []
@@ -160,6 +225,8 @@ class Context7:
     ) -> str:
         """
         Enhanced context preparation with sliding window for message history.
+
+        Stable sections come first (see prepare_parts()).
         
         Args:
             messages: List of LangChain message objects (HumanMessage, AIMessage, etc.)
@@ -172,71 +239,115 @@ class Context7:
         Returns:
             Assembled context string optimized for token budget
         """
+        return self.prepare_parts(
+            messages=messages,
+            original_task=original_task,
+            rag_context=rag_context,
+            project_structure=project_structure,
+            meta_config=meta_config,
+            max_tokens=max_tokens,
+        ).text
+
+    def prepare_parts(
+        self,
+        messages: List[Any],
+        original_task: str,
+        rag_context: str,
+        project_structure: str,
+        meta_config: Dict[str, Any],
+        max_tokens: Optional[int] = None,
+        record: bool = True
+    ) -> PromptParts:
+        """
+        Same as prepare_with_window(), but returns the stable prefix
+        (policy, original task, project structure) and the volatile suffix
+        (recent steps, RAG) separately, with the prefix hash.
+        Sections are truncated deterministically, so identical inputs give a
+        byte-identical prefix.
+        `record=False` leaves the metrics history and prefix-reuse stats
+        untouched (for prompts built off the main thread, e.g. speculation).
+        """
         metrics = ContextMetrics()
         max_tokens = max_tokens or self.MAX_CONTEXT_TOKENS
-        char_budget = max_tokens * self.CHARS_PER_TOKEN
         
-        # 1. Calculate budget for each section based on priority weights
+        # 1. Calculate token budget for each section based on priority weights
         budgets = {
-            section: int(char_budget * weight)
+            section: int(max_tokens * weight)
             for section, weight in self.PRIORITY_WEIGHTS.items()
         }
         
         sections = []
+
+        def _add(name: str, text: str) -> None:
+            sections.append((name, text))
+            metrics.sections_included.append(name)
+            metrics.section_tokens[name] = self.count_tokens(text)
         
         # 2. Policy (always included, minimal truncation)
         policy_block = self._format_policy(meta_config)
-        if len(policy_block) > budgets["policy"]:
-            metrics.truncations["policy"] = len(policy_block) - budgets["policy"]
-            policy_block = policy_block[:budgets["policy"]] + "..."
-        sections.append(("policy", f"## 🧠 STRATEGIC POLICY\n{policy_block}"))
-        metrics.sections_included.append("policy")
+        policy_block, cut = self._truncate(policy_block, budgets["policy"])
+        if cut:
+            metrics.truncations["policy"] = cut
+            policy_block += "..."
+        _add("policy", f"## 🧠 STRATEGIC POLICY\n{policy_block}")
         
         # 3. Original Task (high priority)
         task_section = f"## 🎯 ORIGINAL TASK\n{original_task}"
-        if len(task_section) > budgets["original_task"]:
-            metrics.truncations["original_task"] = len(task_section) - budgets["original_task"]
-            task_section = task_section[:budgets["original_task"]] + "..."
-        sections.append(("original_task", task_section))
-        metrics.sections_included.append("original_task")
+        task_section, cut = self._truncate(task_section, budgets["original_task"])
+        if cut:
+            metrics.truncations["original_task"] = cut
+            task_section += "..."
+        _add("original_task", task_section)
         
         # 4. Recent Steps (sliding window) - highest priority after policy
         recent_steps = self._extract_recent_steps(messages, self.MAX_WINDOW_STEPS)
         if recent_steps:
             steps_text = self._format_recent_steps(recent_steps)
-            if len(steps_text) > budgets["recent_steps"]:
-                # Truncate from the beginning (keep most recent)
-                metrics.truncations["recent_steps"] = len(steps_text) - budgets["recent_steps"]
-                steps_text = "...[Earlier steps truncated]...\n" + steps_text[-(budgets["recent_steps"] - 50):]
-            sections.append(("recent_steps", f"## 📝 RECENT EXECUTION HISTORY\n{steps_text}"))
-            metrics.sections_included.append("recent_steps")
+            # Truncate from the beginning (keep most recent)
+            steps_text, cut = self._truncate(steps_text, max(0, budgets["recent_steps"] - 12), keep="tail")
+            if cut:
+                metrics.truncations["recent_steps"] = cut
+                steps_text = "...[Earlier steps truncated]...\n" + steps_text
+            _add("recent_steps", f"## 📝 RECENT EXECUTION HISTORY\n{steps_text}")
         
         # 5. RAG Context
         if rag_context:
             rag_section = f"## 📚 RETRIEVED KNOWLEDGE (RAG)\n{rag_context}"
-            if len(rag_section) > budgets["rag_context"]:
-                metrics.truncations["rag_context"] = len(rag_section) - budgets["rag_context"]
-                rag_section = rag_section[:budgets["rag_context"]] + "\n...[RAG Truncated]..."
-            sections.append(("rag_context", rag_section))
-            metrics.sections_included.append("rag_context")
+            rag_section, cut = self._truncate(rag_section, budgets["rag_context"])
+            if cut:
+                metrics.truncations["rag_context"] = cut
+                rag_section += "\n...[RAG Truncated]..."
+            _add("rag_context", rag_section)
         
         # 6. Project Structure (lowest priority, can be heavily truncated)
         if project_structure:
             struct_section = f"## 📂 PROJECT STRUCTURE\n{project_structure}"
-            if len(struct_section) > budgets["structure"]:
-                metrics.truncations["structure"] = len(struct_section) - budgets["structure"]
-                struct_section = struct_section[:budgets["structure"]] + "\n...[Structure Truncated]..."
-            sections.append(("structure", struct_section))
-            metrics.sections_included.append("structure")
+            struct_section, cut = self._truncate(struct_section, budgets["structure"])
+            if cut:
+                metrics.truncations["structure"] = cut
+                struct_section += "\n...[Structure Truncated]..."
+            _add("structure", struct_section)
         
-        # 7. Assemble final context (sorted by priority)
-        priority_order = ["policy", "original_task", "recent_steps", "rag_context", "structure"]
-        sorted_sections = sorted(sections, key=lambda x: priority_order.index(x[0]))
-        final_context = "\n\n".join(s[1] for s in sorted_sections)
+        # 7. Assemble: stable prefix, then volatile suffix
+        by_name = dict(sections)
+        prefix = "\n\n".join(by_name[n] for n in self.STABLE_SECTIONS if n in by_name)
+        suffix = "\n\n".join(by_name[n] for n in self.VOLATILE_SECTIONS if n in by_name)
+        parts = PromptParts(prefix=prefix, suffix=suffix, prefix_hash=prefix_hash(prefix))
+        final_context = parts.text
+        if not record:
+            return parts
         
-        # 8. Record metrics
+        # 8. Record metrics (section counts are cached; +1 per "\n\n" separator)
         metrics.total_chars = len(final_context)
         metrics.estimated_tokens = metrics.total_chars // self.CHARS_PER_TOKEN
+        metrics.counted_tokens = sum(metrics.section_tokens.values()) + max(0, len(sections) - 1)
+        metrics.tokenizer = self.token_counter.name
+        metrics.tokenizer_exact = self.token_counter.exact
+        metrics.prefix_hash = parts.prefix_hash
+        metrics.prefix_tokens = self.count_tokens(prefix)
+        if parts.prefix_hash == self._last_prefix_hash:
+            self._prefix_reuse += 1
+        self._last_prefix_hash = parts.prefix_hash
         self._last_metrics = metrics
         self._metrics_history.append(metrics)
         
@@ -245,11 +356,12 @@ class Context7:
             self._metrics_history = self._metrics_history[-100:]
         
         if self.verbose:
-            print(f"[Context7] Prepared context: {metrics.estimated_tokens} tokens, "
+            print(f"[Context7] Prepared context: {metrics.counted_tokens} tokens "
+                  f"({metrics.tokenizer}, char estimate {metrics.estimated_tokens}), "
                   f"{len(metrics.sections_included)} sections, "
                   f"{len(metrics.truncations)} truncations")
         
-        return final_context
+        return parts
 
     def _extract_recent_steps(self, messages: List[Any], max_steps: int) -> List[Dict[str, str]]:
         """Extract the most recent steps from message history."""
@@ -311,7 +423,10 @@ class Context7:
             "policy": "sliding_window_priority",
             "max_window_steps": self.MAX_WINDOW_STEPS,
             "priority_weights": self.PRIORITY_WEIGHTS,
-            "metrics_history_size": len(self._metrics_history)
+            "metrics_history_size": len(self._metrics_history),
+            "token_counter": self.token_counter.stats(),
+            "last_prefix_hash": self._last_prefix_hash,
+            "prefix_reuse": self._prefix_reuse,
         }
         
         if self._last_metrics:
@@ -319,9 +434,11 @@ class Context7:
         
         # Calculate averages from history
         if self._metrics_history:
-            avg_tokens = sum(m.estimated_tokens for m in self._metrics_history) / len(self._metrics_history)
+            avg_tokens = sum(m.counted_tokens for m in self._metrics_history) / len(self._metrics_history)
+            avg_estimated = sum(m.estimated_tokens for m in self._metrics_history) / len(self._metrics_history)
             avg_truncations = sum(len(m.truncations) for m in self._metrics_history) / len(self._metrics_history)
             stats["avg_tokens"] = int(avg_tokens)
+            stats["avg_estimated_tokens"] = int(avg_estimated)
             stats["avg_truncations"] = round(avg_truncations, 2)
         
         return stats
@@ -334,4 +451,6 @@ class Context7:
         """Clear the metrics history."""
         self._metrics_history = []
         self._last_metrics = None
+        self._last_prefix_hash = None
+        self._prefix_reuse = 0
 
@@ -6,37 +6,28 @@ import threading
 import os
 import sys
 import contextlib
+import importlib.util
 
 logger = logging.getLogger(__name__)
 
 from typing import Dict, Any, Callable, List, Optional, Union, Tuple
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-
-# Import RAG integration for intelligent tool selection
-try:
-    from mcp_integration.rag_integration import (
-        select_tool_for_task as rag_select_tool_for_task,
-        get_best_tool_for_task as rag_get_best_tool_for_task,
-        classify_task as rag_classify_task,
-        get_rag_stats as rag_get_rag_stats,
-    )
-    RAG_AVAILABLE = True
-except ImportError:
-    RAG_AVAILABLE = False
-    rag_select_tool_for_task = None
-    rag_get_best_tool_for_task = None
-    rag_classify_task = None
-    rag_get_rag_stats = None
+
+from core.startup import get_startup_profiler, lazy_callable
+
+# RAG integration for intelligent tool selection (imports chromadb, so resolved on first use)
+RAG_AVAILABLE = importlib.util.find_spec("chromadb") is not None
+rag_select_tool_for_task = lazy_callable("mcp_integration.rag_integration", "select_tool_for_task") if RAG_AVAILABLE else None
+rag_get_best_tool_for_task = lazy_callable("mcp_integration.rag_integration", "get_best_tool_for_task") if RAG_AVAILABLE else None
+rag_classify_task = lazy_callable("mcp_integration.rag_integration", "classify_task") if RAG_AVAILABLE else None
+rag_get_rag_stats = lazy_callable("mcp_integration.rag_integration", "get_rag_stats") if RAG_AVAILABLE else None
 
 # Import all tools
 from system_ai.tools.automation import (
     run_shell, open_app, run_applescript, run_shortcut,
     click, type_text, press_key, move_mouse, click_mouse, activate_app
 )
-from system_ai.tools.permissions_manager import create_permissions_manager, open_system_settings_privacy
-from system_ai.tools.screenshot import take_screenshot, capture_screen_region, take_burst_screenshot
-from system_ai.tools.filesystem import read_file, write_file, list_files, copy_file
+from system_ai.tools.permissions_manager import get_permissions_manager, open_system_settings_privacy
+from system_ai.tools.filesystem import read_file, write_file, list_files, copy_file, search_files
 from system_ai.tools.windsurf import (
     send_to_windsurf,
     open_file_in_windsurf,
@@ -44,29 +35,29 @@ from system_ai.tools.windsurf import (
     get_windsurf_current_project_path,
     open_project_in_windsurf,
 )
+from core.memory import save_memory_tool, query_memory_tool
+from system_ai.tools.macos_native_automation import create_automation_executor
+
+# Heavy tool modules (mss/PIL, psutil, pyobjc, Playwright, OpenCV) are imported on first call.
+take_screenshot = lazy_callable("system_ai.tools.screenshot", "take_screenshot")
+capture_screen_region = lazy_callable("system_ai.tools.screenshot", "capture_screen_region")
+take_burst_screenshot = lazy_callable("system_ai.tools.screenshot", "take_burst_screenshot")
+list_processes = lazy_callable("system_ai.tools.system", "list_processes")
+kill_process = lazy_callable("system_ai.tools.system", "kill_process")
+get_system_stats = lazy_callable("system_ai.tools.system", "get_system_stats")
+get_monitors_info = lazy_callable("system_ai.tools.desktop", "get_monitors_info")
+get_open_windows = lazy_callable("system_ai.tools.desktop", "get_open_windows")
+get_clipboard = lazy_callable("system_ai.tools.desktop", "get_clipboard")
+set_clipboard = lazy_callable("system_ai.tools.desktop", "set_clipboard")
+set_wallpaper = lazy_callable("system_ai.tools.desktop", "set_wallpaper")
+get_current_wallpaper = lazy_callable("system_ai.tools.desktop", "get_current_wallpaper")
 analyze_with_copilot = None
 ocr_region = None
 find_image_on_screen = None
+find_images_on_screen = None
 compare_images = None
-from core.memory import save_memory_tool, query_memory_tool
-from system_ai.tools.macos_native_automation import create_automation_executor
-from system_ai.tools.system import list_processes, kill_process, get_system_stats
-from system_ai.tools.desktop import get_monitors_info, get_open_windows, get_clipboard, set_clipboard, set_wallpaper, get_current_wallpaper
-from system_ai.tools.browser import (
-    browser_open_url,
-    browser_click_element,
-    browser_type_text,
-    browser_get_content,
-    browser_execute_script,
-    browser_ensure_ready,
-    browser_press_key,
-    browser_screenshot,
-    browser_snapshot,
-    browser_navigate,
-    browser_get_links,
-    browser_close,
-    browser_search_duckduckgo
-)
+wait_for_screen = None
+find_text_on_screen = None
 
 class ExternalMCPProvider:
     """Handles connection to an external MCP server via stdio."""
@@ -75,7 +66,7 @@ class ExternalMCPProvider:
         self.command = command
         self.args = args
         self.env = env or os.environ.copy()
-        self._server_params = StdioServerParameters(command=command, args=args, env=self.env)
+        self._server_params = None
         self._tools: Dict[str, Any] = {}
         self._loop_lock = threading.Lock()
         self._connect_lock = threading.Lock()
@@ -146,6 +137,12 @@ class ExternalMCPProvider:
         """Persistent task that manages the connection lifecycle."""
         async with contextlib.AsyncExitStack() as stack:
             try:
+                # The MCP SDK is heavy to import; defer it until a provider actually connects.
+                from mcp import ClientSession, StdioServerParameters
+                from mcp.client.stdio import stdio_client
+
+                if self._server_params is None:
+                    self._server_params = StdioServerParameters(command=self.command, args=self.args, env=self.env)
                 read, write = await stack.enter_async_context(stdio_client(self._server_params))
                 self._session = await stack.enter_async_context(ClientSession(read, write))
                 await self._session.initialize()
@@ -260,27 +257,67 @@ class MCPToolRegistry:
         "browser_close": ("playwright", "browser_close"),
     }
 
-    def __init__(self):
+    def __init__(self, eager_connect: Optional[bool] = None):
+        """
+        Args:
+            eager_connect: Connect external MCP providers during construction.
+                Defaults to TRINITY_MCP_EAGER_CONNECT; otherwise providers connect
+                on first use or in `warm_up()` (usually on a background thread).
+        """
         self._tools: Dict[str, Callable] = {}
         self._descriptions: Dict[str, str] = {}
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._cpu_bound: set = set()
         self._external_providers: Dict[str, ExternalMCPProvider] = {}
         self._external_tools_map: Dict[str, str] = {}
-        self._register_foundation_tools()
-        self._register_filesystem_tools()
-        self._register_dev_tools()
-        self._register_vision_tools()
-        self._register_system_and_desktop_tools()
-        self._register_memory_tools()
-        self._register_browser_tools()
-        self._register_recorder_tools()
-        self._register_response_tools()
-        self._register_plugin_tools()
-        self._register_mcp_management_tools()
-        self._register_external_mcp()
+        if eager_connect is None:
+            eager_connect = str(os.getenv("TRINITY_MCP_EAGER_CONNECT") or "").strip().lower() in {"1", "true", "yes", "on"}
+        self._eager_connect = bool(eager_connect)
+
+        profiler = get_startup_profiler()
+        for stage in (
+            self._register_foundation_tools,
+            self._register_filesystem_tools,
+            self._register_dev_tools,
+            self._register_vision_tools,
+            self._register_system_and_desktop_tools,
+            self._register_memory_tools,
+            self._register_browser_tools,
+            self._register_recorder_tools,
+            self._register_response_tools,
+            self._register_plugin_tools,
+            self._register_mcp_management_tools,
+            self._register_external_mcp,
+        ):
+            with profiler.stage(f"registry{stage.__name__.replace('_register', '')}"):
+                stage()
         
         from mcp_integration.core.mcp_client_manager import get_mcp_client_manager, MCPClientType
         self._mcp_client_manager = get_mcp_client_manager()
 
+    def warm_up(self, timeout: float = 5.0) -> Dict[str, bool]:
+        """Connect external MCP providers ahead of first use. Safe to call from a background thread."""
+        results: Dict[str, bool] = {}
+        for name, provider in list(self._external_providers.items()):
+            try:
+                provider.connect(timeout=timeout)
+                results[name] = True
+            except Exception as e:
+                logger.warning(f"[MCP] Warm-up failed for {name} provider: {e}")
+                provider._connected = False
+                results[name] = False
+        return results
+
+    def warm_up_plugins(self) -> Dict[str, bool]:
+        """Import manifest plugins ahead of their first tool call. Safe to call from a background thread."""
+        from plugins import warm_up_plugins
+        return warm_up_plugins(background=True)
+
+    def plugin_import_stats(self) -> Dict[str, Any]:
+        """Per-plugin import timings (ms) and plugins not imported yet."""
+        from plugins import plugin_import_stats
+        return plugin_import_stats()
+
     def set_mcp_client(self, client_type: str) -> bool:
         """Switch active MCP client (open_mcp/continue)."""
         try:
@@ -305,7 +342,7 @@ class MCPToolRegistry:
             "Open macOS Privacy pane. Args: permission (accessibility|automation|screen_recording|full_disk_access|microphone|files_and_folders)",
         )
 
-        pm = create_permissions_manager()
+        pm = get_permissions_manager()
         self.register_tool("check_permissions", lambda: {"tool": "check_permissions", "status": "success", "permissions": {k: vars(v) for k, v in pm.check_all().items()}}, "Check macOS permissions (accessibility/screen_recording/automation). Args: none")
         self.register_tool("permission_help", lambda lang="en": {"tool": "permission_help", "status": "success", "text": pm.get_permission_help_text(lang=str(lang or 'en').strip().lower())}, "Get permissions help text. Args: lang (en|uk)")
         print("✅ [MCP] Low-level tools available: run_shell, run_applescript, open_app, run_shortcut")
@@ -399,10 +436,22 @@ class MCPToolRegistry:
 
     def _register_filesystem_tools(self):
         # Allow full filesystem access for testing
-        self.register_tool("read_file", read_file, "Read file content. Args: path (str)")
+        self.register_tool(
+            "read_file",
+            read_file,
+            "Read file content. Args: path (str), optional start_line/end_line (int, 1-based), head (int lines), "
+            "tail (int lines), offset/length (int bytes). Use ranges for large files and logs.",
+        )
         self.register_tool("write_file", write_file, "Write file content. Args: path (str), content (str)")
         self.register_tool("copy_file", copy_file, "Copy file (binary-safe). Args: src (str), dst (str), overwrite (bool)")
         self.register_tool("list_files", list_files, "List directory. Args: path (str)")
+        self.register_tool(
+            "search_files",
+            search_files,
+            "Search file contents (grep-like, parallel). Args: query (str), path (str, file or directory), "
+            "regex (bool), case_sensitive (bool), include (list of globs like '*.py'), max_matches (int). "
+            "Returns file/line/column/offset and a one-line preview per match.",
+        )
 
     def _register_dev_tools(self):
         self.register_tool("send_to_windsurf", send_to_windsurf, "Send message to Windsurf Chat. Args: message (str)")
@@ -427,36 +476,37 @@ class MCPToolRegistry:
 
         disable_vision = str(os.environ.get("TRINITY_DISABLE_VISION", "")).strip().lower() in {"1", "true", "yes", "on"}
         if not disable_vision:
-            try:
-                from system_ai.tools.vision import (
-                    analyze_with_copilot as _analyze_with_copilot,
-                    ocr_region as _ocr_region,
-                    find_image_on_screen as _find_image_on_screen,
-                    compare_images as _compare_images,
-                )
-                global analyze_with_copilot, ocr_region, find_image_on_screen, compare_images
-                analyze_with_copilot, ocr_region = _analyze_with_copilot, _ocr_region
-                find_image_on_screen, compare_images = _find_image_on_screen, _compare_images
-
-                self.register_tool("vision_analyze", analyze_with_copilot, "Analyze screen with AI to get coordinates and text. Args: image_path (optional), prompt (str)")
-                self.register_tool("analyze_screen", analyze_with_copilot, "Analyze screen with AI to verify state, find elements, or solve tasks. Args: image_path (optional), prompt (str)")
-                self.register_tool("ocr_region", ocr_region, "OCR a screen region using vision. Args: x,y,width,height")
-                self.register_tool("find_image_on_screen", find_image_on_screen, "Find an image template on screen. Args: template_path (str), tolerance (float)")
-                self.register_tool("compare_images", compare_images, "Compare two images (before/after) using vision. Args: path1 (str), path2 (str), prompt (str optional)")
-            except Exception as e:
-                err_func = lambda *_, **__: {"status": "error", "error": f"Vision tools unavailable: {e}"}
-                self.register_tool("vision_analyze", err_func, "Analyze screen with AI (unavailable)")
-                self.register_tool("analyze_screen", err_func, "Analyze screen with AI (unavailable)")
-                self.register_tool("ocr_region", err_func, "OCR a screen region (unavailable)")
-                self.register_tool("find_image_on_screen", err_func, "Find image on screen (unavailable)")
-                self.register_tool("compare_images", err_func, "Compare images (unavailable)")
+            # OpenCV/numpy are imported on first call; an import failure surfaces as a tool error.
+            def _vision_unavailable(e: Exception) -> Callable:
+                return lambda *_, **__: {"status": "error", "error": f"Vision tools unavailable: {e}"}
+
+            global analyze_with_copilot, ocr_region, find_image_on_screen, find_images_on_screen, compare_images, wait_for_screen, find_text_on_screen
+            analyze_with_copilot = lazy_callable("system_ai.tools.vision", "analyze_with_copilot", fallback=_vision_unavailable)
+            ocr_region = lazy_callable("system_ai.tools.vision", "ocr_region", fallback=_vision_unavailable)
+            find_image_on_screen = lazy_callable("system_ai.tools.vision", "find_image_on_screen", fallback=_vision_unavailable)
+            find_images_on_screen = lazy_callable("system_ai.tools.vision", "find_images_on_screen", fallback=_vision_unavailable)
+            compare_images = lazy_callable("system_ai.tools.vision", "compare_images", fallback=_vision_unavailable)
+            wait_for_screen = lazy_callable("system_ai.tools.screen_watch", "wait_for_screen", fallback=_vision_unavailable)
+            find_text_on_screen = lazy_callable("system_ai.tools.vision", "find_text_on_screen", fallback=_vision_unavailable)
+
+            self.register_tool("vision_analyze", analyze_with_copilot, "Analyze screen with AI to get coordinates and text. Args: image_path (optional), prompt (str), prompts (list[str] optional, answered in one call), regions (list of {x,y,width,height} optional crop)")
+            self.register_tool("analyze_screen", analyze_with_copilot, "Analyze screen with AI to verify state, find elements, or solve tasks. Args: image_path (optional), prompt (str), prompts (list[str] optional, answered in one call), regions (list of {x,y,width,height} optional crop)")
+            self.register_tool("ocr_region", ocr_region, "OCR a screen region using vision. Args: x,y,width,height")
+            self.register_tool("find_image_on_screen", find_image_on_screen, "Find an image template on screen. Args: template_path (str), tolerance (float), screenshot_path (optional), roi ({x,y,width,height} optional), multi_scale (bool)")
+            self.register_tool("find_images_on_screen", find_images_on_screen, "Find several image templates in one screen capture. Args: template_paths (list[str]), tolerance (float), screenshot_path (optional), multi_scale (bool)")
+            self.register_tool("compare_images", compare_images, "Compare two images (before/after) using vision. Args: path1 (str), path2 (str), prompt (str optional)")
+            self.register_tool("find_text_on_screen", find_text_on_screen, "Find visible text via OCR and return click coordinates (reuses the OCR of an already analyzed screen). Args: text (str), fuzzy (bool), min_score (float), image_path (optional)")
+            self.register_tool("wait_for_screen", wait_for_screen, "Wait until the screen or a region changes or becomes stable (instead of sleeping). Args: until (change|stable|change_then_stable), timeout (float s), stable_ms (int), x,y,width,height (optional region), min_change (float %)")
         else:
             err_func = lambda *_, **__: {"status": "error", "error": self.VISION_DISABLED_ERROR}
             self.register_tool("vision_analyze", err_func, "Analyze screen with AI (disabled)")
             self.register_tool("analyze_screen", err_func, "Analyze screen with AI (disabled)")
             self.register_tool("ocr_region", err_func, "OCR a screen region (disabled)")
             self.register_tool("find_image_on_screen", err_func, "Find image on screen (disabled)")
+            self.register_tool("find_images_on_screen", err_func, "Find images on screen (disabled)")
             self.register_tool("compare_images", err_func, "Compare images (disabled)")
+            self.register_tool("find_text_on_screen", err_func, "Find text on screen (disabled)")
+            self.register_tool("wait_for_screen", err_func, "Wait for screen change (disabled)")
 
     def _register_system_and_desktop_tools(self):
         self.register_tool("move_mouse", move_mouse, "Move mouse to absolute coordinates. Args: x (int), y (int)")
@@ -541,7 +591,8 @@ class MCPToolRegistry:
         )
         
         try:
-            from plugins import load_all_plugins, discover_plugins
+            # Manifest plugins register import-on-call proxies; plugin code is not imported here
+            from plugins import load_all_plugins
             
             load_results = load_all_plugins(self)
             loaded_count = sum(1 for success in load_results.values() if success)
@@ -635,6 +686,8 @@ class MCPToolRegistry:
                         provider = ExternalMCPProvider(name, cmd, args, env=resolved_env)
                         self._external_providers[name] = provider
                         print(f"[MCP] Registered external provider: {name}")
+                        if not self._eager_connect:
+                            continue
                         
                         # Try to connect immediately to verify configuration
                         try:
@@ -753,13 +806,39 @@ class MCPToolRegistry:
         
         return selector_fixes.get(selector, selector)
 
-    def register_tool(self, name: str, func: Callable, description: str):
+    def register_tool(
+        self,
+        name: str,
+        func: Callable,
+        description: str,
+        cpu_bound: bool = False,
+        schema: Optional[Dict[str, Any]] = None,
+    ):
+        """Register a local tool. CPU-bound tools (flag or `@cpu_bound`) run in the tool process pool.
+
+        `schema` (or a `schema` dict on the callable, as plugin manifest
+        proxies carry) is the JSON schema of the tool's arguments.
+        """
         self._tools[name] = func
         self._descriptions[name] = description
+        if cpu_bound or getattr(func, "cpu_bound", False) is True:
+            self._cpu_bound.add(name)
+        else:
+            self._cpu_bound.discard(name)
+        if schema is None:
+            schema = getattr(func, "schema", None)
+        if isinstance(schema, dict) and schema:
+            self._schemas[name] = schema
+        else:
+            self._schemas.pop(name, None)
 
     def get_tool(self, name: str) -> Optional[Callable]:
         return self._tools.get(name)
 
+    def get_tool_schema(self, name: str) -> Optional[Dict[str, Any]]:
+        """JSON schema of a local tool's arguments, when one was registered."""
+        return self._schemas.get(name)
+
     def list_tools(self, task_type: Optional[str] = None) -> str:
         """Returns a formatted list of tools for the System Prompt."""
         lines = []
@@ -801,12 +880,15 @@ class MCPToolRegistry:
         
         return "\n".join(lines)
 
-    def get_all_tool_definitions(self, task_type: Optional[str] = None) -> List[Dict[str, str]]:
-        """Returns a list of tool definitions for LLM binding."""
+    def get_all_tool_definitions(self, task_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Returns a list of tool definitions for LLM binding (with `parameters` where a schema is known)."""
         defs = []
         
         for name, desc in self._descriptions.items():
-            defs.append({"name": name, "description": desc})
+            tool_def: Dict[str, Any] = {"name": name, "description": desc}
+            if name in self._schemas:
+                tool_def["parameters"] = self._schemas[name]
+            defs.append(tool_def)
             
         for p_name, provider in self._external_providers.items():
             try:
@@ -919,15 +1001,15 @@ class MCPToolRegistry:
             # We call browser_evaluate (which maps to playwright.evaluate)
             eval_tool = f"{provider_name}.browser_evaluate"
             self._external_tools_map[eval_tool] = provider_name
-            # Wait a bit for popup to appear
-            time.sleep(2.0) 
+            # Wait for the popup to appear (until the DOM settles)
+            self._settle_external_page(eval_tool, quiet_ms=500, timeout=2.0)
             smash_res = self._try_external_direct_call(eval_tool, {"function": smash_js})
             
             # Log smash result if needed or append to output? 
             # ideally we just return the nav result, but maybe annotated.
             if smash_res and "Cookie Smashed" in smash_res:
                  # If we smashed, we might want to wait a bit and refresh the content/url status
-                 time.sleep(1.0)
+                 self._settle_external_page(eval_tool, quiet_ms=300, timeout=1.0)
                  return nav_result_json.replace("}", ', "cookie_status": "smashed"}')
                  
         except Exception as e:
@@ -935,6 +1017,23 @@ class MCPToolRegistry:
 
         return nav_result_json
 
+    def _settle_external_page(self, eval_tool: str, quiet_ms: int, timeout: float) -> None:
+        """Wait (at most `timeout` s) for the MCP browser's DOM to go quiet for `quiet_ms`.
+
+        Runs the in-page settle script through the provider's evaluate tool;
+        falls back to watching the screen when that call fails.
+        """
+        try:
+            from system_ai.tools.page_scripts import settle_function
+
+            res = self._try_external_direct_call(eval_tool, {"function": settle_function(quiet_ms, timeout * 1000.0)})
+            if res and "settled" in res:
+                return
+        except Exception:
+            pass
+        from system_ai.tools.screen_watch import settle_screen
+        settle_screen(timeout, stable_ms=quiet_ms)
+
     def _try_mcp_routing(self, tool_name: str, args: Dict[str, Any], task_type: Optional[str] = None) -> Optional[str]:
         """
         Attempts to route the tool call to the appropriate MCP client.
@@ -1031,11 +1130,34 @@ class MCPToolRegistry:
             import inspect
             sig = inspect.signature(func)
             call_kwargs = self._prepare_call_kwargs(sig, args)
-            result = func(**call_kwargs)
+            if tool_name in self._cpu_bound:
+                result = self._call_cpu_bound(tool_name, func, call_kwargs)
+            else:
+                result = func(**call_kwargs)
             return json.dumps(result, indent=2, ensure_ascii=False)
         except Exception as e:
             return f"Error executing '{tool_name}': {str(e)}"
 
+    def _call_cpu_bound(self, tool_name: str, func: Callable, call_kwargs: Dict[str, Any]) -> Any:
+        """Run a CPU-bound tool in the process pool so it doesn't hold this process's GIL."""
+        from core.tool_pool import get_tool_pool, is_picklable, tool_pool_enabled
+
+        if not tool_pool_enabled():
+            return func(**call_kwargs)
+        if not is_picklable(func):
+            logger.warning(f"[MCP] {tool_name} is marked cpu_bound but can't be sent to a worker; running inline")
+            self._cpu_bound.discard(tool_name)
+            return func(**call_kwargs)
+        return get_tool_pool().call(func, call_kwargs)
+
+    def warm_up_tool_pool(self) -> List[int]:
+        """Start the CPU-bound tool workers ahead of the first call (only if any tool needs them)."""
+        from core.tool_pool import get_tool_pool, tool_pool_enabled
+
+        if not self._cpu_bound or not tool_pool_enabled():
+            return []
+        return get_tool_pool().warm_up()
+
     def _prepare_call_kwargs(self, sig: Any, args: Dict[str, Any]) -> Dict[str, Any]:
         if "allow" in sig.parameters and "allow" not in args:
             args["allow"] = True
@@ -1061,7 +1183,10 @@ class MCPToolRegistry:
         Use RAG to intelligently select the best tools for a given task.
         """
         if RAG_AVAILABLE and rag_select_tool_for_task:
-            return rag_select_tool_for_task(task_description, n_candidates)
+            try:
+                return rag_select_tool_for_task(task_description, n_candidates)
+            except ImportError:
+                pass
         
         return self._fallback_tool_selection(task_description, n_candidates)
 
@@ -1075,7 +1200,10 @@ class MCPToolRegistry:
         Classify a task into a category (browser, system, gui, ai, etc.)
         """
         if RAG_AVAILABLE and rag_classify_task:
-            return rag_classify_task(task_description)
+            try:
+                return rag_classify_task(task_description)
+            except ImportError:
+                pass
         
         task_lower = task_description.lower()
         
@@ -1121,7 +1249,10 @@ class MCPToolRegistry:
     def get_rag_stats(self) -> Dict[str, Any]:
         """Get statistics about the RAG system."""
         if RAG_AVAILABLE and rag_get_rag_stats:
-            return rag_get_rag_stats()
+            try:
+                return rag_get_rag_stats()
+            except ImportError:
+                pass
         return {
             "rag_available": False,
             "fallback_mode": True,
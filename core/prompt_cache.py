@@ -0,0 +1,128 @@
+"""Prompt Cache
+
+Local response cache for planner LLM calls, keyed by the full prompt hash.
+
+Identical re-plans are common in replan loops; with the cache enabled they
+skip the LLM entirely. Disabled by default because a cached answer also
+repeats the previous (possibly bad) plan.
+
+Features:
+- prompt_hash: stable hash over message types and contents (+ model)
+- PromptCache: LRU + TTL response cache with hit/miss counters
+- Per-call records of prefix hash, prompt hash and cache hit
+
+Environment:
+    TRINITY_PROMPT_CACHE: enable the response cache (default off)
+    TRINITY_PROMPT_CACHE_SIZE: max cached responses (default 64)
+    TRINITY_PROMPT_CACHE_TTL: seconds a response stays valid (default 600)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+def _message_parts(messages: Iterable[Any]) -> Iterable[Tuple[str, str]]:
+    for m in messages:
+        yield getattr(m, "type", type(m).__name__), str(getattr(m, "content", m))
+
+
+def prompt_hash(messages: Iterable[Any], model: str = "") -> str:
+    """Hash of a formatted prompt (list of LangChain messages)."""
+    h = hashlib.sha256(model.encode("utf-8"))
+    for kind, content in _message_parts(messages):
+        h.update(b"\x00")
+        h.update(kind.encode("utf-8"))
+        h.update(b"\x01")
+        h.update(content.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()[:32]
+
+
+class PromptCache:
+    """LRU response cache with TTL; also records per-call prompt hashes."""
+
+    def __init__(self, enabled: bool = False, max_entries: int = 64, ttl: float = 600.0, history: int = 100):
+        self.enabled = bool(enabled)
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._calls: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(history)))
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "PromptCache":
+        enabled = str(os.getenv("TRINITY_PROMPT_CACHE") or "").strip().lower() in {"1", "true", "yes", "on"}
+        try:
+            size = int(os.getenv("TRINITY_PROMPT_CACHE_SIZE") or 64)
+        except ValueError:
+            size = 64
+        try:
+            ttl = float(os.getenv("TRINITY_PROMPT_CACHE_TTL") or 600)
+        except ValueError:
+            ttl = 600.0
+        return cls(enabled=enabled, max_entries=size, ttl=ttl)
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl > 0 and time.time() - entry[0] > self.ttl):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        if not self.enabled or not response:
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_call(self, name: str, prefix_hash: str, full_hash: str, cache_hit: bool = False) -> None:
+        """Remember the hashes of one LLM call (for prefix-stability stats)."""
+        with self._lock:
+            self._calls.append({
+                "name": name,
+                "prefix_hash": prefix_hash,
+                "prompt_hash": full_hash,
+                "cache_hit": bool(cache_hit),
+                "timestamp": time.time(),
+            })
+
+    def calls(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._calls)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = list(self._calls)
+        # A call "reuses" the prefix if the previous call of the same name had it too
+        reused = 0
+        last: Dict[str, str] = {}
+        for c in calls:
+            if last.get(c["name"]) == c["prefix_hash"]:
+                reused += 1
+            last[c["name"]] = c["prefix_hash"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "calls": len(calls),
+            "prefix_reuse": reused,
+        }
@@ -0,0 +1,297 @@
+"""Staged Startup
+
+Helpers that keep TrinityRuntime and the TUI responsive during startup.
+
+Features:
+- StartupProfiler: wall time spent per subsystem (foreground and background)
+- LazyProxy: heavy subsystems constructed on first use
+- LazyCallable: tool functions imported on first call
+- BackgroundWarmup: daemon thread that warms up ChromaDB, MCP providers, etc.
+"""
+
+import importlib
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class StageRecord:
+    """Timing of a single startup stage."""
+    name: str
+    seconds: float
+    background: bool = False
+    error: Optional[str] = None
+    depth: int = 0
+    started: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "ms": round(self.seconds * 1000.0, 2),
+            "background": self.background,
+            "error": self.error,
+            "depth": self.depth,
+        }
+
+
+class StartupProfiler:
+    """Collects per-subsystem startup timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: List[StageRecord] = []
+        self._t0 = time.perf_counter()
+        self._ready_at: Optional[float] = None
+        self._local = threading.local()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records = []
+            self._t0 = time.perf_counter()
+            self._ready_at = None
+
+    @contextmanager
+    def stage(self, name: str, background: bool = False) -> Iterator[None]:
+        """Time a block of startup work under `name`."""
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        t0 = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._local.depth = depth
+            self.record(name, time.perf_counter() - t0, background=background, error=error, depth=depth, started=t0)
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        background: bool = False,
+        error: Optional[str] = None,
+        depth: int = 0,
+        started: Optional[float] = None,
+    ) -> None:
+        rec = StageRecord(
+            name=name,
+            seconds=float(seconds),
+            background=background,
+            error=error,
+            depth=depth,
+            started=time.perf_counter() - seconds if started is None else started,
+        )
+        with self._lock:
+            self._records.append(rec)
+
+    def mark_ready(self) -> None:
+        """Mark the moment the prompt became interactive."""
+        with self._lock:
+            if self._ready_at is None:
+                self._ready_at = time.perf_counter()
+
+    def records(self) -> List[StageRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            records = sorted(self._records, key=lambda r: r.started)
+            ready_ms = None if self._ready_at is None else round((self._ready_at - self._t0) * 1000.0, 2)
+        # Nested stages are already included in their parent's time.
+        foreground = sum(r.seconds for r in records if not r.background and r.depth == 0)
+        background = sum(r.seconds for r in records if r.background and r.depth == 0)
+        return {
+            "time_to_ready_ms": ready_ms,
+            "foreground_ms": round(foreground * 1000.0, 2),
+            "background_ms": round(background * 1000.0, 2),
+            "stages": [r.to_dict() for r in records],
+        }
+
+    def format_report(self) -> str:
+        rep = self.report()
+        lines = ["Startup profile:"]
+        for r in rep["stages"]:
+            kind = "bg" if r["background"] else "fg"
+            err = f"  ! {r['error']}" if r["error"] else ""
+            name = "  " * r["depth"] + r["name"]
+            lines.append(f"  [{kind}] {name:<40} {r['ms']:>10.2f} ms{err}")
+        lines.append(f"  foreground total: {rep['foreground_ms']:.2f} ms")
+        lines.append(f"  background total: {rep['background_ms']:.2f} ms")
+        if rep["time_to_ready_ms"] is not None:
+            lines.append(f"  start-to-prompt:  {rep['time_to_ready_ms']:.2f} ms")
+        return "\n".join(lines)
+
+
+_profiler = StartupProfiler()
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """Get the process-wide startup profiler."""
+    return _profiler
+
+
+class LazyProxy:
+    """
+    Transparent proxy that builds its target on first attribute access.
+
+    Construction is thread-safe, so a background warm-up and the first real
+    use can race without building the subsystem twice.
+    """
+
+    __slots__ = ("_lp_name", "_lp_factory", "_lp_target", "_lp_lock", "_lp_profiler")
+
+    def __init__(self, name: str, factory: Callable[[], Any], profiler: Optional[StartupProfiler] = None):
+        object.__setattr__(self, "_lp_name", str(name))
+        object.__setattr__(self, "_lp_factory", factory)
+        object.__setattr__(self, "_lp_target", None)
+        object.__setattr__(self, "_lp_lock", threading.Lock())
+        object.__setattr__(self, "_lp_profiler", profiler)
+
+    @property
+    def is_resolved(self) -> bool:
+        return object.__getattribute__(self, "_lp_factory") is None
+
+    def resolve(self, background: bool = False) -> Any:
+        """Build the target (once) and return it."""
+        if object.__getattribute__(self, "_lp_factory") is None:
+            return object.__getattribute__(self, "_lp_target")
+        with object.__getattribute__(self, "_lp_lock"):
+            factory = object.__getattribute__(self, "_lp_factory")
+            if factory is None:
+                return object.__getattribute__(self, "_lp_target")
+            profiler = object.__getattribute__(self, "_lp_profiler") or _profiler
+            with profiler.stage(object.__getattribute__(self, "_lp_name"), background=background):
+                target = factory()
+            object.__setattr__(self, "_lp_target", target)
+            object.__setattr__(self, "_lp_factory", None)
+            return target
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.resolve(), item)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        setattr(self.resolve(), key, value)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, "_lp_name")
+        if self.is_resolved:
+            return f"<LazyProxy {name}: {object.__getattribute__(self, '_lp_target')!r}>"
+        return f"<LazyProxy {name} (unresolved)>"
+
+
+def unwrap(obj: Any) -> Any:
+    """Return the real object behind a LazyProxy (resolving it if needed)."""
+    if isinstance(obj, LazyProxy):
+        return obj.resolve()
+    return obj
+
+
+class LazyCallable:
+    """
+    Callable reference to `module:attr` that imports the module on first use.
+    `attr` may be dotted (e.g. "Class.staticmethod").
+
+    `inspect.signature` sees the real function's signature, so registry
+    argument mapping keeps working without importing at registration time.
+    If `fallback` is given, an import failure resolves to `fallback(error)`
+    instead of raising.
+    """
+
+    def __init__(self, module: str, attr: str, fallback: Optional[Callable[[Exception], Callable[..., Any]]] = None):
+        self.module = module
+        self.attr = attr
+        self.fallback = fallback
+        self._func: Optional[Callable[..., Any]] = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Callable[..., Any]:
+        if self._func is None:
+            with self._lock:
+                if self._func is None:
+                    try:
+                        with _profiler.stage(f"import:{self.module}"):
+                            mod = importlib.import_module(self.module)
+                        target: Any = mod
+                        for part in self.attr.split("."):
+                            target = getattr(target, part)
+                        self._func = target
+                    except Exception as e:
+                        if self.fallback is None:
+                            raise
+                        self._func = self.fallback(e)
+        return self._func
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        return inspect.signature(self.resolve())
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __reduce__(self):
+        # Pickles by reference (tool process pool); the worker imports on first call
+        return (LazyCallable, (self.module, self.attr, self.fallback))
+
+    def __repr__(self) -> str:
+        return f"<LazyCallable {self.module}:{self.attr}>"
+
+
+def lazy_callable(
+    module: str,
+    attr: str,
+    fallback: Optional[Callable[[Exception], Callable[..., Any]]] = None,
+) -> LazyCallable:
+    return LazyCallable(module, attr, fallback=fallback)
+
+
+class BackgroundWarmup:
+    """Runs warm-up tasks on a daemon thread while the prompt is interactive."""
+
+    def __init__(self, name: str = "trinity-warmup", profiler: Optional[StartupProfiler] = None):
+        self.name = name
+        self.profiler = profiler or _profiler
+        self._tasks: List[Tuple[str, Callable[[], Any]]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+        self.errors: Dict[str, str] = {}
+
+    def add(self, name: str, func: Callable[[], Any]) -> "BackgroundWarmup":
+        self._tasks.append((str(name), func))
+        return self
+
+    def start(self) -> "BackgroundWarmup":
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            for name, func in self._tasks:
+                try:
+                    with self.profiler.stage(f"warmup:{name}", background=True):
+                        func()
+                except Exception as e:
+                    self.errors[name] = str(e)
+        finally:
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is None:
+            return True
+        return self._done.wait(timeout)
@@ -94,6 +94,8 @@ class TaskAnalyzer:
             res = take_screenshot()
             if res.get("status") == "success" and res.get("path"):
                 src = res["path"]
+                from system_ai.tools.frame import ensure_file
+                ensure_file(src)
                 ext = os.path.splitext(src)[1] or ".png"
                 dest = os.path.join(self.screenshot_dir, f"{self.current_task['task_id']}_s{len(self.current_task['screenshots'])+1}{ext}")
                 try:
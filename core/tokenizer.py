@@ -0,0 +1,265 @@
+"""Token Counting
+
+Pluggable tokenizer layer used for context budgeting (Context7).
+
+Features:
+- TiktokenTokenizer: fast offline BPE (tiktoken), exact counts for OpenAI-style models
+- HeuristicTokenizer: dependency-free fallback with script-aware estimates
+  (Cyrillic text costs noticeably more tokens per character than English)
+- TokenCounter: memoized counts keyed by content hash; the default
+  tokenizer (and its BPE ranks) loads on the first count, not at construction
+- truncate_to_tokens: token-aware truncation on line/sentence boundaries
+
+Environment:
+    CONTEXT7_TOKENIZER: auto|heuristic|tiktoken[:<encoding>] (default auto)
+    TIKTOKEN_CACHE_DIR: where tiktoken keeps downloaded BPE files (default
+        ~/.system_cli/cache/tiktoken instead of the temp dir; setup.sh
+        fetches the default encoding there)
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_ENCODING = "o200k_base"
+TIKTOKEN_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".system_cli", "cache", "tiktoken")
+
+logger = logging.getLogger(__name__)
+
+
+class HeuristicTokenizer:
+    """Estimates BPE token counts from word shapes without a vocabulary."""
+
+    name = "heuristic"
+    exact = False
+
+    _PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\W\d_]+|\n|[ \t]+|[^\w\s]", re.UNICODE)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        total = 0
+        for piece in self._PIECE_RE.findall(text):
+            c = piece[0]
+            if c.isascii() and c.isalpha():
+                total += max(1, math.ceil(len(piece) / 4.5))
+            elif c.isdigit():
+                total += math.ceil(len(piece) / 3)
+            elif c == "\n":
+                total += 1
+            elif c in " \t":
+                # A single space is merged into the next word
+                total += 1 if len(piece) > 1 else 0
+            elif c.isalpha():
+                if "Ѐ" <= c <= "ӿ":
+                    total += max(1, math.ceil(len(piece) / 2.5))
+                else:
+                    total += max(1, len(piece.encode("utf-8")) // 3)
+            else:
+                total += max(1, len(piece.encode("utf-8")) // 3)
+        return total
+
+
+class TiktokenTokenizer:
+    """Exact counts via tiktoken (BPE ranks are cached locally after first load)."""
+
+    exact = True
+
+    def __init__(self, encoding: str = DEFAULT_ENCODING):
+        # tiktoken downloads the ranks once into this directory; the default
+        # (the temp dir) does not survive reboots, and offline that means no tiktoken
+        cache_dir = os.environ.setdefault("TIKTOKEN_CACHE_DIR", TIKTOKEN_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        import tiktoken
+
+        self._enc = tiktoken.get_encoding(encoding)
+        self.name = f"tiktoken:{encoding}"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self._enc.encode(text, disallowed_special=()))
+
+
+_tokenizers: Dict[str, object] = {}
+_tokenizers_lock = threading.Lock()
+_fallback_warned = False
+
+
+def get_tokenizer(spec: Optional[str] = None):
+    """
+    Get a tokenizer by spec ("auto", "heuristic", "tiktoken[:<encoding>]").
+
+    "auto" uses tiktoken when it is installed and its encoding can be loaded,
+    otherwise the heuristic fallback (logged once as a warning).
+    """
+    global _fallback_warned
+    spec = str(spec or os.getenv("CONTEXT7_TOKENIZER") or "auto").strip().lower()
+    with _tokenizers_lock:
+        tok = _tokenizers.get(spec)
+        if tok is not None:
+            return tok
+        if spec == "heuristic":
+            tok = HeuristicTokenizer()
+        else:
+            encoding = spec.split(":", 1)[1] if spec.startswith("tiktoken:") else DEFAULT_ENCODING
+            try:
+                tok = TiktokenTokenizer(encoding)
+            except Exception as e:
+                tok = HeuristicTokenizer()
+                if not _fallback_warned:
+                    _fallback_warned = True
+                    logger.warning(
+                        "tiktoken encoding %r unavailable (%s); token counts are heuristic estimates. "
+                        "Run setup.sh online once or set TIKTOKEN_CACHE_DIR to a directory with the BPE file.",
+                        encoding, str(e).splitlines()[0] if str(e) else type(e).__name__,
+                    )
+        _tokenizers[spec] = tok
+        return tok
+
+
+class TokenCounter:
+    """Token counts memoized per content hash (LRU)."""
+
+    def __init__(self, tokenizer=None, max_entries: int = 4096):
+        self._tokenizer = tokenizer
+        self.max_entries = max(16, int(max_entries))
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def tokenizer(self):
+        """The tokenizer, resolved via get_tokenizer() on first use."""
+        if self._tokenizer is None:
+            self._tokenizer = get_tokenizer()
+        return self._tokenizer
+
+    @property
+    def loaded(self) -> bool:
+        return self._tokenizer is not None
+
+    def warm_up(self):
+        """Load the tokenizer now (e.g. from a background warm-up thread)."""
+        return self.tokenizer
+
+    @property
+    def name(self) -> str:
+        return getattr(self.tokenizer, "name", type(self.tokenizer).__name__)
+
+    @property
+    def exact(self) -> bool:
+        return bool(getattr(self.tokenizer, "exact", False))
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._lock:
+            n = self._cache.get(key)
+            if n is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return n
+        n = int(self.tokenizer.count(text))
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = n
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return n
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "tokenizer": self.name if self.loaded else None,
+                "exact": self.exact if self.loaded else None,
+                "cache_size": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?…;])(\s+)")
+
+
+def _sentences(line: str) -> List[str]:
+    """Split a line into sentences, keeping the trailing whitespace of each."""
+    parts = _SENTENCE_RE.split(line)
+    return [parts[i] + (parts[i + 1] if i + 1 < len(parts) else "") for i in range(0, len(parts), 2)]
+
+
+def _fit(units: List[str], budget: int, counter: TokenCounter) -> Tuple[List[str], int]:
+    """Take units in order while they fit into `budget` tokens."""
+    taken: List[str] = []
+    used = 0
+    for u in units:
+        n = counter.count(u)
+        if used + n > budget:
+            break
+        taken.append(u)
+        used += n
+    return taken, used
+
+
+def _cut_chars(text: str, budget: int, counter: TokenCounter, from_end: bool) -> str:
+    """Largest prefix (or suffix) of `text` within `budget` tokens (binary search)."""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        part = text[-mid:] if from_end else text[:mid]
+        if counter.tokenizer.count(part) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    if lo == 0:
+        return ""
+    return text[-lo:] if from_end else text[:lo]
+
+
+def truncate_to_tokens(text: str, max_tokens: int, counter: TokenCounter, keep: str = "head") -> Tuple[str, int]:
+    """
+    Truncate `text` to at most `max_tokens` tokens.
+
+    Cuts on line boundaries first, then on sentence boundaries inside the
+    line that does not fit, and only falls back to a character cut when a
+    single sentence exceeds the remaining budget.
+    `keep="tail"` keeps the end of the text instead of the beginning.
+
+    Returns (text, tokens_removed).
+    """
+    total = counter.count(text)
+    if total <= max_tokens:
+        return text, 0
+    if max_tokens <= 0:
+        return "", total
+
+    from_end = keep == "tail"
+    lines = text.splitlines(keepends=True)
+    if from_end:
+        lines.reverse()
+    taken, used = _fit(lines, max_tokens, counter)
+
+    remaining = max_tokens - used
+    if len(taken) < len(lines) and remaining > 0:
+        partial_line = lines[len(taken)]
+        sentences = _sentences(partial_line)
+        if from_end:
+            sentences.reverse()
+        part, _ = _fit(sentences, remaining, counter)
+        if part:
+            taken.append("".join(reversed(part)) if from_end else "".join(part))
+        elif not taken:
+            taken.append(_cut_chars(partial_line, remaining, counter, from_end))
+
+    if from_end:
+        taken.reverse()
+    result = "".join(taken)
+    return result, max(0, total - counter.count(result))
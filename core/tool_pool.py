@@ -0,0 +1,387 @@
+"""Process Pool for CPU-bound Tools
+
+MCPToolRegistry runs local tools on the caller's thread, so a CPU-heavy tool
+holds the GIL and stalls the graph thread and the TUI for its whole run.
+Tools that declare themselves CPU-bound are sent to a ProcessPoolExecutor
+instead; the caller only waits on a future.
+
+Features:
+- `cpu_bound` decorator / `cpu_bound=True` on register_tool / `"cpu_bound": true`
+  in a plugin manifest
+- Warm workers: spawned once, kept between calls, optional module pre-import
+  and warm_up() to start them ahead of the first call
+- Arguments and results are pickled; numpy arrays above SHM_MIN_BYTES travel
+  through shared memory instead of the pickle stream
+- Per-call timeout: a call that overruns kills the pool's workers (a running
+  task can't be stopped otherwise); other calls that were in flight on
+  those workers are resubmitted to the fresh pool within their own timeout
+- Worker recycling after N calls (max_tasks_per_child) or when a worker's
+  RSS exceeds a threshold
+
+Environment:
+- TRINITY_TOOL_POOL: run CPU-bound tools in the pool (default on; 0 runs them inline)
+- TRINITY_TOOL_POOL_WORKERS: worker processes (default min(2, cpu count))
+- TRINITY_TOOL_POOL_TIMEOUT: per-call timeout in seconds (default 120)
+- TRINITY_TOOL_POOL_MAX_CALLS: calls per worker before it is replaced (default 200)
+- TRINITY_TOOL_POOL_MAX_RSS_MB: recycle the pool when a worker grows past this (default 1024)
+- TRINITY_TOOL_POOL_PREWARM: start the workers during the runtime's background warm-up (default off)
+"""
+
+import atexit
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHM_MIN_BYTES = 1024 * 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def cpu_bound(func: Callable) -> Callable:
+    """Mark a tool function as CPU-bound so the registry runs it in the process pool."""
+    func.cpu_bound = True
+    return func
+
+
+class ToolTimeoutError(TimeoutError):
+    pass
+
+
+# ---- shared memory for large arrays ----
+
+@dataclass(frozen=True)
+class _SharedArray:
+    """Reference to an ndarray stored in a SharedMemory block."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def _shm(name: Optional[str] = None, size: int = 0):
+    from multiprocessing import shared_memory
+
+    kwargs: Dict[str, Any] = {"create": name is None}
+    if name is None:
+        kwargs["size"] = max(1, size)
+    else:
+        kwargs["name"] = name
+    if sys.version_info >= (3, 13):
+        # Blocks are unlinked explicitly by whoever consumes them
+        kwargs["track"] = False
+    return shared_memory.SharedMemory(**kwargs)
+
+
+def _pack(obj: Any, blocks: List[Any], min_bytes: int) -> Any:
+    """Replace large ndarrays in `obj` (dicts/lists/tuples) with shared-memory references."""
+    if isinstance(obj, dict):
+        return {k: _pack(v, blocks, min_bytes) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        packed = [_pack(v, blocks, min_bytes) for v in obj]
+        return packed if isinstance(obj, list) else tuple(packed)
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(obj, np.ndarray) and obj.nbytes >= min_bytes and obj.dtype != object:
+        block = _shm(size=obj.nbytes)
+        np.ndarray(obj.shape, dtype=obj.dtype, buffer=block.buf)[...] = obj
+        blocks.append(block)
+        return _SharedArray(block.name, tuple(obj.shape), obj.dtype.str)
+    return obj
+
+
+def _unpack(obj: Any, blocks: List[Any], copy: bool) -> Any:
+    """Inverse of _pack. Views stay valid until the attached blocks are closed."""
+    if isinstance(obj, _SharedArray):
+        import numpy as np
+
+        block = _shm(obj.name)
+        blocks.append(block)
+        arr = np.ndarray(obj.shape, dtype=np.dtype(obj.dtype), buffer=block.buf)
+        return arr.copy() if copy else arr
+    if isinstance(obj, dict):
+        return {k: _unpack(v, blocks, copy) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        unpacked = [_unpack(v, blocks, copy) for v in obj]
+        return unpacked if isinstance(obj, list) else tuple(unpacked)
+    return obj
+
+
+def _release(blocks: Sequence[Any], unlink: bool) -> None:
+    for block in blocks:
+        try:
+            block.close()
+            if unlink:
+                block.unlink()
+        except Exception:
+            pass
+
+
+# ---- worker side ----
+
+def _init_worker(modules: Sequence[str]) -> None:
+    import importlib
+
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def _worker_rss() -> int:
+    try:
+        import psutil
+
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        return 0
+
+
+def _run_in_worker(func: Callable, kwargs: Any, min_bytes: int) -> Tuple[Any, int, int]:
+    attached: List[Any] = []
+    try:
+        result = func(**_unpack(kwargs, attached, copy=False))
+        # Packing copies any array (including views of the inputs) into new blocks
+        packed = _pack(result, [], min_bytes)
+    finally:
+        _release(attached, unlink=False)
+    return packed, os.getpid(), _worker_rss()
+
+
+def _ping() -> int:
+    time.sleep(0.05)
+    return os.getpid()
+
+
+# ---- parent side ----
+
+class ToolProcessPool:
+    """Managed ProcessPoolExecutor for CPU-bound tool calls."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_calls: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        warm_modules: Sequence[str] = (),
+        shm_min_bytes: int = SHM_MIN_BYTES,
+    ):
+        self.workers = max(1, workers or _env_int("TRINITY_TOOL_POOL_WORKERS", min(2, os.cpu_count() or 1)))
+        self.timeout = timeout if timeout is not None else _env_float("TRINITY_TOOL_POOL_TIMEOUT", 120.0)
+        self.max_calls = max_calls if max_calls is not None else _env_int("TRINITY_TOOL_POOL_MAX_CALLS", 200)
+        self.max_rss_mb = max_rss_mb if max_rss_mb is not None else _env_float("TRINITY_TOOL_POOL_MAX_RSS_MB", 1024.0)
+        self.warm_modules = tuple(warm_modules)
+        self.shm_min_bytes = shm_min_bytes
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._pool_calls = 0
+        self._lock = threading.Lock()
+        # Executors this pool shut down on purpose (timeout kill, recycling), as
+        # opposed to ones whose workers crashed
+        self._retired: "weakref.WeakSet[concurrent.futures.ProcessPoolExecutor]" = weakref.WeakSet()
+        self.stats_counters: Dict[str, int] = {
+            "calls": 0, "errors": 0, "timeouts": 0, "recycles": 0, "resubmits": 0, "shm_bytes": 0,
+        }
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats_counters[key] += n
+
+    def _new_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        kwargs: Dict[str, Any] = {
+            "max_workers": self.workers,
+            # fork is unsafe with the runtime's threads; spawn is the macOS default anyway
+            "mp_context": multiprocessing.get_context("spawn"),
+            "initializer": _init_worker,
+            "initargs": (self.warm_modules,),
+        }
+        if self.max_calls > 0 and sys.version_info >= (3, 11):
+            kwargs["max_tasks_per_child"] = self.max_calls
+        return concurrent.futures.ProcessPoolExecutor(**kwargs)
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+                self._pool_calls = 0
+            return self._executor
+
+    def _retire(self, executor: concurrent.futures.ProcessPoolExecutor, kill: bool = False, crashed: bool = False) -> None:
+        """Replace `executor` on the next call; running calls on it finish unless killed.
+
+        Calls queued on it (and, with `kill`, running ones) fail and are
+        resubmitted by call(), unless the executor `crashed` on its own.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.stats_counters["recycles"] += 1
+            if not crashed:
+                self._retired.add(executor)
+        if kill:
+            for proc in list((getattr(executor, "_processes", None) or {}).values()):
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+        try:
+            executor.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def warm_up(self, timeout: float = 30.0) -> List[int]:
+        """Start every worker now instead of on the first calls; returns their pids."""
+        executor = self._get_executor()
+        futures = [executor.submit(_ping) for _ in range(self.workers)]
+        pids = []
+        for fut in futures:
+            try:
+                pids.append(fut.result(timeout=timeout))
+            except Exception:
+                pass
+        return sorted(set(pids))
+
+    def call(self, func: Callable, kwargs: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """Run `func(**kwargs)` in a worker and return its result.
+
+        Raises ToolTimeoutError after `timeout` seconds. The pool's workers are
+        then killed, since a running task can't be cancelled otherwise; calls
+        that were running or queued beside it start again on the new workers
+        with what is left of their own timeout (so a tool may run twice when
+        another call times out next to it).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+        blocks: List[Any] = []
+        packed = _pack(dict(kwargs or {}), blocks, self.shm_min_bytes)
+        self._count("shm_bytes", sum(b.size for b in blocks))
+        self._count("calls")
+        try:
+            while True:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._count("timeouts")
+                    raise ToolTimeoutError(f"timed out after {timeout:g}s")
+                executor = self._get_executor()
+                try:
+                    future = executor.submit(_run_in_worker, func, packed, self.shm_min_bytes)
+                except RuntimeError:
+                    # Broken, or shut down between _get_executor() and submit()
+                    if self._resubmit(executor):
+                        continue
+                    raise
+                try:
+                    result, _pid, rss = future.result(timeout=remaining)
+                    break
+                except concurrent.futures.TimeoutError:
+                    self._count("timeouts")
+                    self._retire(executor, kill=True)
+                    raise ToolTimeoutError(f"timed out after {timeout:g}s")
+                except (BrokenProcessPool, concurrent.futures.CancelledError):
+                    if self._resubmit(executor):
+                        continue
+                    raise
+        finally:
+            _release(blocks, unlink=True)
+
+        out_blocks: List[Any] = []
+        try:
+            value = _unpack(result, out_blocks, copy=True)
+        finally:
+            _release(out_blocks, unlink=True)
+
+        with self._lock:
+            self._pool_calls += 1
+            pool_calls = self._pool_calls
+        if self.max_rss_mb > 0 and rss > self.max_rss_mb * 1024 * 1024:
+            logger.info(f"[ToolPool] worker RSS {rss / 1048576:.0f} MB over {self.max_rss_mb:.0f} MB; recycling")
+            self._retire(executor)
+        elif self.max_calls > 0 and sys.version_info < (3, 11) and pool_calls >= self.max_calls * self.workers:
+            self._retire(executor)
+        return value
+
+    def _resubmit(self, executor: concurrent.futures.ProcessPoolExecutor) -> bool:
+        """Whether a call lost with `executor` should run again (the pool retired it on purpose)."""
+        if executor in self._retired:
+            self._count("resubmits")
+            return True
+        self._count("errors")
+        self._retire(executor, crashed=True)
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.stats_counters)
+        return {
+            **counters,
+            "workers": self.workers,
+            "running": self.running,
+            "timeout_s": self.timeout,
+            "max_calls": self.max_calls,
+            "max_rss_mb": self.max_rss_mb,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def is_picklable(func: Callable) -> bool:
+    try:
+        pickle.dumps(func)
+        return True
+    except Exception:
+        return False
+
+
+def tool_pool_enabled() -> bool:
+    return str(os.getenv("TRINITY_TOOL_POOL") or "").strip().lower() not in {"0", "false", "no", "off"}
+
+
+_pool: Optional[ToolProcessPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_tool_pool() -> ToolProcessPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ToolProcessPool()
+        return _pool
+
+
+@atexit.register
+def shutdown_tool_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
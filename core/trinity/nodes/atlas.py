@@ -2,18 +2,23 @@ import os
 import subprocess
 import time
 import hashlib
+import json
 from difflib import SequenceMatcher
 from typing import List, Dict, Any, Optional
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
 from core.trinity.state import TrinityState
 from core.constants import VOICE_MARKER, UNKNOWN_STEP
 from core.utils import extract_json_object
+from core.prompt_cache import prompt_hash
 from providers.copilot import CopilotLLM
 from core.verification import AdaptiveVerifier
 
 class AtlasMixin:
     """Mixin for TrinityRuntime containing Atlas (Planner) logic."""
 
+    # meta_config fields that reach the planning prompt (Context7 policy block)
+    PLANNING_POLICY_KEYS = ("strategy", "verification_rigor", "tool_preference", "anti_patterns", "focus")
+
     def _atlas_node(self, state: TrinityState):
         """Generates the plan based on Meta-Planner policy."""
         # EMERGENCY: Check recursion depth before any processing
@@ -21,7 +26,7 @@ class AtlasMixin:
         replan_count = state.get("replan_count", 0)
         if step_count >= getattr(self, "MAX_STEPS", 30) or replan_count >= getattr(self, "MAX_REPLANS", 10):
             if self.verbose: print(f"🚨 [Atlas] EMERGENCY: Limits reached (step={step_count}, replan={replan_count}), forcing completion")
-            return {"current_agent": "knowledge", "last_step_status": "failed", "messages": list(state.get("messages", []))}
+            return {"current_agent": "knowledge", "last_step_status": "failed", "messages": []}
         
         if self.verbose: print("🌐 [Atlas] Generating steps...")
         
@@ -48,23 +53,26 @@ class AtlasMixin:
 
         try:
             # 5. Prepare prompt
+            planning_inputs = self._planning_inputs_hash(state, meta_config)
             prompt = self._prepare_atlas_prompt(state, last_msg, meta_config)
             
-            # 6. Execute planning request
-            raw_plan_data = self._execute_atlas_planning_request(prompt)
+            # 6. Execute planning request (or commit the speculative one)
+            raw_plan_data = self._take_speculative_plan(state, meta_config, planning_inputs)
+            if raw_plan_data is None:
+                raw_plan_data = self._execute_atlas_planning_request(prompt)
 
             if isinstance(raw_plan_data, dict) and raw_plan_data.get("status") == "llm_unavailable":
                 msg = str(raw_plan_data.get("message") or "LLM unavailable")
                 return {
                     "current_agent": "end",
-                    "messages": list(context) + [AIMessage(content=f"[VOICE] {msg}")],
+                    "messages": [AIMessage(content=f"[VOICE] {msg}")],
                 }
             
             # 7. Check for completion or valid plan
             if isinstance(raw_plan_data, dict) and raw_plan_data.get("status") == "completed":
                 # Only accept "completed" if global goal is truly achieved
                 if self._is_global_goal_achieved(state, context):
-                    return {"current_agent": "end", "messages": list(context) + [AIMessage(content=f"[VOICE] {raw_plan_data.get('message', 'Done.')}")]}
+                    return {"current_agent": "end", "messages": [AIMessage(content=f"[VOICE] {raw_plan_data.get('message', 'Done.')}")]}
                 else:
                     # Force LLM to generate remaining steps
                     if self.verbose: print("⚠️ [Atlas] LLM claimed completion but global goal not achieved. Forcing continuation.")
@@ -83,8 +91,7 @@ class AtlasMixin:
 
         except Exception as e:
             err_msg = f"[VOICE] Вибачте, у мене виникла помилка під час планування: {str(e)[:100]}. Спробую ще раз." if self.preferred_language == "uk" else f"[VOICE] Planning error: {str(e)[:100]}. Retrying."
-            state["messages"] = list(context) + [AIMessage(content=err_msg)]
-            return self._handle_atlas_planning_error(e, state, last_msg, context, replan_count)
+            return self._handle_atlas_planning_error(e, state, last_msg, context, replan_count, notice=AIMessage(content=err_msg))
 
     def _check_atlas_loop(self, state, replan_count, last_msg):
         """Check if we're stuck in a replan loop and break it if necessary."""
@@ -111,18 +118,27 @@ class AtlasMixin:
             return self._atlas_dispatch(state, fallback, replan_count=replan_count, fail_count=state.get("current_step_fail_count", 0))
         return None
 
-    def _prepare_atlas_prompt(self, state, last_msg, meta_config):
-        """Prepare the prompt for Atlas planning."""
+    def _prepare_atlas_prompt(self, state, last_msg, meta_config, record_metrics: bool = True, vision_context: Optional[str] = None):
+        """
+        Prepare the prompt for Atlas planning.
+
+        `record_metrics=False` keeps Context7 stats untouched; `vision_context`
+        overrides the live vision context (speculation uses a snapshot).
+        """
         from core.agents.atlas import get_atlas_plan_prompt
         
         rag_context = state.get("retrieved_context", "")
         structure_context = self._get_project_structure_context()
         
-        final_context = self.context_layer.prepare(
+        # Stable part (policy, goal, structure) goes into the system message
+        # after the tool catalog; RAG stays in the per-step suffix.
+        context_parts = self.context_layer.prepare_parts(
+            messages=[],
+            original_task=state.get("original_task") or last_msg,
             rag_context=rag_context,
             project_structure=structure_context,
             meta_config=meta_config,
-            last_msg=last_msg
+            record=record_metrics,
         )
 
         execution_history = []
@@ -166,10 +182,11 @@ class AtlasMixin:
         prompt = get_atlas_plan_prompt(
             f"Global Goal: {state.get('original_task')}\nCurrent Request: {last_msg}\n\nEXECUTION HISTORY SO FAR (Status of steps):\n{history_str}",
             tools_desc=tools_desc,
-            context=final_context + ("\n\n[MEDIA_MODE] This is a media-related task. Use the Two-Phase Media Strategy." if state.get("is_media") else ""),
+            context=context_parts.suffix + ("\n\n[MEDIA_MODE] This is a media-related task. Use the Two-Phase Media Strategy." if state.get("is_media") else ""),
             preferred_language=self.preferred_language,
             forbidden_actions="\n".join(state.get("forbidden_actions") or []),
-            vision_context=self.vision_context_manager.current_context
+            vision_context=self.vision_context_manager.current_context if vision_context is None else vision_context,
+            stable_context=context_parts.prefix,
         )
         
         if state.get("is_media"):
@@ -198,10 +215,16 @@ Return JSON with ONLY the replacement step.'''))
         if state.get("is_media"):
             prompt.messages.append(HumanMessage(content="⚠️ STRICT BROWSER MANDATE ⚠️: This is a media/browser task. Do NOT use `meta.execute_task` or native `open_app`/`chrome_open_url`. Use ONLY `playwright.*` tools (browser_navigate, browser_click, browser_type_text, press_key). The browser session is already headful and VISIBLE."))
 
-    def _execute_atlas_planning_request(self, prompt):
-        """Execute the LLM request for planning."""
+    def _execute_atlas_planning_request(self, prompt, stream: bool = True, calls: Optional[list] = None):
+        """
+        Execute the LLM request for planning.
+
+        With `calls` the prompt-cache call record is appended there instead of
+        recorded, so a speculative request only counts once it is committed.
+        """
         def on_delta(chunk):
-            self._deduplicated_stream("atlas", chunk)
+            if stream:
+                self._deduplicated_stream("atlas", chunk)
 
         atlas_model = os.getenv("ATLAS_MODEL") or os.getenv("COPILOT_MODEL") or "gpt-4.1"
         try:
@@ -219,9 +242,162 @@ Return JSON with ONLY the replacement step.'''))
                 "message": f"LLM is not configured. Set {hint} in .env (then restart).{extra}",
             }
 
-        plan_resp = atlas_llm.invoke_with_stream(prompt.format_messages(), on_delta=on_delta)
+        messages = prompt.format_messages()
+        full_hash = prompt_hash(messages, model=atlas_model)
+        cache = getattr(self, "prompt_cache", None)
+        cached = cache.get(full_hash) if cache is not None else None
+        if cache is not None:
+            call = {"name": "atlas", "prefix_hash": prompt_hash(messages[:1]), "full_hash": full_hash, "cache_hit": cached is not None}
+            if calls is None:
+                cache.record_call(**call)
+            else:
+                calls.append(call)
+        if cached is not None:
+            if self.verbose: print("♻️ [Atlas] Identical planning prompt, using cached plan.")
+            return extract_json_object(cached)
+
+        plan_resp = atlas_llm.invoke_with_stream(messages, on_delta=on_delta)
         plan_resp_content = getattr(plan_resp, "content", "") if plan_resp is not None else ""
-        return extract_json_object(plan_resp_content)
+        data = extract_json_object(plan_resp_content)
+        if cache is not None and data:
+            cache.put(full_hash, plan_resp_content)
+        return data
+
+    def _speculation_key(self, state, scenario: str, step_desc: str):
+        return (str(state.get("transcript_id") or ""), int(state.get("step_count", 0) or 0), scenario, str(step_desc))
+
+    def _planning_inputs_hash(self, state, meta_config) -> str:
+        """
+        Fingerprint of the planning inputs known before Grisha's verdict.
+
+        The verdict message and the vision context Grisha refreshes are left
+        out: the speculative prompt is built before either exists.
+        """
+        repair = bool(meta_config.get("repair_mode"))
+        inputs = {
+            "task": state.get("original_task"),
+            "task_type": state.get("task_type"),
+            "is_media": bool(state.get("is_media")),
+            "rag": state.get("retrieved_context") or "",
+            "status": state.get("last_step_status"),
+            "history": [str(h) for h in state.get("history_plan_execution") or []],
+            "forbidden": sorted(str(f) for f in state.get("forbidden_actions") or []),
+            "policy": {k: meta_config.get(k) for k in self.PLANNING_POLICY_KEYS},
+            "failed_step": meta_config.get("failed_step") if repair else None,
+            "remaining": [s.get("description") for s in state.get("plan") or []] if repair else [],
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _start_speculative_planning(self, state):
+        """
+        Start the likely next planning request while Grisha verifies.
+
+        A failed step at any position leads to a new Atlas LLM call: the
+        meta-planner asks for a "repair" step (or a full "replan" after
+        repeated failures). On success only the last step does, when the
+        plan runs out ("continuation").
+        """
+        if not getattr(self, "speculative_planning", False):
+            return False
+        plan = state.get("plan") or []
+        if not plan:
+            return False
+
+        desc = plan[0].get("description", UNKNOWN_STEP)
+        context = state.get("messages", [])
+        last_msg = getattr(context[-1], "content", "") if context else ""
+        meta_config = dict(state.get("meta_config") or {})
+        hist = list(state.get("history_plan_execution") or [])
+        forbidden = list(state.get("forbidden_actions") or [])
+        fail_count = int(state.get("current_step_fail_count") or 0)
+
+        if state.get("last_step_status") == "failed":
+            # Mirror the meta-planner's bookkeeping for a failed step
+            fail_count += 1
+            hist.append(f"FAILED: {desc} (Try #{fail_count})")
+            if fail_count >= 2:
+                forbidden.extend(f"AVOID: {tool} for '{desc}'" for tool in plan[0].get("tools") or [])
+                forbidden.append(f"FAILED APPROACH: {desc}")
+                forbidden = list(set(forbidden))
+            if fail_count >= 3 or meta_config.get("recovery_mode") == "full_replan":
+                if fail_count >= 3:
+                    forbidden.append(f"FAILED ACTION: {hist[-1]}")
+                scenario, predicted_plan = "replan", []
+                meta_config["repair_mode"] = False
+            else:
+                scenario, predicted_plan = "repair", plan[1:]
+                meta_config["repair_mode"] = True
+                meta_config["failed_step"] = desc
+            status = "failed"
+        elif len(plan) == 1:
+            hist.append(f"SUCCESS: {desc}")
+            scenario, predicted_plan, status = "continuation", [], "success"
+            meta_config["repair_mode"] = False
+        else:
+            # The plan continues with its next step; Atlas is not called
+            return False
+
+        predicted = {
+            **state,
+            "plan": predicted_plan,
+            "last_step_status": status,
+            "history_plan_execution": hist,
+            "forbidden_actions": forbidden,
+            "meta_config": meta_config,
+        }
+
+        inputs = self._planning_inputs_hash(predicted, meta_config)
+        # Grisha refreshes the vision context while the request runs
+        vision_context = self.vision_context_manager.current_context
+
+        def _plan():
+            # Context7 metrics and prompt-cache calls belong to the foreground; don't record them here
+            calls = []
+            prompt = self._prepare_atlas_prompt(
+                predicted, last_msg, dict(meta_config), record_metrics=False, vision_context=vision_context
+            )
+            data = self._execute_atlas_planning_request(prompt, stream=False, calls=calls)
+            return {"inputs": inputs, "plan": data, "calls": calls} if data else None
+
+        started = self.speculator.start(self._speculation_key(state, scenario, desc), _plan)
+        if started and self.verbose:
+            print(f"🔮 [Atlas] Speculative {scenario} planning started while Grisha verifies.")
+        return started
+
+    def _take_speculative_plan(self, state, meta_config, planning_inputs: str):
+        """
+        Commit the speculative plan if the verdict matched its scenario and
+        the planning inputs are those the speculation predicted (the
+        meta-planner may have added forbidden actions, changed meta_config
+        or retrieved new context since); otherwise discard it.
+        """
+        speculator = getattr(self, "speculator", None)
+        if speculator is None:
+            return None
+        last_status = state.get("last_step_status")
+        hist = state.get("history_plan_execution") or []
+        if meta_config.get("repair_mode"):
+            scenario, desc = "repair", meta_config.get("failed_step", UNKNOWN_STEP)
+        elif last_status == "success" and hist and str(hist[-1]).startswith("SUCCESS: "):
+            scenario, desc = "continuation", str(hist[-1])[len("SUCCESS: "):]
+        elif last_status == "failed" and hist and str(hist[-1]).startswith("FAILED: "):
+            scenario, desc = "replan", str(hist[-1])[len("FAILED: "):].rsplit(" (Try #", 1)[0]
+        else:
+            speculator.discard()
+            return None
+        spec = speculator.take(
+            self._speculation_key(state, scenario, desc),
+            accept=lambda result: result.get("inputs") == planning_inputs,
+        )
+        if spec is None:
+            return None
+        cache = getattr(self, "prompt_cache", None)
+        if cache is not None:
+            for call in spec.get("calls") or []:
+                cache.record_call(**call)
+        if self.verbose:
+            print(f"🔮 [Atlas] Using speculative {scenario} plan.")
+        return spec["plan"]
 
     def _extract_raw_plan(self, data, meta_config, state):
         """Extract raw plan from JSON data."""
@@ -287,7 +463,7 @@ Return JSON with ONLY the replacement step.'''))
         local_verifier = AdaptiveVerifier(grisha_llm)
         return local_verifier.optimize_plan(raw_plan, meta_config=meta_config)
 
-    def _handle_atlas_planning_error(self, e, state, last_msg, context, replan_count):
+    def _handle_atlas_planning_error(self, e, state, last_msg, context, replan_count, notice=None):
         """Handle errors during Atlas planning phase."""
         if self.verbose: print(f"⚠️ [Atlas] Error: {e}")
         
@@ -314,13 +490,13 @@ Return JSON with ONLY the replacement step.'''))
                 "vibe_assistant_pause": pause_context,
                 "vibe_assistant_context": f"PAUSED: Planning failure for task: {last_msg}",
                 "current_agent": "meta_planner",
-                "messages": list(context) + [AIMessage(content=f"[VOICE] Doctor Vibe: Planning issue. Please clarify task.")]
+                "messages": [AIMessage(content=f"[VOICE] Doctor Vibe: Planning issue. Please clarify task.")]
             }
         else:
             if self.verbose:
                 print(f"🔄 [Atlas] Using fallback plan due to error: {e}")
             fallback = [{"id": 1, "type": "execute", "description": last_msg, "agent": "tetyana"}]
-            return self._atlas_dispatch(state, fallback, replan_count=replan_count)
+            return self._atlas_dispatch(state, fallback, replan_count=replan_count, notices=[notice] if notice else None)
 
     def _is_global_goal_achieved(self, state: TrinityState, context: list) -> bool:
         """Check if the global goal was actually achieved based on task type and history."""
@@ -404,9 +580,13 @@ Return JSON with ONLY the replacement step.'''))
         
         return None  # Let normal replan handle it
 
-    def _atlas_dispatch(self, state, plan, replan_count=None, fail_count=None, last_status=None, uncertain_streak=None):
-        """Internal helper to format the dispatch message and return state."""
-        context = state.get("messages", [])
+    def _atlas_dispatch(self, state, plan, replan_count=None, fail_count=None, last_status=None, uncertain_streak=None, notices=None):
+        """Internal helper to format the dispatch message and return state.
+
+        Only new messages are returned (`notices` first, then the dispatch
+        message); the state reducer appends them to the window.
+        """
+        notices = list(notices or [])
         step_count = state.get("step_count", 0) + 1
         replan_count = replan_count or state.get("replan_count", 0)
         fail_count = fail_count if fail_count is not None else state.get("current_step_fail_count", 0)
@@ -415,7 +595,7 @@ Return JSON with ONLY the replacement step.'''))
         
         current_step = plan[0] if plan else None
         if not current_step:
-            return {"current_agent": "end", "messages": list(context) + [AIMessage(content="[VOICE] План порожній.")]}
+            return {"current_agent": "end", "messages": notices + [AIMessage(content="[VOICE] План порожній.")]}
 
         desc = current_step.get('description', '')
         step_type = current_step.get("type", "execute")
@@ -426,7 +606,7 @@ Return JSON with ONLY the replacement step.'''))
         
         return {
             "current_agent": next_agent,
-            "messages": list(context) + [AIMessage(content=content)],
+            "messages": notices + [AIMessage(content=content)],
             "plan": plan,
             "step_count": step_count,
             "replan_count": replan_count,
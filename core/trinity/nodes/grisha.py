@@ -8,6 +8,19 @@ from core.trinity.state import TrinityState
 from core.constants import VOICE_MARKER, FAILURE_MARKERS, SUCCESS_MARKERS, NEGATION_PATTERNS, STEP_COMPLETED_MARKER, DEFAULT_MODEL_FALLBACK
 from core.agents.grisha import get_grisha_prompt, get_grisha_media_prompt
 from providers.copilot import CopilotLLM
+from system_ai.tools.ocr_index import KeywordSet, index_for
+
+# Media indicators checked in OCR text and vision context (one automaton pass each)
+MEDIA_INDICATORS = KeywordSet({
+    "video_playing": ["playing", "відтворюється", "грає", "running"],
+    "video_player": ["player", "плеєр", "video", "відео", "медіа"],
+    "fullscreen": ["fullscreen", "повний екран", "full screen"],
+    "play_button": ["play", "грати", "відтворити", "▶"],
+    "pause_button": ["pause", "пауза", "⏸"],
+    "progress_bar": ["progress", "прогрес", "timeline", "таймлайн"],
+    "volume_control": ["volume", "гучність", "sound", "звук"],
+    "movie_title": ["film", "movie", "фільм", "кіно"],
+})
 
 class GrishaMixin:
     """Mixin for TrinityRuntime containing Grisha (Verifier) logic."""
@@ -17,9 +30,11 @@ class GrishaMixin:
         step_count = state.get("step_count", 0)
         if step_count >= getattr(self, "MAX_STEPS", 30):
             if self.verbose: print(f"🚨 [Grisha] EMERGENCY: MAX_STEPS reached ({step_count}), forcing completion")
-            return {"current_agent": "knowledge", "last_step_status": "success", "messages": list(state.get("messages", []))}
+            return {"current_agent": "knowledge", "last_step_status": "success", "messages": []}
         
         if self.verbose: print(f"👁️ {VOICE_MARKER} [Grisha] Verifying...")
+        # Opt-in: plan the likely next step while verification runs
+        self._start_speculative_planning(state)
         context = state.get("messages", [])
         last_msg = self._get_last_msg_content(context)
         
@@ -48,7 +63,7 @@ class GrishaMixin:
 
         return {
             "current_agent": next_agent,
-            "messages": list(context) + [AIMessage(content=final_content)],
+            "messages": [AIMessage(content=final_content)],
             "last_step_status": step_status,
             "uncertain_streak": current_streak,
             "plan": state.get("plan"),
@@ -162,7 +177,9 @@ class GrishaMixin:
             return None
 
         if any(t in tetyana_tools for t in ["browser_type_text", "browser_click", "browser_open_url"]):
-            time.sleep(3.0)
+            # Let the page settle; returns as soon as the screen stops changing
+            from system_ai.tools.screen_watch import settle_screen
+            settle_screen(3.0, stable_ms=700)
             
         args = {}
         if tetyana_ctx.get("app_name"):
@@ -187,20 +204,15 @@ class GrishaMixin:
     def _enhance_media_vision_analysis(self, vision_data, original_task):
         """Enhance vision analysis for media tasks by looking for video-specific indicators."""
         try:
-            ocr_text = vision_data.get("ocr", {}).get("text", "").lower()
-            context = vision_data.get("context", "").lower()
+            # OCR text index (built once per OCR result) and the context text
+            ocr_index = index_for(vision_data.get("ocr"))
+            in_ocr = MEDIA_INDICATORS.matches(ocr_index.text, normalized=True)
+            in_context = MEDIA_INDICATORS.matches(str(vision_data.get("context") or ""))
             
             # Look for media-specific indicators in OCR and context
-            media_indicators = {
-                "video_playing": any(word in ocr_text or word in context for word in ["playing", "відтворюється", "грає", "running"]),
-                "video_player": any(word in ocr_text or word in context for word in ["player", "плеєр", "video", "відео", "медіа"]),
-                "fullscreen": any(word in ocr_text or word in context for word in ["fullscreen", "повний екран", "full screen"]),
-                "play_button": any(word in ocr_text or word in context for word in ["play", "грати", "відтворити", "▶"]),
-                "pause_button": any(word in ocr_text or word in context for word in ["pause", "пауза", "⏸"]),
-                "progress_bar": any(word in ocr_text or word in context for word in ["progress", "прогрес", "timeline", "таймлайн"]),
-                "volume_control": any(word in ocr_text or word in context for word in ["volume", "гучність", "sound", "звук"]),
-                "movie_title": len(ocr_text.split()) > 3 and any(word in ocr_text for word in ["film", "movie", "фільм", "кіно"])
-            }
+            found = in_ocr | in_context
+            media_indicators = {name: name in found for name in MEDIA_INDICATORS.groups}
+            media_indicators["movie_title"] = len(ocr_index.text.split()) > 3 and "movie_title" in in_ocr
             
             # Calculate media confidence score
             positive_indicators = sum(1 for v in media_indicators.values() if v)
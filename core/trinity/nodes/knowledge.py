@@ -22,7 +22,7 @@ class KnowledgeMixin:
         self._store_experience(summary, actual_status, plan, confidence, replan_count)
         
         final_msg = "[VOICE] Досвід збережено. Завдання завершено." if self.preferred_language == "uk" else "[VOICE] Experience stored. Task completed."
-        return {"current_agent": "end", "messages": context + [AIMessage(content=final_msg)]}
+        return {"current_agent": "end", "messages": [AIMessage(content=final_msg)]}
 
     def _determine_knowledge_status(self, state: TrinityState, context: list) -> str:
         """Determine actual status for knowledge storage."""
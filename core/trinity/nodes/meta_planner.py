@@ -1,12 +1,17 @@
+import os
 from typing import List, Dict, Any, Optional
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
 from core.trinity.state import TrinityState
 from core.constants import VOICE_MARKER, MESSAGES, UNKNOWN_STEP
 from core.utils import extract_json_object
+from core.trinity.planning.summarizer import BackgroundSummarizer
+from core.trinity.transcript import get_transcript_store
 
 class MetaPlannerMixin:
     """Mixin for TrinityRuntime containing Meta-Planner logic."""
 
+    SUMMARY_MAX_EVENTS = 20  # New events per background summary request
+
     def _meta_planner_node(self, state: TrinityState):
         """The 'Controller Brain' that sets policies and manages replanning strategy."""
         # EMERGENCY: Check recursion depth before any processing
@@ -14,7 +19,7 @@ class MetaPlannerMixin:
         replan_count = state.get("replan_count", 0)
         if step_count >= getattr(self, "MAX_STEPS", 30) or replan_count >= getattr(self, "MAX_REPLANS", 10):
             if self.verbose: print(f"🚨 [Meta-Planner] EMERGENCY: Limits reached (step={step_count}, replan={replan_count}), forcing completion")
-            return {"current_agent": "end", "messages": list(state.get("messages", []))}
+            return {"current_agent": "end", "messages": []}
         
         if self.verbose: print(f"🧠 {VOICE_MARKER} [Meta-Planner] Analyzing strategy...")
         context = state.get("messages", [])
@@ -58,8 +63,10 @@ class MetaPlannerMixin:
                 "repair": "Крок не вдався, спробую виправити ситуацію іншим способом." if self.preferred_language == "uk" else "Step failed, attempting repair."
             }
             msg = verbals.get(action, "Аналізую стратегію." if self.preferred_language == "uk" else "Analyzing strategy.")
-            state["messages"] = list(context) + [AIMessage(content=f"[VOICE] {msg}")]
-            return self._handle_meta_action(state, action, plan, last_msg, meta_config, fail_count, summary, last_status=last_status)
+            out = self._handle_meta_action(state, action, plan, last_msg, meta_config, fail_count, summary, last_status=last_status)
+            # The messages reducer only sees returned messages, not state mutations
+            out["messages"] = [AIMessage(content=f"[VOICE] {msg}")]
+            return out
 
         # 6. Default flow: Atlas dispatch
         out = self._atlas_dispatch(state, plan, last_status=last_status, fail_count=fail_count)
@@ -79,18 +86,52 @@ class MetaPlannerMixin:
         return cfg
 
     def _update_periodic_summary(self, state: TrinityState, context: List[Any]) -> str:
-        summary = state.get("summary", "")
+        """
+        Refresh the running summary without blocking the meta-planner.
+
+        Every third step the events added since the last request are handed
+        to a background summarizer; the latest completed summary is returned.
+        TRINITY_SYNC_SUMMARY=1 restores the inline LLM call.
+        """
+        summary = state.get("summary", "") or ""
         step_count = state.get("step_count", 0)
-        if len(context) > 6 and step_count % 3 == 0:
-            try:
-                recent = [str(getattr(m, "content", ""))[:4000] for m in context[-4:] if m]
-                prompt = [
-                    SystemMessage(content=f"Trinity archivist. Summarize (2-3 sentences) in {self.preferred_language}."),
-                    HumanMessage(content=f"Summary: {summary}\n\nEvents:\n" + "\n".join(recent))
-                ]
-                summary = getattr(self.llm.invoke(prompt), "content", "")
-            except Exception: pass
-        return summary
+        transcript_id = state.get("transcript_id")
+        store = get_transcript_store()
+        total = store.length(transcript_id) if transcript_id else len(context)
+
+        if str(os.getenv("TRINITY_SYNC_SUMMARY") or "").strip().lower() in {"1", "true", "yes", "on"}:
+            if total > 6 and step_count % 3 == 0:
+                try:
+                    recent = [str(getattr(m, "content", ""))[:4000] for m in context[-4:] if m]
+                    summary = self._summarize_events(summary, recent) or summary
+                except Exception: pass
+            return summary
+
+        summarizer = self._get_summarizer()
+        summarizer.reset(transcript_id or "")
+        if total > 6 and step_count % 3 == 0:
+            if transcript_id:
+                cursor = summarizer.cursor
+                new_events = store.read(transcript_id, cursor)[-self.SUMMARY_MAX_EVENTS:]
+            else:
+                cursor, new_events = 0, context[-4:]
+            events = [str(getattr(m, "content", ""))[:4000] for m in new_events if m]
+            summarizer.submit(summary, events, cursor=total)
+        return summarizer.latest(default=summary)
+
+    def _summarize_events(self, previous: str, events: List[str]) -> str:
+        prompt = [
+            SystemMessage(content=f"Trinity archivist. Update the running summary with the new events (2-3 sentences) in {self.preferred_language}."),
+            HumanMessage(content=f"Summary: {previous}\n\nNew events:\n" + "\n".join(events))
+        ]
+        return getattr(self.llm.invoke(prompt), "content", "")
+
+    def _get_summarizer(self) -> BackgroundSummarizer:
+        summarizer = getattr(self, "_summarizer", None)
+        if summarizer is None:
+            summarizer = BackgroundSummarizer(self._summarize_events)
+            self._summarizer = summarizer
+        return summarizer
 
     def _check_master_limits(self, state: TrinityState, context: List[Any]) -> Optional[Dict[str, Any]]:
         lang = self.preferred_language if self.preferred_language in MESSAGES else "en"
@@ -99,10 +140,10 @@ class MetaPlannerMixin:
         
         if state.get("step_count", 0) >= max_steps:
             msg = MESSAGES[lang]["step_limit_reached"].format(limit=max_steps)
-            return {"current_agent": "end", "messages": list(context) + [AIMessage(content=f"{VOICE_MARKER} {msg}")]}
+            return {"current_agent": "end", "messages": [AIMessage(content=f"{VOICE_MARKER} {msg}")]}
         if state.get("replan_count", 0) >= max_replans:
             msg = MESSAGES[lang]["replan_limit_reached"].format(limit=max_replans)
-            return {"current_agent": "end", "messages": list(context) + [AIMessage(content=f"{VOICE_MARKER} {msg}")]}
+            return {"current_agent": "end", "messages": [AIMessage(content=f"{VOICE_MARKER} {msg}")]}
         return None
 
     def _consume_execution_step(self, state: TrinityState, plan: List[Dict], status: str, fail_count: int, last_msg: str) -> tuple:
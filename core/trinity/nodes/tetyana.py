@@ -19,7 +19,7 @@ class TetyanaMixin:
         step_count = state.get("step_count", 0)
         if step_count >= getattr(self, "MAX_STEPS", 30):
             if self.verbose: print(f"🚨 [Tetyana] EMERGENCY: MAX_STEPS reached ({step_count}), forcing completion")
-            return {"current_agent": "knowledge", "last_step_status": "failed", "messages": list(state.get("messages", []))}
+            return {"current_agent": "knowledge", "last_step_status": "failed", "messages": []}
         
         if self.verbose:
             print(f"🔧 {VOICE_MARKER} [Tetyana] Executing step...")
@@ -83,7 +83,7 @@ class TetyanaMixin:
                         pass
                     # Sanitize content for UI (replace Windsurf with Doctor Vibe note)
                     sanitized = re.sub(r"(?i)windsurf", "Doctor Vibe (paused)", str(content or ""))
-                    return {**state, "messages": list(context) + [AIMessage(content=sanitized)], "vibe_assistant_pause": pause}
+                    return {**state, "messages": [AIMessage(content=sanitized)], "vibe_assistant_pause": pause}
             except Exception:
                 pass
 
@@ -159,7 +159,7 @@ class TetyanaMixin:
         if any(re.search(p, lower_content) for p in acknowledgment_patterns) and len(lower_content) < 300:
             if self.verbose: print("⚠️ [Tetyana] Acknowledgment loop detected.")
             new_msg = AIMessage(content=f"{VOICE_MARKER} Error: No tool call provided. USE A TOOL. {content}")
-            return {"messages": context + [new_msg], "last_step_status": "failed"}
+            return {"messages": [new_msg], "last_step_status": "failed"}
         return None
 
     def _is_env_true(self, var: str, default: bool = False) -> bool:
@@ -376,7 +376,7 @@ class TetyanaMixin:
         except Exception:
             pass
 
-        updated_messages = list(context) + [AIMessage(content=content)]
+        updated_messages = [AIMessage(content=content)]
         used_tools = [t.get("name") for t in tool_calls] if tool_calls else []
 
         if pause_info:
@@ -416,4 +416,4 @@ class TetyanaMixin:
 
     def _handle_tetyana_error(self, state, context, e):
         err_msg = f"Error invoking Tetyana: {e}"
-        return {**state, "messages": list(context) + [AIMessage(content=err_msg)], "last_step_status": "failed", "current_agent": "grisha"}
+        return {**state, "messages": [AIMessage(content=err_msg)], "last_step_status": "failed", "current_agent": "grisha"}
@@ -2,4 +2,7 @@
 Trinity Planning module - Strategy and plan optimization.
 """
 
-__all__ = []
+from .speculation import SpeculativePlanner
+from .summarizer import BackgroundSummarizer
+
+__all__ = ["BackgroundSummarizer", "SpeculativePlanner"]
@@ -0,0 +1,125 @@
+"""
+Speculative Atlas pre-planning.
+
+While Grisha verifies a step, the likely next Atlas planning request is
+started on a worker thread:
+
+- "continuation": the last plan step is being verified; if it succeeds the
+  plan is empty and Atlas will plan the rest of the task
+- "repair": Tetyana reported a failure; the meta-planner will most likely
+  ask Atlas for a repair step
+
+When Atlas actually needs a plan it takes the speculative result only if the
+verdict produced the predicted scenario for the same step and the caller
+accepts it (Atlas compares prompt hashes); otherwise the result is discarded. Python threads cannot be interrupted, so a discarded
+request simply runs to completion and is ignored.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+SpeculationKey = Tuple[str, int, str, str]  # (run id, step, scenario, step description)
+
+
+@dataclass
+class Speculation:
+    key: SpeculationKey
+    future: Future
+    started: float = field(default_factory=time.perf_counter)
+
+
+class SpeculativePlanner:
+    """One in-flight speculative planning request at a time."""
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._current: Optional[Speculation] = None
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.failed = 0
+        self.saved_seconds = 0.0
+
+    def start(self, key: SpeculationKey, fn: Callable[[], Any]) -> bool:
+        """Start `fn` speculatively under `key`, replacing any previous speculation."""
+        with self._lock:
+            if self._current is not None:
+                if self._current.key == key:
+                    return False
+                self.misses += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="atlas-speculative")
+            self._current = Speculation(key=key, future=self._executor.submit(fn))
+            self.started += 1
+            return True
+
+    def take(
+        self,
+        key: SpeculationKey,
+        timeout: Optional[float] = None,
+        accept: Optional[Callable[[Any], bool]] = None,
+    ) -> Optional[Any]:
+        """
+        Commit the speculation if it was started for `key`; otherwise discard it.
+        Waits for an in-flight matching request (it is already ahead of a fresh one).
+        `accept` can still reject the finished result (counted as a miss).
+        Returns None on a miss or if the speculative request failed.
+        """
+        with self._lock:
+            spec, self._current = self._current, None
+        if spec is None:
+            return None
+        if spec.key != key:
+            with self._lock:
+                self.misses += 1
+            return None
+        t0 = time.perf_counter()
+        try:
+            result = spec.future.result(timeout=timeout)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            return None
+        if not result:
+            with self._lock:
+                self.failed += 1
+            return None
+        if accept is not None and not accept(result):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            # Time the request had already been running when it was needed
+            self.saved_seconds += max(0.0, t0 - spec.started)
+        return result
+
+    def discard(self) -> None:
+        with self._lock:
+            if self._current is not None:
+                self.misses += 1
+            self._current = None
+
+    def shutdown(self) -> None:
+        self.discard()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decided = self.hits + self.misses + self.failed
+            return {
+                "started": self.started,
+                "hits": self.hits,
+                "misses": self.misses,
+                "failed": self.failed,
+                "hit_rate": round(self.hits / decided, 3) if decided else 0.0,
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
@@ -0,0 +1,146 @@
+"""
+Background incremental summarization for the meta-planner.
+
+The meta-planner refreshes `summary` every few steps. Doing that inline puts
+an LLM round trip on the orchestration critical path, so requests are handed
+to a worker thread instead:
+
+- each request only carries the events added since the last one
+- a newer request replaces a pending one (the stale request is cancelled)
+- the latest completed summary is published and read without blocking
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class SummaryRequest:
+    run_id: str
+    version: int
+    previous: str  # used when nothing has been published for the run yet
+    events: List[str]
+
+
+class BackgroundSummarizer:
+    """Single worker thread; latest request wins."""
+
+    def __init__(self, summarize: Callable[[str, List[str]], str], name: str = "trinity-summarizer"):
+        self._summarize = summarize
+        self._name = name
+        self._cond = threading.Condition()
+        self._pending: Optional[SummaryRequest] = None
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        self._run_id = ""
+        self._version = 0
+        self._published_version = 0
+        self._published = ""
+        self._cursor = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.discarded = 0
+        self.failed = 0
+        self.last_duration = 0.0
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+            self._thread.start()
+
+    def reset(self, run_id: str) -> None:
+        """Start tracking a new run; pending work for the old run is dropped."""
+        with self._cond:
+            if run_id == self._run_id:
+                return
+            if self._pending is not None:
+                self.cancelled += 1
+            self._pending = None
+            self._run_id = run_id
+            self._published = ""
+            self._published_version = self._version
+            self._cursor = 0
+
+    @property
+    def cursor(self) -> int:
+        """Number of events of the current run already handed to the worker."""
+        with self._cond:
+            return self._cursor
+
+    def submit(self, previous: str, events: List[str], cursor: int) -> bool:
+        """
+        Queue a summary update over `events` (the new events only).
+        `cursor` is the event position after these events.
+        Returns False if there is nothing new.
+        """
+        if not events:
+            return False
+        with self._cond:
+            if self._pending is not None:
+                # Fold the stale request's events in, so nothing is lost
+                events = list(self._pending.events) + list(events)
+                previous = self._pending.previous
+                self.cancelled += 1
+            self._version += 1
+            self._pending = SummaryRequest(self._run_id, self._version, previous, list(events))
+            self._cursor = max(self._cursor, cursor)
+            self._ensure_thread()
+            self._cond.notify()
+        return True
+
+    def latest(self, default: str = "") -> str:
+        """Latest completed summary for the current run (never blocks on the LLM)."""
+        with self._cond:
+            return self._published or default
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no request is pending or running."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending is not None or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                req, self._pending = self._pending, None
+                self._busy = True
+                # Requests run one at a time, so the previous one has been
+                # published by now: build on it.
+                previous = self._published if req.run_id == self._run_id and self._published else req.previous
+            t0 = time.perf_counter()
+            summary = ""
+            try:
+                summary = str(self._summarize(previous, req.events) or "")
+            except Exception:
+                self.failed += 1
+            with self._cond:
+                self._busy = False
+                self.last_duration = time.perf_counter() - t0
+                if summary and req.run_id == self._run_id and req.version > self._published_version:
+                    self._published = summary
+                    self._published_version = req.version
+                    self.completed += 1
+                elif summary:
+                    self.discarded += 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "discarded": self.discarded,
+                "failed": self.failed,
+                "pending": self._pending is not None,
+                "busy": self._busy,
+                "last_duration_ms": round(self.last_duration * 1000.0, 2),
+            }
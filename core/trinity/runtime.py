@@ -1,4 +1,5 @@
 import os
+import sys
 import threading
 import subprocess
 import time
@@ -6,7 +7,11 @@ from typing import Optional, Callable, Dict, Any, List, Generator
 from datetime import datetime
 
 from core.trinity.state import TrinityState, TrinityPermissions
+from core.prompt_cache import PromptCache
+from core.trinity.planning.speculation import SpeculativePlanner
+from core.trinity.transcript import get_transcript_store, new_messages, trim_window
 from core.memory import get_memory
+from core.startup import BackgroundWarmup, LazyProxy, get_startup_profiler
 from core.context7 import Context7
 from core.verification import AdaptiveVerifier
 from core.mcp_registry import MCPToolRegistry
@@ -15,7 +20,7 @@ from core.vibe_assistant import VibeCLIAssistant
 from tui.logger import get_logger, trace
 from providers.copilot import CopilotLLM
 from core.state_logger import log_initial_state, log_state_transition
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 
 # Mixins
 from core.trinity.nodes.meta_planner import MetaPlannerMixin
@@ -98,28 +103,39 @@ class TrinityRuntime(
         preferred_language: str = "en",
         enable_self_healing: bool = True,
         hyper_mode: bool = False,
-        learning_mode: bool = False
+        learning_mode: bool = False,
+        speculative_planning: Optional[bool] = None
     ):
-        self.llm = _build_llm()
+        profiler = get_startup_profiler()
         self.verbose = verbose
         self.logger = get_logger("trinity.core")
-        self.registry = MCPToolRegistry()
         self.learning_mode = learning_mode
         self.preferred_language = preferred_language
+
+        # Heavy subsystems are proxies resolved on first use (or by the background warm-up).
+        self.llm = LazyProxy("llm", _build_llm, profiler)
+        with profiler.stage("registry"):
+            self.registry = MCPToolRegistry()
         
         # Integrate MCP tools
         try:
             from system_ai.tools.mcp_integration import register_mcp_tools_with_trinity
-            register_mcp_tools_with_trinity(self.registry)
+            with profiler.stage("mcp_integration"):
+                register_mcp_tools_with_trinity(self.registry)
         except Exception as e:
             if self.verbose:
                 self.logger.warning(f"MCP integration with Trinity deferred: {e}")
         
         self.context_layer = Context7(verbose=verbose)
-        self.verifier = AdaptiveVerifier(self.llm)
-        self.memory = get_memory()
+        self.prompt_cache = PromptCache.from_env()
+        # Opt-in: start the next Atlas planning request while Grisha verifies
+        if speculative_planning is None:
+            speculative_planning = str(os.getenv("TRINITY_SPECULATIVE_PLANNING") or "").strip().lower() in {"1", "true", "yes", "on"}
+        self.speculative_planning = bool(speculative_planning)
+        self.speculator = SpeculativePlanner()
+        self.verifier = LazyProxy("verifier", lambda: AdaptiveVerifier(self.llm), profiler)
+        self.memory = LazyProxy("memory", get_memory, profiler)
         self.permissions = permissions or TrinityPermissions()
-        self.preferred_language = preferred_language
         
         # Stream handling
         self.on_stream = on_stream
@@ -128,15 +144,12 @@ class TrinityRuntime(
         
         # Helper initialization
         self.vision_context_manager = VisionContextManager(max_history=10)
-        self.vibe_assistant = VibeCLIAssistant(name="Doctor Vibe")
-        try:
-            self.vibe_assistant.set_update_callback(self._on_vibe_update)
-        except Exception:
-            pass
+        self.vibe_assistant = LazyProxy("vibe_assistant", self._build_vibe_assistant, profiler)
 
         # Register custom tools (vision, window detection, etc.)
         try:
-            self._register_tools()
+            with profiler.stage("trinity_tools"):
+                self._register_tools()
         except Exception as e:
             try:
                 from tui.logger import log_exception as _log_exception
@@ -147,7 +160,8 @@ class TrinityRuntime(
 
         # Build Graph
         try:
-            self.workflow = self._build_graph()
+            with profiler.stage("workflow_graph"):
+                self.workflow = self._build_graph()
         except Exception as e:
             try:
                 from tui.logger import log_exception as _log_exception
@@ -159,6 +173,7 @@ class TrinityRuntime(
         # Execution tracing
         self.execution_trace = []
         self.max_execution_steps = 250  # Safety limit increased
+        self.transcript_id: Optional[str] = None
         self.enable_execution_tracing = verbose
         
         # Hyper mode
@@ -191,10 +206,31 @@ class TrinityRuntime(
              if self.verbose: self.logger.warning(f"Sonar background scanner init failed: {e}")
              self.sonar_scanner = None
 
-        # ChromaDB health check and recovery
+        # ChromaDB, MCP providers, embedding models and the tokenizer warm up while the prompt is interactive
+        self.warmup = BackgroundWarmup(profiler=profiler)
+        self.warmup.add("memory", self._warm_up_memory)
+        self.warmup.add("mcp_providers", self.registry.warm_up)
+        self.warmup.add("embeddings", self._warm_up_embeddings)
+        self.warmup.add("tokenizer", self.context_layer.warm_up)
+        if self._is_env_true("TRINITY_PLUGIN_WARMUP", False):
+            self.warmup.add("plugins", self.registry.warm_up_plugins)
+        if self._is_env_true("TRINITY_TOOL_POOL_PREWARM", False):
+            self.warmup.add("tool_pool", self.registry.warm_up_tool_pool)
+        if not self._is_env_true("TRINITY_DISABLE_WARMUP", False):
+            self.warmup.start()
+
+    def _build_vibe_assistant(self) -> VibeCLIAssistant:
+        assistant = VibeCLIAssistant(name="Doctor Vibe")
+        try:
+            assistant.set_update_callback(self._on_vibe_update)
+        except Exception:
+            pass
+        return assistant
+
+    def _warm_up_memory(self) -> None:
+        """Resolve the memory proxy (ChromaDB client init) and run the health check."""
+        memory = self.memory.resolve(background=True) if isinstance(self.memory, LazyProxy) else self.memory
         try:
-            from core.memory import get_memory as get_memory_func
-            memory = get_memory_func()
             if hasattr(memory, 'check_chroma_health'):
                 health_status = memory.check_chroma_health()
                 if not health_status.get('healthy', True):
@@ -212,6 +248,14 @@ class TrinityRuntime(
             if self.verbose:
                 self.logger.debug(f"ChromaDB health check failed (non-critical): {e}")
 
+    def _warm_up_embeddings(self) -> None:
+        """Run one tiny query so Chroma loads its embedding model before the first real lookup."""
+        try:
+            self.memory.query_memory("knowledge_base", "warmup", n_results=1)
+        except Exception as e:
+            if self.verbose:
+                self.logger.debug(f"Embedding warm-up skipped: {e}")
+
     def _is_env_true(self, var: str, default: bool) -> bool:
         val = str(os.getenv(var) or "").strip().lower()
         if not val: return default
@@ -219,18 +263,27 @@ class TrinityRuntime(
 
     def cleanup(self):
         """Cleanup resources."""
+        if hasattr(self, 'warmup'):
+            self.warmup.wait(timeout=5.0)
+        if hasattr(self, 'speculator'):
+            self.speculator.shutdown()
         if hasattr(self, 'sonar_scanner') and self.sonar_scanner:
             self.sonar_scanner.stop()
+        # Screen capture sessions opened by tool / watcher threads
+        capture = sys.modules.get("system_ai.tools.capture")
+        if capture is not None:
+            capture.close_capture_services()
     
     def get_execution_trace(self) -> List[Dict[str, Any]]:
         """Get the execution trace for debugging"""
         return self.execution_trace
+
+    def get_transcript(self, start: int = 0, end: Optional[int] = None) -> List[BaseMessage]:
+        """Full message history of the current (or last) run."""
+        return get_transcript_store().read(self.transcript_id, start, end)
     
     def get_execution_stats(self) -> Dict[str, Any]:
         """Get execution statistics"""
-        if not self.execution_trace:
-            return {'steps': 0, 'agents': {}, 'duration': 0}
-        
         stats = {
             'steps': len(self.execution_trace),
             'agents': {},
@@ -251,6 +304,17 @@ class TrinityRuntime(
                 stats['duration'] = (end_time - start_time).total_seconds()
             except Exception:
                 pass
+
+        # Wall-clock time of the current/last task (independent of tracing)
+        started = getattr(self, "_execution_start_time", None)
+        if started:
+            ended = getattr(self, "_execution_end_time", None) or time.time()
+            stats['wall_clock'] = round(ended - started, 3)
+
+        stats['speculation'] = dict(self.speculator.stats(), enabled=self.speculative_planning)
+        stats['prompt_cache'] = self.prompt_cache.stats()
+        if getattr(self, "_summarizer", None) is not None:
+            stats['summarizer'] = self._summarizer.stats()
         
         return stats
 
@@ -297,12 +361,20 @@ class TrinityRuntime(
         # Safety checks
         self._check_safety_limits = True
         self._execution_start_time = time.time()
+        self._execution_end_time: Optional[float] = None
         
         # 1. Classify task
         task_type, is_dev, is_media = self._classify_task(task)
         
+        # Full history goes to the transcript store; graph state only keeps
+        # a bounded window of recent messages.
+        first_msg = HumanMessage(content=task)
+        self.transcript_id = get_transcript_store().create([first_msg])
+        window = [first_msg]
+
         state = {
-            "messages": [HumanMessage(content=task)],
+            "messages": [first_msg],
+            "transcript_id": self.transcript_id,
             "original_task": task,
             "current_agent": "meta_planner",
             "task_status": "pending",
@@ -349,6 +421,11 @@ class TrinityRuntime(
                 for node_name, node_state in event.items():
                     if not isinstance(node_state, dict):
                         continue
+                    if "messages" in node_state:
+                        added = new_messages(window, node_state.get("messages"))
+                        if added:
+                            get_transcript_store().append(self.transcript_id, added)
+                            window = trim_window(window + added)
                     agent = node_state.get("current_agent")
                     if agent:
                         self._log_execution_step(agent, node_state)
@@ -373,6 +450,8 @@ class TrinityRuntime(
         finally:
             # Restore original Python recursion limit
             sys.setrecursionlimit(old_recursion_limit)
+            self._execution_end_time = time.time()
+            self.speculator.discard()
 
     def _log_execution_step(self, step_name: str, state: Dict[str, Any]):
         """Log execution steps for debugging and tracing"""
@@ -6,12 +6,14 @@ This module contains the core state types for the Trinity runtime:
 - TrinityState: TypedDict defining the full graph state schema
 """
 
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import Annotated, TypedDict, List, Dict, Any, Optional
 from dataclasses import dataclass
 import os
 
 from langchain_core.messages import BaseMessage
 
+from core.trinity.transcript import window_messages
+
 
 @dataclass
 class TrinityPermissions:
@@ -102,7 +104,10 @@ class TrinityState(TypedDict, total=False):
     the current execution context.
     
     Core Fields:
-        messages: List of conversation messages (LangChain format)
+        messages: Bounded window of recent messages (LangChain format).
+            Nodes return only the messages they add; the reducer appends
+            and trims. The full history lives in the transcript store.
+        transcript_id: ID of the run's transcript in TranscriptStore
         current_agent: Currently active agent (meta_planner, atlas, tetyana, grisha)
         task_status: Overall task status (pending, in_progress, completed, failed)
         final_response: Final response to user when task completes
@@ -148,7 +153,8 @@ class TrinityState(TypedDict, total=False):
         learning_mode: Whether learning/experience extraction is enabled
     """
     # Core fields
-    messages: List[BaseMessage]
+    messages: Annotated[List[BaseMessage], window_messages]
+    transcript_id: Optional[str]
     current_agent: str
     task_status: str
     final_response: Optional[str]
@@ -227,6 +233,7 @@ def create_initial_state(
     
     return TrinityState(
         messages=[HumanMessage(content=task)],
+        transcript_id=None,
         current_agent="meta_planner",  # Always start with meta_planner
         task_status="pending",
         final_response=None,
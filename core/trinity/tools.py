@@ -1,6 +1,7 @@
 from typing import Any, Dict, Optional, Callable
 import os
 from core.mcp_registry import MCPToolRegistry
+from core.startup import lazy_callable
 
 class TrinityToolsMixin:
     """Mixin for TrinityRuntime containing tool registration and management logic."""
@@ -9,30 +10,33 @@ class TrinityToolsMixin:
         """Register all local tools and MCP tools."""
         # Note: self.registry is expected to be initialized in TrinityRuntime.__init__
         
-        from system_ai.tools.screenshot import get_frontmost_app, get_all_windows
+        # Screenshot/vision modules import mss, PIL and OpenCV; resolve them on first call.
+        get_frontmost_app = lazy_callable("system_ai.tools.screenshot", "get_frontmost_app")
+        get_all_windows = lazy_callable("system_ai.tools.screenshot", "get_all_windows")
 
         disable_vision = str(os.environ.get("TRINITY_DISABLE_VISION", "")).strip().lower() in {"1", "true", "yes", "on"}
-        EnhancedVisionTools = None
-        if not disable_vision:
-            try:
-                from system_ai.tools.vision import EnhancedVisionTools as _EnhancedVisionTools
-                EnhancedVisionTools = _EnhancedVisionTools
-            except Exception as e:
-                # self.logger is expected to be available
-                if hasattr(self, 'verbose') and self.verbose and hasattr(self, 'logger'):
-                    self.logger.warning(f"Vision tools unavailable: {e}")
         
         # Core Vision Tools (optional)
-        if EnhancedVisionTools is not None:
+        if not disable_vision:
+            def _vision_unavailable(e: Exception) -> Callable:
+                return lambda *_, **__: {"status": "error", "error": f"Vision tools unavailable: {e}"}
+
+            capture_and_analyze = lazy_callable(
+                "system_ai.tools.vision", "EnhancedVisionTools.capture_and_analyze", fallback=_vision_unavailable
+            )
+            analyze_with_context = lazy_callable(
+                "system_ai.tools.vision", "EnhancedVisionTools.analyze_with_context", fallback=_vision_unavailable
+            )
+
             self.registry.register_tool(
                 "enhanced_vision_analysis",
-                EnhancedVisionTools.capture_and_analyze,
+                capture_and_analyze,
                 description="Capture screen and perform differential visual/OCR analysis. Args: app_name (optional), window_title (optional)"
             )
 
             self.registry.register_tool(
                 "vision_analysis_with_context",
-                lambda args: EnhancedVisionTools.analyze_with_context(
+                lambda args: analyze_with_context(
                     args.get("image_path"),
                     getattr(self, 'vision_context_manager', None)
                 ),
@@ -0,0 +1,136 @@
+"""
+Bounded message window and out-of-band transcript store.
+
+Graph state only carries a bounded window of recent messages; the full
+conversation lives in an append-only TranscriptStore referenced by
+`transcript_id`. This keeps per-step cost flat regardless of run length.
+
+Features:
+- window_messages: LangGraph reducer that appends node output and trims
+- new_messages: the part of a node update that is not yet in the window
+- TranscriptStore: thread-safe append-only transcripts keyed by ID
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except (TypeError, ValueError):
+        return default
+
+
+# The first message (the user's task) is always kept, so the window holds
+# the task plus the last MESSAGE_WINDOW - 1 messages.
+MESSAGE_WINDOW = max(2, _env_int("TRINITY_MESSAGE_WINDOW", 16))
+
+
+def _as_list(value) -> List[BaseMessage]:
+    if value is None:
+        return []
+    if isinstance(value, BaseMessage):
+        return [value]
+    return list(value)
+
+
+def new_messages(current: Optional[Sequence[BaseMessage]], update) -> List[BaseMessage]:
+    """
+    Return the messages in `update` that are not already in `current`.
+
+    Nodes should return only the messages they add. Older code returns the
+    whole window plus new messages (`list(context) + [msg]`); that is
+    detected by identity of the leading messages and reduced to the tail.
+    """
+    current = current or []
+    update = _as_list(update)
+    n = len(current)
+    if n and len(update) >= n and all(a is b for a, b in zip(update, current)):
+        return update[n:]
+    return update
+
+
+def trim_window(messages: List[BaseMessage], size: int = MESSAGE_WINDOW) -> List[BaseMessage]:
+    """Keep the first message and the most recent `size - 1` messages."""
+    if len(messages) <= size:
+        return messages
+    return [messages[0]] + messages[-(size - 1):]
+
+
+def window_messages(current: Optional[List[BaseMessage]], update) -> List[BaseMessage]:
+    """LangGraph reducer for `TrinityState.messages`: append, then trim."""
+    added = new_messages(current, update)
+    if not added:
+        return list(current or [])
+    return trim_window(list(current or []) + added)
+
+
+class TranscriptStore:
+    """
+    Append-only transcripts, one per run.
+
+    Only the most recent `max_transcripts` runs are kept in memory.
+    """
+
+    def __init__(self, max_transcripts: int = 32):
+        self.max_transcripts = max(1, int(max_transcripts))
+        self._lock = threading.Lock()
+        self._transcripts: "OrderedDict[str, List[BaseMessage]]" = OrderedDict()
+
+    def create(self, messages: Optional[Sequence[BaseMessage]] = None) -> str:
+        """Start a new transcript and return its ID."""
+        tid = uuid.uuid4().hex
+        with self._lock:
+            self._transcripts[tid] = list(messages or [])
+            while len(self._transcripts) > self.max_transcripts:
+                self._transcripts.popitem(last=False)
+        return tid
+
+    def append(self, transcript_id: Optional[str], messages) -> int:
+        """Append messages; returns the new transcript length (0 if unknown ID)."""
+        msgs = _as_list(messages)
+        with self._lock:
+            transcript = self._transcripts.get(transcript_id or "")
+            if transcript is None:
+                return 0
+            transcript.extend(msgs)
+            return len(transcript)
+
+    def read(self, transcript_id: Optional[str], start: int = 0, end: Optional[int] = None) -> List[BaseMessage]:
+        with self._lock:
+            transcript = self._transcripts.get(transcript_id or "", [])
+            return transcript[start:end]
+
+    def tail(self, transcript_id: Optional[str], n: int) -> List[BaseMessage]:
+        if n <= 0:
+            return []
+        return self.read(transcript_id, -n)
+
+    def length(self, transcript_id: Optional[str]) -> int:
+        with self._lock:
+            return len(self._transcripts.get(transcript_id or "", []))
+
+    def drop(self, transcript_id: Optional[str]) -> None:
+        with self._lock:
+            self._transcripts.pop(transcript_id or "", None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "transcripts": len(self._transcripts),
+                "messages": sum(len(t) for t in self._transcripts.values()),
+            }
+
+
+_store = TranscriptStore()
+
+
+def get_transcript_store() -> TranscriptStore:
+    """Get the process-wide transcript store."""
+    return _store
@@ -5,16 +5,44 @@ Enhanced visual context management with:
 - Change region tracking
 - Smart summarization
 - Multi-monitor aware context
+- Perceptual frame-cache metrics (reused OCR / LLM results)
+
+Per-update cost is constant: history is a ring buffer of slotted records,
+change regions accumulate in a fixed NumPy heat-map grid that decays in one
+vectorized multiply, and the trend keeps running sums of its two halves.
 """
 
 import os
+import sys
 import json
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from itertools import islice
+from typing import Deque, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
+
+# Heat-map grid: cells of HEAT_CELL px, HEAT_COLS x HEAT_ROWS cells (9600x4800 px);
+# changes beyond the grid land in the edge cells
+HEAT_CELL = 100
+HEAT_COLS = 96
+HEAT_ROWS = 48
+# Every update multiplies the whole grid by HEAT_DECAY; cells below HEAT_FLOOR are cleared
+HEAT_DECAY = 0.9
+HEAT_FLOOR = 0.05
+
+
+def _clock(timestamp: str) -> str:
+    """HH:MM:SS of an ISO timestamp (parsed once, when the frame is recorded)."""
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%H:%M:%S")
+    except (TypeError, ValueError):
+        return str(timestamp)[:8]
+
 
-@dataclass
+@dataclass(slots=True)
 class ChangeRegion:
     """Represents a region of visual change."""
     x: int
@@ -37,7 +65,7 @@ class ChangeRegion:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class FrameAnalysis:
     """Complete analysis of a single frame."""
     timestamp: str
@@ -48,6 +76,8 @@ class FrameAnalysis:
     ocr_status: str
     context_summary: str
     monitor_count: int = 1
+    cache_hit: bool = False
+    clock: str = ""
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -58,7 +88,8 @@ class FrameAnalysis:
             "ocr_text_preview": self.ocr_text[:100] if self.ocr_text else "",
             "ocr_status": self.ocr_status,
             "summary": self.context_summary,
-            "monitor_count": self.monitor_count
+            "monitor_count": self.monitor_count,
+            "cache_hit": self.cache_hit
         }
 
 
@@ -73,16 +104,20 @@ class VisionContextManager:
     """
 
     def __init__(self, max_history: int = 10):
-        self.history: List[FrameAnalysis] = []
         self.max_history = max_history
+        self.history: Deque[FrameAnalysis] = deque(maxlen=max(1, max_history))
         self.current_context = "No visual context available"
         
-        # Trend tracking
-        self._change_trend: List[float] = []
+        # Trend tracking: the window is split into an older and a newer half,
+        # each with a running sum
         self._max_trend_samples = 5
+        self._trend_older: Deque[float] = deque()
+        self._trend_newer: Deque[float] = deque()
+        self._older_sum = 0.0
+        self._newer_sum = 0.0
         
         # Active region tracking (regions that change frequently)
-        self._active_regions: Dict[str, int] = {}  # region_key -> frequency
+        self._heat = np.zeros((HEAT_ROWS, HEAT_COLS), dtype=np.float32)
         
         # Monitor info
         self._monitor_count = 1
@@ -109,23 +144,28 @@ class VisionContextManager:
                 ))
         
         # Create frame analysis
+        timestamp = new_data.get("timestamp")
+        if timestamp:
+            clock = _clock(timestamp)
+        else:
+            now = datetime.now()
+            timestamp, clock = now.isoformat(), now.strftime("%H:%M:%S")
         frame = FrameAnalysis(
-            timestamp=new_data.get("timestamp", datetime.now().isoformat()),
+            timestamp=timestamp,
             change_percentage=diff.get("global_change_percentage", 0),
             has_significant_changes=diff.get("has_significant_changes", False),
             changed_regions=regions,
             ocr_text=ocr.get("full_text", ""),
             ocr_status=ocr.get("status", "unknown"),
             context_summary=new_data.get("context", ""),
-            monitor_count=diff.get("monitor_count", 1)
+            monitor_count=diff.get("monitor_count", 1),
+            cache_hit=bool((new_data.get("frame_cache") or {}).get("hit", False)),
+            clock=clock
         )
         
+        # Ring buffer: the oldest frame drops out automatically
         self.history.append(frame)
         
-        # Limit history size
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
-        
         # Update trend
         self._update_change_trend(frame.change_percentage)
         
@@ -137,37 +177,40 @@ class VisionContextManager:
 
     def _update_change_trend(self, change_pct: float) -> None:
         """Track change percentage trend."""
-        self._change_trend.append(change_pct)
-        if len(self._change_trend) > self._max_trend_samples:
-            self._change_trend.pop(0)
+        change_pct = float(change_pct or 0.0)
+        self._trend_newer.append(change_pct)
+        self._newer_sum += change_pct
+        if len(self._trend_older) + len(self._trend_newer) > self._max_trend_samples:
+            if self._trend_older:
+                self._older_sum -= self._trend_older.popleft()
+            else:
+                self._newer_sum -= self._trend_newer.popleft()
+        # Keep the older half at n // 2 samples (at most one moves per update)
+        target = (len(self._trend_older) + len(self._trend_newer)) // 2
+        while len(self._trend_older) < target:
+            moved = self._trend_newer.popleft()
+            self._newer_sum -= moved
+            self._trend_older.append(moved)
+            self._older_sum += moved
 
     def _track_active_regions(self, regions: List[ChangeRegion]) -> None:
         """Track regions that change frequently."""
-        for r in regions:
-            # Create region key based on approximate location (grid-based)
-            grid_x = r.x // 100
-            grid_y = r.y // 100
-            key = f"{grid_x}_{grid_y}"
-            self._active_regions[key] = self._active_regions.get(key, 0) + 1
-        
-        # Decay old regions
-        keys_to_remove = []
-        for key in self._active_regions:
-            self._active_regions[key] -= 0.1
-            if self._active_regions[key] <= 0:
-                keys_to_remove.append(key)
-        for key in keys_to_remove:
-            del self._active_regions[key]
+        heat = self._heat
+        heat *= HEAT_DECAY
+        if regions:
+            # Grid cell of each region's top-left corner (approximate location)
+            gx = np.clip([r.x // HEAT_CELL for r in regions], 0, HEAT_COLS - 1)
+            gy = np.clip([r.y // HEAT_CELL for r in regions], 0, HEAT_ROWS - 1)
+            np.add.at(heat, (gy, gx), 1.0)
+        heat[heat < HEAT_FLOOR] = 0.0
 
     def get_trend(self) -> str:
         """Get the current change trend: 'increasing', 'decreasing', 'stable'."""
-        if len(self._change_trend) < 2:
+        n_older, n_newer = len(self._trend_older), len(self._trend_newer)
+        if n_older + n_newer < 2:
             return "unknown"
         
-        avg_first = sum(self._change_trend[:len(self._change_trend)//2]) / max(1, len(self._change_trend)//2)
-        avg_second = sum(self._change_trend[len(self._change_trend)//2:]) / max(1, len(self._change_trend) - len(self._change_trend)//2)
-        
-        diff = avg_second - avg_first
+        diff = self._newer_sum / n_newer - self._older_sum / n_older
         if diff > 2:
             return "increasing"
         elif diff < -2:
@@ -176,15 +219,17 @@ class VisionContextManager:
 
     def get_most_active_regions(self, limit: int = 3) -> List[Dict[str, Any]]:
         """Get the most frequently changing regions."""
-        sorted_regions = sorted(
-            self._active_regions.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:limit]
+        flat = self._heat.ravel()
+        active = int(np.count_nonzero(flat))
+        limit = min(max(0, limit), active)
+        if limit == 0:
+            return []
+        top = np.argpartition(flat, -limit)[-limit:]
+        top = top[np.argsort(flat[top])[::-1]]
         
         return [
-            {"grid_location": k, "frequency_score": v}
-            for k, v in sorted_regions
+            {"grid_location": f"{i % HEAT_COLS}_{i // HEAT_COLS}", "frequency_score": round(float(flat[i]), 3)}
+            for i in top.tolist()
         ]
 
     def _generate_summary(self) -> str:
@@ -196,8 +241,7 @@ class VisionContextManager:
         summary_parts = []
         
         # Timestamp
-        ts = datetime.fromisoformat(recent.timestamp).strftime("%H:%M:%S")
-        summary_parts.append(f"[{ts}]")
+        summary_parts.append(f"[{recent.clock or _clock(recent.timestamp)}]")
 
         # Change info with trend
         trend = self.get_trend()
@@ -229,15 +273,27 @@ class VisionContextManager:
         return {
             "history_summary": [
                 frame.to_dict() 
-                for frame in self.history[-5:]
+                for frame in islice(self.history, max(0, len(self.history) - 5), None)
             ],
             "current_context": self.current_context,
             "analysis_count": len(self.history),
             "trend": self.get_trend(),
             "active_regions": self.get_most_active_regions(3),
-            "monitor_count": self._monitor_count
+            "monitor_count": self._monitor_count,
+            "frame_cache": self._frame_cache_stats()
         }
 
+    @staticmethod
+    def _frame_cache_stats() -> Dict[str, Any]:
+        """Hit/miss metrics of the perceptual frame cache (empty until vision tools ran)."""
+        module = sys.modules.get("system_ai.tools.frame_cache")
+        if module is None:
+            return {}
+        try:
+            return module.get_frame_cache().stats()
+        except Exception:
+            return {}
+
     def get_diff_summary_for_step(self, step_index: int = -1) -> str:
         """Get a diff summary formatted for a specific step verification."""
         if not self.history:
@@ -267,10 +323,12 @@ class VisionContextManager:
 
     def clear(self) -> None:
         """Reset the vision context."""
-        self.history = []
+        self.history.clear()
         self.current_context = "No visual context available"
-        self._change_trend = []
-        self._active_regions = {}
+        self._trend_older.clear()
+        self._trend_newer.clear()
+        self._older_sum = self._newer_sum = 0.0
+        self._heat.fill(0.0)
 
     def set_monitor_count(self, count: int) -> None:
         """Update the known monitor count."""
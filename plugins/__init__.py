@@ -2,13 +2,41 @@
 
 This package contains custom plugins developed by Trinity.
 Plugins are automatically discovered and registered with the MCP tool registry.
+
+Plugins that ship a `plugin.json` manifest are registered without importing
+any plugin code: each declared tool becomes a proxy that imports plugin.py on
+its first call. Plugins without a manifest are still imported eagerly.
+
+Features:
+- Static manifest (tool names, descriptions, parameter schemas, cpu_bound);
+  schemas reach the registry and an `Args:` summary in tool descriptions
+- Per-plugin import timing, with a warning when an import exceeds the budget
+- warm_up_plugins() for importing declared plugins off the critical path
+
+Environment:
+- TRINITY_PLUGIN_IMPORT_BUDGET_MS: warn when a plugin import takes longer (default 250)
+- TRINITY_PLUGIN_WARMUP: import manifest plugins during background warm-up (default off)
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional
 import os
+import json
+import time
+import logging
+import threading
 import importlib.util
+from dataclasses import dataclass
 from pathlib import Path
 
+from core.startup import LazyCallable, get_startup_profiler
+
+
+logger = logging.getLogger(__name__)
+
+PLUGINS_DIR = Path(__file__).parent
+MANIFEST_FILE = "plugin.json"
+DEFAULT_IMPORT_BUDGET_MS = 250.0
+
 
 class PluginMeta:
     """Plugin metadata descriptor."""
@@ -44,7 +72,7 @@ def discover_plugins(plugins_dir: Optional[Path] = None) -> List[Dict[str, Any]]
         List of plugin metadata dictionaries
     """
     if plugins_dir is None:
-        plugins_dir = Path(__file__).parent
+        plugins_dir = PLUGINS_DIR
     
     discovered = []
     
@@ -56,6 +84,18 @@ def discover_plugins(plugins_dir: Optional[Path] = None) -> List[Dict[str, Any]]
         if not plugin_file.exists():
             continue
         
+        manifest = read_manifest(item)
+        if manifest is not None:
+            meta = PluginMeta(
+                name=str(manifest.get("name") or item.name),
+                version=str(manifest.get("version") or "0.1.0"),
+                description=str(manifest.get("description") or ""),
+                author=str(manifest.get("author") or "Trinity System"),
+                dependencies=list(manifest.get("dependencies") or []),
+            )
+            discovered.append(meta.to_dict())
+            continue
+        
         try:
             # Import plugin module
             spec = importlib.util.spec_from_file_location(f"plugins.{item.name}.plugin", plugin_file)
@@ -70,12 +110,240 @@ def discover_plugins(plugins_dir: Optional[Path] = None) -> List[Dict[str, Any]]
                         discovered.append(meta.to_dict())
         except Exception as e:
             # Log error but continue discovery
-            import logging
-            logging.getLogger(__name__).warning(f"Failed to load plugin {item.name}: {e}")
+            logger.warning(f"Failed to load plugin {item.name}: {e}")
     
     return discovered
 
 
+def _exec_plugin_module(plugin_name: str, plugin_file: Path) -> Any:
+    spec = importlib.util.spec_from_file_location(f"plugins.{plugin_name}.plugin", plugin_file)
+    if not spec or not spec.loader:
+        raise ImportError(f"Cannot load {plugin_file}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def read_manifest(plugin_dir: Path) -> Optional[Dict[str, Any]]:
+    """Read `plugin.json` from a plugin directory (None when absent or invalid)."""
+    path = Path(plugin_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"Invalid plugin manifest {path}: {e}")
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("tools", []), list):
+        logger.warning(f"Invalid plugin manifest {path}: 'tools' must be a list")
+        return None
+    return data
+
+
+def import_budget_ms() -> float:
+    try:
+        return float(os.getenv("TRINITY_PLUGIN_IMPORT_BUDGET_MS") or DEFAULT_IMPORT_BUDGET_MS)
+    except ValueError:
+        return DEFAULT_IMPORT_BUDGET_MS
+
+
+@dataclass
+class PluginImportRecord:
+    """Timing of one plugin import."""
+    name: str
+    ms: float
+    ok: bool
+    background: bool = False
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "ms": round(self.ms, 2),
+            "ok": self.ok,
+            "background": self.background,
+            "error": self.error,
+        }
+
+
+class _ToolCollector:
+    """Stands in for the registry while a lazily imported plugin runs register()."""
+
+    def __init__(self):
+        self.tools: Dict[str, Callable] = {}
+
+    def register_tool(self, name: str, func: Callable, description: str = "") -> None:
+        self.tools[name] = func
+
+
+class LazyPlugin:
+    """A manifest-declared plugin whose plugin.py is imported on first use."""
+
+    def __init__(self, name: str, plugin_file: Path, manifest: Dict[str, Any]):
+        self.name = name
+        self.plugin_file = Path(plugin_file)
+        self.manifest = manifest
+        self.record: Optional[PluginImportRecord] = None
+        self._tools: Optional[Dict[str, Callable]] = None
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    @property
+    def tools(self) -> List[Dict[str, Any]]:
+        return [t for t in self.manifest.get("tools", []) if isinstance(t, dict) and t.get("name")]
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.record is not None
+
+    def load(self, background: bool = False) -> Dict[str, Callable]:
+        """Import plugin.py (once) and return its tool functions by name."""
+        if self.record is None:
+            with self._lock:
+                if self.record is None:
+                    self._import(background)
+        if self._error is not None:
+            raise self._error
+        return self._tools or {}
+
+    def _import(self, background: bool) -> None:
+        t0 = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            with get_startup_profiler().stage(f"plugin:{self.name}", background=background):
+                module = _exec_plugin_module(self.name, self.plugin_file)
+                collector = _ToolCollector()
+                if hasattr(module, "register"):
+                    module.register(collector)
+            tools: Dict[str, Callable] = {}
+            for tool in self.tools:
+                attr = tool.get("function")
+                func = getattr(module, attr, None) if attr else collector.tools.get(tool["name"])
+                if func is not None:
+                    tools[tool["name"]] = func
+            undeclared = sorted(set(collector.tools) - {t["name"] for t in self.tools})
+            if undeclared:
+                logger.warning(f"Plugin {self.name} registers tools missing from {MANIFEST_FILE}: {', '.join(undeclared)}")
+            self._tools = tools
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            self._error = e
+            logger.error(f"Failed to load plugin {self.name}: {e}")
+        ms = (time.perf_counter() - t0) * 1000.0
+        self.record = PluginImportRecord(self.name, ms, error is None, background=background, error=error)
+        _import_records[self.name] = self.record
+        budget = import_budget_ms()
+        if budget > 0 and ms > budget:
+            logger.warning(f"Plugin {self.name} import took {ms:.0f} ms (budget {budget:.0f} ms)")
+
+
+class PluginToolProxy(LazyCallable):
+    """Registry entry for a manifest-declared tool; imports its plugin on first call."""
+
+    def __init__(self, plugin: LazyPlugin, tool: Dict[str, Any]):
+        super().__init__(f"plugins.{plugin.name}.plugin", str(tool.get("function") or tool["name"]))
+        self.plugin = plugin
+        self.tool_name = str(tool["name"])
+        self.schema: Dict[str, Any] = dict(tool.get("parameters") or {})
+        self.tool = dict(tool)
+        self.cpu_bound = bool(tool.get("cpu_bound"))
+
+    def resolve(self) -> Callable[..., Any]:
+        if self._func is None:
+            func = self.plugin.load().get(self.tool_name)
+            if func is None:
+                raise AttributeError(f"Plugin {self.plugin.name} does not provide tool '{self.tool_name}'")
+            self._func = func
+        return self._func
+
+    def __reduce__(self):
+        # Rebuilt in the tool pool worker, which imports the plugin there
+        return (_plugin_tool, (self.plugin.name, str(self.plugin.plugin_file), self.plugin.manifest, self.tool))
+
+    def __repr__(self) -> str:
+        return f"<PluginToolProxy {self.plugin.name}:{self.tool_name}>"
+
+
+def _plugin_tool(plugin_name: str, plugin_file: str, manifest: Dict[str, Any], tool: Dict[str, Any]) -> PluginToolProxy:
+    plugin = _lazy_plugins.get(plugin_name)
+    if plugin is None or str(plugin.plugin_file) != plugin_file:
+        plugin = _lazy_plugins[plugin_name] = LazyPlugin(plugin_name, Path(plugin_file), manifest)
+    return PluginToolProxy(plugin, tool)
+
+
+_lazy_plugins: Dict[str, LazyPlugin] = {}
+_import_records: Dict[str, PluginImportRecord] = {}
+
+
+def register_lazy_plugin(plugin_name: str, registry: Any, plugins_dir: Optional[Path] = None) -> bool:
+    """Register the tools declared in a plugin's manifest as import-on-call proxies.
+
+    Returns False (nothing registered) when there is no manifest or it
+    declares no tools; such plugins must be imported eagerly, since only
+    their register() knows what they provide.
+    """
+    plugin_dir = Path(plugins_dir or PLUGINS_DIR) / plugin_name
+    plugin_file = plugin_dir / "plugin.py"
+    manifest = read_manifest(plugin_dir)
+    if manifest is None or not plugin_file.exists():
+        return False
+    plugin = LazyPlugin(plugin_name, plugin_file, manifest)
+    if not plugin.tools:
+        return False
+    _lazy_plugins[plugin_name] = plugin
+    for tool in plugin.tools:
+        proxy = PluginToolProxy(plugin, tool)
+        # The proxy's schema reaches registries that read it (MCPToolRegistry); the
+        # description carries it to the prompt tool lists either way
+        registry.register_tool(tool["name"], proxy, describe_tool(tool))
+    return True
+
+
+_JSON_TYPES = {"string": "str", "integer": "int", "number": "float", "boolean": "bool", "array": "list", "object": "dict"}
+
+
+def describe_tool(tool: Dict[str, Any]) -> str:
+    """Manifest tool description, with an `Args:` summary of its parameters schema when it has none.
+
+    e.g. "Process JSON. Args: data (str), limit (int, optional)".
+    """
+    description = str(tool.get("description") or "").strip()
+    schema = tool.get("parameters") or {}
+    properties = schema.get("properties") if isinstance(schema, dict) else None
+    if not isinstance(properties, dict) or "Args:" in description:
+        return description
+    required = set(schema.get("required") or [])
+    args = []
+    for arg, spec in properties.items():
+        kind = spec.get("type") if isinstance(spec, dict) else None
+        kind = _JSON_TYPES.get(kind, kind) if isinstance(kind, str) else None
+        notes = [n for n in (kind, None if arg in required else "optional") if n]
+        args.append(f"{arg} ({', '.join(notes)})" if notes else str(arg))
+    summary = f"Args: {', '.join(args) or 'none'}"
+    return f"{description.rstrip('.')}. {summary}" if description else summary
+
+
+def warm_up_plugins(background: bool = True) -> Dict[str, bool]:
+    """Import every manifest plugin that has not been loaded yet."""
+    results: Dict[str, bool] = {}
+    for name, plugin in list(_lazy_plugins.items()):
+        try:
+            plugin.load(background=background)
+            results[name] = True
+        except Exception:
+            results[name] = False
+    return results
+
+
+def plugin_import_stats() -> Dict[str, Any]:
+    """Import timings of plugins loaded so far, plus the ones still pending."""
+    return {
+        "budget_ms": import_budget_ms(),
+        "loaded": {name: rec.to_dict() for name, rec in _import_records.items()},
+        "pending": sorted(n for n, p in _lazy_plugins.items() if not p.is_loaded),
+    }
+
+
 def load_plugin(plugin_name: str, registry: Any) -> bool:
     """Load and register a specific plugin.
     
@@ -86,27 +354,28 @@ def load_plugin(plugin_name: str, registry: Any) -> bool:
     Returns:
         True if plugin loaded successfully, False otherwise
     """
-    plugins_dir = Path(__file__).parent
-    plugin_dir = plugins_dir / plugin_name
+    plugin_dir = PLUGINS_DIR / plugin_name
     plugin_file = plugin_dir / "plugin.py"
     
     if not plugin_file.exists():
         return False
     
+    t0 = time.perf_counter()
     try:
-        # Import plugin module
-        spec = importlib.util.spec_from_file_location(f"plugins.{plugin_name}.plugin", plugin_file)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            # Call register function if it exists
-            if hasattr(module, "register"):
-                module.register(registry)
-                return True
+        with get_startup_profiler().stage(f"plugin:{plugin_name}"):
+            module = _exec_plugin_module(plugin_name, plugin_file)
+        
+        # Call register function if it exists
+        if hasattr(module, "register"):
+            module.register(registry)
+            return True
     except Exception as e:
-        import logging
-        logging.getLogger(__name__).error(f"Failed to load plugin {plugin_name}: {e}")
+        logger.error(f"Failed to load plugin {plugin_name}: {e}")
+    finally:
+        ms = (time.perf_counter() - t0) * 1000.0
+        budget = import_budget_ms()
+        if budget > 0 and ms > budget:
+            logger.warning(f"Plugin {plugin_name} import took {ms:.0f} ms (budget {budget:.0f} ms); add a {MANIFEST_FILE} manifest to load it lazily")
     
     return False
 
@@ -114,19 +383,25 @@ def load_plugin(plugin_name: str, registry: Any) -> bool:
 def load_all_plugins(registry: Any) -> Dict[str, bool]:
     """Load all discovered plugins.
     
+    Plugins whose manifest declares tools are registered as lazy proxies;
+    the rest (no manifest, or `"tools": []`) are imported and registered
+    immediately.
+    
     Args:
         registry: MCPToolRegistry instance to register tools with
         
     Returns:
         Dictionary mapping plugin names to load status (True/False)
     """
-    plugins_dir = Path(__file__).parent
     results = {}
     
-    for item in plugins_dir.iterdir():
+    for item in PLUGINS_DIR.iterdir():
         if not item.is_dir() or item.name.startswith("_") or item.name.startswith("."):
             continue
         
-        results[item.name] = load_plugin(item.name, registry)
+        if (item / MANIFEST_FILE).exists() and register_lazy_plugin(item.name, registry):
+            results[item.name] = True
+        else:
+            results[item.name] = load_plugin(item.name, registry)
     
     return results
@@ -248,7 +248,7 @@ def create_vibe_plugin(
         Dictionary with creation status and plugin details
     """
     try:
-        from plugins.plugin_creator import create_plugin_structure, sanitize_plugin_name
+        from plugins.plugin_creator import create_plugin_structure, sanitize_plugin_name, write_manifest
         
         # Analyze task requirements
         analysis = analyze_task_requirements(task_description)
@@ -287,6 +287,16 @@ def create_vibe_plugin(
         plugin_dir = Path(result["path"])
         plugin_file = plugin_dir / "plugin.py"
         plugin_file.write_text(plugin_code)
+        write_manifest(
+            plugin_dir,
+            plugin_name,
+            f"Auto-generated plugin for {analysis['plugin_type']} operations",
+            tools=[
+                {"name": t["name"], "function": t["name"], "description": t["description"]}
+                for t in analysis["suggested_tools"]
+            ],
+            version="1.0.0"
+        )
         
         return {
             "status": "success",
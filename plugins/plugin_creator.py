@@ -3,8 +3,9 @@
 Handles automatic plugin scaffolding and Doctor Vibe integration.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import os
+import json
 from pathlib import Path
 import re
 
@@ -120,6 +121,33 @@ def sanitize_plugin_name(name: str) -> str:
     return name
 
 
+def write_manifest(
+    plugin_path: Path,
+    plugin_name: str,
+    description: str = "",
+    tools: Optional[List[Dict[str, Any]]] = None,
+    version: str = "0.1.0"
+) -> Path:
+    """Write plugin.json, which lets the registry list the plugin's tools without importing it.
+    
+    Every tool that register() adds must have an entry here
+    (name, description and optionally function/parameters). A manifest
+    without tools (the scaffold's default) keeps the plugin loading
+    eagerly at startup until its tools are listed.
+    """
+    manifest = {
+        "name": plugin_name,
+        "version": version,
+        "description": description,
+        "author": "Trinity System",
+        "dependencies": [],
+        "tools": list(tools or []),
+    }
+    path = Path(plugin_path) / "plugin.json"
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+    return path
+
+
 def create_plugin_structure(
     plugin_name: str,
     description: str = "",
@@ -164,6 +192,7 @@ def create_plugin_structure(
         plugin_content = PLUGIN_TEMPLATE.replace("{{PLUGIN_NAME}}", plugin_name)
         plugin_content = plugin_content.replace("{{DESCRIPTION}}", description or f"{plugin_name} plugin for Trinity System")
         (plugin_path / "plugin.py").write_text(plugin_content)
+        write_manifest(plugin_path, plugin_name, description or f"{plugin_name} plugin for Trinity System")
         
         # Create README.md
         readme_content = README_TEMPLATE.replace("{{PLUGIN_NAME}}", plugin_name)
@@ -184,6 +213,7 @@ def create_plugin_structure(
             "files_created": [
                 str(plugin_path / "__init__.py"),
                 str(plugin_path / "plugin.py"),
+                str(plugin_path / "plugin.json"),
                 str(plugin_path / "README.md"),
                 str(plugin_path / "tests" / "test_plugin.py")
             ]
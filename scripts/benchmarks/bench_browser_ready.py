@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Benchmark readiness waits against local pages with delayed content.
+
+Compares the previous fixed sleeps (goto + 2 s, as in browser_open_url and
+browser_search_duckduckgo) with BrowserManager.wait_ready. Each page adds
+its content after a delay (setTimeout + a delayed fetch), so the fixed
+sleep is either too long or too short; the benchmark reports latency and
+whether the content was present when the wait returned.
+
+Requires Playwright with Chromium.
+
+Usage:
+    python scripts/benchmarks/bench_browser_ready.py [--runs 5] [--delays 100,400,1200] [--output bench_ready.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+sys.path.insert(0, _repo_root)
+
+FIXED_SLEEP_S = 2.0
+
+PAGE = """<!doctype html><title>delayed</title><body><p>loading</p><script>
+setTimeout(() => {{
+  fetch('/slow?ms={delay}').then(r => r.text()).then(t => {{
+    for (let i = 0; i < 20; i++) {{
+      const a = document.createElement('a');
+      a.className = 'result__a'; a.href = '/r' + i; a.textContent = 'Result ' + i + ' ' + t;
+      document.body.appendChild(a);
+    }}
+  }});
+}}, {delay});
+</script></body>"""
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            ms = int(self.path.split("ms=", 1)[1])
+            time.sleep(ms / 2000.0)
+            body = b"ok"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def _stats(samples):
+    return {
+        "median_ms": round(statistics.median(samples) * 1000.0, 2),
+        "min_ms": round(min(samples) * 1000.0, 2),
+        "max_ms": round(max(samples) * 1000.0, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Browser readiness benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--delays", default="100,400,1200", help="Content delays in ms")
+    parser.add_argument("--output", help="Append results as a JSON line to this file")
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+        from system_ai.tools.browser import BrowserManager, DDG_RESULT_SELECTOR
+    except Exception as e:
+        print(f"playwright unavailable: {e}")
+        return
+
+    delays = [int(d) for d in args.delays.split(",") if d.strip()]
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        for d in delays:
+            with open(os.path.join(root, f"page_{d}.html"), "w", encoding="utf-8") as fh:
+                fh.write(PAGE.format(delay=d))
+        server = ThreadingHTTPServer(("127.0.0.1", 0), lambda *a: _Handler(*a, directory=root))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+
+        with sync_playwright() as pw:
+            browser = pw.chromium.launch(headless=True)
+            page = browser.new_page()
+            manager = BrowserManager()
+
+            def count_links() -> int:
+                return int(page.evaluate("() => document.querySelectorAll('a.result__a').length"))
+
+            strategies = {
+                "fixed_sleep": lambda: time.sleep(FIXED_SLEEP_S),
+                "wait_ready_settle": lambda: manager.wait_ready(page, timeout=2.0, network_idle_timeout=1.5, quiet_ms=500),
+                "wait_ready_selector": lambda: manager.wait_ready(
+                    page, timeout=8.0, network_idle_timeout=None, selector=DDG_RESULT_SELECTOR, quiet_ms=300
+                ),
+            }
+            for d in delays:
+                url = f"{base}/page_{d}.html"
+                for name, wait in strategies.items():
+                    samples, complete = [], 0
+                    for _ in range(args.runs):
+                        page.goto(url, wait_until="domcontentloaded")
+                        t0 = time.perf_counter()
+                        wait()
+                        samples.append(time.perf_counter() - t0)
+                        complete += count_links() == 20
+                    results[f"{name}@{d}ms"] = {**_stats(samples), "content_ready": f"{complete}/{args.runs}"}
+            browser.close()
+        server.shutdown()
+
+    for name, stats in results.items():
+        print(
+            f"{name:28s} median={stats['median_ms']:8.1f}ms min={stats['min_ms']:8.1f}ms "
+            f"max={stats['max_ms']:8.1f}ms ready={stats['content_ready']}"
+        )
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"ts": time.time(), "results": results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
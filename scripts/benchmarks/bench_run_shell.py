@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark memory use of run_shell on a command with large output.
+
+Compares the previous approach (subprocess.run(capture_output=True), then
+keep the last 8000 chars) with streaming capture into bounded buffers.
+Peak memory is measured with tracemalloc (Python allocations, which is
+where captured output lives).
+
+Usage:
+    python scripts/benchmarks/bench_run_shell.py [--runs 3] [--mb 200] [--output bench_shell.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+sys.path.insert(0, _repo_root)
+
+
+def _command(mb: int) -> str:
+    return f"{sys.executable} -c \"import sys; line = 'x' * 1023 + chr(10); [sys.stdout.write(line) for _ in range({mb} * 1024)]\""
+
+
+def _baseline(command: str) -> int:
+    proc = subprocess.run(command, shell=True, capture_output=True, text=True)
+    return len((proc.stdout or "")[-8000:])
+
+
+def _streaming(command: str) -> int:
+    from system_ai.tools.automation import run_shell
+
+    return len(run_shell(command, allow=True)["stdout"])
+
+
+def _measure(fn, command: str, runs: int) -> dict:
+    samples, peaks = [], []
+    for _ in range(runs):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        fn(command)
+        samples.append(time.perf_counter() - t0)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(samples) * 1000.0, 2),
+        "min_ms": round(min(samples) * 1000.0, 2),
+        "max_ms": round(max(samples) * 1000.0, 2),
+        "peak_mb": round(max(peaks) / (1024 * 1024), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="run_shell memory benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--mb", type=int, default=200, help="Output size of the benchmark command in MB")
+    parser.add_argument("--output", help="Append results as a JSON line to this file")
+    args = parser.parse_args()
+
+    command = _command(args.mb)
+    results = {
+        "baseline_capture_output": _measure(_baseline, command, args.runs),
+        "streaming_bounded": _measure(_streaming, command, args.runs),
+    }
+    for name, stats in results.items():
+        print(f"{name:26s} median={stats['median_ms']:9.1f}ms min={stats['min_ms']:9.1f}ms max={stats['max_ms']:9.1f}ms peak={stats['peak_mb']:8.2f}MB")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"ts": time.time(), "output_mb": args.mb, "results": results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
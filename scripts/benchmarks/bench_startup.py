@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark cold start-to-prompt time for the TUI and TrinityRuntime.
+
+Each sample runs in a fresh interpreter so module caches do not hide import cost.
+
+Usage:
+    python scripts/benchmarks/bench_startup.py [--runs 5] [--output bench_startup.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+
+# Start-to-prompt for the TUI: everything run_tui() does before the app loop starts.
+TUI_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import tui.cli as cli
+cli._load_ui_settings()
+cli._load_env()
+print(time.perf_counter() - t0)
+"""
+
+# Start-to-first-task for Trinity: runtime construction without background warm-up.
+RUNTIME_SNIPPET = """
+import os, time
+os.environ.setdefault("TRINITY_DISABLE_WARMUP", "1")
+t0 = time.perf_counter()
+from core.trinity import TrinityRuntime
+rt = TrinityRuntime(verbose=False, enable_self_healing=False)
+print(time.perf_counter() - t0)
+"""
+
+
+def _sample(snippet: str) -> float:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = _repo_root + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=_repo_root,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip()[-2000:])
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def _bench(name: str, snippet: str, runs: int) -> dict:
+    samples = []
+    error = None
+    for _ in range(runs):
+        try:
+            samples.append(_sample(snippet))
+        except Exception as e:
+            error = str(e)
+            break
+    result = {"name": name, "runs": len(samples), "error": error}
+    if samples:
+        result.update({
+            "median_ms": round(statistics.median(samples) * 1000.0, 1),
+            "min_ms": round(min(samples) * 1000.0, 1),
+            "max_ms": round(max(samples) * 1000.0, 1),
+        })
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold start-to-prompt benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Append results as a JSON line to this file")
+    args = parser.parse_args()
+
+    results = [
+        _bench("tui_start_to_prompt", TUI_SNIPPET, args.runs),
+        _bench("trinity_runtime_init", RUNTIME_SNIPPET, args.runs),
+    ]
+    for r in results:
+        if r.get("error"):
+            print(f"{r['name']:<24} ERROR: {r['error'].splitlines()[-1] if r['error'] else ''}")
+        else:
+            print(f"{r['name']:<24} median {r['median_ms']:>8.1f} ms  (min {r['min_ms']:.1f}, max {r['max_ms']:.1f}, n={r['runs']})")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": time.time(), "results": results}, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark find_image_on_screen matching on a saved or synthetic screenshot.
+
+Compares the previous approach (imread the template on every call, one
+full-resolution BGR matchTemplate) with the cached coarse-to-fine engine.
+
+Usage:
+    python scripts/benchmarks/bench_template_match.py [--runs 10] [--size 5120x2880] [--screenshot shot.png] [--output bench_match.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+sys.path.insert(0, _repo_root)
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+
+def _synthetic(width: int, height: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 255, (height // 16, width // 16, 3), dtype=np.uint8)
+    return cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC)
+
+
+def _baseline(screen_bgr: np.ndarray, template_path: str) -> float:
+    template = cv2.imread(template_path, cv2.IMREAD_UNCHANGED)
+    result = cv2.matchTemplate(screen_bgr, template, cv2.TM_CCOEFF_NORMED)
+    return float(cv2.minMaxLoc(result)[1])
+
+
+def _time(fn, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {
+        "median_ms": round(statistics.median(samples) * 1000.0, 2),
+        "min_ms": round(min(samples) * 1000.0, 2),
+        "max_ms": round(max(samples) * 1000.0, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Template matching benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--size", default="5120x2880", help="Synthetic screenshot size WxH")
+    parser.add_argument("--screenshot", help="Use a saved screenshot instead of a synthetic one")
+    parser.add_argument("--output", help="Append results as a JSON line to this file")
+    args = parser.parse_args()
+
+    from system_ai.tools.frame import Frame
+    from system_ai.tools.template_match import TemplateMatcher
+
+    if args.screenshot:
+        screen = cv2.imread(args.screenshot, cv2.IMREAD_COLOR)
+    else:
+        w, h = (int(v) for v in args.size.lower().split("x"))
+        screen = _synthetic(w, h)
+    sh, sw = screen.shape[:2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tpl_path = os.path.join(tmp, "template.png")
+        y, x = sh * 2 // 3, sw * 3 // 5
+        cv2.imwrite(tpl_path, screen[y:y + 96, x:x + 160])
+
+        matcher = TemplateMatcher()
+        frame = Frame.from_array(screen)
+        matcher.match(frame, tpl_path)  # warm the template cache
+
+        results = {
+            "baseline_full_res": _time(lambda: _baseline(screen, tpl_path), args.runs),
+            # Fresh frame per call: includes the screen pyramid build
+            "engine_new_frame": _time(lambda: TemplateMatcher(matcher.cache).match(Frame.from_array(screen), tpl_path), args.runs),
+            "engine_last_match": _time(lambda: matcher.match(Frame.from_array(screen), tpl_path), args.runs),
+        }
+
+    for name, r in results.items():
+        print(f"{name:<20} median {r['median_ms']:>8.2f} ms  (min {r['min_ms']:.2f}, max {r['max_ms']:.2f})")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": time.time(), "size": f"{sw}x{sh}", "results": results}, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
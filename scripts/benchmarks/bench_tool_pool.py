@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark UI responsiveness while a CPU-bound tool runs.
+
+A ticker thread stands in for the TUI event loop: it wakes every 10 ms and
+records how late each wake-up is. Meanwhile the example data-processor
+plugin tool (example_process_json, declared cpu_bound) parses a large JSON
+document, either inline on a worker thread of this process (previous
+behaviour) or through the tool process pool. Reports tick lateness
+(p50/p99/max) and the tool's wall time for both.
+
+Usage:
+    python scripts/benchmarks/bench_tool_pool.py [--runs 3] [--items 300000] [--output bench_pool.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+sys.path.insert(0, _repo_root)
+
+TICK_S = 0.010
+
+
+def _payload(items: int) -> str:
+    return json.dumps({f"k{i}": {"id": i, "name": f"item {i}", "tags": ["a", "b", "c"], "v": i * 0.5} for i in range(items)})
+
+
+def _run_with_ticker(call) -> dict:
+    lateness, done = [], threading.Event()
+
+    def ticker():
+        next_at = time.perf_counter() + TICK_S
+        while not done.is_set():
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+            now = time.perf_counter()
+            lateness.append(max(0.0, now - next_at))
+            next_at = now + TICK_S
+
+    t = threading.Thread(target=ticker, daemon=True)
+    t.start()
+    time.sleep(0.1)
+    t0 = time.perf_counter()
+    worker = threading.Thread(target=call)
+    worker.start()
+    worker.join()
+    wall = time.perf_counter() - t0
+    done.set()
+    t.join()
+    lateness.sort()
+    return {
+        "tool_ms": wall * 1000.0,
+        "tick_p50_ms": statistics.median(lateness) * 1000.0,
+        "tick_p99_ms": lateness[int(len(lateness) * 0.99) - 1] * 1000.0,
+        "tick_max_ms": lateness[-1] * 1000.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tool process pool responsiveness benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--items", type=int, default=300000, help="Objects in the JSON document")
+    parser.add_argument("--output", help="Append results as a JSON line to this file")
+    args = parser.parse_args()
+
+    import plugins
+    from core.tool_pool import ToolProcessPool
+
+    class _Registry:
+        tools = {}
+
+        def register_tool(self, name, func, description):
+            self.tools[name] = func
+
+    registry = _Registry()
+    plugins.register_lazy_plugin("example_data_processor", registry)
+    tool = registry.tools["example_process_json"]
+    data = _payload(args.items)
+    pool = ToolProcessPool(workers=1)
+    pool.warm_up()
+    pool.call(tool, {"data": "{}"})
+
+    strategies = {
+        "inline_thread": lambda: tool(data=data),
+        "process_pool": lambda: pool.call(tool, {"data": data}),
+    }
+    results = {}
+    for name, call in strategies.items():
+        runs = [_run_with_ticker(call) for _ in range(args.runs)]
+        results[name] = {k: round(statistics.median(r[k] for r in runs), 2) for k in runs[0]}
+    pool.shutdown()
+
+    print(f"payload: {len(data) / 1048576:.1f} MB JSON")
+    for name, r in results.items():
+        print(
+            f"{name:14s} tool median={r['tool_ms']:8.1f}ms  tick lateness p50={r['tick_p50_ms']:6.2f}ms "
+            f"p99={r['tick_p99_ms']:7.2f}ms max={r['tick_max_ms']:7.2f}ms"
+        )
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"ts": time.time(), "items": args.items, "results": results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark the capture -> analyze -> LLM payload path for screenshots.
+
+Compares the file-based pipeline (save JPEG, re-read for diff, re-open and
+re-encode through a temporary PNG for the payload) with in-memory frames.
+Uses synthetic captures unless --live is given (needs a display for mss).
+
+Usage:
+    python scripts/benchmarks/bench_vision_pipeline.py [--runs 10] [--size 2560x1600] [--live] [--output bench_vision.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+sys.path.insert(0, _repo_root)
+
+import numpy as np  # noqa: E402
+
+
+class _SyntheticShot:
+    """mss-like ScreenShot with a changing rectangle on a UI-like background."""
+
+    def __init__(self, width: int, height: int, i: int):
+        arr = np.full((height, width, 4), 235, dtype=np.uint8)
+        arr[::24, :, :3] = 180
+        x = (i * 97) % max(1, width - 200)
+        arr[200:320, x:x + 200, :3] = (40, 90, 200)
+        self.width, self.height = width, height
+        self.raw = bytearray(arr.tobytes())
+
+
+def _shots(args):
+    if args.live:
+        import mss
+
+        sct = mss.mss()
+        monitor = sct.monitors[1]
+        return lambda i: sct.grab(monitor)
+    w, h = (int(v) for v in args.size.lower().split("x"))
+    return lambda i: _SyntheticShot(w, h, i)
+
+
+def _disk_pipeline(shot, out_dir: str, i: int, analyzer) -> int:
+    import cv2
+    from PIL import Image
+
+    from system_ai.tools.vision import load_image_b64
+
+    img = Image.frombytes("RGB", (shot.width, shot.height), bytes(shot.raw), "raw", "BGRX")
+    path = os.path.join(out_dir, f"disk_{i}.jpg")
+    img.save(path, "JPEG", quality=85)
+    curr = cv2.imread(path)
+    if analyzer.previous_frame is not None:
+        analyzer._calculate_frame_diff(analyzer.previous_frame, curr)
+    analyzer.previous_frame = curr
+    img = Image.open(path)
+    img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+    tmp = os.path.join(out_dir, f"payload_{i}.png")
+    img.save(tmp, format="PNG")
+    b64 = load_image_b64(tmp)
+    os.unlink(tmp)
+    return len(b64 or "")
+
+
+def _memory_pipeline(shot, out_dir: str, i: int, analyzer, background: bool) -> int:
+    from system_ai.tools.frame import Frame
+
+    frame = Frame.from_mss(shot)
+    frame.persist(os.path.join(out_dir, f"mem_{i}.jpg"), "JPEG", background=background)
+    curr = frame.bgr
+    if analyzer.previous_frame is not None:
+        analyzer._calculate_frame_diff(analyzer.previous_frame, curr)
+    analyzer.previous_frame = curr
+    return len(frame.png_b64())
+
+
+def _bench(name: str, fn, grab, runs: int) -> dict:
+    from system_ai.tools.vision import DifferentialVisionAnalyzer
+
+    analyzer = DifferentialVisionAnalyzer()
+    samples = []
+    payload = 0
+    with tempfile.TemporaryDirectory() as out_dir:
+        for i in range(runs):
+            shot = grab(i)
+            t0 = time.perf_counter()
+            payload = fn(shot, out_dir, i, analyzer)
+            samples.append(time.perf_counter() - t0)
+    return {
+        "name": name,
+        "runs": runs,
+        "median_ms": round(statistics.median(samples) * 1000.0, 1),
+        "min_ms": round(min(samples) * 1000.0, 1),
+        "max_ms": round(max(samples) * 1000.0, 1),
+        "payload_b64_chars": payload,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Screenshot capture -> analyze -> payload benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--size", default="2560x1600", help="Synthetic capture size WxH")
+    parser.add_argument("--live", action="store_true", help="Capture the primary monitor with mss")
+    parser.add_argument("--output", help="Append results as a JSON line to this file")
+    args = parser.parse_args()
+
+    grab = _shots(args)
+    results = [
+        _bench("disk_roundtrip", _disk_pipeline, grab, args.runs),
+        _bench("in_memory_sync_persist", lambda s, d, i, a: _memory_pipeline(s, d, i, a, False), grab, args.runs),
+        _bench("in_memory_async_persist", lambda s, d, i, a: _memory_pipeline(s, d, i, a, True), grab, args.runs),
+    ]
+    for r in results:
+        print(f"{r['name']:<26} median {r['median_ms']:>8.1f} ms  (min {r['min_ms']:.1f}, max {r['max_ms']:.1f}, n={r['runs']})")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": time.time(), "live": args.live, "size": args.size, "results": results}, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
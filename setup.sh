@@ -80,6 +80,8 @@ echo -e "${BLUE}--- Validating Setup ---${NC}"
 source .venv/bin/activate
 # Check imports
 python3 -c "import pydantic; import yaml; print('✓ Pydantic & PyYAML available')"
+# Cache the tokenizer's BPE ranks now so token counts stay exact offline
+python3 -c "from core.tokenizer import TiktokenTokenizer; TiktokenTokenizer(); print('✓ tiktoken encoding cached')" || echo "⚠ tiktoken encoding not cached; token counts will be estimated"
 
 echo -e "${BLUE}=== Setup Complete ===${NC}"
 echo -e "Run: ${GREEN}./cli.sh${NC} to start Atlas."
\ No newline at end of file
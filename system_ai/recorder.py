@@ -260,6 +260,7 @@ class RecorderService:
 
         app = str(ev.get("front_app") or "").strip() or None
 
+        from system_ai.tools.frame import ensure_file
         from system_ai.tools.screenshot import take_screenshot
 
         out = take_screenshot(app)
@@ -283,7 +284,8 @@ class RecorderService:
             return ""
 
         src_path = str(out.get("path") or "")
-        if not src_path or not os.path.exists(src_path):
+        # The screenshot may still be queued on the frame writer
+        if not src_path or not ensure_file(src_path):
             return ""
 
         screens_dir = os.path.join(self.status.session_dir, "screens")
@@ -593,27 +595,32 @@ class RecorderService:
                 front_app, front_title = self._get_frontmost_app_and_title()
                 if not front_app:
                     continue
-                from system_ai.tools.screenshot import take_screenshot
-                out = take_screenshot(front_app)
-                if isinstance(out, dict) and out.get("status") == "success":
-                    src_path = str(out.get("path") or "")
-                    if src_path and os.path.exists(src_path):
-                        screens_dir = os.path.join(self.status.session_dir, "screens")
-                        os.makedirs(screens_dir, exist_ok=True)
-                        ext = os.path.splitext(src_path)[1] or ".jpg"
-                        dst_name = f"periodic_{int(time.time() * 1000)}{ext}"
-                        dst_path = os.path.join(screens_dir, dst_name)
-                        try:
-                            shutil.copy2(src_path, dst_path)
-                            self._enqueue({
-                                "type": "screenshot_periodic",
-                                "ts": time.time(),
-                                "path": dst_path,
-                                "front_app": front_app,
-                                "front_title": front_title,
-                            })
-                        except Exception:
-                            pass
+                screens_dir = os.path.join(self.status.session_dir, "screens")
+                os.makedirs(screens_dir, exist_ok=True)
+                dst_path = os.path.join(screens_dir, f"periodic_{int(time.time() * 1000)}.jpg")
+
+                # Capture on this thread's persistent mss session and write the
+                # frame straight into the session (no intermediate file + copy)
+                from system_ai.tools.screenshot import capture_frame
+                frame, _err = capture_frame(front_app)
+                if frame is not None:
+                    frame.save(dst_path, "JPEG")
+                else:
+                    from system_ai.tools.frame import ensure_file
+                    from system_ai.tools.screenshot import take_screenshot
+                    out = take_screenshot(front_app)
+                    src_path = str(out.get("path") or "") if isinstance(out, dict) and out.get("status") == "success" else ""
+                    if not src_path or not ensure_file(src_path):
+                        continue
+                    dst_path = os.path.splitext(dst_path)[0] + (os.path.splitext(src_path)[1] or ".jpg")
+                    shutil.copy2(src_path, dst_path)
+                self._enqueue({
+                    "type": "screenshot_periodic",
+                    "ts": time.time(),
+                    "path": dst_path,
+                    "front_app": front_app,
+                    "front_title": front_title,
+                })
             except Exception:
                 pass
 
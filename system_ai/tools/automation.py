@@ -7,7 +7,7 @@ Uses `MacOSNativeAutomation` as the primary driver for AppleScript/Input recordi
 import os
 import time
 import subprocess
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 
 from system_ai.tools.macos_native_automation import create_automation_executor, MacOSNativeAutomation
 
@@ -32,7 +32,22 @@ _DEFAULT_FORBIDDEN_TOKENS = [
     ":(){ :|:& };:",
 ]
 
-def run_shell(command: str, *, allow: bool, cwd: Optional[str] = None) -> Dict[str, Any]:
+def run_shell(
+    command: str,
+    *,
+    allow: bool,
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = None,
+    idle_timeout: Optional[float] = None,
+    on_chunk: Optional[Callable[[str, str], None]] = None,
+) -> Dict[str, Any]:
+    """Run a shell command with streamed, bounded output capture.
+
+    stdout/stderr keep the first and last few KB (see shell_stream). The
+    command's process group is killed after `timeout` seconds, or after
+    `idle_timeout` seconds without output (env defaults; 0 disables).
+    on_chunk(stream, text) receives output as it arrives.
+    """
     if not allow:
         return {"tool": "run_shell", "status": "error", "error": "Confirmation required"}
 
@@ -42,44 +57,34 @@ def run_shell(command: str, *, allow: bool, cwd: Optional[str] = None) -> Dict[s
             return {"tool": "run_shell", "status": "error", "error": "Command blocked by safety filter", "command": command}
 
     try:
-        proc = subprocess.run(
-            command,
-            shell=True,
-            cwd=cwd or os.getcwd(),
-            capture_output=True,
-            text=True,
-        )
-        
-        if proc.returncode != 0:
-            # We can reuse the detection logic or inline it. For now let's keep it simple or recreate it if executor is gone.
-            # Inline detection for robustness since we are deleting executor.py
-            perm_issue = None
-            err_lower = (proc.stderr or "").lower()
-            if "operation not permitted" in err_lower:
-                perm_issue = {"error_type": "permission_required", "permission": "full_disk_access"}
-            elif "permission denied" in err_lower:
-                perm_issue = {"error_type": "permission_required", "permission": "files_and_folders"}
-            
-            res = {
-                "tool": "run_shell",
-                "status": "error",
-                "command": command,
-                "returncode": proc.returncode,
-                "stdout": (proc.stdout or "")[-8000:],
-                "stderr": (proc.stderr or "")[-8000:],
-            }
-            if perm_issue:
-                res.update(perm_issue)
-            return res
-            
-        return {
+        from system_ai.tools.shell_stream import run_streaming
+
+        proc = run_streaming(command, cwd=cwd, timeout=timeout, idle_timeout=idle_timeout, on_chunk=on_chunk)
+        if proc.returncode is None and proc.timed_out is None:
+            return {"tool": "run_shell", "status": "error", "command": command, "error": proc.error or "Failed to start"}
+
+        stdout, stderr = proc.stdout.text(), proc.stderr.text()
+        res = {
             "tool": "run_shell",
             "status": "success",
             "command": command,
             "returncode": proc.returncode,
-            "stdout": (proc.stdout or "")[-8000:],
-            "stderr": (proc.stderr or "")[-8000:],
+            "stdout": stdout,
+            "stderr": stderr,
+            **proc.stats(),
         }
+        if proc.timed_out:
+            res.update({"status": "error", "timed_out": proc.timed_out, "error": proc.error})
+            return res
+
+        if proc.returncode != 0:
+            res["status"] = "error"
+            err_lower = stderr.lower()
+            if "operation not permitted" in err_lower:
+                res.update({"error_type": "permission_required", "permission": "full_disk_access"})
+            elif "permission denied" in err_lower:
+                res.update({"error_type": "permission_required", "permission": "files_and_folders"})
+        return res
     except Exception as e:
         return {"tool": "run_shell", "status": "error", "command": command, "error": str(e)}
 
@@ -1,9 +1,62 @@
 import os
 import time
 import json
+from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any
 from playwright.sync_api import sync_playwright, Browser, Page
 
+from system_ai.tools.file_log import get_file_logger
+from system_ai.tools.page_scripts import SETTLE_JS, SNAPSHOT_JS
+
+
+BROWSER_DEBUG_LOG = "~/.system_cli/logs/browser_debug.log"
+_debug_log = None
+
+
+def _browser_log():
+    """Debug logger for browser_debug.log (queued; no file I/O on the caller)."""
+    global _debug_log
+    if _debug_log is None:
+        _debug_log = get_file_logger("system_ai.browser_debug", BROWSER_DEBUG_LOG)
+    return _debug_log
+
+
+CAPTCHA_MARKERS = [
+    "g-recaptcha", "hcaptcha", "cloudflare-turnstile",
+    "verify you are human", "solving this captcha",
+    "unusual traffic from your computer network",
+    "check if you are a robot"
+]
+# Looser hints used before extracting links (URL or page)
+CAPTCHA_HINTS = ["sorry/index", "recaptcha", "unusual traffic", "captcha"]
+# DuckDuckGo result links are in data-testid="result-title-a" or class="result__a"
+DDG_RESULT_SELECTOR = 'a[data-testid="result-title-a"], a.result__a, article a'
+SNAPSHOT_TEXT_LIMIT = 30000
+SNAPSHOT_HTML_LIMIT = 30000
+SNAPSHOT_LINK_LIMIT = 500
+
+@dataclass
+class ReadyResult:
+    ready: bool
+    elapsed_ms: float
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "elapsed_ms": round(self.elapsed_ms, 1), "stages": self.stages}
+
+
+@dataclass
+class PageSnapshot:
+    url: str
+    title: str
+    text: str
+    links: List[Dict[str, str]]
+    mutations: int
+    has_captcha: bool = False
+    captcha_hint: bool = False
+    html: Optional[str] = None
+    taken_at: float = field(default_factory=time.time)
+
 class BrowserManager:
     _instance = None
     
@@ -12,6 +65,10 @@ class BrowserManager:
         self.browser = None
         self.page: Optional[Page] = None
         self._last_headless = None
+        # Snapshot per page (keyed by id(page)); dropped on navigation or by the action tools
+        self._snapshots: Dict[int, PageSnapshot] = {}
+        self._watched: set = set()
+        self.snapshot_stats = {"hits": 0, "misses": 0}
         self.user_data_dir = os.path.expanduser("~/.antigravity/browser_session")
         os.makedirs(self.user_data_dir, exist_ok=True)
 
@@ -22,10 +79,8 @@ class BrowserManager:
         return cls._instance
 
     def get_page(self, headless: Optional[bool] = None) -> Page:
-        log_file = os.path.expanduser("~/.system_cli/logs/browser_debug.log")
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        with open(log_file, "a") as f:
-            f.write(f"{time.ctime()}: get_page called with headless={headless} (last={self._last_headless})\n")
+        log = _browser_log()
+        log.debug("get_page called with headless=%s (last=%s)", headless, self._last_headless)
 
         # If headless mode is not specified, use the last one or default to False (visible)
         if headless is None:
@@ -33,13 +88,11 @@ class BrowserManager:
 
         # If already running but in different headless mode, restart
         if self.pw and self.browser and self._last_headless is not None and self._last_headless != headless:
-            with open(log_file, "a") as f:
-                f.write(f"{time.ctime()}: Re-starting browser due to headless change\n")
+            log.debug("Re-starting browser due to headless change")
             self.close()
 
         if not self.browser:
-            with open(log_file, "a") as f:
-                f.write(f"{time.ctime()}: Launching new browser instance\n")
+            log.debug("Launching new browser instance")
             try:
                 if not self.pw:
                     self.pw = sync_playwright().start()
@@ -57,6 +110,7 @@ class BrowserManager:
                     else:
                         self.page = self.browser.contexts[0].new_page() if self.browser.contexts else self.browser.new_context().new_page()
                     self._connected_via_cdp = True
+                    self._watch_page(self.page)
                     return self.page
                 except Exception:
                     # CDP connection failed, fall back to launching new browser
@@ -81,14 +135,135 @@ class BrowserManager:
                 self.close()
                 raise
 
+        self._watch_page(self.page)
         return self.page
 
+    def _watch_page(self, page: Optional[Page]) -> None:
+        """Drop the page's cached snapshot whenever its main frame navigates."""
+        if page is None or id(page) in self._watched:
+            return
+        self._watched.add(id(page))
+        try:
+            page.on("framenavigated", lambda frame: frame.parent_frame is None and self.invalidate_snapshot(page))
+        except Exception:
+            pass
+
+    def invalidate_snapshot(self, page: Optional[Page] = None) -> None:
+        """Forget the cached snapshot of `page` (all pages when None)."""
+        if page is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(id(page), None)
+
+    def page_snapshot(self, page: Optional[Page] = None, html: bool = False) -> PageSnapshot:
+        """Title, URL, visible text, links and captcha flags in one evaluate.
+
+        A cached snapshot is reused while the page URL and its DOM mutation
+        counter are unchanged (checked with a tiny probe evaluate).
+        """
+        page = page or self.get_page()
+        cached = self._snapshots.get(id(page))
+        if cached is not None and (cached.html is not None or not html):
+            try:
+                probe = page.evaluate(SNAPSHOT_JS, {"probe": True})
+                if probe.get("url") == cached.url and int(probe.get("mutations", -1)) == cached.mutations:
+                    self.snapshot_stats["hits"] += 1
+                    return cached
+            except Exception:
+                pass
+        self.snapshot_stats["misses"] += 1
+        data = page.evaluate(SNAPSHOT_JS, {
+            "probe": False,
+            "html": bool(html),
+            "markers": CAPTCHA_MARKERS,
+            "hints": CAPTCHA_HINTS,
+            "maxText": SNAPSHOT_TEXT_LIMIT,
+            "maxHtml": SNAPSHOT_HTML_LIMIT,
+            "maxLinks": SNAPSHOT_LINK_LIMIT,
+        })
+        snap = PageSnapshot(
+            url=str(data.get("url") or ""),
+            title=str(data.get("title") or ""),
+            text=str(data.get("text") or ""),
+            links=list(data.get("links") or []),
+            mutations=int(data.get("mutations") or 0),
+            has_captcha=bool(data.get("captcha")),
+            captcha_hint=bool(data.get("captcha_hint")),
+            html=data.get("html"),
+        )
+        self._snapshots[id(page)] = snap
+        return snap
+
+
+    def wait_ready(
+        self,
+        page: Optional[Page] = None,
+        *,
+        timeout: float = 10.0,
+        url_change_from: Optional[str] = None,
+        network_idle_timeout: Optional[float] = 3.0,
+        selector: Optional[str] = None,
+        text: Optional[str] = None,
+        quiet_ms: Optional[int] = 500,
+    ) -> ReadyResult:
+        """Wait until the page is ready, all conditions sharing one `timeout` (seconds).
+
+        In order, each optional: URL differs from `url_change_from`; network
+        idle (Playwright's 500 ms without connections, capped at
+        `network_idle_timeout`); `selector` visible; `text` present in the
+        body; no DOM mutations for `quiet_ms`. A stage that times out is
+        recorded and the next one runs with what is left of the budget; once
+        the budget is spent the remaining stages are recorded as timed out
+        without calling Playwright (its timeout=0 means "wait forever").
+        """
+        page = page or self.get_page()
+        started = time.perf_counter()
+        deadline = started + max(0.0, timeout)
+        stages: Dict[str, Dict[str, Any]] = {}
+
+        def remaining_ms(cap: Optional[float] = None) -> float:
+            left = max(0.0, deadline - time.perf_counter())
+            if cap is not None:
+                left = min(left, cap)
+            return max(1.0, left * 1000.0)
+
+        def stage(name: str, fn) -> None:
+            t0 = time.perf_counter()
+            if t0 >= deadline:
+                stages[name] = {"ok": False, "ms": 0.0, "error": "timeout budget exhausted"}
+                return
+            try:
+                info = fn() or {}
+                ok = bool(info.pop("ok", True))
+            except Exception as e:
+                ok, info = False, {"error": str(e).splitlines()[0][:200]}
+            stages[name] = {"ok": ok, "ms": round((time.perf_counter() - t0) * 1000.0, 1), **info}
+
+        if url_change_from is not None:
+            stage("url_change", lambda: page.wait_for_url(lambda u: u != url_change_from, timeout=remaining_ms()))
+        if network_idle_timeout:
+            stage("network_idle", lambda: page.wait_for_load_state("networkidle", timeout=remaining_ms(network_idle_timeout)))
+        if selector:
+            stage("selector", lambda: page.wait_for_selector(selector, state="visible", timeout=remaining_ms()) and None)
+        if text:
+            stage("text", lambda: page.wait_for_function(
+                "t => !!document.body && document.body.innerText.includes(t)", arg=text, timeout=remaining_ms()
+            ) and None)
+        if quiet_ms:
+            def settle() -> Dict[str, Any]:
+                res = page.evaluate(SETTLE_JS, {"quietMs": int(quiet_ms), "timeoutMs": remaining_ms()}) or {}
+                return {"ok": bool(res.get("settled")), "mutations": int(res.get("mutations") or 0)}
+
+            stage("dom_settle", settle)
+
+        return ReadyResult(
+            ready=all(st["ok"] for st in stages.values()),
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+            stages=stages,
+        )
 
     def close(self):
-        log_file = os.path.expanduser("~/.system_cli/logs/browser_debug.log")
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        with open(log_file, "a") as f:
-            f.write(f"{time.ctime()}: close() called\n")
+        _browser_log().debug("close() called")
         if self.browser:
             try:
                 self.browser.close()
@@ -102,24 +277,21 @@ class BrowserManager:
         self.pw = None
         self.browser = None
         self.page = None
+        self._snapshots.clear()
+        self._watched.clear()
 
 def browser_open_url(url: str, headless: bool = False) -> str:
     try:
         manager = BrowserManager.get_instance()
         page = manager.get_page(headless=headless)
+        manager.invalidate_snapshot(page)
         page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        time.sleep(2) # Give page some time to settle
+        # Give the page time to settle (network idle, then a quiet DOM), at
+        # most the 2 s the fixed settle wait used to take
+        ready = manager.wait_ready(page, timeout=2.0, network_idle_timeout=1.5, quiet_ms=500)
         
-        content = page.content().lower()
-        captcha_markers = [
-            "g-recaptcha", "hcaptcha", "cloudflare-turnstile",
-            "verify you are human", "solving this captcha",
-            "unusual traffic from your computer network",
-            "check if you are a robot"
-        ]
-        has_captcha = any(marker in content for marker in captcha_markers)
-        if not has_captcha and ("sorry" in content and "unusual traffic" in content):
-            has_captcha = True
+        snap = manager.page_snapshot(page)
+        has_captcha = snap.has_captcha
         
         if has_captcha:
             return json.dumps({
@@ -130,9 +302,10 @@ def browser_open_url(url: str, headless: bool = False) -> str:
             }, ensure_ascii=False)
         return json.dumps({
             "status": "success",
-            "url": page.url,
-            "title": page.title(),
-            "has_captcha": False
+            "url": snap.url,
+            "title": snap.title,
+            "has_captcha": False,
+            "ready": ready.ready
         }, ensure_ascii=False)
     except Exception as e:
         return json.dumps({"status": "error", "error": str(e)})
@@ -141,12 +314,9 @@ def browser_click_element(selector: str) -> str:
     try:
         manager = BrowserManager.get_instance()
         page = manager.get_page()
+        manager.invalidate_snapshot(page)
         page.click(selector, timeout=5000)
-        try:
-             page.wait_for_load_state("domcontentloaded", timeout=5000)
-             time.sleep(1.0)
-        except Exception:
-             time.sleep(1.0)
+        manager.wait_ready(page, timeout=5.0, network_idle_timeout=2.0, quiet_ms=300)
         return json.dumps({"status": "success"})
     except Exception as e:
         return json.dumps({"status": "error", "error": str(e)})
@@ -158,14 +328,13 @@ def browser_type_text(selector: str, text: str, press_enter: bool = False) -> st
             
         manager = BrowserManager.get_instance()
         page = manager.get_page()
+        manager.invalidate_snapshot(page)
         page.fill(selector, text, timeout=10000)
         if press_enter:
+            url = page.url
             page.press(selector, "Enter")
-            try:
-                page.wait_for_load_state("domcontentloaded", timeout=5000)
-                time.sleep(2.0)
-            except Exception:
-                time.sleep(3.0)
+            # Submitting a form navigates: wait for the new URL, then the page
+            manager.wait_ready(page, timeout=6.0, url_change_from=url, network_idle_timeout=3.0, quiet_ms=500)
         return json.dumps({"status": "success"})
     except Exception as e:
         return json.dumps({"status": "error", "error": str(e)})
@@ -174,6 +343,7 @@ def browser_press_key(key: str) -> str:
     try:
         manager = BrowserManager.get_instance()
         page = manager.get_page()
+        manager.invalidate_snapshot(page)
         page.keyboard.press(key)
         return json.dumps({"status": "success"})
     except Exception as e:
@@ -183,6 +353,7 @@ def browser_execute_script(script: str) -> str:
     try:
         manager = BrowserManager.get_instance()
         page = manager.get_page()
+        manager.invalidate_snapshot(page)
         result = page.evaluate(script)
         return json.dumps({"status": "success", "result": str(result)})
     except Exception as e:
@@ -217,13 +388,12 @@ def browser_screenshot(path: Optional[str] = None) -> str:
 def browser_get_content() -> str:
     try:
         manager = BrowserManager.get_instance()
-        page = manager.get_page()
-        text_content = page.inner_text("body")
+        snap = manager.page_snapshot()
         return json.dumps({
             "status": "success",
-            "content": text_content[:15000],
-            "url": page.url,
-            "title": page.title()
+            "content": snap.text[:15000],
+            "url": snap.url,
+            "title": snap.title
         }, ensure_ascii=False)
     except Exception as e:
         return json.dumps({"status": "error", "error": str(e)})
@@ -231,25 +401,13 @@ def browser_get_content() -> str:
 def browser_snapshot() -> str:
     try:
         manager = BrowserManager.get_instance()
-        page = manager.get_page()
-        content = page.content()
-        content_lower = content.lower()
-        captcha_markers = [
-            "g-recaptcha", "hcaptcha", "cloudflare-turnstile",
-            "verify you are human", "solving this captcha",
-            "unusual traffic from your computer network",
-            "check if you are a robot"
-        ]
-        has_captcha = any(marker in content_lower for marker in captcha_markers)
-        if not has_captcha and ("sorry" in content_lower and "unusual traffic" in content_lower):
-            has_captcha = True
-        
+        snap = manager.page_snapshot(html=True)
         return json.dumps({
             "status": "success",
-            "url": page.url,
-            "title": page.title(),
-            "has_captcha": has_captcha,
-            "content_preview": content[:30000]
+            "url": snap.url,
+            "title": snap.title,
+            "has_captcha": snap.has_captcha,
+            "content_preview": snap.html or ""
         }, ensure_ascii=False)
     except Exception as e:
         return json.dumps({"status": "error", "error": str(e)})
@@ -262,31 +420,15 @@ def browser_get_links() -> str:
         manager = BrowserManager.get_instance()
         page = manager.get_page()
         
+        snap = manager.page_snapshot(page)
         # Check if currently on a captcha/sorry page
-        current_url = page.url.lower()
-        content = page.content().lower()
-        captcha_indicators = ["sorry/index", "recaptcha", "unusual traffic", "captcha"]
-        if any(ind in current_url or ind in content for ind in captcha_indicators):
+        if snap.captcha_hint:
             return json.dumps({
                 "status": "captcha",
                 "error": "Currently on CAPTCHA page - cannot get links. Use DuckDuckGo instead.",
                 "links": []
             }, ensure_ascii=False)
-        
-        links = page.evaluate("""
-            () => {
-                const results = [];
-                const anchors = document.querySelectorAll('a[href]');
-                anchors.forEach(a => {
-                    const text = a.innerText.trim();
-                    const href = a.href;
-                    if (text && href && !href.startsWith('javascript:')) {
-                        results.push({text, href});
-                    }
-                });
-                return results;
-            }
-        """)
+        links = snap.links
         
         # Warn if no links found (possible blocked page)
         if not links:
@@ -327,15 +469,16 @@ def browser_search_duckduckgo(query: str, headless: bool = False) -> str:
         encoded_query = urllib.parse.quote_plus(query)
         url = f"https://duckduckgo.com/?q={encoded_query}"
         
+        manager.invalidate_snapshot(page)
         page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        time.sleep(2)  # Wait for results to load
+        # Wait for results to load
+        manager.wait_ready(page, timeout=8.0, network_idle_timeout=None, selector=DDG_RESULT_SELECTOR, quiet_ms=300)
         
         # Extract search result links
         links = page.evaluate("""
-            () => {
+            (selector) => {
                 const results = [];
-                // DuckDuckGo result links are in data-testid="result" or class="result__a"
-                const anchors = document.querySelectorAll('a[data-testid="result-title-a"], a.result__a, article a');
+                const anchors = document.querySelectorAll(selector);
                 anchors.forEach(a => {
                     const text = a.innerText.trim();
                     const href = a.href;
@@ -345,7 +488,7 @@ def browser_search_duckduckgo(query: str, headless: bool = False) -> str:
                 });
                 return results;
             }
-        """)
+        """, DDG_RESULT_SELECTOR)
         
         return json.dumps({
             "status": "success",
@@ -0,0 +1,360 @@
+"""Persistent screen capture sessions.
+
+Opening an `mss.mss()` context and rediscovering monitors on every
+screenshot dominates the cost of small and repeated captures. A
+CaptureService keeps one mss instance per thread (mss handles are not
+shareable across threads on every platform) and caches monitor geometry.
+
+Features:
+- get_capture_service(): long-lived per-thread service; sessions of threads
+  that have exited are closed on the next call, release_capture_service()
+  closes the calling thread's one, close_capture_services() all of them
+  (also at interpreter exit)
+- Cached monitor geometry, invalidated on display reconfiguration
+  (Quartz display signature on macOS, periodic re-check elsewhere) and
+  after capture errors
+- burst(): high-rate capture of N frames on a fixed schedule
+- ContinuousCapture: background capture into a ring of reused buffers,
+  consumers read the latest frame or iterate over new ones (copies by
+  default, ring views with copy=False)
+
+Environment:
+    CAPTURE_MONITOR_TTL: seconds before monitor geometry is re-checked on
+        platforms without a display-change signal (default 10)
+"""
+
+import atexit
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from system_ai.tools.frame import Frame
+
+
+Region = Dict[str, int]
+
+
+def _monitor_ttl() -> float:
+    try:
+        return max(0.5, float(os.getenv("CAPTURE_MONITOR_TTL") or 10))
+    except ValueError:
+        return 10.0
+
+
+def _display_signature() -> Optional[Tuple[Any, ...]]:
+    """Cheap description of the current display layout (None if unavailable)."""
+    try:
+        from Quartz import CGDisplayBounds, CGGetActiveDisplayList  # type: ignore
+    except Exception:
+        return None
+    try:
+        _, displays, count = CGGetActiveDisplayList(16, None, None)
+        sig = []
+        for d in displays[:count]:
+            b = CGDisplayBounds(d)
+            sig.append((int(d), b.origin.x, b.origin.y, b.size.width, b.size.height))
+        return tuple(sig)
+    except Exception:
+        return None
+
+
+def _default_factory():
+    import mss
+
+    return mss.mss()
+
+
+class CaptureService:
+    """One mss session with cached monitor geometry. Not thread-safe: use one per thread."""
+
+    SIGNATURE_CHECK_INTERVAL = 1.0
+
+    def __init__(self, factory: Optional[Callable[[], Any]] = None, signature: Optional[Callable[[], Any]] = None):
+        self._factory = factory or _default_factory
+        self._signature_fn = signature or _display_signature
+        self._sct = None
+        self._monitors: Optional[List[Region]] = None
+        self._monitors_at = 0.0
+        self._previous_monitors: Optional[List[Region]] = None
+        self._signature: Any = None
+        self._signature_checked = 0.0
+        self.geometry_version = 0
+        self.grabs = 0
+        self.reopens = 0
+        self.errors = 0
+
+    # ---- session / geometry ----
+
+    def _session(self):
+        if self._sct is None:
+            self._sct = self._factory()
+            self.reopens += 1
+        return self._sct
+
+    def close(self) -> None:
+        sct, self._sct = self._sct, None
+        self._monitors = None
+        if sct is not None:
+            try:
+                sct.close()
+            except Exception:
+                pass
+
+    def invalidate(self) -> None:
+        """Forget monitor geometry; the next capture reopens the session."""
+        self.close()
+
+    def _geometry_stale(self) -> bool:
+        now = time.monotonic()
+        if now - self._signature_checked >= self.SIGNATURE_CHECK_INTERVAL:
+            self._signature_checked = now
+            sig = self._signature_fn()
+            if sig is not None:
+                changed = self._signature is not None and sig != self._signature
+                self._signature = sig
+                return changed
+        if self._signature is None:
+            return now - self._monitors_at > _monitor_ttl()
+        return False
+
+    @property
+    def monitors(self) -> List[Region]:
+        """mss monitor list: [all monitors combined, monitor 1, monitor 2, ...]."""
+        if self._monitors is not None and self._geometry_stale():
+            self.invalidate()
+        if self._monitors is None:
+            monitors = [dict(m) for m in self._session().monitors]
+            if self._previous_monitors is not None and monitors != self._previous_monitors:
+                self.geometry_version += 1
+            self._previous_monitors = monitors
+            self._monitors = monitors
+            self._monitors_at = time.monotonic()
+            self._signature = self._signature_fn()
+            self._signature_checked = self._monitors_at
+        return self._monitors
+
+    @property
+    def monitor_count(self) -> int:
+        return max(1, len(self.monitors) - 1)
+
+    def monitor(self, index: int = 0) -> Region:
+        monitors = self.monitors
+        if index < 0 or index >= len(monitors):
+            index = 1 if len(monitors) > 1 else 0
+        return monitors[index]
+
+    # ---- capture ----
+
+    def grab_raw(self, region: Optional[Region] = None, monitor: int = 0) -> Any:
+        """mss ScreenShot of `region` (or of monitor `monitor`); retries once after reopening."""
+        target = region or self.monitor(monitor)
+        try:
+            shot = self._session().grab(target)
+        except Exception:
+            # Display layout may have changed under us: reopen and retry once
+            self.errors += 1
+            self.invalidate()
+            target = region or self.monitor(monitor)
+            shot = self._session().grab(target)
+        self.grabs += 1
+        return shot
+
+    def grab(self, region: Optional[Region] = None, monitor: int = 0) -> Frame:
+        return Frame.from_mss(self.grab_raw(region, monitor))
+
+    def burst(self, count: int, interval: float = 0.0, region: Optional[Region] = None, monitor: int = 0) -> List[Frame]:
+        """Capture `count` frames, one every `interval` seconds (fixed schedule, no drift)."""
+        frames: List[Frame] = []
+        start = time.perf_counter()
+        for i in range(max(0, int(count))):
+            if interval > 0:
+                delay = start + i * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            frames.append(self.grab(region, monitor))
+        return frames
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "grabs": self.grabs,
+            "reopens": self.reopens,
+            "errors": self.errors,
+            "geometry_version": self.geometry_version,
+            "monitors": len(self._monitors or []),
+        }
+
+
+_local = threading.local()
+# Every thread's service, so sessions can be closed once their thread is gone
+_services: Dict[threading.Thread, CaptureService] = {}
+_services_lock = threading.Lock()
+
+
+def _reap_exited_threads() -> None:
+    with _services_lock:
+        dead = [t for t in _services if not t.is_alive()]
+        services = [_services.pop(t) for t in dead]
+    for svc in services:
+        svc.close()
+
+
+def get_capture_service() -> CaptureService:
+    """The calling thread's capture service."""
+    svc = getattr(_local, "service", None)
+    if svc is None:
+        _reap_exited_threads()
+        svc = CaptureService()
+        _local.service = svc
+        with _services_lock:
+            _services[threading.current_thread()] = svc
+    return svc
+
+
+def release_capture_service() -> None:
+    """Close the calling thread's capture session (call before a capture thread exits)."""
+    svc = getattr(_local, "service", None)
+    _local.service = None
+    with _services_lock:
+        _services.pop(threading.current_thread(), None)
+    if svc is not None:
+        svc.close()
+
+
+@atexit.register
+def close_capture_services() -> None:
+    """Close every thread's capture session (pipeline shutdown / interpreter exit).
+
+    A service closed this way reopens its session on the next grab.
+    """
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+    for svc in services:
+        svc.close()
+
+
+class ContinuousCapture:
+    """Background capture at a target rate into a ring of reused buffers.
+
+    Frames handed out are copies by default. `copy=False` returns views of
+    ring slots instead (no per-frame copy), which the capture thread
+    overwrites once the ring wraps around (`ring_size` captures later).
+    """
+
+    def __init__(
+        self,
+        fps: float = 10.0,
+        region: Optional[Region] = None,
+        monitor: int = 0,
+        ring_size: int = 8,
+        service_factory: Optional[Callable[[], CaptureService]] = None,
+    ):
+        self.interval = 1.0 / max(0.1, float(fps))
+        self.region = region
+        self.monitor = monitor
+        self.ring_size = max(2, int(ring_size))
+        self._service_factory = service_factory or get_capture_service
+        self._ring: List[Optional[np.ndarray]] = [None] * self.ring_size
+        self._stamps: List[float] = [0.0] * self.ring_size
+        self._seq = 0  # number of frames captured so far
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[str] = None
+        self.dropped = 0
+
+    def start(self) -> "ContinuousCapture":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="continuous-capture", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self) -> "ContinuousCapture":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        svc = self._service_factory()
+        try:
+            self._capture_loop(svc)
+        finally:
+            # The session belongs to this thread, which is about to exit
+            if self._service_factory is get_capture_service:
+                release_capture_service()
+            else:
+                svc.close()
+
+    def _capture_loop(self, svc: CaptureService) -> None:
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                shot = svc.grab_raw(self.region, self.monitor)
+                src = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+            except Exception as e:
+                self.error = str(e)
+                break
+            slot = self._seq % self.ring_size
+            with self._cond:
+                buf = self._ring[slot]
+                if buf is None or buf.shape != src.shape:
+                    buf = np.empty_like(src)
+                    self._ring[slot] = buf
+                np.copyto(buf, src)
+                self._stamps[slot] = time.time()
+                self._seq += 1
+                self._cond.notify_all()
+            next_at += self.interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_at = time.perf_counter()  # running behind: do not try to catch up
+        with self._cond:
+            self._cond.notify_all()
+
+    @property
+    def captured(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def _frame(self, seq: int, copy: bool) -> Frame:
+        slot = seq % self.ring_size
+        px = self._ring[slot]
+        return Frame(px.copy() if copy else px, "BGRA", timestamp=self._stamps[slot])
+
+    def latest(self, copy: bool = True, timeout: Optional[float] = None) -> Optional[Frame]:
+        """Most recent frame, waiting up to `timeout` for the first one."""
+        with self._cond:
+            if self._seq == 0 and timeout:
+                self._cond.wait_for(lambda: self._seq > 0 or self._stop.is_set(), timeout)
+            if self._seq == 0:
+                return None
+            return self._frame(self._seq - 1, copy)
+
+    def frames(self, timeout: Optional[float] = None, copy: bool = True) -> Iterator[Frame]:
+        """Yield new frames as they arrive; a slow consumer skips to the newest one."""
+        seen = self.captured
+        while not self._stop.is_set():
+            with self._cond:
+                if not self._cond.wait_for(lambda: self._seq > seen or self._stop.is_set(), timeout):
+                    return
+                if self._seq <= seen:
+                    return
+                if self._seq - seen > 1:
+                    self.dropped += self._seq - seen - 1
+                seen = self._seq
+                frame = self._frame(seen - 1, copy)
+            yield frame
@@ -0,0 +1,181 @@
+"""Ranged file reads over mmap with a cached line-offset index.
+
+read_file used to load the whole file into one string, even for multi-GB
+logs where the agent needs a few lines. These helpers map the file and
+slice only the requested bytes.
+
+Features:
+- read_bytes(): byte range (offset, length)
+- read_head()/read_tail(): first/last N lines, scanning only those lines
+- read_lines(): 1-based inclusive line range via LineIndex
+- LineIndex: newline offsets (int64 array, built in chunks with NumPy);
+  cached per (path, mtime, size) so repeated line-range reads are O(1),
+  and extended instead of rebuilt when a log only grew
+"""
+
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+SCAN_CHUNK = 64 * 1024 * 1024
+INDEX_CACHE_SIZE = 8
+# Bytes before the old end compared to tell an append from a rewrite
+_APPEND_PROBE = 64
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def _newlines(mm: "mmap.mmap", start: int, end: int) -> np.ndarray:
+    """Absolute offsets of b"\\n" in mm[start:end]."""
+    parts = []
+    pos = start
+    while pos < end:
+        stop = min(end, pos + SCAN_CHUNK)
+        chunk = np.frombuffer(mm, dtype=np.uint8, count=stop - pos, offset=pos)
+        parts.append(np.flatnonzero(chunk == 10).astype(np.int64) + pos)
+        del chunk  # release the buffer export before the map can be closed
+        pos = stop
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+class _Mapped:
+    """Read-only map of a file; empty files (which mmap rejects) map to b""."""
+
+    def __init__(self, path: str):
+        self._fh = open(path, "rb")
+        self.size = os.fstat(self._fh.fileno()).st_size
+        self.mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def __enter__(self) -> "_Mapped":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.mm is not None:
+            self.mm.close()
+        self._fh.close()
+
+    def slice(self, start: int, end: int) -> bytes:
+        return self.mm[start:end] if self.mm is not None else b""
+
+
+@dataclass
+class LineIndex:
+    path: str
+    mtime_ns: int
+    size: int
+    newlines: np.ndarray  # offsets of every b"\n"
+    probe: bytes = b""
+
+    @property
+    def line_count(self) -> int:
+        n = int(self.newlines.size)
+        # A last line without a trailing newline still counts
+        if self.size and (n == 0 or int(self.newlines[-1]) != self.size - 1):
+            n += 1
+        return n
+
+    def span(self, start_line: int, end_line: int) -> Tuple[int, int]:
+        """Byte span of lines start_line..end_line (1-based, inclusive, clamped)."""
+        total = self.line_count
+        start_line = max(1, start_line)
+        end_line = min(total, end_line)
+        if start_line > end_line:
+            return self.size, self.size
+        begin = 0 if start_line == 1 else int(self.newlines[start_line - 2]) + 1
+        end = int(self.newlines[end_line - 1]) + 1 if end_line <= self.newlines.size else self.size
+        return begin, end
+
+
+_indexes: "OrderedDict[str, LineIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_line_index(path: str) -> LineIndex:
+    """Line index of `path`, reused while (mtime, size) match and extended on append."""
+    st = os.stat(path)
+    with _indexes_lock:
+        cached = _indexes.get(path)
+        if cached is not None and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+            _indexes.move_to_end(path)
+            return cached
+
+    with _Mapped(path) as mf:
+        size = mf.size
+        start, base = 0, np.empty(0, dtype=np.int64)
+        if cached is not None and 0 < cached.size < size:
+            lo = max(0, cached.size - _APPEND_PROBE)
+            if mf.slice(lo, cached.size) == cached.probe:
+                start, base = cached.size, cached.newlines
+        found = _newlines(mf.mm, start, size) if mf.mm is not None else base[:0]
+        index = LineIndex(
+            path,
+            st.st_mtime_ns,
+            size,
+            np.concatenate([base, found]) if base.size else found,
+            mf.slice(max(0, size - _APPEND_PROBE), size),
+        )
+
+    with _indexes_lock:
+        _indexes[path] = index
+        _indexes.move_to_end(path)
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def read_bytes(path: str, offset: int = 0, length: Optional[int] = None) -> Tuple[bytes, int]:
+    """Bytes [offset, offset+length) (negative offset counts from the end) and the file size."""
+    with _Mapped(path) as mf:
+        start = offset if offset >= 0 else max(0, mf.size + offset)
+        start = min(start, mf.size)
+        end = mf.size if length is None else min(mf.size, start + max(0, length))
+        return mf.slice(start, end), mf.size
+
+
+def read_head(path: str, lines: int) -> Tuple[str, int]:
+    """First `lines` lines and the byte offset where they end."""
+    with _Mapped(path) as mf:
+        if mf.mm is None or lines <= 0:
+            return "", 0
+        pos = 0
+        for _ in range(lines):
+            nl = mf.mm.find(b"\n", pos)
+            if nl < 0:
+                pos = mf.size
+                break
+            pos = nl + 1
+        return _decode(mf.slice(0, pos)), pos
+
+
+def read_tail(path: str, lines: int) -> Tuple[str, int]:
+    """Last `lines` lines and the byte offset where they start."""
+    with _Mapped(path) as mf:
+        if mf.mm is None or lines <= 0:
+            return "", mf.size
+        end = mf.size
+        # A trailing newline terminates the last line rather than starting a new one
+        pos = end - 1 if mf.mm[end - 1:end] == b"\n" else end
+        for _ in range(lines):
+            nl = mf.mm.rfind(b"\n", 0, pos)
+            if nl < 0:
+                pos = -1
+                break
+            pos = nl
+        start = pos + 1
+        return _decode(mf.slice(start, end)), start
+
+
+def read_lines(path: str, start_line: int, end_line: Optional[int] = None) -> Tuple[str, LineIndex]:
+    """Lines start_line..end_line (1-based, inclusive; None = to the end)."""
+    index = get_line_index(path)
+    begin, end = index.span(start_line, index.line_count if end_line is None else end_line)
+    with _Mapped(path) as mf:
+        return _decode(mf.slice(begin, end)), index
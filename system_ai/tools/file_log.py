@@ -0,0 +1,143 @@
+"""Queue-backed file loggers for tool debug logs.
+
+Tools used to keep ad-hoc debug logs by calling os.makedirs and
+open(path, "a") for every line, on the caller's thread. get_file_logger()
+returns a standard logging.Logger with a QueueHandler; one QueueListener
+thread per file does all the filesystem work (as core/logging_config.py does
+for the main log files).
+
+Features:
+- One open handle per log file, shared by every logger writing to it
+- Size-based rotation (RotatingFileHandler naming: .1, .2, ...) with the
+  size tracked in memory rather than stat-ed per record
+- Batched writes: the listener flushes once the queue is drained
+- Callers only format and enqueue: no syscalls on the logging call
+- flush_file_logs() waits for queued records (tests, shutdown)
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUPS = 2
+# Same shape as the time.ctime() prefix the old per-line writes used
+CTIME_FORMAT = "%a %b %d %H:%M:%S %Y"
+
+class BatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that writes without flushing; the listener flushes per batch."""
+
+    def __init__(self, filename: str, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUPS):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self._size = 0
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename) or ".", exist_ok=True)
+        stream = super()._open()
+        self._size = stream.seek(0, os.SEEK_END)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            n = len(data.encode("utf-8", errors="replace"))
+            if self.maxBytes > 0 and self._size and self._size + n > self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(data)
+            self._size += n
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchingListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers once the queue is drained, not per record."""
+
+    def __init__(self, q: "queue.Queue", *handlers: logging.Handler):
+        super().__init__(q, *handlers)
+        self.batches = 0
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            self.flush_handlers()
+
+    def flush_handlers(self) -> None:
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+        self.batches += 1
+
+    def flush(self) -> None:
+        """Write everything queued so far (stop drains the queue), then resume."""
+        self.stop()
+        self.flush_handlers()
+        self.start()
+
+    def close(self) -> None:
+        self.stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+_listeners: Dict[str, _BatchingListener] = {}
+_listeners_lock = threading.Lock()
+
+
+def get_file_logger(
+    name: str,
+    path: str,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUPS,
+    fmt: str = "%(asctime)s: %(message)s",
+    datefmt: Optional[str] = CTIME_FORMAT,
+) -> logging.Logger:
+    """Logger `name` writing to `path` through the shared queue listener for that file."""
+    path = os.path.abspath(os.path.expanduser(path))
+    logger = logging.getLogger(name)
+    with _listeners_lock:
+        listener = _listeners.get(path)
+        if listener is None:
+            handler = BatchedRotatingFileHandler(path, max_bytes, backup_count)
+            handler.setFormatter(logging.Formatter(fmt, datefmt=datefmt))
+            listener = _BatchingListener(queue.Queue(), handler)
+            listener.start()
+            _listeners[path] = listener
+        for h in list(logger.handlers):
+            # Left over from a listener that was closed
+            if isinstance(h, logging.handlers.QueueHandler) and h.get_name() == path and h.queue is not listener.queue:
+                logger.removeHandler(h)
+        if not any(isinstance(h, logging.handlers.QueueHandler) and h.queue is listener.queue for h in logger.handlers):
+            # QueueHandler resolves the message (and traceback) on the caller's thread
+            enqueue = logging.handlers.QueueHandler(listener.queue)
+            enqueue.set_name(path)
+            logger.addHandler(enqueue)
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+    return logger
+
+
+def flush_file_logs() -> None:
+    """Wait until every queued record has been written and flushed."""
+    with _listeners_lock:
+        for listener in _listeners.values():
+            listener.flush()
+
+
+@atexit.register
+def close_file_logs() -> None:
+    with _listeners_lock:
+        listeners = list(_listeners.values())
+        _listeners.clear()
+    for listener in listeners:
+        listener.close()
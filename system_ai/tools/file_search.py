@@ -0,0 +1,177 @@
+"""Parallel grep-style content search.
+
+Features:
+- Walks the tree with os.scandir (DirEntry types, no extra stat per entry),
+  skipping VCS/cache directories and hidden entries
+- Files are mmap-ed and searched with a bytes regex in a thread pool;
+  files with a NUL byte near the start are treated as binary and skipped
+- Stops as soon as `max_matches` hits are collected (no further files are
+  scheduled and running scans bail out)
+- Returns offsets (file, line, column, byte offset) plus a short preview of
+  the matching line, never whole file contents
+- Literal queries are case-insensitive for non-ASCII text too (each cased
+  letter becomes an alternation of its UTF-8 forms)
+"""
+
+import fnmatch
+import mmap
+import os
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+SKIP_DIRS = frozenset({".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".mypy_cache", ".pytest_cache"})
+BINARY_PROBE = 8192
+PREVIEW_CHARS = 200
+DEFAULT_MAX_FILE_BYTES = 512 * 1024 * 1024
+
+
+@dataclass
+class SearchMatch:
+    file: str
+    line: int
+    column: int  # 1-based, in bytes
+    offset: int  # byte offset of the match in the file
+    length: int
+    preview: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self.file,
+            "line": self.line,
+            "column": self.column,
+            "offset": self.offset,
+            "length": self.length,
+            "preview": self.preview,
+        }
+
+
+def compile_query(query: str, regex: bool = False, case_sensitive: bool = False) -> "re.Pattern[bytes]":
+    flags = re.MULTILINE | (0 if case_sensitive else re.IGNORECASE)
+    if regex:
+        # re.IGNORECASE on bytes folds ASCII letters only
+        return re.compile(query.encode("utf-8"), flags)
+    parts = []
+    for ch in query:
+        lo, up = ch.lower(), ch.upper()
+        if not case_sensitive and not ch.isascii() and lo != up:
+            parts.append(b"(?:" + re.escape(lo.encode("utf-8")) + b"|" + re.escape(up.encode("utf-8")) + b")")
+        else:
+            parts.append(re.escape(ch.encode("utf-8")))
+    return re.compile(b"".join(parts), flags)
+
+
+def iter_files(root: str, include: Optional[Sequence[str]] = None, include_hidden: bool = False) -> Iterator[str]:
+    """Regular files under `root` (or `root` itself), depth-first, names filtered by glob patterns."""
+    if os.path.isfile(root):
+        yield root
+        return
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if not include_hidden and entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    if not include or any(fnmatch.fnmatch(entry.name, pat) for pat in include):
+                        yield entry.path
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+def _preview(mm: "mmap.mmap", start: int, end: int) -> str:
+    line_start = mm.rfind(b"\n", 0, start) + 1
+    line_end = mm.find(b"\n", end)
+    if line_end < 0:
+        line_end = len(mm)
+    line_end = min(line_end, line_start + PREVIEW_CHARS * 4)
+    return mm[line_start:line_end].decode("utf-8", errors="replace").rstrip("\r")[:PREVIEW_CHARS]
+
+
+def search_file(
+    path: str,
+    pattern: "re.Pattern[bytes]",
+    limit: int,
+    stop: Optional[threading.Event] = None,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> List[SearchMatch]:
+    """Up to `limit` matches of `pattern` in one file."""
+    out: List[SearchMatch] = []
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size == 0 or size > max_file_bytes:
+                return out
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b"\0", 0, BINARY_PROBE) >= 0:
+                    return out
+                line, counted = 1, 0
+                for m in pattern.finditer(mm):
+                    if stop is not None and stop.is_set():
+                        break
+                    start = m.start()
+                    # Count newlines only in the gap since the previous match
+                    line += mm[counted:start].count(b"\n")
+                    counted = start
+                    column = start - (mm.rfind(b"\n", 0, start) + 1) + 1
+                    out.append(SearchMatch(path, line, column, start, m.end() - start, _preview(mm, start, m.end())))
+                    if len(out) >= limit:
+                        break
+    except (OSError, ValueError):
+        pass
+    return out
+
+
+def search_files(
+    root: str,
+    pattern: "re.Pattern[bytes]",
+    max_matches: int = 50,
+    include: Optional[Sequence[str]] = None,
+    workers: int = 8,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> Dict[str, Any]:
+    """Search every file under `root` in parallel until `max_matches` hits."""
+    stop = threading.Event()
+    matches: List[SearchMatch] = []
+    files_searched = 0
+    files = iter_files(root, include)
+    workers = max(1, int(workers))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search_files") as pool:
+        pending = set()
+        exhausted = False
+        while True:
+            # Keep a bounded number of scans in flight so the walk stays lazy
+            while not exhausted and not stop.is_set() and len(pending) < workers * 2:
+                path = next(files, None)
+                if path is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(search_file, path, pattern, max_matches, stop, max_file_bytes))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                files_searched += 1
+                matches.extend(fut.result())
+            if len(matches) >= max_matches:
+                stop.set()
+        matches.sort(key=lambda m: (m.file, m.offset))
+    return {
+        "matches": matches[:max_matches],
+        "files_searched": files_searched,
+        "truncated": stop.is_set(),
+    }
@@ -87,26 +87,74 @@ def _normalize_special_paths(path: str) -> str:
 
     return p
 
-def read_file(path: str) -> Dict[str, Any]:
-    """Reads the content of a file."""
+def _resolve_path(path: str) -> str:
+    path = _normalize_special_paths(path)
+    path = os.path.expanduser(path)
+    if not os.path.isabs(path):
+        path = os.path.abspath(path)
+    return path
+
+
+def _env_int(name: str, default: int) -> int:
     try:
-        path = _normalize_special_paths(path)
-        path = os.path.expanduser(path)
-        if not os.path.isabs(path):
-            path = os.path.abspath(path)
-        
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def read_file(
+    path: str,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    head: Optional[int] = None,
+    tail: Optional[int] = None,
+    offset: Optional[int] = None,
+    length: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Reads the content of a file, or part of it.
+
+    start_line/end_line (1-based, inclusive), head/tail (N lines) or
+    offset/length (bytes; negative offset counts from the end) read only
+    that part via mmap. Without a range, files larger than READ_FILE_MAX_BYTES
+    (default 8 MB) return their first bytes with truncated=True.
+    """
+    try:
+        path = _resolve_path(path)
+
         if not os.path.exists(path):
             return {"tool": "read_file", "status": "error", "error": f"File not found: {path}"}
-            
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
-            
-        return {
-            "tool": "read_file", 
-            "status": "success", 
-            "path": path, 
-            "content": content
-        }
+
+        from system_ai.tools import file_index
+
+        res: Dict[str, Any] = {"tool": "read_file", "status": "success", "path": path}
+        if start_line is not None or end_line is not None:
+            content, index = file_index.read_lines(path, int(start_line or 1), None if end_line is None else int(end_line))
+            res.update(content=content, start_line=max(1, int(start_line or 1)), total_lines=index.line_count)
+        elif head is not None:
+            content, end = file_index.read_head(path, int(head))
+            res.update(content=content, byte_range=[0, end])
+        elif tail is not None:
+            content, start = file_index.read_tail(path, int(tail))
+            res.update(content=content, byte_range=[start, os.path.getsize(path)])
+        elif offset is not None or length is not None:
+            data, size = file_index.read_bytes(path, int(offset or 0), None if length is None else int(length))
+            start = int(offset or 0) if int(offset or 0) >= 0 else max(0, size + int(offset))
+            res.update(content=data.decode("utf-8", errors="replace"), byte_range=[start, start + len(data)], size=size)
+        else:
+            limit = _env_int("READ_FILE_MAX_BYTES", 8 * 1024 * 1024)
+            size = os.path.getsize(path)
+            if limit > 0 and size > limit:
+                data, _ = file_index.read_bytes(path, 0, limit)
+                res.update(
+                    content=data.decode("utf-8", errors="replace"),
+                    truncated=True,
+                    size=size,
+                    hint="File is large: pass start_line/end_line, head, tail or offset/length",
+                )
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    res["content"] = f.read()
+        return res
     except Exception as e:
         return {"tool": "read_file", "status": "error", "path": path, "error": str(e)}
 
@@ -138,32 +186,76 @@ def write_file(path: str, content: str, mode: str = "w") -> Dict[str, Any]:
 def list_files(path: str) -> Dict[str, Any]:
     """Lists files in a directory."""
     try:
-        path = _normalize_special_paths(path)
-        path = os.path.expanduser(path)
-        if not os.path.isabs(path):
-            path = os.path.abspath(path)
-            
+        path = _resolve_path(path)
+
         if not os.path.exists(path):
              return {"tool": "list_files", "status": "error", "error": f"Path not found: {path}"}
-             
-        items = os.listdir(path)
+
         details = []
-        for item in items[:50]: # Limit for safety
-            full = os.path.join(path, item)
-            is_dir = os.path.isdir(full)
-            details.append({"name": item, "is_dir": is_dir})
-            
+        total = 0
+        with os.scandir(path) as it:
+            for entry in it:
+                total += 1
+                if len(details) < 50:  # Limit for safety
+                    try:
+                        # DirEntry caches the type from readdir: no stat per item
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    details.append({"name": entry.name, "is_dir": is_dir})
+
         return {
             "tool": "list_files", 
             "status": "success", 
             "path": path, 
             "items": details,
-            "total_count": len(items)
+            "total_count": total
         }
     except Exception as e:
         return {"tool": "list_files", "status": "error", "path": path, "error": str(e)}
 
 
+def search_files(
+    query: str,
+    path: str = ".",
+    regex: bool = False,
+    case_sensitive: bool = False,
+    include: Optional[List[str]] = None,
+    max_matches: int = 50,
+) -> Dict[str, Any]:
+    """Grep-style search under a file or directory; returns match offsets, not contents."""
+    try:
+        path = _resolve_path(path)
+        if not query:
+            return {"tool": "search_files", "status": "error", "error": "Missing query"}
+        if not os.path.exists(path):
+            return {"tool": "search_files", "status": "error", "error": f"Path not found: {path}"}
+
+        from system_ai.tools import file_search
+
+        if isinstance(include, str):
+            include = [p.strip() for p in include.split(",") if p.strip()]
+        pattern = file_search.compile_query(str(query), regex=bool(regex), case_sensitive=bool(case_sensitive))
+        found = file_search.search_files(
+            path,
+            pattern,
+            max_matches=max(1, int(max_matches)),
+            include=include,
+            workers=_env_int("SEARCH_FILES_WORKERS", min(8, (os.cpu_count() or 4))),
+        )
+        return {
+            "tool": "search_files",
+            "status": "success",
+            "path": path,
+            "query": query,
+            "matches": [m.to_dict() for m in found["matches"]],
+            "files_searched": found["files_searched"],
+            "truncated": found["truncated"],
+        }
+    except Exception as e:
+        return {"tool": "search_files", "status": "error", "path": str(path or ""), "error": str(e)}
+
+
 def copy_file(src: str, dst: str, overwrite: bool = True) -> Dict[str, Any]:
     """Copy a file from src to dst (binary-safe)."""
     try:
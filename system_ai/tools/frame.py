@@ -0,0 +1,388 @@
+"""In-memory screen frames.
+
+A captured frame is kept in memory and handed between the screenshot,
+diff, OCR and vision-LLM tools instead of being written to disk and decoded
+again by every consumer.
+
+Features:
+- Frame: NumPy view of the raw capture buffer (mss BGRA, no copy) with
+  lazily computed and cached derivatives: BGR/RGB arrays, gray thumbnails,
+  downscaled RGB and encoded PNG/JPEG bytes
+- Optional background disk persistence (single writer thread); readers of a
+  pending path wait for the write instead of racing it
+- Small LRU registry keyed by file path, so tools that only receive a path
+  (analyze_frame, load_image_png_b64, OCR) reuse the in-memory frame
+
+Environment:
+    VISION_ASYNC_PERSIST: write screenshots on the background writer (default on;
+        callers that read the file directly use ensure_file() first)
+    VISION_FRAME_CACHE_SIZE: frames kept in the path registry (default 8)
+"""
+
+import base64
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    cv2 = None
+
+
+def async_persist_enabled() -> bool:
+    raw = str(os.getenv("VISION_ASYNC_PERSIST") or "").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+def fit_size(width: int, height: int, max_dimension: Optional[int] = None, max_side_limit: Optional[int] = None) -> Tuple[int, int]:
+    """Target size after the two-step clamp used for vision payloads.
+
+    First no side may exceed `max_side_limit`, then the image is fitted into
+    `max_dimension` (both keep the aspect ratio).
+    """
+    for limit in (max_side_limit, max_dimension):
+        if limit and (width > limit or height > limit):
+            ratio = min(limit / width, limit / height)
+            width, height = max(1, int(width * ratio)), max(1, int(height * ratio))
+    return width, height
+
+
+def _resize(arr: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    if (arr.shape[1], arr.shape[0]) == size:
+        return arr
+    if cv2 is not None:
+        return cv2.resize(arr, size, interpolation=cv2.INTER_AREA)
+    from PIL import Image
+
+    return np.asarray(Image.fromarray(arr).resize(size, Image.Resampling.LANCZOS))
+
+
+class Frame:
+    """One captured image held in memory.
+
+    `pixels` is an HxWxC (or HxW for gray) uint8 array in `order`
+    ("BGRA", "BGR", "RGB" or "GRAY"). It is treated as read-only: every
+    derivative is computed once and cached on the frame.
+    """
+
+    def __init__(self, pixels: np.ndarray, order: str = "BGR", focus_id: Optional[str] = None, timestamp: Optional[float] = None):
+        self.pixels = pixels
+        self.order = order.upper()
+        self.focus_id = focus_id
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._cache: Dict[Any, Any] = {}
+        self._persist: Optional[Future] = None
+
+    # ---- constructors ----
+
+    @classmethod
+    def from_mss(cls, shot: Any, **kwargs) -> "Frame":
+        """Wrap an mss ScreenShot; the array is a view of its raw BGRA buffer."""
+        pixels = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return cls(pixels, "BGRA", **kwargs)
+
+    @classmethod
+    def from_pil(cls, img: Any, **kwargs) -> "Frame":
+        if img.mode == "L":
+            return cls(np.asarray(img), "GRAY", **kwargs)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        return cls(np.asarray(img), "RGB", **kwargs)
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray, order: Optional[str] = None, **kwargs) -> "Frame":
+        if order is None:
+            order = "GRAY" if arr.ndim == 2 else ("BGRA" if arr.shape[2] == 4 else "BGR")
+        return cls(arr, order, **kwargs)
+
+    @classmethod
+    def from_path(cls, path: str, **kwargs) -> Optional["Frame"]:
+        """Decode an image file (None if it cannot be read)."""
+        if cv2 is not None:
+            arr = cv2.imread(path, cv2.IMREAD_COLOR)
+            if arr is None:
+                return None
+            frame = cls(arr, "BGR", **kwargs)
+        else:
+            try:
+                from PIL import Image
+
+                with Image.open(path) as img:
+                    frame = cls.from_pil(img, **kwargs)
+            except Exception:
+                return None
+        frame.path = path
+        return frame
+
+    @classmethod
+    def coerce(cls, obj: Any, **kwargs) -> "Frame":
+        """Frame from a Frame, PIL image or NumPy array."""
+        if isinstance(obj, Frame):
+            return obj
+        if isinstance(obj, np.ndarray):
+            return cls.from_array(obj, **kwargs)
+        return cls.from_pil(obj, **kwargs)
+
+    # ---- geometry ----
+
+    @property
+    def width(self) -> int:
+        return int(self.pixels.shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self.pixels.shape[0])
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    # ---- cached derivatives ----
+
+    def _cached(self, key: Any, build):
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        value = build()
+        with self._lock:
+            return self._cache.setdefault(key, value)
+
+    def _convert(self, target: str) -> np.ndarray:
+        src, px = self.order, self.pixels
+        if src == target:
+            return px
+        if cv2 is not None:
+            code = {
+                ("BGRA", "BGR"): cv2.COLOR_BGRA2BGR,
+                ("BGRA", "RGB"): cv2.COLOR_BGRA2RGB,
+                ("BGRA", "GRAY"): cv2.COLOR_BGRA2GRAY,
+                ("BGR", "RGB"): cv2.COLOR_BGR2RGB,
+                ("BGR", "GRAY"): cv2.COLOR_BGR2GRAY,
+                ("RGB", "BGR"): cv2.COLOR_RGB2BGR,
+                ("RGB", "GRAY"): cv2.COLOR_RGB2GRAY,
+                ("GRAY", "BGR"): cv2.COLOR_GRAY2BGR,
+                ("GRAY", "RGB"): cv2.COLOR_GRAY2RGB,
+            }[(src, target)]
+            return cv2.cvtColor(np.ascontiguousarray(px), code)
+        if src == "GRAY":
+            return np.repeat(px[:, :, None], 3, axis=2)
+        rgb = px[:, :, 2::-1] if src in ("BGRA", "BGR") else px[:, :, :3]
+        if target == "GRAY":
+            return (rgb @ np.array([0.299, 0.587, 0.114])).astype(np.uint8)
+        return np.ascontiguousarray(rgb if target == "RGB" else rgb[:, :, ::-1])
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """Contiguous BGR array (the OpenCV layout)."""
+        return self._cached("BGR", lambda: self._convert("BGR"))
+
+    @property
+    def rgb(self) -> np.ndarray:
+        return self._cached("RGB", lambda: self._convert("RGB"))
+
+    @property
+    def gray(self) -> np.ndarray:
+        return self._cached("GRAY", lambda: self._convert("GRAY"))
+
+    def thumbnail(self, max_side: int = 256) -> np.ndarray:
+        """Small gray image for cheap change detection."""
+
+        def build():
+            size = fit_size(self.width, self.height, max_side)
+            # Shrink first so the color conversion touches few pixels
+            small = _resize(np.ascontiguousarray(self.pixels), size)
+            return Frame(small, self.order)._convert("GRAY")
+
+        return self._cached(("thumb", max_side), build)
+
+    def tiles(self, block: int) -> np.ndarray:
+        """Gray means of `block` x `block` pixel tiles (edge remainders dropped).
+
+        A crop aligned to the tile grid yields exactly the full frame's tiles
+        for that area, so a region capture can be checked against them.
+        """
+        block = max(1, int(block))
+
+        def build():
+            rows, cols = self.height // block, self.width // block
+            if not rows or not cols:
+                return np.zeros((rows, cols), dtype=np.uint8)
+            px = np.ascontiguousarray(self.pixels[: rows * block, : cols * block])
+            if cv2 is not None:
+                small = cv2.resize(px, (cols, rows), interpolation=cv2.INTER_AREA)
+            else:
+                small = px.reshape((rows, block, cols, block) + px.shape[2:]).mean(axis=(1, 3)).round().astype(np.uint8)
+            return Frame(small, self.order)._convert("GRAY")
+
+        return self._cached(("tiles", block), build)
+
+    def downscaled_rgb(self, max_dimension: Optional[int] = 1024, max_side_limit: Optional[int] = 3800) -> np.ndarray:
+        size = fit_size(self.width, self.height, max_dimension, max_side_limit)
+        return self._cached(("rgb", size), lambda: _resize(self.rgb, size))
+
+    def to_pil(self) -> Any:
+        from PIL import Image
+
+        if self.order == "GRAY":
+            return Image.fromarray(self.pixels, "L")
+        return Image.fromarray(self.rgb, "RGB")
+
+    def encode(self, fmt: str = "PNG", max_dimension: Optional[int] = None, max_side_limit: Optional[int] = None, quality: int = 85) -> bytes:
+        """Encoded image bytes (cached per format, size and quality)."""
+        fmt = "JPEG" if fmt.upper() in ("JPG", "JPEG") else "PNG"
+        size = fit_size(self.width, self.height, max_dimension, max_side_limit)
+
+        def build() -> bytes:
+            rgb = self.rgb if size == self.size else self.downscaled_rgb(max_dimension, max_side_limit)
+            if cv2 is not None:
+                params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)] if fmt == "JPEG" else [cv2.IMWRITE_PNG_COMPRESSION, 3]
+                ok, buf = cv2.imencode(".jpg" if fmt == "JPEG" else ".png", cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR), params)
+                if ok:
+                    return buf.tobytes()
+            from PIL import Image
+
+            out = io.BytesIO()
+            if fmt == "JPEG":
+                Image.fromarray(rgb).save(out, "JPEG", quality=int(quality))
+            else:
+                Image.fromarray(rgb).save(out, "PNG")
+            return out.getvalue()
+
+        return self._cached(("enc", fmt, size, quality if fmt == "JPEG" else None), build)
+
+    def png_b64(self, max_dimension: int = 1024, max_side_limit: int = 3800) -> str:
+        """Base64 PNG payload for vision LLMs (same sizing as load_image_png_b64)."""
+        return base64.b64encode(self.encode("PNG", max_dimension, max_side_limit)).decode("utf-8")
+
+    # ---- persistence ----
+
+    def save(self, path: str, fmt: Optional[str] = None, quality: int = 85) -> str:
+        """Write the frame to `path` (atomically) and return the path."""
+        if fmt is None:
+            fmt = "JPEG" if os.path.splitext(path)[1].lower() in (".jpg", ".jpeg") else "PNG"
+        data = self.encode(fmt, quality=quality)
+        tmp = f"{path}.tmp{threading.get_ident()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.path = path
+        return path
+
+    def persist(self, path: str, fmt: Optional[str] = None, quality: int = 85, background: Optional[bool] = None) -> str:
+        """Register the frame under `path` and write it, in the background if enabled."""
+        self.path = path
+        register_frame(self, path)
+        if background is None:
+            background = async_persist_enabled()
+        if background:
+            self._persist = _get_writer().submit(self.save, path, fmt, quality)
+        else:
+            self.save(path, fmt, quality)
+        return path
+
+    @property
+    def persisted(self) -> bool:
+        return self._persist is None or self._persist.done()
+
+    def wait_persisted(self, timeout: Optional[float] = None) -> bool:
+        """Block until a background write has finished. False on timeout or write error."""
+        fut = self._persist
+        if fut is None:
+            return True
+        try:
+            fut.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+
+_writer: Optional[ThreadPoolExecutor] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> ThreadPoolExecutor:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-writer")
+        return _writer
+
+
+def submit_io(fn, *args, **kwargs) -> Future:
+    """Run `fn` on the frame writer thread, after all writes queued before it."""
+    return _get_writer().submit(fn, *args, **kwargs)
+
+
+def flush_writes(timeout: Optional[float] = None) -> bool:
+    """Wait until every write queued so far has finished."""
+    try:
+        submit_io(lambda: None).result(timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+_frames: "OrderedDict[str, Frame]" = OrderedDict()
+_frames_lock = threading.Lock()
+
+
+def _registry_size() -> int:
+    try:
+        return max(1, int(os.getenv("VISION_FRAME_CACHE_SIZE") or 8))
+    except ValueError:
+        return 8
+
+
+def _key(path: str) -> str:
+    return os.path.abspath(os.path.expanduser(str(path)))
+
+
+def register_frame(frame: Frame, path: str) -> None:
+    with _frames_lock:
+        key = _key(path)
+        _frames[key] = frame
+        _frames.move_to_end(key)
+        limit = _registry_size()
+        while len(_frames) > limit:
+            _frames.popitem(last=False)
+
+
+def get_frame(path: Optional[str]) -> Optional[Frame]:
+    """In-memory frame previously captured to `path`, if still cached."""
+    if not path:
+        return None
+    with _frames_lock:
+        frame = _frames.get(_key(path))
+        if frame is not None:
+            _frames.move_to_end(_key(path))
+        return frame
+
+
+def forget_frame(path: str) -> None:
+    with _frames_lock:
+        _frames.pop(_key(path), None)
+
+
+def load_frame(path: Optional[str]) -> Optional[Frame]:
+    """Cached frame for `path`, or decode the file."""
+    frame = get_frame(path)
+    if frame is not None or not path:
+        return frame
+    return Frame.from_path(path)
+
+
+def ensure_file(path: Optional[str], timeout: Optional[float] = 10.0) -> bool:
+    """Make sure `path` exists on disk, waiting for a pending background write."""
+    frame = get_frame(path)
+    if frame is not None:
+        frame.wait_persisted(timeout)
+    return bool(path) and os.path.exists(str(path))
@@ -0,0 +1,323 @@
+"""Perceptual-hash frame cache.
+
+Grisha analyses the screen after nearly every step, and most of the time
+the screen has not meaningfully changed. Each frame is reduced once to a
+gray tile grid (means of small pixel blocks, about 512 tiles on the long
+side); frames are keyed by a perceptual hash of that grid, and a new frame
+within a Hamming distance of a cached one is a candidate. A 256-bit hash
+cannot see a typed word or a toast message, so a candidate is only reused
+once the new frame's tile grid matches the one kept with the entry.
+
+Features:
+- dhash / phash over the tile grid (64-bit words, any multiple of 64 bits)
+- Vectorized Hamming search over all cached hashes
+- LRU eviction, per-entry values (OCR, analysis, LLM answers per prompt)
+- match(): hash lookup verified against the entry's tile grid (~150 KB per
+  entry at 5K); entries that fail verification are invalidated
+- region_unchanged(): checks a grid-aligned region capture against an entry
+- Hit/miss/lookup-time metrics
+
+Environment:
+    VISION_FRAME_CACHE: enable the cache (default on)
+    VISION_PHASH_ALGO: dhash (default) or phash
+    VISION_PHASH_THRESHOLD: max differing bits for a hit (default 6 of 256)
+    VISION_FRAME_CACHE_ENTRIES: cached frames (default 64)
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    cv2 = None
+
+
+HASH_SIZE = 16  # 16x16 bits = 256-bit hashes
+GRID_SIDE = 512  # tiles on the long side of the verification grid
+TILE_DELTA = 8  # gray levels a tile may drift before it counts as changed
+REGION_TILES = 16  # changed tiles are reported in squares of this many tiles
+
+
+def _resize_gray(gray: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    if cv2 is not None:
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    from PIL import Image
+
+    return np.asarray(Image.fromarray(gray).resize(size, Image.Resampling.BOX))
+
+
+def dhash(gray: np.ndarray, hash_size: int = HASH_SIZE) -> np.ndarray:
+    """Difference hash: sign of horizontal gradients on a (hash_size+1) x hash_size thumbnail."""
+    small = _resize_gray(gray, (hash_size + 1, hash_size)).astype(np.int16)
+    bits = small[:, 1:] > small[:, :-1]
+    return np.packbits(bits.ravel()).view(">u8").astype(np.uint64)
+
+
+def phash(gray: np.ndarray, hash_size: int = HASH_SIZE) -> np.ndarray:
+    """DCT hash: low-frequency DCT coefficients above their median."""
+    n = hash_size * 4
+    small = _resize_gray(gray, (n, n)).astype(np.float32)
+    if cv2 is not None:
+        dct = cv2.dct(small)
+    else:
+        k = np.arange(n)
+        basis = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)).astype(np.float32)
+        dct = basis @ small @ basis.T
+    low = dct[:hash_size, :hash_size].ravel()
+    bits = low > np.median(low[1:])
+    return np.packbits(bits).view(">u8").astype(np.uint64)
+
+
+_HASHES = {"dhash": dhash, "phash": phash}
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(x: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(x)
+else:  # NumPy < 2.0
+    def _popcount(x: np.ndarray) -> np.ndarray:
+        return np.unpackbits(x.view(np.uint8).reshape(*x.shape, 8), axis=-1).sum(axis=-1)
+
+
+def hamming(a: np.ndarray, b: np.ndarray) -> int:
+    return int(_popcount(np.bitwise_xor(a, b)).sum())
+
+
+def grid_block(width: int, height: int) -> int:
+    """Tile side in pixels for a frame: even, so Retina (2x) crops align to whole points."""
+    return 2 * max(1, math.ceil(max(width, height) / (2 * GRID_SIDE)))
+
+
+def frame_grid(frame: Any) -> Tuple[np.ndarray, int]:
+    """Tile grid of a Frame, array or PIL image, and its block size."""
+    from system_ai.tools.frame import Frame
+
+    frame = Frame.coerce(frame)
+    block = grid_block(frame.width, frame.height)
+    return frame.tiles(block), block
+
+
+@dataclass
+class CacheEntry:
+    key: int
+    hash: np.ndarray
+    values: Dict[str, Any] = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+    hits: int = 0
+    grid: Optional[np.ndarray] = None  # tile grid of the cached frame, for verification
+    block: int = 0
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+class PerceptualFrameCache:
+    """LRU of frame analyses keyed by perceptual hash."""
+
+    def __init__(
+        self,
+        max_entries: int = 64,
+        threshold: int = 6,
+        algo: str = "dhash",
+        enabled: bool = True,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.threshold = max(0, int(threshold))
+        self.algo = algo if algo in _HASHES else "dhash"
+        self.enabled = bool(enabled)
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None  # stacked hashes, rebuilt lazily
+        self._matrix_keys: Tuple[int, ...] = ()
+        self._lock = threading.Lock()
+        self._next_key = 1
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.lookup_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "PerceptualFrameCache":
+        return cls(
+            max_entries=_env_int("VISION_FRAME_CACHE_ENTRIES", 64),
+            threshold=_env_int("VISION_PHASH_THRESHOLD", 6),
+            algo=str(os.getenv("VISION_PHASH_ALGO") or "dhash").strip().lower(),
+            enabled=_env_flag("VISION_FRAME_CACHE", True),
+        )
+
+    def hash_frame(self, frame: Any) -> np.ndarray:
+        """Perceptual hash of a Frame (uses its cached tile grid) or a gray array."""
+        gray = frame_grid(frame)[0] if hasattr(frame, "tiles") else frame
+        return _HASHES[self.algo](gray)
+
+    def lookup(self, h: np.ndarray) -> Tuple[Optional[CacheEntry], int]:
+        """Closest cached entry within the threshold, and its distance."""
+        if not self.enabled:
+            return None, -1
+        t0 = time.perf_counter()
+        with self._lock:
+            entry, dist = None, -1
+            if self._entries:
+                keys = tuple(self._entries)
+                if self._matrix is None or self._matrix_keys != keys:
+                    self._matrix = np.stack([self._entries[k].hash for k in keys])
+                    self._matrix_keys = keys
+                dists = _popcount(np.bitwise_xor(self._matrix, h)).sum(axis=1)
+                i = int(dists.argmin())
+                if dists[i] <= self.threshold:
+                    entry, dist = self._entries[keys[i]], int(dists[i])
+                    self._entries.move_to_end(entry.key)
+                    entry.hits += 1
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self.lookup_seconds += time.perf_counter() - t0
+            return entry, dist
+
+    def changed_regions(self, entry: CacheEntry, frame: Any) -> Optional[List[Dict[str, Any]]]:
+        """Regions (frame pixels) where `frame`'s tile grid differs from the entry's.
+
+        [] means unchanged; None means the entry cannot be verified (no grid
+        kept, or a frame of another size).
+        """
+        if entry.grid is None or frame is None:
+            return None
+        grid, block = frame_grid(frame)
+        if block != entry.block or grid.shape != entry.grid.shape:
+            return None
+        return _tile_regions(_changed_tiles(entry.grid, grid), block)
+
+    def region_unchanged(self, entry: CacheEntry, crop: Any, left: int, top: int) -> bool:
+        """Whether `crop`, captured at pixel offset (left, top) of the entry's frame, is unchanged.
+
+        The crop must be aligned to the entry's tile grid (offset and size
+        multiples of `entry.block`); its tiles then equal the cached ones.
+        """
+        if entry.grid is None or not entry.block:
+            return False
+        from system_ai.tools.frame import Frame
+
+        crop = Frame.coerce(crop)
+        block = entry.block
+        if left % block or top % block or crop.width % block or crop.height % block:
+            return False
+        grid = crop.tiles(block)
+        row, col = top // block, left // block
+        ref = entry.grid[row:row + grid.shape[0], col:col + grid.shape[1]]
+        return ref.shape == grid.shape and grid.size > 0 and not _changed_tiles(ref, grid).any()
+
+    def match(self, frame: Any) -> Tuple[Optional[CacheEntry], int, Optional[np.ndarray]]:
+        """Verified lookup for a Frame: (entry, distance, hash).
+
+        A hash hit is only returned when changed_regions() finds no change;
+        otherwise the stale entry is invalidated and the lookup counts as a miss.
+        """
+        if not self.enabled:
+            return None, -1, None
+        h = self.hash_frame(frame)
+        entry, dist = self.lookup(h)
+        if entry is not None and self.changed_regions(entry, frame) != []:
+            self.invalidate(entry.key)
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            entry, dist = None, -1
+        return entry, dist, h
+
+    def put(self, h: np.ndarray, values: Dict[str, Any], frame: Any = None) -> Optional[CacheEntry]:
+        """Cache `values` under `h`; keeping `frame`'s tile grid lets match() verify later hits."""
+        if not self.enabled:
+            return None
+        grid, block = frame_grid(frame) if frame is not None else (None, 0)
+        with self._lock:
+            entry = CacheEntry(key=self._next_key, hash=h, values=dict(values), grid=grid, block=block)
+            self._next_key += 1
+            self._entries[entry.key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def latest(self, value: str) -> Optional[CacheEntry]:
+        """Most recently used entry holding `value` (e.g. "ocr")."""
+        with self._lock:
+            for entry in reversed(self._entries.values()):
+                if value in entry.values:
+                    return entry
+        return None
+
+    def update(self, key: int, **values: Any) -> None:
+        """Attach more results (e.g. an LLM answer) to an entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.values.update(values)
+
+    def invalidate(self, key: int) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            self._matrix_keys = ()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "algo": self.algo,
+                "threshold": self.threshold,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "avg_lookup_ms": round(self.lookup_seconds / lookups * 1000.0, 4) if lookups else 0.0,
+            }
+
+
+def _changed_tiles(ref: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    return np.abs(ref.astype(np.int16) - grid.astype(np.int16)) > TILE_DELTA
+
+
+def _tile_regions(changed: np.ndarray, block: int) -> List[Dict[str, Any]]:
+    """Bounding boxes (frame pixels) of the REGION_TILES squares containing changed tiles."""
+    if not changed.any():
+        return []
+    rows, cols = np.nonzero(changed)
+    size = REGION_TILES * block
+    cells = sorted(set(zip((rows // REGION_TILES).tolist(), (cols // REGION_TILES).tolist())))
+    return [{"bbox": {"x": c * size, "y": r * size, "width": size, "height": size}} for r, c in cells]
+
+
+_cache: Optional[PerceptualFrameCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_frame_cache() -> PerceptualFrameCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PerceptualFrameCache.from_env()
+        return _cache
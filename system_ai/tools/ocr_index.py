@@ -0,0 +1,269 @@
+"""OCR text index.
+
+An OCR pass yields text lines with quads. Callers used to scan the joined
+text with one `word in text` check per keyword and re-run OCR to find a
+label. OcrTextIndex is built once per OCR result and answers those queries
+from memory.
+
+Features:
+- normalize(): NFKC + casefold, unified apostrophes, collapsed whitespace
+  (Ukrainian and English text alike)
+- Token -> bounding boxes map; token boxes are interpolated along the line
+  quad by character offset
+- KeywordSet: Aho-Corasick automaton over keyword groups, so any number of
+  keyword checks costs one pass over the text
+- find(): exact or fuzzy (difflib ratio over token windows) lookup of a
+  phrase with its box, screen click point and score
+- in_region(): text inside a screen rectangle, without another OCR call
+- index_for(): small identity cache, one index per OCR result
+"""
+
+import difflib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+
+_APOSTROPHES = str.maketrans({"’": "'", "ʼ": "'", "`": "'", "‘": "'"})
+_SPACE = re.compile(r"\s+")
+_TOKEN = re.compile(r"[\w'▶⏸]+")
+
+
+def normalize(text: str) -> str:
+    """Comparable form of OCR or query text."""
+    text = unicodedata.normalize("NFKC", str(text or "")).translate(_APOSTROPHES).casefold()
+    return _SPACE.sub(" ", text).strip()
+
+
+class KeywordSet:
+    """Aho-Corasick matcher for named keyword groups.
+
+    `groups` maps a name to its keywords (phrases allowed). matches() walks
+    the text once and returns the names whose keywords occur as substrings,
+    like `any(k in text for k in keywords)` for every group at once.
+    """
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        self.groups = {name: [normalize(k) for k in words if normalize(k)] for name, words in groups.items()}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Set[str]] = [set()]
+        for name, words in self.groups.items():
+            for word in words:
+                node = 0
+                for ch in word:
+                    nxt = self._goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[node][ch] = nxt
+                        self._goto.append({})
+                        self._out.append(set())
+                    node = nxt
+                self._out[node].add(name)
+        # Failure links (breadth-first), outputs merged along them
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if self._goto[f].get(ch, 0) != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def matches(self, text: str, normalized: bool = False) -> Set[str]:
+        """Names of the groups with at least one keyword in `text` (one pass)."""
+        found: Set[str] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in (text if normalized else normalize(text)):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+    def flags(self, text: str, normalized: bool = False) -> Dict[str, bool]:
+        hits = self.matches(text, normalized)
+        return {name: name in hits for name in self.groups}
+
+
+@dataclass
+class TextMatch:
+    text: str
+    bbox: Tuple[float, float, float, float]  # x, y, width, height in image pixels
+    center: Tuple[int, int]  # screen click point
+    score: float
+    confidence: float
+    line: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        x, y, w, h = self.bbox
+        return {
+            "text": self.text,
+            "bbox": {"x": int(x), "y": int(y), "width": int(round(w)), "height": int(round(h))},
+            "x": self.center[0],
+            "y": self.center[1],
+            "score": round(self.score, 3),
+            "confidence": round(self.confidence, 3),
+        }
+
+
+@dataclass
+class _Line:
+    raw: str
+    norm: str
+    quad: List[List[float]]
+    confidence: float
+    tokens: List[Tuple[str, int, int]]  # normalized token, start, end (in norm)
+
+
+def _quad_of(bbox: Any) -> Optional[List[List[float]]]:
+    if isinstance(bbox, dict):
+        x, y = float(bbox.get("x", 0)), float(bbox.get("y", 0))
+        w, h = float(bbox.get("width", 0)), float(bbox.get("height", 0))
+        return [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+    try:
+        quad = [[float(p[0]), float(p[1])] for p in bbox]
+        return quad if len(quad) == 4 else None
+    except Exception:
+        return None
+
+
+class OcrTextIndex:
+    """Searchable view of one OCR result (regions of text with quads)."""
+
+    def __init__(self, regions: Sequence[Dict[str, Any]], full_text: str = "", origin: Tuple[float, float] = (0.0, 0.0), scale: float = 1.0):
+        self.origin = origin
+        self.scale = scale
+        self.lines: List[_Line] = []
+        self.tokens: Dict[str, List[Tuple[int, int]]] = {}  # token -> [(line, token index)]
+        for region in regions or []:
+            raw = str(region.get("text") or "")
+            quad = _quad_of(region.get("bbox"))
+            norm = normalize(raw)
+            if not norm or quad is None:
+                continue
+            toks = [(m.group(0), m.start(), m.end()) for m in _TOKEN.finditer(norm)]
+            li = len(self.lines)
+            self.lines.append(_Line(raw, norm, quad, float(region.get("confidence") or 0.0), toks))
+            for ti, (tok, _s, _e) in enumerate(toks):
+                self.tokens.setdefault(tok, []).append((li, ti))
+        joined = " \n ".join(line.norm for line in self.lines)
+        self.text = normalize(full_text) if full_text and not self.lines else joined
+
+    @classmethod
+    def from_ocr(cls, ocr: Optional[Dict[str, Any]], origin: Tuple[float, float] = (0.0, 0.0), scale: float = 1.0) -> "OcrTextIndex":
+        ocr = ocr or {}
+        return cls(ocr.get("regions") or [], str(ocr.get("full_text") or ocr.get("text") or ""), origin, scale)
+
+    # ---- geometry ----
+
+    def _span_box(self, line: _Line, start: int, end: int) -> Tuple[float, float, float, float]:
+        """Box of characters [start, end) of a line, interpolated along its quad."""
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = line.quad
+        n = max(1, len(line.norm))
+        a, b = start / n, end / n
+        xs = [x0 + (x1 - x0) * a, x0 + (x1 - x0) * b, x3 + (x2 - x3) * a, x3 + (x2 - x3) * b]
+        ys = [y0 + (y1 - y0) * a, y0 + (y1 - y0) * b, y3 + (y2 - y3) * a, y3 + (y2 - y3) * b]
+        return min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)
+
+    def to_screen(self, x: float, y: float) -> Tuple[int, int]:
+        return int(round(self.origin[0] + x * self.scale)), int(round(self.origin[1] + y * self.scale))
+
+    def _match(self, li: int, start: int, end: int, score: float) -> TextMatch:
+        line = self.lines[li]
+        box = self._span_box(line, start, end)
+        center = self.to_screen(box[0] + box[2] / 2, box[1] + box[3] / 2)
+        return TextMatch(line.raw, box, center, score, line.confidence, li)
+
+    # ---- queries ----
+
+    def contains(self, keyword: str) -> bool:
+        return normalize(keyword) in self.text
+
+    def boxes(self, token: str) -> List[Tuple[float, float, float, float]]:
+        """Boxes of every occurrence of a single token."""
+        out = []
+        for li, ti in self.tokens.get(normalize(token), []):
+            _tok, s, e = self.lines[li].tokens[ti]
+            out.append(self._span_box(self.lines[li], s, e))
+        return out
+
+    def find(self, query: str, fuzzy: bool = True, min_score: float = 0.75, limit: int = 5) -> List[TextMatch]:
+        """Occurrences of `query`, best first: exact substrings (score 1.0), then fuzzy token windows."""
+        q = normalize(query)
+        if not q:
+            return []
+        results: List[TextMatch] = []
+        for li, line in enumerate(self.lines):
+            start = line.norm.find(q)
+            while start >= 0:
+                results.append(self._match(li, start, start + len(q), 1.0))
+                start = line.norm.find(q, start + 1)
+        if results or not fuzzy:
+            return results[:limit]
+
+        n = max(1, len(_TOKEN.findall(q)))
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        matcher.set_seq2(q)
+        for li, line in enumerate(self.lines):
+            toks = line.tokens
+            for i in range(max(1, len(toks) - n + 1)):
+                window = toks[i:i + n]
+                if not window:
+                    continue
+                s, e = window[0][1], window[-1][2]
+                matcher.set_seq1(line.norm[s:e])
+                if matcher.real_quick_ratio() < min_score or matcher.quick_ratio() < min_score:
+                    continue
+                score = matcher.ratio()
+                if score >= min_score:
+                    results.append(self._match(li, s, e, score))
+        results.sort(key=lambda m: (-m.score, -m.confidence))
+        return results[:limit]
+
+    def click_point(self, query: str, fuzzy: bool = True, min_score: float = 0.75) -> Optional[Tuple[int, int]]:
+        found = self.find(query, fuzzy=fuzzy, min_score=min_score, limit=1)
+        return found[0].center if found else None
+
+    def in_region(self, x: float, y: float, width: float, height: float) -> List[Dict[str, Any]]:
+        """Lines whose center lies in a screen rectangle (same coordinates as click points)."""
+        out = []
+        for line in self.lines:
+            xs = [p[0] for p in line.quad]
+            ys = [p[1] for p in line.quad]
+            cx, cy = self.to_screen(sum(xs) / 4, sum(ys) / 4)
+            if x <= cx < x + width and y <= cy < y + height:
+                out.append({"text": line.raw, "confidence": line.confidence, "bbox": line.quad})
+        return out
+
+
+_indexes: "OrderedDict[int, Tuple[Dict[str, Any], OcrTextIndex]]" = OrderedDict()
+_indexes_lock = threading.Lock()
+_INDEX_CACHE_SIZE = 16
+
+
+def index_for(ocr: Optional[Dict[str, Any]], origin: Tuple[float, float] = (0.0, 0.0), scale: float = 1.0) -> OcrTextIndex:
+    """Index of an OCR result dict, built once per result object (and geometry)."""
+    if not isinstance(ocr, dict):
+        return OcrTextIndex.from_ocr(None, origin, scale)
+    key = id(ocr)
+    with _indexes_lock:
+        hit = _indexes.get(key)
+        if hit is not None and hit[0] is ocr and hit[1].origin == origin and hit[1].scale == scale:
+            _indexes.move_to_end(key)
+            return hit[1]
+    index = OcrTextIndex.from_ocr(ocr, origin, scale)
+    with _indexes_lock:
+        # Holding the dict keeps its id from being reused while cached
+        _indexes[key] = (ocr, index)
+        _indexes.move_to_end(key)
+        while len(_indexes) > _INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
@@ -0,0 +1,87 @@
+"""In-page scripts shared by the local browser tools and the MCP browser path.
+
+Plain strings with no Playwright import, so callers that only talk to an
+external Playwright MCP server can use them too.
+"""
+
+
+# One round trip: installs a MutationObserver-backed counter on first use and
+# returns either just {url, mutations} (probe) or the full page state.
+SNAPSHOT_JS = """
+(opts) => {
+    if (!window.__systemSnapshot) {
+        const state = {mutations: 0};
+        window.__systemSnapshot = state;
+        try {
+            new MutationObserver((records) => { state.mutations += records.length; })
+                .observe(document.documentElement || document, {subtree: true, childList: true, characterData: true, attributes: true});
+        } catch (e) {}
+    }
+    const mutations = window.__systemSnapshot.mutations;
+    if (opts.probe) {
+        return {url: location.href, mutations};
+    }
+    const root = document.documentElement;
+    const html = root ? root.outerHTML : "";
+    const lower = html.toLowerCase();
+    let captcha = opts.markers.some(m => lower.includes(m));
+    if (!captcha && lower.includes("sorry") && lower.includes("unusual traffic")) {
+        captcha = true;
+    }
+    const url = location.href;
+    const hint = opts.hints.some(h => url.toLowerCase().includes(h) || lower.includes(h));
+    const links = [];
+    for (const a of document.querySelectorAll('a[href]')) {
+        if (links.length >= opts.maxLinks) break;
+        const text = (a.innerText || "").trim();
+        const href = a.href;
+        if (text && href && !href.startsWith('javascript:')) {
+            links.push({text, href});
+        }
+    }
+    return {
+        url,
+        title: document.title || "",
+        text: document.body ? document.body.innerText.slice(0, opts.maxText) : "",
+        html: opts.html ? html.slice(0, opts.maxHtml) : null,
+        links,
+        captcha,
+        captcha_hint: hint,
+        mutations,
+    };
+}
+"""
+
+
+# Resolves once the DOM has had no mutations for quietMs (or after timeoutMs).
+SETTLE_JS = """
+(opts) => new Promise((resolve) => {
+    const start = performance.now();
+    let last = start;
+    let count = 0;
+    let observer = null;
+    try {
+        observer = new MutationObserver((records) => { count += records.length; last = performance.now(); });
+        observer.observe(document.documentElement || document, {subtree: true, childList: true, characterData: true, attributes: true});
+    } catch (e) {
+        resolve({settled: true, mutations: 0, waited_ms: 0});
+        return;
+    }
+    const step = Math.max(10, Math.min(50, opts.quietMs));
+    const tick = () => {
+        const now = performance.now();
+        if (now - last >= opts.quietMs || now - start >= opts.timeoutMs) {
+            observer.disconnect();
+            resolve({settled: now - last >= opts.quietMs, mutations: count, waited_ms: now - start});
+        } else {
+            setTimeout(tick, step);
+        }
+    };
+    setTimeout(tick, step);
+})
+"""
+
+
+def settle_function(quiet_ms: int, timeout_ms: float) -> str:
+    """SETTLE_JS as a zero-argument function (for evaluate tools that take no args)."""
+    return f"() => ({SETTLE_JS.strip()})({{quietMs: {int(quiet_ms)}, timeoutMs: {int(timeout_ms)}}})"
@@ -2,12 +2,26 @@
 
 Handles permission checks and requests for automation, recording, and accessibility.
 Provides clear feedback and guidance for users.
+
+Features:
+- Framework handles and function pointers resolved once per process (Frameworks)
+- Status cache with a TTL (shorter for denied permissions), invalidated by
+  request_permission() and open_settings()
+- Pluggable probes (MacPermissionProbes on macOS), so the caching can be
+  exercised on any platform
+
+Environment:
+    PERMISSIONS_CACHE_TTL: seconds a granted status is reused (default 60)
+    PERMISSIONS_DENIED_TTL: seconds a denied status is reused (default 5)
 """
 
 import subprocess
 import ctypes
+import os
 import sys
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from typing import Dict, Any, Callable, Optional, List, Sequence, Tuple
 from dataclasses import dataclass
 
 
@@ -21,241 +35,212 @@ class PermissionStatus:
     settings_url: Optional[str] = None
 
 
-class PermissionsManager:
-    """Manages macOS permissions for automation and recording"""
-    
-    PRIVACY_URLS = {
-        "accessibility": "x-apple.systempreferences:com.apple.preference.security?Privacy_Accessibility",
-        "automation": "x-apple.systempreferences:com.apple.preference.security?Privacy_Automation",
-        "full_disk_access": "x-apple.systempreferences:com.apple.preference.security?Privacy_AllFiles",
-        "screen_recording": "x-apple.systempreferences:com.apple.preference.security?Privacy_ScreenCapture",
-        "microphone": "x-apple.systempreferences:com.apple.preference.security?Privacy_Microphone",
-        "files_and_folders": "x-apple.systempreferences:com.apple.preference.security?Privacy_FilesAndFolders",
-    }
-    
-    def __init__(self):
-        self.statuses: Dict[str, PermissionStatus] = {}
-    
-    def check_accessibility(self) -> PermissionStatus:
-        """Check Accessibility permission status"""
-        if sys.platform != "darwin":
-            return PermissionStatus("accessibility", True, settings_url=None)
-        
+PRIVACY_URLS = {
+    "accessibility": "x-apple.systempreferences:com.apple.preference.security?Privacy_Accessibility",
+    "automation": "x-apple.systempreferences:com.apple.preference.security?Privacy_Automation",
+    "full_disk_access": "x-apple.systempreferences:com.apple.preference.security?Privacy_AllFiles",
+    "screen_recording": "x-apple.systempreferences:com.apple.preference.security?Privacy_ScreenCapture",
+    "microphone": "x-apple.systempreferences:com.apple.preference.security?Privacy_Microphone",
+    "files_and_folders": "x-apple.systempreferences:com.apple.preference.security?Privacy_FilesAndFolders",
+}
+
+FRAMEWORK_PATHS = {
+    "ApplicationServices": "/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices",
+    "CoreGraphics": "/System/Library/Frameworks/CoreGraphics.framework/CoreGraphics",
+    "CoreFoundation": "/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation",
+}
+
+AUTOMATION_SCRIPT = 'tell application "System Events" to count of processes'
+
+_MISSING = object()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class Frameworks:
+    """ctypes handles for the system frameworks and their function pointers, resolved once."""
+
+    def __init__(self, loader: Callable[[str], Any] = ctypes.cdll.LoadLibrary):
+        self._loader = loader
+        self._libs: Dict[str, Any] = {}
+        self._funcs: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def lib(self, name: str) -> Any:
+        """Loaded framework `name` (load errors are raised and not cached)."""
+        with self._lock:
+            lib = self._libs.get(name)
+            if lib is None:
+                lib = self._libs[name] = self._loader(FRAMEWORK_PATHS[name])
+            return lib
+
+    def func(self, lib: str, symbol: str, restype: Any = ctypes.c_bool, argtypes: Sequence[Any] = ()) -> Optional[Any]:
+        """Function pointer `symbol` with its types set, or None when the framework lacks it."""
+        key = (lib, symbol)
+        fn = self._funcs.get(key, _MISSING)
+        if fn is _MISSING:
+            fn = getattr(self.lib(lib), symbol, None)
+            if fn is not None:
+                fn.restype = restype
+                fn.argtypes = list(argtypes)
+            self._funcs[key] = fn
+        return fn
+
+
+class MacPermissionProbes:
+    """Default probes: TCC checks through ApplicationServices/CoreGraphics and osascript."""
+
+    def __init__(self, frameworks: Optional[Frameworks] = None):
+        self.frameworks = frameworks or get_frameworks()
+
+    def accessibility(self) -> PermissionStatus:
         try:
-            app = ctypes.cdll.LoadLibrary(
-                "/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices"
-            )
-            fn = getattr(app, "AXIsProcessTrusted", None)
+            fn = self.frameworks.func("ApplicationServices", "AXIsProcessTrusted")
             if fn is None:
                 return PermissionStatus(
                     "accessibility",
                     False,
                     error_message="Cannot check accessibility permission",
-                    settings_url=self.PRIVACY_URLS["accessibility"]
+                    settings_url=PRIVACY_URLS["accessibility"]
                 )
-            
-            fn.restype = ctypes.c_bool
-            fn.argtypes = []
             granted = bool(fn())
-            
-            self.statuses["accessibility"] = PermissionStatus(
+            return PermissionStatus(
                 "accessibility",
                 granted,
-                settings_url=self.PRIVACY_URLS["accessibility"] if not granted else None
+                settings_url=PRIVACY_URLS["accessibility"] if not granted else None
             )
-            return self.statuses["accessibility"]
         except Exception as e:
-            status = PermissionStatus(
+            return PermissionStatus(
                 "accessibility",
                 False,
                 error_message=str(e),
-                settings_url=self.PRIVACY_URLS["accessibility"]
+                settings_url=PRIVACY_URLS["accessibility"]
             )
-            self.statuses["accessibility"] = status
-            return status
-    
-    def check_screen_recording(self) -> PermissionStatus:
-        """Check Screen Recording permission status"""
-        if sys.platform != "darwin":
-            return PermissionStatus("screen_recording", True, settings_url=None)
-        
+
+    def screen_recording(self) -> PermissionStatus:
         try:
-            cg = ctypes.cdll.LoadLibrary(
-                "/System/Library/Frameworks/CoreGraphics.framework/CoreGraphics"
-            )
-            fn = getattr(cg, "CGPreflightScreenCaptureAccess", None)
+            fn = self.frameworks.func("CoreGraphics", "CGPreflightScreenCaptureAccess")
             if fn is None:
                 return PermissionStatus(
                     "screen_recording",
                     False,
                     error_message="Cannot check screen recording permission",
-                    settings_url=self.PRIVACY_URLS["screen_recording"]
+                    settings_url=PRIVACY_URLS["screen_recording"]
                 )
-            
-            fn.restype = ctypes.c_bool
-            fn.argtypes = []
             granted = bool(fn())
-            
-            self.statuses["screen_recording"] = PermissionStatus(
+            return PermissionStatus(
                 "screen_recording",
                 granted,
-                settings_url=self.PRIVACY_URLS["screen_recording"] if not granted else None
+                settings_url=PRIVACY_URLS["screen_recording"] if not granted else None
             )
-            return self.statuses["screen_recording"]
         except Exception as e:
-            status = PermissionStatus(
+            return PermissionStatus(
                 "screen_recording",
                 False,
                 error_message=str(e),
-                settings_url=self.PRIVACY_URLS["screen_recording"]
+                settings_url=PRIVACY_URLS["screen_recording"]
             )
-            self.statuses["screen_recording"] = status
-            return status
-    
-    def check_automation(self) -> PermissionStatus:
-        """Check Automation permission status"""
-        if sys.platform != "darwin":
-            return PermissionStatus("automation", True, settings_url=None)
-        
-        script = 'tell application "System Events" to count of processes'
+
+    def automation(self) -> PermissionStatus:
         try:
             proc = subprocess.run(
-                ["/usr/bin/osascript", "-e", script],
+                ["/usr/bin/osascript", "-e", AUTOMATION_SCRIPT],
                 capture_output=True,
                 text=True,
                 timeout=2.5,
             )
             
             if proc.returncode == 0:
-                self.statuses["automation"] = PermissionStatus("automation", True)
-                return self.statuses["automation"]
+                return PermissionStatus("automation", True)
             
             err = (proc.stderr or "") + "\n" + (proc.stdout or "")
             low = err.lower()
             
             if any(phrase in low for phrase in ["not authorised", "not authorized", "not allowed", "permission"]):
-                status = PermissionStatus(
+                return PermissionStatus(
                     "automation",
                     False,
                     error_message="Automation permission denied",
-                    settings_url=self.PRIVACY_URLS["automation"]
+                    settings_url=PRIVACY_URLS["automation"]
                 )
-                self.statuses["automation"] = status
-                return status
             
-            status = PermissionStatus(
+            return PermissionStatus(
                 "automation",
                 False,
                 error_message=err[:200],
-                settings_url=self.PRIVACY_URLS["automation"]
+                settings_url=PRIVACY_URLS["automation"]
             )
-            self.statuses["automation"] = status
-            return status
         except subprocess.TimeoutExpired:
-            status = PermissionStatus(
+            return PermissionStatus(
                 "automation",
                 False,
                 error_message="Automation check timeout",
-                settings_url=self.PRIVACY_URLS["automation"]
+                settings_url=PRIVACY_URLS["automation"]
             )
-            self.statuses["automation"] = status
-            return status
         except Exception as e:
-            status = PermissionStatus(
+            return PermissionStatus(
                 "automation",
                 False,
                 error_message=str(e),
-                settings_url=self.PRIVACY_URLS["automation"]
+                settings_url=PRIVACY_URLS["automation"]
             )
-            self.statuses["automation"] = status
-            return status
-    
-    def request_permission(self, permission: str) -> bool:
-        """Request a permission from the user
-        
-        Args:
-            permission: Permission name (accessibility, screen_recording, automation)
-            
-        Returns:
-            True if permission was granted
-        """
-        if sys.platform != "darwin":
-            return True
-        
-        if permission == "accessibility":
-            return self._request_accessibility()
-        elif permission == "screen_recording":
-            return self._request_screen_recording()
-        elif permission == "automation":
-            return self._request_automation()
-        
-        return False
-    
-    def _request_accessibility(self) -> bool:
-        """Request accessibility permission"""
+
+    def request_accessibility(self) -> bool:
+        """Show the Accessibility prompt (AXIsProcessTrustedWithOptions with prompt=true)."""
         try:
-            app = ctypes.cdll.LoadLibrary(
-                "/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices"
-            )
-            cf = ctypes.cdll.LoadLibrary(
-                "/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation"
-            )
-            
-            fn = getattr(app, "AXIsProcessTrustedWithOptions", None)
+            fn = self.frameworks.func("ApplicationServices", "AXIsProcessTrustedWithOptions", argtypes=[ctypes.c_void_p])
             if fn is None:
                 return False
             
+            app = self.frameworks.lib("ApplicationServices")
+            cf = self.frameworks.lib("CoreFoundation")
             key = ctypes.c_void_p.in_dll(app, "kAXTrustedCheckOptionPrompt")
             val = ctypes.c_void_p.in_dll(cf, "kCFBooleanTrue")
             
-            cf.CFDictionaryCreate.restype = ctypes.c_void_p
-            cf.CFDictionaryCreate.argtypes = [
-                ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p),
-                ctypes.POINTER(ctypes.c_void_p), ctypes.c_long,
-                ctypes.c_void_p, ctypes.c_void_p,
-            ]
-            cf.CFRelease.restype = None
-            cf.CFRelease.argtypes = [ctypes.c_void_p]
+            create = self.frameworks.func(
+                "CoreFoundation", "CFDictionaryCreate",
+                restype=ctypes.c_void_p,
+                argtypes=[
+                    ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p),
+                    ctypes.POINTER(ctypes.c_void_p), ctypes.c_long,
+                    ctypes.c_void_p, ctypes.c_void_p,
+                ],
+            )
+            release = self.frameworks.func("CoreFoundation", "CFRelease", restype=None, argtypes=[ctypes.c_void_p])
             
             keys = (ctypes.c_void_p * 1)(key)
             vals = (ctypes.c_void_p * 1)(val)
-            d = cf.CFDictionaryCreate(None, keys, vals, 1, None, None)
+            d = create(None, keys, vals, 1, None, None)
             
             try:
-                fn.restype = ctypes.c_bool
-                fn.argtypes = [ctypes.c_void_p]
                 return bool(fn(ctypes.c_void_p(d)))
             finally:
                 try:
                     if d:
-                        cf.CFRelease(ctypes.c_void_p(d))
+                        release(ctypes.c_void_p(d))
                 except Exception:
                     pass
         except Exception:
             return False
-    
-    def _request_screen_recording(self) -> bool:
-        """Request screen recording permission"""
+
+    def request_screen_recording(self) -> bool:
         try:
-            cg = ctypes.cdll.LoadLibrary(
-                "/System/Library/Frameworks/CoreGraphics.framework/CoreGraphics"
-            )
-            fn = getattr(cg, "CGRequestScreenCaptureAccess", None)
+            fn = self.frameworks.func("CoreGraphics", "CGRequestScreenCaptureAccess")
             if fn is None:
                 return False
-            
-            fn.restype = ctypes.c_bool
-            fn.argtypes = []
             return bool(fn())
         except Exception:
             return False
-    
-    def _request_automation(self) -> bool:
-        """Request automation permission"""
-        script = 'tell application "System Events" to count of processes'
+
+    def request_automation(self) -> bool:
         try:
             subprocess.run(
-                ["/usr/bin/osascript", "-e", script],
+                ["/usr/bin/osascript", "-e", AUTOMATION_SCRIPT],
                 capture_output=True,
                 text=True,
                 timeout=2.5,
@@ -263,6 +248,106 @@ class PermissionsManager:
             return True
         except Exception:
             return False
+
+
+class GrantedPermissionProbes:
+    """Probes for platforms without TCC: everything is granted."""
+
+    def accessibility(self) -> PermissionStatus:
+        return PermissionStatus("accessibility", True)
+
+    def screen_recording(self) -> PermissionStatus:
+        return PermissionStatus("screen_recording", True)
+
+    def automation(self) -> PermissionStatus:
+        return PermissionStatus("automation", True)
+
+    def request_accessibility(self) -> bool:
+        return True
+
+    def request_screen_recording(self) -> bool:
+        return True
+
+    def request_automation(self) -> bool:
+        return True
+
+
+class PermissionsManager:
+    """Manages macOS permissions for automation and recording
+    
+    Statuses are cached: granted ones for PERMISSIONS_CACHE_TTL seconds,
+    denied ones for PERMISSIONS_DENIED_TTL (the user is likely fixing them).
+    request_permission() and open_settings() drop the cached entry.
+    """
+    
+    PRIVACY_URLS = PRIVACY_URLS
+    CHECKABLE = ("accessibility", "screen_recording", "automation")
+    
+    def __init__(self, probes: Any = None, ttl: Optional[float] = None, denied_ttl: Optional[float] = None):
+        """
+        Args:
+            probes: Object with accessibility/screen_recording/automation() -> PermissionStatus
+                and request_<name>() -> bool. Defaults to MacPermissionProbes on macOS.
+            ttl: Seconds a granted status is reused.
+            denied_ttl: Seconds a denied status is reused.
+        """
+        if probes is None:
+            probes = MacPermissionProbes() if sys.platform == "darwin" else GrantedPermissionProbes()
+        self.probes = probes
+        self.ttl = _env_float("PERMISSIONS_CACHE_TTL", 60.0) if ttl is None else float(ttl)
+        self.denied_ttl = _env_float("PERMISSIONS_DENIED_TTL", 5.0) if denied_ttl is None else float(denied_ttl)
+        self.statuses: Dict[str, PermissionStatus] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def _check(self, name: str, refresh: bool = False) -> PermissionStatus:
+        if not refresh:
+            with self._lock:
+                status = self.statuses.get(name)
+                if status is not None and time.monotonic() < self._expires.get(name, 0.0):
+                    return status
+        status = getattr(self.probes, name)()
+        ttl = self.ttl if status.granted else self.denied_ttl
+        with self._lock:
+            self.statuses[name] = status
+            self._expires[name] = time.monotonic() + ttl
+        return status
+    
+    def invalidate(self, permission: Optional[str] = None) -> None:
+        """Forget the cached status of `permission` (all when None)."""
+        with self._lock:
+            if permission is None:
+                self._expires.clear()
+            else:
+                self._expires.pop(permission, None)
+    
+    def check_accessibility(self, refresh: bool = False) -> PermissionStatus:
+        """Check Accessibility permission status"""
+        return self._check("accessibility", refresh)
+    
+    def check_screen_recording(self, refresh: bool = False) -> PermissionStatus:
+        """Check Screen Recording permission status"""
+        return self._check("screen_recording", refresh)
+    
+    def check_automation(self, refresh: bool = False) -> PermissionStatus:
+        """Check Automation permission status (may run osascript)"""
+        return self._check("automation", refresh)
+    
+    def request_permission(self, permission: str) -> bool:
+        """Request a permission from the user
+        
+        Args:
+            permission: Permission name (accessibility, screen_recording, automation)
+            
+        Returns:
+            True if permission was granted
+        """
+        if permission not in self.CHECKABLE:
+            return False
+        try:
+            return bool(getattr(self.probes, f"request_{permission}")())
+        finally:
+            self.invalidate(permission)
     
     def open_settings(self, permission: str) -> bool:
         """Open System Settings to the permission pane
@@ -277,6 +362,8 @@ class PermissionsManager:
         if not url:
             return False
         
+        # The user is about to change it; don't trust the cached status
+        self.invalidate(permission)
         try:
             subprocess.run(["/usr/bin/open", url], capture_output=True, text=True)
             return True
@@ -303,21 +390,7 @@ class PermissionsManager:
         Returns:
             List of missing permission names
         """
-        missing = []
-        for perm in required:
-            if perm == "accessibility":
-                status = self.check_accessibility()
-            elif perm == "screen_recording":
-                status = self.check_screen_recording()
-            elif perm == "automation":
-                status = self.check_automation()
-            else:
-                continue
-            
-            if not status.granted:
-                missing.append(perm)
-        
-        return missing
+        return [perm for perm in required if perm in self.CHECKABLE and not self._check(perm).granted]
     
     def get_permission_help_text(self, lang: str = "en") -> str:
         """Get help text for permissions
@@ -384,8 +457,8 @@ def open_system_settings_privacy(permission: str) -> Dict[str, Any]:
         Dict with status and url
     """
     perm = str(permission or "").strip().lower() or "accessibility"
-    pm = PermissionsManager()
-    url = pm.PRIVACY_URLS.get(perm) or pm.PRIVACY_URLS["accessibility"]
+    url = PRIVACY_URLS.get(perm) or PRIVACY_URLS["accessibility"]
+    get_permissions_manager().invalidate(perm)
     
     try:
         proc = subprocess.run(["open", url], capture_output=True, text=True)
@@ -408,3 +481,26 @@ def create_permissions_manager() -> PermissionsManager:
         PermissionsManager instance
     """
     return PermissionsManager()
+
+
+_frameworks: Optional[Frameworks] = None
+_frameworks_lock = threading.Lock()
+_manager: Optional[PermissionsManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_frameworks() -> Frameworks:
+    global _frameworks
+    with _frameworks_lock:
+        if _frameworks is None:
+            _frameworks = Frameworks()
+        return _frameworks
+
+
+def get_permissions_manager() -> PermissionsManager:
+    """Shared manager, so every caller benefits from (and invalidates) one status cache."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = PermissionsManager()
+        return _manager
@@ -0,0 +1,296 @@
+"""Background process sampler.
+
+list_processes used to walk psutil.process_iter with fresh Process objects,
+so cpu_percent had no previous sample and was always 0.0, and
+get_system_stats blocked 100 ms in cpu_percent(interval=0.1). One sampler
+thread now keeps Process handles between samples and publishes immutable
+snapshots that readers take without locking or waiting.
+
+Features:
+- Persistent psutil.Process handles per pid (dropped when the pid goes
+  away), CPU% as a real delta between two samples
+- Top-K by CPU and by memory via heapq.nlargest, kept in each snapshot
+- System CPU (delta since the previous sample) and process count
+- Name -> pids and command-line (pgrep -f) lookups for trace attribution,
+  without spawning pgrep per traced line
+- Starts on first use; stops after an idle period without readers unless
+  held with acquire() (TUI monitoring, ProcTraceService)
+
+Environment:
+    PROCESS_SAMPLER_INTERVAL: seconds between samples (default 2.0)
+    PROCESS_SAMPLER_TOP_K: processes kept per top list (default 50)
+    PROCESS_SAMPLER_IDLE_S: stop after this long without reads (default 300)
+"""
+
+import heapq
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class ProcessSnapshot:
+    taken_at: float
+    processes: Tuple[Dict[str, Any], ...]
+    top_cpu: Tuple[Dict[str, Any], ...]
+    top_memory: Tuple[Dict[str, Any], ...]
+    cpu_percent: float
+    # False for the priming sample: CPU values need two samples
+    cpu_valid: bool
+    sample_ms: float = 0.0
+    _by_name: Dict[str, Tuple[int, ...]] = field(default_factory=dict, repr=False, compare=False)
+    _cmdlines: Dict[int, str] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def count(self) -> int:
+        return len(self.processes)
+
+    @property
+    def age_s(self) -> float:
+        return max(0.0, time.time() - self.taken_at)
+
+    def find_pids(self, name: str) -> List[int]:
+        """Pids whose process name equals `name` (case-insensitive), else contains it."""
+        key = str(name or "").strip().lower()
+        if not key:
+            return []
+        exact = self._by_name.get(key)
+        if exact:
+            return list(exact)
+        return sorted(pid for n, pids in self._by_name.items() if key in n for pid in pids)
+
+    def match_cmdline(self, pattern: str) -> List[int]:
+        """Pids whose full command line matches `pattern`, like `pgrep -f`.
+
+        `pattern` is a regular expression searched in the space-joined argv
+        (the process name when argv is unreadable); an invalid expression is
+        matched as plain text.
+        """
+        pattern = str(pattern or "")
+        if not pattern:
+            return []
+        try:
+            search = re.compile(pattern).search
+        except re.error:
+            search = re.compile(re.escape(pattern)).search
+        return sorted(pid for pid, cmdline in self._cmdlines.items() if search(cmdline))
+
+    def top(self, limit: int = 50, sort_by: str = "cpu") -> List[Dict[str, Any]]:
+        if sort_by == "name":
+            rows = sorted(self.processes, key=lambda x: str(x.get("name", "")).lower())
+        elif sort_by in ("cpu", "memory"):
+            ranked = self.top_cpu if sort_by == "cpu" else self.top_memory
+            if limit <= len(ranked):
+                rows = list(ranked)
+            else:
+                key = "cpu_percent" if sort_by == "cpu" else "memory_percent"
+                rows = sorted(self.processes, key=lambda x: float(x.get(key) or 0.0), reverse=True)
+        else:
+            rows = list(self.processes)
+        return [dict(r) for r in rows[: max(0, int(limit))]]
+
+
+class _Handle:
+    """A Process kept across samples, with its static fields read once."""
+
+    __slots__ = ("proc", "name", "username", "cmdline")
+
+    def __init__(self, proc: "psutil.Process"):
+        self.proc = proc
+        with proc.oneshot():
+            self.name = proc.name()
+            try:
+                self.username = proc.username()
+            except (psutil.AccessDenied, KeyError):
+                self.username = None
+            try:
+                self.cmdline = " ".join(proc.cmdline())
+            except (psutil.AccessDenied, psutil.ZombieProcess):
+                self.cmdline = ""
+        # Prime the CPU counter: the next call returns the delta since now
+        _denied_as_none(proc.cpu_percent, None)
+
+
+def _denied_as_none(fn: Callable[..., Any], *args: Any) -> Any:
+    try:
+        return fn(*args)
+    except psutil.AccessDenied:
+        return None
+
+
+class ProcessSampler:
+    """Samples all processes on a background thread; snapshot() never blocks."""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        top_k: Optional[int] = None,
+        idle_stop_s: Optional[float] = None,
+        process_factory: Callable[[int], "psutil.Process"] = psutil.Process,
+        pids: Callable[[], List[int]] = psutil.pids,
+    ):
+        self.interval = max(0.05, interval if interval is not None else _env_float("PROCESS_SAMPLER_INTERVAL", 2.0))
+        self.top_k = max(1, int(top_k if top_k is not None else _env_float("PROCESS_SAMPLER_TOP_K", 50)))
+        self.idle_stop_s = idle_stop_s if idle_stop_s is not None else _env_float("PROCESS_SAMPLER_IDLE_S", 300.0)
+        self._process_factory = process_factory
+        self._pids = pids
+        self._handles: Dict[int, _Handle] = {}
+        self._snapshot: Optional[ProcessSnapshot] = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._holders = 0
+        self._last_read = time.monotonic()
+        self.samples = 0
+
+    # ---- sampling ----
+
+    def sample_once(self) -> ProcessSnapshot:
+        """Take one sample (on the calling thread) and publish it."""
+        with self._sample_lock:
+            t0 = time.perf_counter()
+            primed = bool(self._handles)
+            seen = set()
+            rows: List[Dict[str, Any]] = []
+            for pid in self._pids():
+                handle = self._handles.get(pid)
+                try:
+                    if handle is None:
+                        handle = _Handle(self._process_factory(pid))
+                        self._handles[pid] = handle
+                        cpu: Optional[float] = 0.0
+                    else:
+                        cpu = _denied_as_none(handle.proc.cpu_percent, None)
+                    mem = _denied_as_none(handle.proc.memory_percent)
+                except psutil.NoSuchProcess:
+                    self._handles.pop(pid, None)
+                    continue
+                except psutil.AccessDenied:
+                    continue
+                seen.add(pid)
+                rows.append({
+                    "pid": pid,
+                    "name": handle.name,
+                    "username": handle.username,
+                    "cpu_percent": None if cpu is None else round(float(cpu), 1),
+                    "memory_percent": None if mem is None else round(float(mem), 3),
+                })
+            for pid in list(self._handles):
+                if pid not in seen:
+                    del self._handles[pid]
+
+            by_name: Dict[str, List[int]] = {}
+            for r in rows:
+                by_name.setdefault(str(r["name"] or "").lower(), []).append(r["pid"])
+            cmdlines = {pid: self._handles[pid].cmdline or str(self._handles[pid].name or "") for pid in seen}
+            snap = ProcessSnapshot(
+                taken_at=time.time(),
+                processes=tuple(rows),
+                top_cpu=tuple(heapq.nlargest(self.top_k, rows, key=lambda r: r["cpu_percent"] or 0.0)),
+                top_memory=tuple(heapq.nlargest(self.top_k, rows, key=lambda r: r["memory_percent"] or 0.0)),
+                cpu_percent=float(psutil.cpu_percent(interval=None)),
+                cpu_valid=primed,
+                sample_ms=round((time.perf_counter() - t0) * 1000.0, 2),
+                _by_name={k: tuple(v) for k, v in by_name.items()},
+                _cmdlines=cmdlines,
+            )
+            # Publishing is a single reference swap; readers never lock
+            self._snapshot = snap
+            self.samples += 1
+            if primed:
+                self._ready.set()
+            return snap
+
+    def _run(self) -> None:
+        # Prime quickly so the first real CPU values arrive soon after start
+        delay = min(self.interval, 0.5)
+        while not self._stop.wait(delay):
+            try:
+                self.sample_once()
+            except Exception:
+                pass
+            delay = self.interval
+            with self._lock:
+                idle = time.monotonic() - self._last_read
+                if self._holders <= 0 and self.idle_stop_s and idle > self.idle_stop_s:
+                    self._thread = None
+                    return
+
+    # ---- lifecycle ----
+
+    @property
+    def running(self) -> bool:
+        t = self._thread
+        return t is not None and t.is_alive()
+
+    def start(self) -> "ProcessSampler":
+        with self._lock:
+            self._last_read = time.monotonic()
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            if self._snapshot is None:
+                try:
+                    self.sample_once()
+                except Exception:
+                    pass
+            self._thread = threading.Thread(target=self._run, name="process-sampler", daemon=True)
+            self._thread.start()
+            return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        t = self._thread
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=2.0)
+        self._thread = None
+
+    def acquire(self) -> "ProcessSampler":
+        """Keep sampling until release(), regardless of reads."""
+        with self._lock:
+            self._holders += 1
+        return self.start()
+
+    def release(self) -> None:
+        with self._lock:
+            self._holders = max(0, self._holders - 1)
+            self._last_read = time.monotonic()
+
+    # ---- reads ----
+
+    def snapshot(self, wait_ready: float = 0.0) -> Optional[ProcessSnapshot]:
+        """Latest snapshot (starting the sampler if needed).
+
+        With wait_ready > 0 and no CPU-valid sample yet, waits up to that long
+        for one; later reads return immediately.
+        """
+        self.start()
+        if wait_ready > 0 and not self._ready.is_set():
+            self._ready.wait(wait_ready)
+        return self._snapshot
+
+
+_sampler: Optional[ProcessSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_process_sampler() -> ProcessSampler:
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = ProcessSampler()
+        return _sampler
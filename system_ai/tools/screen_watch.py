@@ -0,0 +1,229 @@
+"""Event-driven waits on screen changes.
+
+Steps that wait for the UI (a page loading, a dialog appearing, an
+animation finishing) used fixed sleeps. ScreenWatcher samples the screen,
+or a region of it, and returns as soon as the wait condition holds.
+
+Features:
+- Wait modes: "change" (differs from the first sample), "stable" (no
+  change for `stable_ms`) and "change_then_stable"
+- Adaptive sampling: starts at `min_interval` and backs off to
+  `max_interval` while nothing moves; any motion resets it
+- Cheap checks: thumbnail diff with a refined bbox (detect_change from the
+  screenshot manager), then the DifferentialVisionAnalyzer tile-grid diff
+  only for frames that differ, so caret blinks and repaints smaller than a
+  region are ignored
+- Any frame source: the capture service (default) or a callable
+- settle_screen(): drop-in replacement for a fixed UI sleep
+- wait_for_screen(): registry tool wrapper
+
+Environment:
+    VISION_SCREEN_WATCH: use the watcher in place of fixed sleeps (default on)
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from system_ai.tools.frame import Frame
+
+
+WATCH_MODES = ("change", "stable", "change_then_stable")
+
+
+def screen_watch_enabled() -> bool:
+    raw = str(os.getenv("VISION_SCREEN_WATCH") or "").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+@dataclass
+class WatchResult:
+    event: str  # changed | stable | timeout | error
+    elapsed_ms: float
+    samples: int
+    changed: bool = False
+    change_percentage: float = 0.0
+    bbox: Optional[Tuple[int, int, int, int]] = None
+    regions: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.event in ("changed", "stable")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "event": self.event,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "samples": self.samples,
+            "changed": self.changed,
+            "change_percentage": round(self.change_percentage, 4),
+            "bbox": list(self.bbox) if self.bbox else None,
+            "regions": self.regions,
+            "error": self.error,
+        }
+
+
+class ScreenWatcher:
+    """Samples a screen region until a change or stability is observed."""
+
+    def __init__(
+        self,
+        region: Optional[Dict[str, int]] = None,
+        monitor: int = 0,
+        grab: Optional[Callable[[], Any]] = None,
+        analyzer: Any = None,
+        min_interval: float = 0.05,
+        max_interval: float = 0.5,
+        backoff: float = 1.5,
+        min_change: float = 0.0,
+    ):
+        self.region = region
+        self.monitor = monitor
+        self.min_interval = max(0.0, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        self.backoff = max(1.0, float(backoff))
+        self.min_change = float(min_change)
+        self.samples = 0
+        self._grab = grab
+        self._analyzer = analyzer
+
+    def _analyzer_instance(self) -> Any:
+        if self._analyzer is None:
+            from system_ai.tools.vision import EnhancedVisionTools
+
+            self._analyzer = EnhancedVisionTools.get_analyzer()
+        return self._analyzer
+
+    def sample(self) -> Frame:
+        if self._grab is not None:
+            frame = Frame.coerce(self._grab())
+        else:
+            from system_ai.tools.capture import get_capture_service
+
+            frame = get_capture_service().grab(self.region, self.monitor)
+        self.samples += 1
+        return frame
+
+    def compare(self, prev: Frame, curr: Frame) -> Optional[Dict[str, Any]]:
+        """Significant change between two frames (bbox, change_percentage, regions), or None."""
+        if prev.size != curr.size:
+            return {"bbox": (0, 0, curr.width, curr.height), "change_percentage": 100.0, "regions": []}
+        from system_ai.tools.screenshot import detect_change
+
+        bbox = detect_change(prev, curr)
+        if bbox is None:
+            return None
+        diff = self._analyzer_instance()._calculate_frame_diff(prev.bgr, curr.bgr)
+        pct = float(diff.get("global_change_percentage") or 0.0)
+        regions = diff.get("changed_regions") or []
+        if not regions or pct < self.min_change:
+            return None
+        return {"bbox": bbox, "change_percentage": pct, "regions": regions}
+
+    def wait(self, until: str = "change", timeout: float = 5.0, stable_ms: float = 500) -> WatchResult:
+        """Block until `until` holds or `timeout` seconds pass."""
+        if until not in WATCH_MODES:
+            raise ValueError(f"until must be one of {WATCH_MODES}, got {until!r}")
+        start = time.monotonic()
+        deadline = start + max(0.0, float(timeout))
+        stable_s = max(0.0, float(stable_ms)) / 1000.0
+        self.samples = 0
+        last_change: Optional[Dict[str, Any]] = None
+
+        def result(event: str, error: Optional[str] = None) -> WatchResult:
+            change = last_change or {}
+            return WatchResult(
+                event=event,
+                elapsed_ms=(time.monotonic() - start) * 1000.0,
+                samples=self.samples,
+                changed=last_change is not None,
+                change_percentage=float(change.get("change_percentage") or 0.0),
+                bbox=change.get("bbox"),
+                regions=list(change.get("regions") or []),
+                error=error,
+            )
+
+        try:
+            baseline = prev = self.sample()
+        except Exception as e:
+            return result("error", str(e))
+        phase = "stable" if until == "stable" else "change"
+        last_motion = time.monotonic()
+        interval = self.min_interval
+
+        while True:
+            now = time.monotonic()
+            if phase == "stable" and now - last_motion >= stable_s:
+                return result("stable")
+            if now >= deadline:
+                return result("timeout")
+            delay = min(interval, deadline - now)
+            if phase == "stable":
+                # Wake up right when the quiet window would be complete
+                delay = min(delay, last_motion + stable_s - now)
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                frame = self.sample()
+            except Exception as e:
+                return result("error", str(e))
+            change = self.compare(baseline if phase == "change" else prev, frame)
+            if change is None:
+                interval = min(self.max_interval, max(interval, 0.001) * self.backoff)
+                continue
+            last_change = change
+            if until == "change":
+                return result("changed")
+            phase = "stable"
+            prev = frame
+            last_motion = time.monotonic()
+            interval = self.min_interval
+
+
+def settle_screen(
+    timeout: float,
+    until: str = "stable",
+    stable_ms: float = 500,
+    region: Optional[Dict[str, int]] = None,
+    grab: Optional[Callable[[], Any]] = None,
+) -> WatchResult:
+    """Wait for the UI instead of sleeping a fixed `timeout`.
+
+    Returns as soon as `until` holds. When the watcher is disabled or the
+    screen cannot be sampled, it sleeps the rest of `timeout` like the
+    fixed delay it replaces.
+    """
+    if not screen_watch_enabled():
+        time.sleep(max(0.0, float(timeout)))
+        return WatchResult(event="timeout", elapsed_ms=float(timeout) * 1000.0, samples=0)
+    res = ScreenWatcher(region=region, grab=grab).wait(until, timeout, stable_ms)
+    if res.event == "error":
+        time.sleep(max(0.0, float(timeout) - res.elapsed_ms / 1000.0))
+    return res
+
+
+def wait_for_screen(
+    until: str = "change",
+    timeout: float = 5.0,
+    stable_ms: float = 500,
+    x: Optional[int] = None,
+    y: Optional[int] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    monitor: int = 0,
+    min_change: float = 0.0,
+) -> Dict[str, Any]:
+    """Wait until the screen (or a region) changes or becomes stable."""
+    try:
+        region = None
+        if width and height:
+            region = {"left": int(x or 0), "top": int(y or 0), "width": int(width), "height": int(height)}
+        watcher = ScreenWatcher(region=region, monitor=int(monitor), min_change=float(min_change))
+        res = watcher.wait(str(until), float(timeout), float(stable_ms))
+        out = {"tool": "wait_for_screen", "status": "error" if res.event == "error" else "success", "until": until}
+        out.update(res.to_dict())
+        return out
+    except Exception as e:
+        return {"tool": "wait_for_screen", "status": "error", "error": str(e)}
@@ -5,10 +5,14 @@ import tempfile
 import logging
 import traceback
 import datetime
-from typing import Any, Dict, Optional, Tuple, Union, List
-from PIL import Image, ImageChops
-import mss
-import mss.tools
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple, Union, List
+from PIL import Image
+import numpy as np
+
+from system_ai.tools.capture import get_capture_service
+from system_ai.tools.frame import Frame, forget_frame, submit_io
 
 # Module logger
 logger = logging.getLogger(__name__)
@@ -110,15 +114,40 @@ def get_all_windows() -> Dict[str, Any]:
         return {"status": "error", "error": str(e)}
 
 
+# Screenshot retention
+SESSION_LIMIT = 5
+FILE_LIMIT = 20
+# Longest side of the gray thumbnails compared for change detection
+DIFF_THUMB_SIDE = 512
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except Exception:
+        pass
+
+
 class VisionDiffManager:
-    """Manages screenshot lifecycle and calculates differences between frames."""
+    """Manages screenshot lifecycle and calculates differences between frames.
+
+    Saving is handed to the frame writer thread and the files of the current
+    session are tracked in memory, so a screenshot costs the capture plus a
+    thumbnail diff. The directory is only listed when the session changes.
+    """
     _instance = None
-    _last_image: Optional[Image.Image] = None
+    _last_frame: Optional[Frame] = None
     _last_focus: Optional[str] = None 
+    _last_timestamp: int = 0
     _session_id: Optional[str] = None
+    # Refine the thumbnail bbox to exact pixels (diffs only the changed window)
+    refine_bbox: bool = True
 
     def __init__(self):
         self._session_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._session_dir: Optional[str] = None
+        self._session_files: Deque[str] = deque()
+        self._lock = threading.Lock()
 
     @classmethod
     def get_instance(cls):
@@ -160,52 +189,111 @@ class VisionDiffManager:
         except Exception:
             pass
 
-    def process_screenshot(self, current_img: Image.Image, focus_id: str) -> Dict[str, Any]:
+    def _base_dir(self) -> str:
         # Prioritize project data folder if it exists
         project_base_dir = os.path.abspath(".agent/workflows/data/screenshots")
         if not os.path.isdir(os.path.dirname(project_base_dir)):
              # Fallback if .agent/workflows/data doesn't exist
              project_base_dir = os.path.expanduser("~/.antigravity/vision_cache")
-        
-        os.makedirs(project_base_dir, exist_ok=True)
-        
-        # Session rotation (max 5)
-        self._rotate_sessions(project_base_dir, 5)
-        
-        # Session folder
+        return project_base_dir
+
+    def _prepare_session_dir(self) -> str:
+        """Session folder for the next file; rotates and indexes it once per session."""
         sid = self._session_id or "default"
-        session_dir = os.path.join(project_base_dir, sid)
+        session_dir = os.path.join(self._base_dir(), sid)
+        if session_dir == self._session_dir and os.path.isdir(session_dir):
+            return session_dir
+
+        project_base_dir = os.path.dirname(session_dir)
+        os.makedirs(project_base_dir, exist_ok=True)
+        self._rotate_sessions(project_base_dir, SESSION_LIMIT)
         os.makedirs(session_dir, exist_ok=True)
-        
-        # File rotation within session (max 20)
-        self._rotate_files(session_dir, 20)
-        
-        timestamp = int(time.time() * 1000)
-        path = os.path.join(session_dir, f"snap_{timestamp}.jpg")
-        
-        # Save current frame
-        current_img.convert("RGB").save(path, "JPEG", quality=85)
-        
+        self._rotate_files(session_dir, FILE_LIMIT)
+        try:
+            files = [os.path.join(session_dir, f) for f in os.listdir(session_dir)]
+            files = [f for f in files if os.path.isfile(f)]
+            files.sort(key=os.path.getmtime)
+        except Exception:
+            files = []
+        self._session_dir = session_dir
+        self._session_files = deque(files)
+        return session_dir
+
+    def _track_file(self, path: str) -> None:
+        """Add `path` to the session index and drop the oldest files past FILE_LIMIT."""
+        self._session_files.append(path)
+        while len(self._session_files) > FILE_LIMIT:
+            old = self._session_files.popleft()
+            forget_frame(old)
+            # Queued behind pending writes, so an old file is never unlinked before it exists
+            submit_io(_unlink_quietly, old)
+
+    def process_screenshot(self, current_img: Union[Frame, Image.Image], focus_id: str, refine: Optional[bool] = None) -> Dict[str, Any]:
+        frame = Frame.coerce(current_img, focus_id=focus_id)
+
+        with self._lock:
+            session_dir = self._prepare_session_dir()
+            # Unique per frame even for bursts captured within the same millisecond
+            timestamp = max(int(time.time() * 1000), self._last_timestamp + 1)
+            self._last_timestamp = timestamp
+            path = os.path.join(session_dir, f"snap_{timestamp}.jpg")
+
+            # Kept in memory for diff/OCR/LLM consumers of `path`; written by the frame writer
+            frame.persist(path, "JPEG", quality=85)
+            self._track_file(path)
+
+            last, last_focus = self._last_frame, self._last_focus
+            self._last_frame = frame
+            self._last_focus = focus_id
+
         mode = "initial"
         bbox = None
-        
-        if self._last_image and self._last_focus == focus_id and self._last_image.size == current_img.size:
-            diff = ImageChops.difference(current_img, self._last_image)
-            bbox = diff.getbbox()
+        if last is not None and last_focus == focus_id and last.size == frame.size:
+            bbox = detect_change(last, frame, self.refine_bbox if refine is None else refine)
             if bbox:
                 mode = "update"
             else:
                 mode = "no_change"
         
-        self._last_image = current_img
-        self._last_focus = focus_id
-        
         return {
             "path": path,
             "mode": mode,
             "bbox": bbox
         }
 
+
+def detect_change(last: Frame, frame: Frame, refine: bool = True) -> Optional[Tuple[int, int, int, int]]:
+    """Changed bbox (left, upper, right, lower) in full-resolution pixels, or None."""
+    if max(frame.size) <= DIFF_THUMB_SIDE:
+        return _diff_bbox(last.bgr, frame.bgr)
+    prev_small, curr_small = last.thumbnail(DIFF_THUMB_SIDE), frame.thumbnail(DIFF_THUMB_SIDE)
+    coarse = _diff_bbox(prev_small, curr_small)
+    if coarse is None:
+        return None
+    th, tw = curr_small.shape[:2]
+    # One thumbnail pixel of slack on each side: area resampling blends neighbours
+    sx, sy = frame.width / tw, frame.height / th
+    left = max(0, int((coarse[0] - 1) * sx))
+    upper = max(0, int((coarse[1] - 1) * sy))
+    right = min(frame.width, int(np.ceil((coarse[2] + 1) * sx)))
+    lower = min(frame.height, int(np.ceil((coarse[3] + 1) * sy)))
+    if not refine:
+        return left, upper, right, lower
+    fine = _diff_bbox(last.bgr[upper:lower, left:right], frame.bgr[upper:lower, left:right])
+    if fine is None:
+        return None
+    return fine[0] + left, fine[1] + upper, fine[2] + left, fine[3] + upper
+
+
+def _diff_bbox(prev: np.ndarray, curr: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """Bounding box (left, upper, right, lower) of differing pixels, like PIL getbbox()."""
+    changed = np.any(prev != curr, axis=2) if curr.ndim == 3 else prev != curr
+    rows = np.flatnonzero(changed.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(changed[rows[0]:rows[-1] + 1].any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
 def take_screenshot(app_name: Optional[str] = None, window_title: Optional[str] = None, activate: bool = False, use_frontmost: bool = False) -> Dict[str, Any]:
     """Takes a smart screenshot of an application or the full screen."""
     try:
@@ -277,26 +365,29 @@ def _build_focus_id(app_name: Optional[str], window_title: Optional[str]) -> str
     fid = f"APP_{app_name}"
     return fid + f"_{window_title}" if window_title else fid
 
-def _capture_with_mss(region: Optional[Dict[str, int]]) -> Tuple[Optional[Image.Image], Optional[str]]:
+def _capture_with_mss(region: Optional[Dict[str, int]]) -> Tuple[Optional[Frame], Optional[str]]:
     last_err = "Unknown error"
     try:
-        with mss.mss() as sct:
-            monitor = sct.monitors[0]
-            # Try a few times because sometimes the display is busy
-            for _ in range(2):
-                try:
-                    sct_img = sct.grab(region or monitor)
-                    img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-                    return img, None
-                except Exception as e:
-                    last_err = str(e)
-                    time.sleep(0.2)
-            return None, last_err
+        svc = get_capture_service()
+        # Try a few times because sometimes the display is busy
+        for _ in range(2):
+            try:
+                return svc.grab(region), None
+            except Exception as e:
+                last_err = str(e)
+                time.sleep(0.2)
+        return None, last_err
     except Exception as e:
         tb = traceback.format_exc()
         logger.exception("mss capture failed")
         return None, f"{str(e)}\n{tb}"
 
+
+def capture_frame(app_name: Optional[str] = None, window_title: Optional[str] = None) -> Tuple[Optional[Frame], Optional[str]]:
+    """Capture an app window (or the full screen) as an in-memory frame, without saving it."""
+    region = _get_app_geometry(app_name, window_title) if app_name else None
+    return _capture_with_mss(region)
+
 def _capture_with_fallback(app_name, window_title, mss_error, manager, focus_id):
     try:
         fd, tmp_path = tempfile.mkstemp(suffix=".png")
@@ -316,8 +407,10 @@ def _capture_with_fallback(app_name, window_title, mss_error, manager, focus_id)
             return {"tool": "take_screenshot", "status": "error", "error": "screencapture failed to create file"}
 
         try:
-            img = Image.open(tmp_path)
-            res = manager.process_screenshot(img, focus_id)
+            frame = Frame.from_path(tmp_path)
+            if frame is None:
+                return {"tool": "take_screenshot", "status": "error", "error": "screencapture produced an unreadable file"}
+            res = manager.process_screenshot(frame, focus_id)
             return _build_success_response("take_screenshot", res, focus_id)
         finally:
             if os.path.exists(tmp_path):
@@ -375,29 +468,41 @@ def _get_app_geometry(app_name: str, window_title: Optional[str] = None) -> Opti
         pass
     return None
 
+def save_region_frame(frame: Frame) -> str:
+    """Persist a region capture to the vision cache directory; returns its path."""
+    output_dir = os.path.expanduser("~/.antigravity/vision_cache")
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"region_{int(time.time())}.png")
+    frame.persist(path, "PNG")
+    return path
+
 def capture_screen_region(x: int, y: int, width: int, height: int) -> Dict[str, Any]:
     """Capture a specific region of the screen."""
     try:
         region = {"left": int(x), "top": int(y), "width": int(width), "height": int(height)}
-        with mss.mss() as sct:
-            sct_img = sct.grab(region)
-            img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-            
-        output_dir = os.path.expanduser("~/.antigravity/vision_cache")
-        os.makedirs(output_dir, exist_ok=True)
-        path = os.path.join(output_dir, f"region_{int(time.time())}.png")
-        img.save(path)
-        
-        return {"tool": "capture_screen_region", "status": "success", "path": path}
+        frame = get_capture_service().grab(region)
+        return {"tool": "capture_screen_region", "status": "success", "path": save_region_frame(frame)}
     except Exception as e:
         return {"tool": "capture_screen_region", "status": "error", "error": str(e)}
 
 def take_burst_screenshot(app_name: Optional[str] = None, count: int = 3, interval: float = 0.3) -> Dict[str, Any]:
     """Take multiple screenshots in rapid succession."""
-    paths = []
-    for _ in range(count):
-        res = take_screenshot(app_name)
-        if res["status"] == "success":
-            paths.append(res["path"])
-        time.sleep(interval)
+    # Resolve the window once and capture on a fixed schedule; frames are
+    # saved after the burst so disk writes do not stretch the intervals.
+    region = _get_app_geometry(app_name) if app_name else None
+    try:
+        frames = get_capture_service().burst(count, interval, region)
+    except Exception:
+        # mss unavailable: fall back to individual screenshots
+        paths = []
+        for _ in range(count):
+            res = take_screenshot(app_name)
+            if res["status"] == "success":
+                paths.append(res["path"])
+            time.sleep(interval)
+        return {"tool": "take_burst_screenshot", "status": "success", "paths": paths}
+
+    manager = VisionDiffManager.get_instance()
+    focus_id = _build_focus_id(app_name, None)
+    paths = [manager.process_screenshot(frame, focus_id)["path"] for frame in frames]
     return {"tool": "take_burst_screenshot", "status": "success", "paths": paths}
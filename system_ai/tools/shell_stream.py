@@ -0,0 +1,313 @@
+"""Streaming shell execution.
+
+run_shell used to call subprocess.run(capture_output=True) with no timeout:
+the whole output was held in memory (then cut to the last 8000 chars) and a
+command waiting on input or a server that never exits blocked the caller
+forever. run_streaming() reads the pipes as data arrives and keeps only
+what is returned.
+
+Features:
+- Popen in its own session/process group, stdin closed (prompts fail fast
+  instead of hanging on the terminal)
+- One reader thread per pipe (os.read returns whatever is available), so
+  stdout and stderr never block each other
+- OutputBuffer: bounded head + tail per stream, total byte count, the
+  middle dropped with a marker
+- Wall-clock timeout and idle-output timeout; the whole process group is
+  sent SIGTERM, then SIGKILL after a grace period
+- on_chunk(stream, text) callback with incrementally decoded text;
+  LineEmitter turns it into complete lines for a log panel
+
+Environment:
+    RUN_SHELL_TIMEOUT: wall-clock limit in seconds (default 600, 0 = none)
+    RUN_SHELL_IDLE_TIMEOUT: limit without any output (default 300, 0 = none)
+"""
+
+import codecs
+import os
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+CHUNK_SIZE = 64 * 1024
+HEAD_BYTES = 2000
+TAIL_BYTES = 6000
+KILL_GRACE_S = 2.0
+# After the shell exits, background children may still hold the pipes open
+DRAIN_TIMEOUT_S = 2.0
+
+ChunkCallback = Callable[[str, str], None]
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def default_timeout() -> float:
+    return _env_seconds("RUN_SHELL_TIMEOUT", 600.0)
+
+
+def default_idle_timeout() -> float:
+    return _env_seconds("RUN_SHELL_IDLE_TIMEOUT", 300.0)
+
+
+class OutputBuffer:
+    """First `head_bytes` and last `tail_bytes` of a byte stream."""
+
+    def __init__(self, head_bytes: int = HEAD_BYTES, tail_bytes: int = TAIL_BYTES):
+        self.head_bytes = max(0, int(head_bytes))
+        self.tail_bytes = max(0, int(tail_bytes))
+        self.head = bytearray()
+        self._tail = bytearray()
+        self.total = 0
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data and self.tail_bytes:
+            self._tail += data
+            # Trim in batches: amortised O(1) per byte
+            if len(self._tail) > 2 * self.tail_bytes:
+                del self._tail[: len(self._tail) - self.tail_bytes]
+
+    @property
+    def tail(self) -> bytes:
+        return bytes(self._tail[-self.tail_bytes:]) if self.tail_bytes else b""
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+    def text(self) -> str:
+        head = bytes(self.head).decode("utf-8", errors="replace")
+        tail = self.tail
+        if not self.dropped:
+            return head + tail.decode("utf-8", errors="replace")
+        # Don't start the tail in the middle of a UTF-8 sequence
+        skip = 0
+        while skip < min(3, len(tail)) and 0x80 <= tail[skip] < 0xC0:
+            skip += 1
+        marker = f"\n... [{self.dropped} bytes omitted] ...\n"
+        return head + marker + tail[skip:].decode("utf-8", errors="replace")
+
+
+class LineEmitter:
+    """on_chunk adapter that forwards complete lines to `sink(stream, line)`.
+
+    At most `max_lines` lines are forwarded per stream so a noisy command
+    cannot flood a log panel; flush() emits a trailing partial line.
+    """
+
+    def __init__(self, sink: Callable[[str, str], None], max_lines: int = 200):
+        self.sink = sink
+        self.max_lines = max_lines
+        self._partial: Dict[str, str] = {}
+        self._count: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _emit(self, stream: str, line: str) -> None:
+        n = self._count.get(stream, 0)
+        self._count[stream] = n + 1
+        if n < self.max_lines:
+            self.sink(stream, line)
+        elif n == self.max_lines:
+            self.sink(stream, "... (further output not shown)")
+
+    def __call__(self, stream: str, text: str) -> None:
+        with self._lock:
+            lines = (self._partial.pop(stream, "") + text).split("\n")
+            self._partial[stream] = lines.pop()
+            for line in lines:
+                self._emit(stream, line.rstrip("\r"))
+
+    def flush(self) -> None:
+        with self._lock:
+            for stream, rest in list(self._partial.items()):
+                if rest:
+                    self._emit(stream, rest)
+            self._partial.clear()
+
+
+@dataclass
+class StreamingResult:
+    returncode: Optional[int]
+    stdout: OutputBuffer
+    stderr: OutputBuffer
+    duration_s: float
+    timed_out: Optional[str] = None  # "timeout" | "idle_timeout"
+    error: Optional[str] = None
+    pid: Optional[int] = None
+    chunks: int = 0
+
+    @property
+    def truncated(self) -> bool:
+        return bool(self.stdout.dropped or self.stderr.dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "duration_s": round(self.duration_s, 3),
+            "stdout_bytes": self.stdout.total,
+            "stderr_bytes": self.stderr.total,
+            "truncated": self.truncated,
+        }
+
+
+@dataclass
+class _Activity:
+    last: float = field(default_factory=time.monotonic)
+    chunks: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def touch(self) -> None:
+        with self.lock:
+            self.last = time.monotonic()
+            self.chunks += 1
+
+
+def _pump(fd: int, name: str, buf: OutputBuffer, activity: _Activity, on_chunk: Optional[ChunkCallback]) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace") if on_chunk else None
+    try:
+        while True:
+            data = os.read(fd, CHUNK_SIZE)
+            if not data:
+                break
+            buf.write(data)
+            activity.touch()
+            if decoder is not None:
+                text = decoder.decode(data)
+                if text:
+                    try:
+                        on_chunk(name, text)
+                    except Exception:
+                        pass
+    except OSError:
+        pass
+    finally:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _kill_group(proc: subprocess.Popen, grace: float = KILL_GRACE_S) -> None:
+    """SIGTERM the process group, SIGKILL whatever is left after `grace`."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(proc.pid, sig)
+            elif sig == signal.SIGTERM:
+                proc.terminate()
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        try:
+            proc.wait(timeout=grace)
+            if sig == signal.SIGTERM and hasattr(os, "killpg"):
+                # The shell is gone; make sure its children are too
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except (ProcessLookupError, PermissionError, OSError):
+                    pass
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def run_streaming(
+    command: str,
+    *,
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = None,
+    idle_timeout: Optional[float] = None,
+    head_bytes: int = HEAD_BYTES,
+    tail_bytes: int = TAIL_BYTES,
+    on_chunk: Optional[ChunkCallback] = None,
+    env: Optional[Dict[str, str]] = None,
+    poll_interval: float = 0.05,
+) -> StreamingResult:
+    """Run a shell command with bounded output capture and timeouts.
+
+    `timeout`/`idle_timeout` default to RUN_SHELL_TIMEOUT/RUN_SHELL_IDLE_TIMEOUT;
+    0 disables a limit. on_chunk is called from the reader threads.
+    """
+    timeout = default_timeout() if timeout is None else max(0.0, float(timeout))
+    idle_timeout = default_idle_timeout() if idle_timeout is None else max(0.0, float(idle_timeout))
+    out, err = OutputBuffer(head_bytes, tail_bytes), OutputBuffer(head_bytes, tail_bytes)
+    started = time.monotonic()
+    try:
+        proc = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=cwd or os.getcwd(),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+    except Exception as e:
+        return StreamingResult(None, out, err, time.monotonic() - started, error=str(e))
+
+    activity = _Activity()
+    readers: List[threading.Thread] = []
+    for name, pipe, buf in (("stdout", proc.stdout, out), ("stderr", proc.stderr, err)):
+        # Readers own the raw fds; detach so the file objects don't close them too
+        fd = os.dup(pipe.fileno())
+        pipe.close()
+        t = threading.Thread(target=_pump, args=(fd, name, buf, activity, on_chunk), name=f"run_shell-{name}", daemon=True)
+        t.start()
+        readers.append(t)
+
+    timed_out: Optional[str] = None
+    while True:
+        try:
+            proc.wait(timeout=poll_interval)
+            break
+        except subprocess.TimeoutExpired:
+            pass
+        now = time.monotonic()
+        if timeout and now - started >= timeout:
+            timed_out = "timeout"
+        elif idle_timeout and now - activity.last >= idle_timeout:
+            timed_out = "idle_timeout"
+        if timed_out:
+            _kill_group(proc)
+            break
+
+    drain_until = time.monotonic() + DRAIN_TIMEOUT_S
+    for t in readers:
+        t.join(timeout=max(0.0, drain_until - time.monotonic()))
+
+    flush = getattr(on_chunk, "flush", None)
+    if callable(flush):
+        try:
+            flush()
+        except Exception:
+            pass
+
+    error = None
+    if timed_out == "timeout":
+        error = f"Command timed out after {timeout:g}s"
+    elif timed_out == "idle_timeout":
+        error = f"Command produced no output for {idle_timeout:g}s"
+    return StreamingResult(
+        proc.returncode,
+        out,
+        err,
+        time.monotonic() - started,
+        timed_out=timed_out,
+        error=error,
+        pid=proc.pid,
+        chunks=activity.chunks,
+    )
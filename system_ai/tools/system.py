@@ -7,6 +7,8 @@ import psutil
 import time
 from typing import Dict, Any, List, Optional
 
+from system_ai.tools.process_sampler import get_process_sampler
+
 def list_processes(limit: int = 50, sort_by: str = "cpu") -> List[Dict[str, Any]]:
     """List running processes
     
@@ -17,22 +19,11 @@ def list_processes(limit: int = 50, sort_by: str = "cpu") -> List[Dict[str, Any]
     Returns:
         List of process dictionaries
     """
-    procs = []
-    for p in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent']):
-        try:
-            procs.append(p.info)
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
-
-    # Sort
-    if sort_by == "cpu":
-        procs.sort(key=lambda x: float(x.get('cpu_percent') or 0.0), reverse=True)
-    elif sort_by == "memory":
-        procs.sort(key=lambda x: float(x.get('memory_percent') or 0.0), reverse=True)
-    elif sort_by == "name":
-        procs.sort(key=lambda x: str(x.get('name', '')).lower())
-
-    return procs[:limit]
+    # CPU% needs two samples; only the very first call waits for the second one
+    snap = get_process_sampler().snapshot(wait_ready=1.0 if sort_by == "cpu" else 0.0)
+    if snap is None:
+        return []
+    return snap.top(limit, sort_by)
 
 def kill_process(pid: int) -> Dict[str, Any]:
     """Terminate a process by PID
@@ -82,12 +73,14 @@ def get_system_stats() -> Dict[str, Any]:
     Returns:
         Dict with CPU, memory, and disk info
     """
+    snap = get_process_sampler().snapshot(wait_ready=1.0)
     mem = psutil.virtual_memory()
     disk = psutil.disk_usage('/')
     
     return {
         "tool": "get_system_stats",
-        "cpu_percent": psutil.cpu_percent(interval=0.1),
+        "cpu_percent": snap.cpu_percent if snap is not None else psutil.cpu_percent(interval=0.1),
+        "process_count": snap.count if snap is not None else len(psutil.pids()),
         "memory_percent": mem.percent,
         "memory_total_gb": round(mem.total / (1024**3), 2),
         "memory_available_gb": round(mem.available / (1024**3), 2),
@@ -0,0 +1,324 @@
+"""Template matching engine for find_image_on_screen.
+
+Features:
+- TemplateCache: decoded templates with pre-built pyramids and scaled
+  variants, keyed by (path, mtime, size) so edited files are reloaded
+- Coarse-to-fine search: candidates from a downscaled gray pyramid level,
+  verified with TM_CCOEFF_NORMED at full resolution in small windows
+- ROI hints: explicit regions (window bounds) and the last match location
+  of each template are searched before the full frame
+- Multi-scale mode for HiDPI (Retina captures are 2x the template size)
+- Batch matching of several templates against one frame; screen pyramids
+  are cached on the frame and shared
+
+Works on any Frame (live capture or a saved screenshot).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import cv2  # type: ignore
+import numpy as np
+
+from system_ai.tools.frame import Frame
+
+
+Region = Dict[str, int]
+
+# Scales tried by multi-scale matching (template size relative to the file)
+DEFAULT_SCALES: Tuple[float, ...] = (1.0, 2.0, 0.5, 1.5, 0.75)
+# Coarse levels keep the template at least this many pixels on its short side
+MIN_COARSE_SIDE = 12
+COARSE_CANDIDATES = 3
+# A coarse score below threshold - margin is not worth verifying
+COARSE_MARGIN = 0.25
+
+
+@dataclass
+class Template:
+    path: str
+    bgr: np.ndarray
+    gray: np.ndarray
+    _scaled: Dict[float, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+    _pyramid: Dict[Tuple[float, int], np.ndarray] = field(default_factory=dict)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return int(self.bgr.shape[1]), int(self.bgr.shape[0])
+
+    def scaled(self, scale: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(bgr, gray) at `scale`."""
+        if scale == 1.0:
+            return self.bgr, self.gray
+        if scale not in self._scaled:
+            w, h = self.size
+            size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+            interp = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            bgr = cv2.resize(self.bgr, size, interpolation=interp)
+            self._scaled[scale] = (bgr, cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY))
+        return self._scaled[scale]
+
+    def level(self, scale: float, level: int) -> np.ndarray:
+        """Gray template at pyramid `level` (each level halves the size)."""
+        key = (scale, level)
+        if key not in self._pyramid:
+            gray = self.scaled(scale)[1]
+            for _ in range(level):
+                gray = cv2.pyrDown(gray)
+            self._pyramid[key] = gray
+        return self._pyramid[key]
+
+
+class TemplateCache:
+    """LRU of decoded templates keyed by path and file stat."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[Tuple[str, int, int], Template]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> Optional[Template]:
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            tpl = self._entries.get(key)
+            if tpl is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return tpl
+        tpl = self._load(path)
+        if tpl is None:
+            return None
+        with self._lock:
+            self.misses += 1
+            for old in [k for k in self._entries if k[0] == path]:
+                del self._entries[old]
+            self._entries[key] = tpl
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return tpl
+
+    @staticmethod
+    def _load(path: str) -> Optional[Template]:
+        img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if img is None or img.size == 0:
+            return None
+        if img.ndim == 2:
+            bgr = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        elif img.shape[2] == 4:
+            bgr = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        else:
+            bgr = img
+        return Template(path=path, bgr=bgr, gray=cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def _screen_level(frame: Frame, level: int) -> np.ndarray:
+    """Gray screen at pyramid `level`, cached on the frame."""
+
+    def build():
+        gray = frame.gray
+        for _ in range(level):
+            gray = cv2.pyrDown(gray)
+        return gray
+
+    return frame._cached(("gray_pyr", level), build) if level else frame.gray
+
+
+def _clip(region: Region, width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+    x0 = max(0, int(region.get("x", region.get("left", 0))))
+    y0 = max(0, int(region.get("y", region.get("top", 0))))
+    x1 = min(width, x0 + int(region.get("width", width)))
+    y1 = min(height, y0 + int(region.get("height", height)))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1, y1
+
+
+def _top_peaks(result: np.ndarray, k: int, suppress: Tuple[int, int]) -> List[Tuple[float, Tuple[int, int]]]:
+    """Best `k` maxima of a matchTemplate result with non-maximum suppression."""
+    res = result.copy()
+    peaks = []
+    sw, sh = max(1, suppress[0]), max(1, suppress[1])
+    for _ in range(k):
+        _min_val, max_val, _min_loc, max_loc = cv2.minMaxLoc(res)
+        if not np.isfinite(max_val):
+            break
+        peaks.append((float(max_val), max_loc))
+        x, y = max_loc
+        res[max(0, y - sh):y + sh + 1, max(0, x - sw):x + sw + 1] = -1.0
+    return peaks
+
+
+class TemplateMatcher:
+    """Coarse-to-fine, multi-scale template search over frames."""
+
+    def __init__(self, cache: Optional[TemplateCache] = None):
+        self.cache = cache or TemplateCache()
+        self._last: Dict[str, Tuple[int, int, int, int]] = {}  # path -> last match box
+        self.searches = 0
+        self.full_searches = 0
+
+    # ---- core search ----
+
+    def _exact(self, screen_bgr: np.ndarray, tpl_bgr: np.ndarray, box: Tuple[int, int, int, int]) -> Tuple[float, Tuple[int, int]]:
+        """Best full-resolution match whose top-left lies inside the window `box`."""
+        x0, y0, x1, y1 = box
+        th, tw = tpl_bgr.shape[:2]
+        sh, sw = screen_bgr.shape[:2]
+        x1, y1 = min(sw, x1 + tw), min(sh, y1 + th)
+        if x1 - x0 < tw or y1 - y0 < th:
+            return -1.0, (0, 0)
+        result = cv2.matchTemplate(screen_bgr[y0:y1, x0:x1], tpl_bgr, cv2.TM_CCOEFF_NORMED)
+        _min_val, max_val, _min_loc, max_loc = cv2.minMaxLoc(result)
+        return float(max_val), (x0 + max_loc[0], y0 + max_loc[1])
+
+    def _search(self, frame: Frame, tpl: Template, scale: float, box: Tuple[int, int, int, int], threshold: float, coarse: bool) -> Tuple[float, Tuple[int, int]]:
+        screen_bgr = frame.bgr
+        tpl_bgr, _tpl_gray = tpl.scaled(scale)
+        th, tw = tpl_bgr.shape[:2]
+        x0, y0, x1, y1 = box
+        if x1 - x0 < tw or y1 - y0 < th:
+            return -1.0, (0, 0)
+
+        level = 0
+        if coarse:
+            while min(th, tw) >> (level + 1) >= MIN_COARSE_SIDE and level < 4:
+                level += 1
+        if level == 0:
+            self.full_searches += 1
+            return self._exact(screen_bgr, tpl_bgr, (x0, y0, x1 - tw, y1 - th))
+
+        f = 1 << level
+        if (x0, y0, x1, y1) == (0, 0, frame.width, frame.height):
+            small_screen = _screen_level(frame, level)
+        else:
+            # ROI windows: pyramid of the crop only
+            small_screen = cv2.cvtColor(screen_bgr[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+            for _ in range(level):
+                small_screen = cv2.pyrDown(small_screen)
+        small_tpl = tpl.level(scale, level)
+        if small_screen.shape[0] < small_tpl.shape[0] or small_screen.shape[1] < small_tpl.shape[1]:
+            return self._exact(screen_bgr, tpl_bgr, (x0, y0, x1 - tw, y1 - th))
+        result = cv2.matchTemplate(small_screen, small_tpl, cv2.TM_CCOEFF_NORMED)
+
+        best = (-1.0, (0, 0))
+        pad = 2 * f
+        for score, (cx, cy) in _top_peaks(result, COARSE_CANDIDATES, (small_tpl.shape[1] // 2, small_tpl.shape[0] // 2)):
+            if score < threshold - COARSE_MARGIN and best[0] >= 0:
+                break
+            px, py = x0 + cx * f, y0 + cy * f
+            window = (max(x0, px - pad), max(y0, py - pad), min(x1 - tw, px + pad), min(y1 - th, py + pad))
+            found = self._exact(screen_bgr, tpl_bgr, window)
+            if found[0] > best[0]:
+                best = found
+            if best[0] >= threshold:
+                break
+        return best
+
+    # ---- public API ----
+
+    def match(
+        self,
+        frame: Frame,
+        template_path: str,
+        threshold: float = 0.9,
+        roi: Optional[Region] = None,
+        scales: Optional[Sequence[float]] = None,
+        use_last: bool = True,
+        exhaustive: bool = True,
+    ) -> Dict[str, Any]:
+        """Find `template_path` in `frame`.
+
+        Search order: ROI hint, last match location, whole frame (coarse to
+        fine). With `exhaustive` a miss is confirmed by a full-resolution
+        pass, so results agree with a single full matchTemplate.
+        """
+        tpl = self.cache.get(template_path)
+        if tpl is None:
+            return {"status": "error", "error": f"Failed to load template: {template_path}"}
+        self.searches += 1
+        sw, sh = frame.size
+        scale_list = list(scales) if scales else [1.0]
+        tw0, th0 = tpl.size
+        if all(int(round(tw0 * s)) > sw or int(round(th0 * s)) > sh for s in scale_list):
+            return {"status": "success", "found": False, "confidence": 0.0, "reason": "template_larger_than_screen"}
+
+        hints: List[Tuple[str, Tuple[int, int, int, int]]] = []
+        if roi:
+            box = _clip(roi, sw, sh)
+            if box:
+                hints.append(("roi", box))
+        last = self._last.get(tpl.path) if use_last else None
+        if last:
+            lx, ly, lw, lh = last
+            margin = max(lw, lh) // 2
+            box = _clip({"x": lx - margin, "y": ly - margin, "width": lw + 2 * margin, "height": lh + 2 * margin}, sw, sh)
+            if box:
+                hints.append(("last_match", box))
+        hints.append(("full", (0, 0, sw, sh)))
+
+        best = (-1.0, (0, 0), 1.0, "full")
+        for source, box in hints:
+            for scale in scale_list:
+                score, loc = self._search(frame, tpl, scale, box, threshold, coarse=True)
+                if score > best[0]:
+                    best = (score, loc, scale, source)
+                if best[0] >= threshold:
+                    break
+            if best[0] >= threshold:
+                break
+
+        if best[0] < threshold and exhaustive:
+            for scale in scale_list:
+                score, loc = self._search(frame, tpl, scale, (0, 0, sw, sh), threshold, coarse=False)
+                if score > best[0]:
+                    best = (score, loc, scale, "full")
+
+        confidence, (mx, my), scale, source = best
+        confidence = max(0.0, confidence)
+        if confidence < threshold:
+            return {"status": "success", "found": False, "confidence": confidence}
+        tw, th = tpl.scaled(scale)[0].shape[1], tpl.scaled(scale)[0].shape[0]
+        self._last[tpl.path] = (mx, my, tw, th)
+        return {
+            "status": "success",
+            "found": True,
+            "x": int(mx + tw // 2),
+            "y": int(my + th // 2),
+            "confidence": confidence,
+            "scale": scale,
+            "source": source,
+            "match": {"x": int(mx), "y": int(my), "width": int(tw), "height": int(th)},
+        }
+
+    def match_many(self, frame: Frame, template_paths: Iterable[str], threshold: float = 0.9, **kwargs) -> Dict[str, Dict[str, Any]]:
+        """Match several templates against one frame (screen pyramids are shared)."""
+        return {p: self.match(frame, p, threshold, **kwargs) for p in template_paths}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"searches": self.searches, "full_searches": self.full_searches, "templates": self.cache.stats()}
+
+
+_matcher: Optional[TemplateMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_template_matcher() -> TemplateMatcher:
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = TemplateMatcher()
+        return _matcher
@@ -4,10 +4,13 @@ import json
 import tempfile
 import subprocess
 import hashlib
-from typing import Any, Dict, Optional, List
+import math
+from typing import Any, Dict, Optional, List, Tuple
 from datetime import datetime
 import numpy as np
 
+from system_ai.tools.frame import Frame, ensure_file, get_frame, load_frame
+from system_ai.tools.frame_cache import get_frame_cache
 
 
 def analyze_image_local(image_path: str, *, mode: str = "auto") -> Dict[str, Any]:
@@ -36,7 +39,7 @@ def summarize_image_for_prompt(image_path: str) -> str:
 
 
 def load_image_b64(image_path: str) -> Optional[str]:
-    if not image_path or not os.path.exists(image_path):
+    if not image_path or not ensure_file(image_path):
         return None
     try:
         with open(image_path, "rb") as f:
@@ -52,38 +55,23 @@ def load_image_png_b64(image_path: str, max_dimension: int = 1024, max_side_limi
     We also resize to max_dimension (default 1024px) to avoid HTTP 413 errors.
     Additionally, we ensure no side exceeds max_side_limit (default 3800px) for Claude API compatibility.
     """
+    frame = get_frame(image_path)
+    if frame is not None:
+        # Captured in this process: encode straight from memory
+        try:
+            return frame.png_b64(max_dimension, max_side_limit)
+        except Exception:
+            pass
+
     if not image_path or not os.path.exists(image_path):
         return None
 
     try:
         from PIL import Image  # type: ignore
 
-        img = Image.open(image_path)
-        
-        # First, ensure no side exceeds Claude API limit (4000px, we use 3800 for safety margin)
-        width, height = img.size
-        if width > max_side_limit or height > max_side_limit:
-            ratio = min(max_side_limit / width, max_side_limit / height)
-            new_size = (int(width * ratio), int(height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            width, height = img.size
-        
-        # Then resize to max_dimension if still too large
-        if width > max_dimension or height > max_dimension:
-            ratio = min(max_dimension / width, max_dimension / height)
-            new_size = (int(width * ratio), int(height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            tmp_path = f.name
-        try:
-            img.save(tmp_path, format="PNG")
-            return load_image_b64(tmp_path)
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except Exception:
-                pass
+        with Image.open(image_path) as img:
+            frame = Frame.from_pil(img)
+        return frame.png_b64(max_dimension, max_side_limit)
     except Exception:
         pass
 
@@ -110,12 +98,35 @@ def load_image_png_b64(image_path: str, max_dimension: int = 1024, max_side_limi
 
     return None
 
-def analyze_with_copilot(image_path: str = None, prompt: str = "Describe the user interface state in detail.") -> Dict[str, Any]:
+def _frame_for_llm(image_path: str) -> Optional[Frame]:
+    """In-memory frame for `image_path`, decoding formats OpenCV cannot read via load_image_png_b64."""
+    frame = load_frame(image_path)
+    if frame is not None:
+        return frame
+    b64 = load_image_png_b64(image_path, max_dimension=8192, max_side_limit=None)
+    if not b64:
+        return None
+    import cv2
+
+    arr = cv2.imdecode(np.frombuffer(base64.b64decode(b64), dtype=np.uint8), cv2.IMREAD_COLOR)
+    return Frame(arr, "BGR") if arr is not None else None
+
+
+def analyze_with_copilot(
+    image_path: str = None,
+    prompt: str = "Describe the user interface state in detail.",
+    prompts: Optional[List[str]] = None,
+    regions: Optional[List[Any]] = None,
+) -> Dict[str, Any]:
     """
     Uses CopilotLLM (GPT-4-Vision) to analyze a local image file.
     If image_path is none or doesn't exist, takes a fresh screenshot first.
+
+    `prompts` asks several questions about the same screen in one call
+    (answers are returned per question); `regions` (diff bboxes) crops the
+    image to the changed areas plus a small overview.
     """
-    if not image_path or not os.path.exists(image_path):
+    if not image_path or (get_frame(image_path) is None and not os.path.exists(image_path)):
         from system_ai.tools.screenshot import take_screenshot
         res = take_screenshot()
         if res.get("status") != "success":
@@ -123,54 +134,160 @@ def analyze_with_copilot(image_path: str = None, prompt: str = "Describe the use
         image_path = res.get("path")
         
     try:
-        from providers.copilot import CopilotLLM
-        from langchain_core.messages import HumanMessage
-        
-        # Initialize specialized Vision LLM
-        # We assume CopilotLLM handles the image_url payload format for its API
-        llm = CopilotLLM(vision_model_name="gpt-4.1") 
-        
-        # Encode image
-        b64 = load_image_png_b64(image_path)
-        if not b64:
+        from system_ai.tools.vision_request import VisionRequest
+
+        questions = [str(p) for p in (prompts or [prompt])]
+        frame = _frame_for_llm(image_path)
+        if frame is None:
              return {"status": "error", "error": "Failed to encode image"}
-             
-        # Construct Message
-        message = HumanMessage(
-            content=[
-                {"type": "text", "text": prompt},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{b64}"},
-                },
-            ]
-        )
-        
-        # Invoke
-        response = llm.invoke([message])
-        return {"status": "success", "analysis": response.content}
+
+        # Same screen, same question: reuse the previous answer. The hash only
+        # nominates a candidate; match() rejects it unless the frame is
+        # byte-identical or the tile diff finds no changed region.
+        cache = get_frame_cache()
+        scope = "" if not regions else f"@{sorted(str(r) for r in regions)}"
+        entry, distance, frame_hash = cache.match(frame)
+        answers: Dict[str, str] = {}
+        if entry is not None:
+            for q in questions:
+                cached = entry.values.get(f"llm:{q}{scope}")
+                if cached is not None:
+                    answers[q] = cached
+
+        missing = [q for q in dict.fromkeys(questions) if q not in answers]
+        payload: Dict[str, Any] = {}
+        if missing:
+            request = VisionRequest()
+            request.add_frame(frame, "screen", regions=regions, overview=bool(regions))
+            for q in missing:
+                request.ask(q)
+            # One call for all uncached questions
+            for q, answer in zip(missing, request.invoke()):
+                answers[q] = answer
+            payload = request.stats()
+            fresh = {f"llm:{q}{scope}": answers[q] for q in missing if answers[q]}
+            if frame_hash is not None and fresh:
+                if entry is not None:
+                    cache.update(entry.key, **fresh)
+                else:
+                    cache.put(frame_hash, fresh, frame=frame)
+
+        result: Dict[str, Any] = {"status": "success", "analysis": "\n\n".join(answers[q] for q in questions)}
+        if prompts:
+            result["answers"] = [answers[q] for q in questions]
+        if not missing:
+            result.update({"cached": True, "hash_distance": distance})
+        else:
+            result["payload"] = payload
+        return result
         
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 
+def _screen_geometry(frame: Frame) -> Tuple[Tuple[float, float], float]:
+    """Origin and points-per-pixel scale of a full-desktop capture."""
+    try:
+        from system_ai.tools.capture import get_capture_service
+
+        mon = get_capture_service().monitor(0)
+        return (float(mon["left"]), float(mon["top"])), float(mon["width"]) / float(frame.width)
+    except Exception:
+        return (0.0, 0.0), 1.0
+
+
+def _cached_screen_ocr(frame: Frame, image_path: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """OCR result for `frame` from the perceptual frame cache, or a fresh OCR pass of `image_path`.
+
+    Returns (ocr, cached); ocr is None on a cache miss without a path. A
+    cached OCR is only reused when match() verifies that nothing on screen
+    changed since it was taken; otherwise the screen is OCR'd again.
+    """
+    cache = get_frame_cache()
+    entry, _distance, frame_hash = cache.match(frame)
+    # OCR boxes are in pixels of the analyzed frame: only reuse same-size captures
+    if entry is not None and "ocr" in entry.values and entry.values.get("size") == frame.size:
+        return entry.values["ocr"], True
+    if not image_path:
+        return None, False
+    ocr = EnhancedVisionTools.get_analyzer()._perform_ocr_analysis(image_path)
+    if frame_hash is not None and ocr.get("status") == "success":
+        if entry is not None:
+            cache.update(entry.key, ocr=ocr, size=frame.size)
+        else:
+            cache.put(frame_hash, {"ocr": ocr, "size": frame.size}, frame=frame)
+    return ocr, False
+
+
+def _grid_aligned_region(entry: Any, monitor: Dict[str, Any], x: int, y: int, width: int, height: int) -> Optional[Dict[str, Any]]:
+    """Capture region covering the rectangle, aligned to the tile grid of `entry` (a full-desktop OCR).
+
+    Returns {"region" (points), "offset" (pixels of the entry's frame), "scale"
+    (pixels per point)}, or None when the entry's frame is not a capture of
+    `monitor` or the aligned edges do not fall on whole points.
+    """
+    size = entry.values.get("size")
+    if not size or entry.grid is None or not entry.block:
+        return None
+    scale = size[0] / float(monitor["width"])
+    if scale <= 0 or abs(size[1] / float(monitor["height"]) - scale) > 1e-3:
+        return None
+    block = entry.block
+    rows, cols = entry.grid.shape[0] * block, entry.grid.shape[1] * block
+    x0 = max(0, math.floor((x - monitor["left"]) * scale / block) * block)
+    y0 = max(0, math.floor((y - monitor["top"]) * scale / block) * block)
+    x1 = min(cols, math.ceil((x + width - monitor["left"]) * scale / block) * block)
+    y1 = min(rows, math.ceil((y + height - monitor["top"]) * scale / block) * block)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    points = [v / scale for v in (x0, y0, x1 - x0, y1 - y0)]
+    if any(abs(v - round(v)) > 1e-6 for v in points):
+        return None
+    left, top, w, h = (int(round(v)) for v in points)
+    region = {"left": int(monitor["left"]) + left, "top": int(monitor["top"]) + top, "width": w, "height": h}
+    return {"region": region, "offset": (x0, y0), "scale": scale}
+
+
 def ocr_region(x: int, y: int, width: int, height: int) -> Dict[str, Any]:
     """Best-effort OCR for a screen region using native macOS Vision.
 
-    Implementation: capture region -> use local native OCR.
+    Implementation: only the region is captured (widened to the tile grid
+    of the last OCR'd screen). If that part of the screen is unchanged since
+    the cached OCR, the result is the cached lines whose center falls inside
+    the rectangle (whole lines, not clipped to it); otherwise the same
+    capture, cut to the rectangle, goes to local native OCR.
     This is much faster than cloud-based vision models.
     """
     try:
-        from system_ai.tools.screenshot import capture_screen_region
-
-        snap = capture_screen_region(x=x, y=y, width=width, height=height)
-        if snap.get("status") != "success":
-            return {"status": "error", **snap}
-
-        image_path = str(snap.get("path") or "")
+        from system_ai.tools.capture import get_capture_service
+        from system_ai.tools.ocr_index import index_for
+        from system_ai.tools.screenshot import save_region_frame
+
+        svc = get_capture_service()
+        box = {"left": int(x), "top": int(y), "width": int(width), "height": int(height)}
+        cache = get_frame_cache()
+        entry = cache.latest("ocr") if cache.enabled else None
+        monitor = svc.monitor(0)
+        aligned = _grid_aligned_region(entry, monitor, x, y, width, height) if entry is not None else None
+
+        crop = svc.grab(aligned["region"] if aligned else box)
+        if aligned is not None:
+            ocr = entry.values["ocr"]
+            if ocr.get("status") == "success" and cache.region_unchanged(entry, crop, *aligned["offset"]):
+                origin = (float(monitor["left"]), float(monitor["top"]))
+                lines = index_for(ocr, origin, 1.0 / aligned["scale"]).in_region(x, y, width, height)
+                text = "\n".join(line["text"] for line in lines).strip()
+                return {"status": "success", "text": text, "regions": lines, "cached": True}
+            # Cut the widened capture back to the requested rectangle
+            scale = aligned["scale"]
+            left = int(round((box["left"] - aligned["region"]["left"]) * scale))
+            top = int(round((box["top"] - aligned["region"]["top"]) * scale))
+            pixels = crop.bgr[top:top + int(round(box["height"] * scale)), left:left + int(round(box["width"] * scale))]
+            crop = Frame.from_array(np.ascontiguousarray(pixels))
+
+        image_path = save_region_frame(crop)
         
         # Use our enhanced vision tools which now uses native OCR
-        from system_ai.tools.vision import EnhancedVisionTools
         analyzer = EnhancedVisionTools.get_analyzer()
         ocr_res = analyzer._perform_ocr_analysis(image_path)
         
@@ -183,8 +300,69 @@ def ocr_region(x: int, y: int, width: int, height: int) -> Dict[str, Any]:
         return {"status": "error", "error": str(e)}
 
 
-def find_image_on_screen(template_path: str, tolerance: float = 0.9) -> Dict[str, Any]:
-    """Find an image template on the primary screen using OpenCV template matching."""
+def find_text_on_screen(text: str, fuzzy: bool = True, min_score: float = 0.75, image_path: Optional[str] = None, limit: int = 5) -> Dict[str, Any]:
+    """Find on-screen text and return click coordinates.
+
+    Uses the OCR of the current screen from the frame cache when the screen
+    was already analyzed, so repeated lookups cost no OCR pass. Coordinates
+    are desktop points for a fresh capture, image pixels for `image_path`.
+    """
+    try:
+        from system_ai.tools.ocr_index import index_for
+
+        origin, scale = (0.0, 0.0), 1.0
+        if not image_path:
+            from system_ai.tools.screenshot import take_screenshot
+
+            snap = take_screenshot()
+            if snap.get("status") != "success":
+                return {"status": "error", "error": snap.get("error") or "screenshot failed"}
+            image_path = str(snap.get("path") or "")
+            frame = load_frame(image_path)
+            if frame is not None:
+                origin, scale = _screen_geometry(frame)
+        else:
+            frame = load_frame(image_path)
+        if frame is None:
+            return {"status": "error", "error": f"Cannot load image at {image_path}"}
+
+        ocr, cached = _cached_screen_ocr(frame, image_path)
+        if not ocr or ocr.get("status") != "success":
+            return {"status": "error", "error": (ocr or {}).get("error") or "OCR failed", "image_path": image_path}
+        matches = index_for(ocr, origin, scale).find(text, fuzzy=fuzzy, min_score=min_score, limit=limit)
+        out: Dict[str, Any] = {
+            "status": "success",
+            "found": bool(matches),
+            "query": text,
+            "matches": [m.to_dict() for m in matches],
+            "ocr_cached": cached,
+            "image_path": image_path,
+        }
+        if matches:
+            out["x"], out["y"] = matches[0].center
+        return out
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+def find_image_on_screen(
+    template_path: str,
+    tolerance: float = 0.9,
+    screenshot_path: Optional[str] = None,
+    roi: Optional[Dict[str, int]] = None,
+    multi_scale: bool = False,
+    exhaustive: bool = True,
+) -> Dict[str, Any]:
+    """Find an image template on the primary screen using OpenCV template matching.
+
+    Args:
+        template_path: Image to look for
+        tolerance: Minimum TM_CCOEFF_NORMED score (0.0, 1.0]
+        screenshot_path: Search a saved screenshot instead of capturing the screen
+        roi: Region hint {x, y, width, height} (e.g. window bounds) searched first
+        multi_scale: Also try scaled templates (HiDPI / Retina captures)
+        exhaustive: Confirm a miss with a full-resolution pass
+    """
     try:
         template_path_s = str(template_path or "").strip()
         if not template_path_s:
@@ -207,7 +385,8 @@ def find_image_on_screen(template_path: str, tolerance: float = 0.9) -> Dict[str
         try:
             import cv2  # type: ignore
             import numpy as np  # type: ignore
-            import mss  # type: ignore
+            if not screenshot_path:
+                import mss  # type: ignore
         except ImportError as e:
             missing = str(e)
             return {
@@ -217,68 +396,21 @@ def find_image_on_screen(template_path: str, tolerance: float = 0.9) -> Dict[str
                 "error": f"Missing dependency: {missing}",
             }
 
-        with mss.mss() as sct:
-            monitor = sct.monitors[1]
-            sct_img = sct.grab(monitor)
-
-        screen = np.array(sct_img)
-        if screen is None or screen.size == 0:
+        screen = _screen_frame_for_matching(screenshot_path)
+        if screen is None or screen.pixels.size == 0:
             return {"tool": "find_image_on_screen", "status": "error", "error": "Failed to capture screen"}
 
-        if len(screen.shape) == 3 and screen.shape[2] == 4:
-            screen_bgr = cv2.cvtColor(screen, cv2.COLOR_BGRA2BGR)
-        else:
-            screen_bgr = screen
-
-        template = cv2.imread(template_path_s, cv2.IMREAD_UNCHANGED)
-        if template is None or template.size == 0:
-            return {
-                "tool": "find_image_on_screen",
-                "status": "error",
-                "error": f"Failed to load template: {template_path_s}",
-            }
-
-        if len(template.shape) == 3 and template.shape[2] == 4:
-            template_bgr = cv2.cvtColor(template, cv2.COLOR_BGRA2BGR)
-        else:
-            template_bgr = template
-
-        th, tw = template_bgr.shape[:2]
-        sh, sw = screen_bgr.shape[:2]
-        if th <= 0 or tw <= 0:
-            return {"tool": "find_image_on_screen", "status": "error", "error": "Invalid template size"}
-        if th > sh or tw > sw:
-            return {
-                "tool": "find_image_on_screen",
-                "status": "success",
-                "found": False,
-                "confidence": 0.0,
-                "reason": "template_larger_than_screen",
-            }
-
-        result = cv2.matchTemplate(screen_bgr, template_bgr, cv2.TM_CCOEFF_NORMED)
-        _min_val, max_val, _min_loc, max_loc = cv2.minMaxLoc(result)
-        confidence = float(max_val)
-
-        if confidence >= tol:
-            x_center = int(max_loc[0] + (tw // 2))
-            y_center = int(max_loc[1] + (th // 2))
-            return {
-                "tool": "find_image_on_screen",
-                "status": "success",
-                "found": True,
-                "x": x_center,
-                "y": y_center,
-                "confidence": confidence,
-                "match": {"x": int(max_loc[0]), "y": int(max_loc[1]), "width": int(tw), "height": int(th)},
-            }
+        from system_ai.tools.template_match import DEFAULT_SCALES, get_template_matcher
 
-        return {
-            "tool": "find_image_on_screen",
-            "status": "success",
-            "found": False,
-            "confidence": confidence,
-        }
+        res = get_template_matcher().match(
+            screen,
+            template_path_s,
+            tol,
+            roi=roi,
+            scales=DEFAULT_SCALES if multi_scale else None,
+            exhaustive=exhaustive,
+        )
+        return {"tool": "find_image_on_screen", **res}
     except Exception as e:
         err_str = str(e).lower()
         if "screen recording" in err_str or "access" in err_str:
@@ -292,9 +424,55 @@ def find_image_on_screen(template_path: str, tolerance: float = 0.9) -> Dict[str
         return {"tool": "find_image_on_screen", "status": "error", "error": str(e)}
 
 
+def find_images_on_screen(
+    template_paths: List[str],
+    tolerance: float = 0.9,
+    screenshot_path: Optional[str] = None,
+    multi_scale: bool = False,
+) -> Dict[str, Any]:
+    """Match several templates against a single capture (or saved screenshot)."""
+    try:
+        paths = [str(p).strip() for p in (template_paths or []) if str(p).strip()]
+        if not paths:
+            return {"tool": "find_images_on_screen", "status": "error", "error": "template_paths is required"}
+        screen = _screen_frame_for_matching(screenshot_path)
+        if screen is None:
+            return {"tool": "find_images_on_screen", "status": "error", "error": "Failed to capture screen"}
+
+        from system_ai.tools.template_match import DEFAULT_SCALES, get_template_matcher
+
+        matcher = get_template_matcher()
+        results = {}
+        for p in paths:
+            if not os.path.exists(p):
+                results[p] = {"status": "error", "error": f"Template not found: {p}"}
+                continue
+            results[p] = matcher.match(screen, p, float(tolerance), scales=DEFAULT_SCALES if multi_scale else None)
+        return {
+            "tool": "find_images_on_screen",
+            "status": "success",
+            "results": results,
+            "found": [p for p, r in results.items() if r.get("found")],
+        }
+    except Exception as e:
+        return {"tool": "find_images_on_screen", "status": "error", "error": str(e)}
+
+
+def _screen_frame_for_matching(screenshot_path: Optional[str] = None) -> Optional[Frame]:
+    """Saved screenshot (in-memory if still cached) or a fresh capture of the primary monitor."""
+    if screenshot_path:
+        return load_frame(screenshot_path)
+    from system_ai.tools.capture import get_capture_service
+
+    return get_capture_service().grab(monitor=1)
+
+
 def compare_images(path1: str, path2: str, prompt: str = None) -> Dict[str, Any]:
     """
     Compare two images (before/after) using GPT-4o-vision.
+
+    Only the changed regions of both images are sent (plus a small overview
+    of the "after" image); identical images are reported without a model call.
     
     Args:
         path1: Path to first image (before)
@@ -304,55 +482,57 @@ def compare_images(path1: str, path2: str, prompt: str = None) -> Dict[str, Any]
     Returns:
         Dict with comparison analysis
     """
-    if not path1 or not os.path.exists(path1):
+    if not path1 or (get_frame(path1) is None and not os.path.exists(path1)):
         return {"status": "error", "error": f"Image not found: {path1}"}
-    if not path2 or not os.path.exists(path2):
+    if not path2 or (get_frame(path2) is None and not os.path.exists(path2)):
         return {"status": "error", "error": f"Image not found: {path2}"}
     
     try:
-        from providers.copilot import CopilotLLM
-        from langchain_core.messages import HumanMessage
-        
-        # Initialize Vision LLM
-        llm = CopilotLLM(vision_model_name="gpt-4.1")
-        
-        # Encode both images
-        b64_1 = load_image_png_b64(path1)
-        b64_2 = load_image_png_b64(path2)
-        
-        if not b64_1:
+        from system_ai.tools.vision_request import VisionRequest
+
+        before = _frame_for_llm(path1)
+        after = _frame_for_llm(path2)
+        if before is None:
             return {"status": "error", "error": f"Failed to encode image: {path1}"}
-        if not b64_2:
+        if after is None:
             return {"status": "error", "error": f"Failed to encode image: {path2}"}
+
+        # Changed regions from one tile-grid diff (same-size captures only)
+        regions = None
+        if before.size == after.size:
+            from system_ai.tools.frame_diff import diff_frames
+
+            diff = diff_frames(before.bgr, after.bgr)
+            # No tile moved: only then is the exact comparison worth its cost
+            if diff.bbox is None and np.array_equal(before.bgr, after.bgr):
+                return {
+                    "status": "success",
+                    "analysis": "The two images are identical; no visible changes.",
+                    "identical": True,
+                    "image1": path1,
+                    "image2": path2,
+                }
+            # Changes too small for a region still have the candidate tiles' bbox
+            regions = [r["bbox"] for r in diff.regions] or ([diff.bbox] if diff.bbox else None)
         
         # Default prompt if not provided
         if not prompt:
             prompt = "Compare these two images (before and after). Describe all differences in detail. Are they as expected? List specific changes."
         
-        # Construct message with both images
-        message = HumanMessage(
-            content=[
-                {"type": "text", "text": prompt},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{b64_1}"},
-                },
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{b64_2}"},
-                },
-            ]
-        )
+        request = VisionRequest()
+        request.add_frame(before, "before", regions=regions)
+        request.add_frame(after, "after", regions=regions, overview=bool(regions))
+        request.ask(prompt)
         
         # Invoke vision model
-        response = llm.invoke([message])
-        analysis = response.content
+        analysis = request.invoke()[0]
         
         return {
             "status": "success",
             "analysis": analysis,
             "image1": path1,
             "image2": path2,
+            "payload": request.stats(),
         }
         
     except Exception as e:
@@ -377,6 +557,7 @@ class DifferentialVisionAnalyzer:
         self.similarity_threshold = float(os.getenv("VISION_SIMILARITY_THRESHOLD", "0.95"))
         self._ocr_engine = None
         self._monitor_count = 1
+        self._monitor_bounds: List[Dict[str, Any]] = []
         self._last_diff_image_path: Optional[str] = None
 
     def _perform_ocr_analysis(self, image_path: str) -> dict:
@@ -396,6 +577,13 @@ class DifferentialVisionAnalyzer:
                     return {"status": "error", "error": f"Native OCR binary not found at {bin_path}"}
                 bin_path = "macos-vision-ocr"
 
+            # The binary reads the file: wait for a pending background write
+            ensure_file(image_path)
+            w, h = None, None
+            frame = get_frame(image_path)
+            if frame is not None:
+                w, h = frame.size
+
             # Prepare output directory
             with tempfile.TemporaryDirectory() as tmp_out:
                 cmd = [bin_path, "--img", image_path, "--output", tmp_out]
@@ -423,9 +611,10 @@ class DifferentialVisionAnalyzer:
                     
                     # Native tool provides relative coordinates (0.0 - 1.0)
                     # We scale them to pixels using image dimensions
-                    from PIL import Image
-                    with Image.open(image_path) as img:
-                        w, h = img.size
+                    if w is None:
+                        from PIL import Image
+                        with Image.open(image_path) as img:
+                            w, h = img.size
                     
                     bbox = [
                         [tl.get("x", 0) * w, tl.get("y", 0) * h],
@@ -481,8 +670,15 @@ class DifferentialVisionAnalyzer:
             min_x, min_y = float('inf'), float('inf')
             max_x, max_y = float('-inf'), float('-inf')
             
+            self._monitor_bounds = []
             for display_id in active_displays[:num_displays]:
                 bounds = CGDisplayBounds(display_id)
+                self._monitor_bounds.append({
+                    "left": bounds.origin.x,
+                    "top": bounds.origin.y,
+                    "width": bounds.size.width,
+                    "height": bounds.size.height,
+                })
                 min_x = min(min_x, bounds.origin.x)
                 min_y = min(min_y, bounds.origin.y)
                 max_x = max(max_x, bounds.origin.x + bounds.size.width)
@@ -517,22 +713,23 @@ class DifferentialVisionAnalyzer:
         except ImportError:
             # Fallback to mss for multi-monitor
             try:
-                import mss
+                from system_ai.tools.capture import get_capture_service
                 
-                with mss.mss() as sct:
-                    # Monitor 0 is the combined view
-                    self._monitor_count = len(sct.monitors) - 1
-                    screenshot = sct.grab(sct.monitors[0])
-                    
-                    output_path = tempfile.mktemp(suffix=".png")
-                    mss.tools.to_png(screenshot.rgb, screenshot.size, output=output_path)
-                    
-                    return {
-                        "status": "success",
-                        "path": output_path,
-                        "monitor_count": self._monitor_count,
-                        "bounds": sct.monitors[0]
-                    }
+                svc = get_capture_service()
+                # Monitor 0 is the combined view
+                self._monitor_count = svc.monitor_count
+                self._monitor_bounds = [dict(m) for m in svc.monitors[1:]]
+                frame = svc.grab(monitor=0)
+                
+                output_path = tempfile.mktemp(suffix=".png")
+                frame.persist(output_path, "PNG")
+                
+                return {
+                    "status": "success",
+                    "path": output_path,
+                    "monitor_count": self._monitor_count,
+                    "bounds": svc.monitor(0)
+                }
             except Exception as e:
                 return {"status": "error", "error": f"mss fallback failed: {e}"}
                 
@@ -551,15 +748,17 @@ class DifferentialVisionAnalyzer:
         try:
             import cv2
             
-            # 1. Load current frame
-            current_frame = cv2.imread(image_path)
-            if current_frame is None:
+            # 1. Load current frame (in-memory capture if available)
+            frame = load_frame(image_path)
+            if frame is None:
                 return {"status": "error", "error": f"Cannot load image at {image_path}"}
+            current_frame = frame.bgr
 
             # 2. Comparison reference
             ref_frame = None
             if reference_path:
-                ref_frame = cv2.imread(reference_path)
+                ref = load_frame(reference_path)
+                ref_frame = ref.bgr if ref is not None else None
             elif self.previous_frame is not None:
                 ref_frame = self.previous_frame
 
@@ -576,8 +775,16 @@ class DifferentialVisionAnalyzer:
                     "monitor_count": self._monitor_count
                 }
 
-            # 4. Perform OCR
-            ocr_results = self._perform_ocr_analysis(image_path)
+            # 4. Perform OCR (reused for perceptually identical frames)
+            cache_info = self._lookup_frame_cache(frame)
+            cached = cache_info.pop("entry", None)
+            if cached is not None and "ocr" in cached.values:
+                ocr_results = cached.values["ocr"]
+            else:
+                ocr_results = self._perform_ocr_analysis(image_path)
+                if cache_info.get("hash") is not None and ocr_results.get("status") == "success":
+                    get_frame_cache().put(cache_info["hash"], {"ocr": ocr_results, "size": frame.size}, frame=frame)
+            cache_info.pop("hash", None)
 
             # 5. Store state
             self.previous_frame = current_frame
@@ -590,7 +797,8 @@ class DifferentialVisionAnalyzer:
                 "timestamp": datetime.now().isoformat(),
                 "diff": diff_result,
                 "ocr": ocr_results,
-                "context": context_summary
+                "context": context_summary,
+                "frame_cache": cache_info
             }
             
             if generate_diff_image and self._last_diff_image_path:
@@ -605,9 +813,23 @@ class DifferentialVisionAnalyzer:
                 "timestamp": datetime.now().isoformat()
             }
 
+    def _lookup_frame_cache(self, frame) -> Dict[str, Any]:
+        """Perceptual-hash lookup for `frame`: {"hit", "distance", "entry", "hash"}."""
+        cache = get_frame_cache()
+        if not cache.enabled:
+            return {"hit": False}
+        try:
+            # match() diffs against the entry's own frame, so a change the
+            # hash cannot see invalidates the entry instead of reusing it
+            entry, distance, frame_hash = cache.match(frame)
+        except Exception:
+            return {"hit": False}
+        return {"hit": entry is not None, "distance": distance, "entry": entry, "hash": frame_hash}
+
     def _calculate_frame_diff(self, prev_frame, curr_frame, generate_image: bool = False) -> dict:
-        """Calculate visual differences between frames using OpenCV."""
+        """Calculate visual differences between frames (tile grid + connected components)."""
         import cv2
+        from system_ai.tools.frame_diff import diff_frames
         
         # Ensure identical sizes
         if prev_frame.shape != curr_frame.shape:
@@ -616,60 +838,47 @@ class DifferentialVisionAnalyzer:
         else:
              curr_frame_resized = curr_frame
 
-        # Structural difference
-        diff = cv2.absdiff(prev_frame, curr_frame_resized)
-        gray_diff = cv2.cvtColor(diff, cv2.COLOR_BGR2GRAY)
-        
-        # Threshold to find significant changes
-        _, thresh = cv2.threshold(gray_diff, 30, 255, cv2.THRESH_BINARY)
-        
-        non_zero = cv2.countNonZero(thresh)
-        total_pixels = gray_diff.size
-        change_percentage = (non_zero / total_pixels) * 100
-
-        # Find changed regions
-        contours_result = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        # Handle different OpenCV versions (returns 2 or 3 values)
-        contours = contours_result[0] if len(contours_result) == 2 else contours_result[1]
-        changed_regions = []
-        for cnt in contours:
-            area = cv2.contourArea(cnt)
-            if area > 500:  # Ignore noise
-                x, y, w, h = cv2.boundingRect(cnt)
-                
-                # Calculate which monitor this region belongs to
-                monitor_idx = self._get_monitor_for_position(x, y)
-                
-                # Calculate color change intensity in region
-                region_diff = diff[y:y+h, x:x+w]
-                color_intensity = float(np.mean(region_diff)) if region_diff.size > 0 else 0
-                
-                changed_regions.append({
-                    "area": float(area),
-                    "bbox": {"x": int(x), "y": int(y), "width": int(w), "height": int(h)},
-                    "monitor": monitor_idx,
-                    "color_intensity": color_intensity
-                })
+        result = diff_frames(prev_frame, curr_frame_resized)
+        changed_regions = result.regions
+        if changed_regions:
+            h, w = curr_frame_resized.shape[:2]
+            centers = [(r["bbox"]["x"] + r["bbox"]["width"] // 2, r["bbox"]["y"] + r["bbox"]["height"] // 2) for r in changed_regions]
+            for region, monitor_idx in zip(changed_regions, self._get_monitors_for_positions(centers, (w, h))):
+                region["monitor"] = int(monitor_idx)
 
         # Generate diff visualization image
         if generate_image and len(changed_regions) > 0:
             self._last_diff_image_path = self._generate_diff_image(curr_frame_resized, changed_regions)
 
         return {
-            "global_change_percentage": float(change_percentage),
+            "global_change_percentage": float(result.change_percentage),
             "changed_regions": changed_regions,
-            "has_significant_changes": change_percentage > (1.0 - self.similarity_threshold) * 100,
+            "has_significant_changes": result.change_percentage > (1.0 - self.similarity_threshold) * 100,
             "monitor_count": self._monitor_count
         }
 
-    def _get_monitor_for_position(self, x: int, y: int) -> int:
-        """Determine which monitor a position belongs to (simplified)."""
-        # This is a simplified version - could be enhanced with actual monitor bounds
-        # For now, divide screen width by monitor count
+    def _display_bounds(self) -> List[Dict[str, Any]]:
+        """Display rectangles of the last multi-monitor capture, else of the capture session."""
+        if self._monitor_bounds:
+            return self._monitor_bounds
         if self._monitor_count <= 1:
-            return 0
-        # Assume horizontal arrangement, ~1920px per monitor
-        return min(x // 1920, self._monitor_count - 1)
+            return []
+        try:
+            from system_ai.tools.capture import get_capture_service
+            return get_capture_service().monitors[1:]
+        except Exception:
+            return []
+
+    def _get_monitors_for_positions(self, positions, frame_size=None) -> List[int]:
+        from system_ai.tools.frame_diff import assign_monitors
+        bounds = self._display_bounds()
+        if len(bounds) <= 1:
+            return [0] * len(positions)
+        return assign_monitors(np.asarray(positions), bounds, frame_size).tolist()
+
+    def _get_monitor_for_position(self, x: int, y: int, frame_size=None) -> int:
+        """Determine which monitor a frame position belongs to (actual display bounds)."""
+        return self._get_monitors_for_positions([(x, y)], frame_size)[0]
 
     def _generate_diff_image(self, frame, regions: List[Dict]) -> str:
         """Generate a visualization of changed regions."""
@@ -0,0 +1,271 @@
+"""Batched vision LLM requests.
+
+Each vision call used to carry full-screen PNGs, one question at a time.
+VisionRequest assembles a single multi-image, multi-question request and
+keeps the payload small.
+
+Features:
+- Crops to changed regions (diff bboxes), padded and merged, with an
+  optional low-resolution overview for context
+- Tiles wide or tall captures (side-by-side monitors) so each tile keeps
+  legible detail after the model-side downscale
+- Identical tiles in one request are sent once (content digest)
+- Several questions about the same images in one call; answers are split
+  back per question
+- Transport: CopilotLLM (default) or any OpenAI-compatible
+  /chat/completions endpoint
+
+Environment:
+    VISION_LLM_ENDPOINT: OpenAI-compatible base URL used instead of Copilot
+    VISION_LLM_MODEL: model name for that endpoint (default gpt-4.1)
+    VISION_LLM_API_KEY: bearer token for that endpoint (optional)
+"""
+
+import base64
+import hashlib
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from system_ai.tools.frame import Frame
+
+
+Box = Tuple[int, int, int, int]  # left, upper, right, lower
+
+MAX_DIMENSION = 1024
+# Captures wider (or taller) than this aspect ratio are split into tiles
+MAX_TILE_ASPECT = 1.8
+CROP_PADDING = 32
+# Crops covering more than this share of the frame are sent whole
+MAX_CROP_SHARE = 0.6
+# The overview only gives context for the crops: small, lossy
+OVERVIEW_SIDE = 384
+OVERVIEW_QUALITY = 60
+
+
+@dataclass
+class ImagePart:
+    label: str
+    digest: str
+    b64: str
+    box: Box
+    source_size: Tuple[int, int]
+    mime: str = "image/png"
+    duplicate_of: Optional[int] = None  # image number of the identical part already sent
+
+    @property
+    def payload_bytes(self) -> int:
+        return 0 if self.duplicate_of is not None else len(self.b64)
+
+    def describe(self, number: Optional[int]) -> str:
+        l, u, r, b = self.box
+        w, h = self.source_size
+        where = "full frame" if self.box == (0, 0, w, h) else f"region x={l} y={u} w={r - l} h={b - u}"
+        what = f"{self.label}, {where} of a {w}x{h} screen"
+        if self.duplicate_of is not None:
+            return f"Not repeated: {what} is identical to Image {self.duplicate_of}"
+        return f"Image {number}: {what}"
+
+
+def _to_box(region: Union[Box, Dict[str, Any]]) -> Box:
+    if isinstance(region, dict):
+        bbox = region.get("bbox", region)
+        x, y = int(bbox.get("x", 0)), int(bbox.get("y", 0))
+        return x, y, x + int(bbox.get("width", 0)), y + int(bbox.get("height", 0))
+    l, u, r, b = region
+    return int(l), int(u), int(r), int(b)
+
+
+def merge_boxes(boxes: Sequence[Box], padding: int, size: Tuple[int, int]) -> List[Box]:
+    """Pad boxes, clip them to the frame and merge the ones that overlap."""
+    w, h = size
+    pending = [
+        (max(0, l - padding), max(0, u - padding), min(w, r + padding), min(h, b + padding))
+        for l, u, r, b in boxes
+        if r > l and b > u
+    ]
+    merged: List[Box] = []
+    while pending:
+        cur = pending.pop()
+        changed = True
+        while changed:
+            changed = False
+            for other in list(pending):
+                if cur[0] <= other[2] and other[0] <= cur[2] and cur[1] <= other[3] and other[1] <= cur[3]:
+                    cur = (min(cur[0], other[0]), min(cur[1], other[1]), max(cur[2], other[2]), max(cur[3], other[3]))
+                    pending.remove(other)
+                    changed = True
+        merged.append(cur)
+    return sorted(merged, key=lambda bx: (bx[1], bx[0]))
+
+
+def tile_boxes(size: Tuple[int, int], max_aspect: float = MAX_TILE_ASPECT) -> List[Box]:
+    """Split a wide or tall frame into roughly square-ish tiles (one box if not needed)."""
+    w, h = size
+    nx = max(1, math.ceil(w / (h * max_aspect))) if h else 1
+    ny = max(1, math.ceil(h / (w * max_aspect))) if w else 1
+    xs = np.linspace(0, w, nx + 1).astype(int)
+    ys = np.linspace(0, h, ny + 1).astype(int)
+    return [(int(xs[i]), int(ys[j]), int(xs[i + 1]), int(ys[j + 1])) for j in range(ny) for i in range(nx)]
+
+
+class VisionRequest:
+    """One vision LLM call: images (crops/tiles, deduplicated) plus numbered questions."""
+
+    def __init__(self, max_dimension: int = MAX_DIMENSION, padding: int = CROP_PADDING, max_aspect: float = MAX_TILE_ASPECT):
+        self.max_dimension = max_dimension
+        self.padding = padding
+        self.max_aspect = max_aspect
+        self.parts: List[ImagePart] = []
+        self.questions: List[str] = []
+        self._digests: Dict[str, int] = {}
+
+    # ---- images ----
+
+    def _add_part(self, frame: Frame, box: Box, label: str, max_dimension: int, fmt: str = "PNG") -> ImagePart:
+        l, u, r, b = box
+        crop = np.ascontiguousarray(frame.bgr[u:b, l:r])
+        digest = hashlib.blake2b(memoryview(crop), digest_size=16).hexdigest() + f":{crop.shape}:{max_dimension}:{fmt}"
+        mime = "image/jpeg" if fmt == "JPEG" else "image/png"
+        dup = self._digests.get(digest)
+        if dup is not None:
+            part = ImagePart(label, digest, "", box, frame.size, mime, duplicate_of=dup)
+        else:
+            whole = box == (0, 0, frame.width, frame.height)
+            src = frame if whole else Frame(crop, "BGR")
+            data = src.encode(fmt, max_dimension, quality=OVERVIEW_QUALITY)
+            part = ImagePart(label, digest, base64.b64encode(data).decode("ascii"), box, frame.size, mime)
+            self._digests[digest] = sum(1 for p in self.parts if p.duplicate_of is None) + 1
+        self.parts.append(part)
+        return part
+
+    def add_frame(
+        self,
+        frame: Frame,
+        label: str = "screen",
+        regions: Optional[Sequence[Union[Box, Dict[str, Any]]]] = None,
+        overview: bool = False,
+    ) -> List[ImagePart]:
+        """Add a frame: cropped to `regions` if given, else whole (tiled when very wide/tall)."""
+        added: List[ImagePart] = []
+        boxes: List[Box] = []
+        if regions:
+            boxes = merge_boxes([_to_box(r) for r in regions], self.padding, frame.size)
+            area = sum((r - l) * (b - u) for l, u, r, b in boxes)
+            if area > MAX_CROP_SHARE * frame.width * frame.height:
+                boxes = []
+        if boxes:
+            if overview:
+                added.append(self._add_part(frame, (0, 0, frame.width, frame.height), f"{label} overview", OVERVIEW_SIDE, "JPEG"))
+            for box in boxes:
+                added.append(self._add_part(frame, box, f"{label} changed region", self.max_dimension))
+            return added
+        tiles = tile_boxes(frame.size, self.max_aspect)
+        for i, box in enumerate(tiles):
+            name = label if len(tiles) == 1 else f"{label} tile {i + 1}/{len(tiles)}"
+            added.append(self._add_part(frame, box, name, self.max_dimension))
+        return added
+
+    # ---- questions ----
+
+    def ask(self, question: str) -> int:
+        self.questions.append(str(question))
+        return len(self.questions) - 1
+
+    def prompt_text(self) -> str:
+        lines: List[str] = []
+        number = 0
+        for p in self.parts:
+            if p.duplicate_of is None:
+                number += 1
+            lines.append(p.describe(number))
+        if len(self.questions) == 1:
+            lines.append("")
+            lines.append(self.questions[0])
+        else:
+            lines.append("")
+            lines.append("Answer each question separately, starting each answer with its heading '### Q<n>'.")
+            lines.extend(f"Q{i}: {q}" for i, q in enumerate(self.questions, 1))
+        return "\n".join(lines)
+
+    def content(self) -> List[Dict[str, Any]]:
+        """Message content parts (text first, then each distinct image)."""
+        parts: List[Dict[str, Any]] = [{"type": "text", "text": self.prompt_text()}]
+        for p in self.parts:
+            if p.duplicate_of is None:
+                parts.append({"type": "image_url", "image_url": {"url": f"data:{p.mime};base64,{p.b64}"}})
+        return parts
+
+    def payload(self, model: str) -> Dict[str, Any]:
+        """OpenAI-compatible chat-completions body."""
+        return {
+            "model": model,
+            "messages": [{"role": "user", "content": self.content()}],
+            "temperature": 0.1,
+            "max_tokens": 2048,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        sent = [p for p in self.parts if p.duplicate_of is None]
+        return {
+            "images": len(sent),
+            "deduplicated": len(self.parts) - len(sent),
+            "questions": len(self.questions),
+            "image_bytes": sum(p.payload_bytes for p in self.parts),
+        }
+
+    # ---- answers ----
+
+    def split_answers(self, text: str) -> List[str]:
+        """Answer per question; the whole reply when headings are missing."""
+        n = len(self.questions)
+        if n <= 1:
+            return [text]
+        found: Dict[int, str] = {}
+        chunks = re.split(r"^\s*#{1,4}\s*Q(\d+)\b[:.)]?", text, flags=re.MULTILINE)
+        for i in range(1, len(chunks) - 1, 2):
+            found[int(chunks[i])] = chunks[i + 1].strip()
+        if not found:
+            return [text] * n
+        return [found.get(i, "") for i in range(1, n + 1)]
+
+    # ---- transport ----
+
+    def invoke(self, llm: Any = None, endpoint: Optional[str] = None, timeout: float = 120.0) -> List[str]:
+        """Send the request and return one answer per question."""
+        endpoint = endpoint or os.getenv("VISION_LLM_ENDPOINT") or None
+        if endpoint:
+            text = post_chat_completions(endpoint, self.payload(os.getenv("VISION_LLM_MODEL") or "gpt-4.1"), timeout=timeout)
+        else:
+            from langchain_core.messages import HumanMessage
+
+            if llm is None:
+                from providers.copilot import CopilotLLM
+
+                llm = CopilotLLM(vision_model_name="gpt-4.1")
+            text = str(llm.invoke([HumanMessage(content=self.content())]).content or "")
+        return self.split_answers(text)
+
+
+def post_chat_completions(endpoint: str, payload: Dict[str, Any], timeout: float = 120.0) -> str:
+    """POST to an OpenAI-compatible endpoint and return the first choice's text."""
+    import requests
+
+    headers = {"Content-Type": "application/json"}
+    key = os.getenv("VISION_LLM_API_KEY")
+    if key:
+        headers["Authorization"] = f"Bearer {key}"
+    url = endpoint.rstrip("/")
+    if not url.endswith("/chat/completions"):
+        url += "/chat/completions"
+    resp = requests.post(url, data=json.dumps(payload), headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    choices = resp.json().get("choices") or []
+    if not choices:
+        return ""
+    return str((choices[0].get("message") or {}).get("content") or "")
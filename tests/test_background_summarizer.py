@@ -0,0 +1,110 @@
+"""Tests for background, incremental meta-planner summarization."""
+
+import threading
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from core.trinity.nodes.meta_planner import MetaPlannerMixin
+from core.trinity.planning.summarizer import BackgroundSummarizer
+from core.trinity.transcript import get_transcript_store
+
+
+def test_submit_does_not_block_and_publishes_latest():
+    release = threading.Event()
+    seen = []
+
+    def summarize(previous, events):
+        release.wait(5)
+        seen.append((previous, list(events)))
+        return f"{previous}+{len(events)}"
+
+    s = BackgroundSummarizer(summarize)
+    s.reset("run")
+    t0 = time.perf_counter()
+    assert s.submit("base", ["e1", "e2"], cursor=2)
+    assert time.perf_counter() - t0 < 0.5
+    assert s.latest("base") == "base"
+
+    release.set()
+    assert s.wait(5)
+    assert s.latest() == "base+2"
+    # Next request builds on the published summary and only sees new events
+    s.submit("ignored", ["e3"], cursor=3)
+    assert s.wait(5)
+    assert seen[-1] == ("base+2", ["e3"])
+    assert s.cursor == 3
+
+
+def test_newer_request_supersedes_pending_one():
+    gate = threading.Event()
+    calls = []
+
+    def summarize(previous, events):
+        calls.append(list(events))
+        gate.wait(5)
+        return ",".join(events)
+
+    s = BackgroundSummarizer(summarize)
+    s.reset("run")
+    s.submit("", ["a"], cursor=1)
+    time.sleep(0.05)  # let the worker pick up "a"
+    s.submit("", ["b"], cursor=2)
+    s.submit("", ["c"], cursor=3)  # replaces pending "b", keeping its events
+    gate.set()
+    assert s.wait(5)
+    assert calls == [["a"], ["b", "c"]]
+    assert s.stats()["cancelled"] == 1
+    assert s.latest() == "b,c"
+
+
+def test_results_for_previous_run_are_discarded():
+    gate = threading.Event()
+
+    def summarize(previous, events):
+        gate.wait(5)
+        return "old run summary"
+
+    s = BackgroundSummarizer(summarize)
+    s.reset("run-1")
+    s.submit("", ["x"], cursor=1)
+    time.sleep(0.05)
+    s.reset("run-2")
+    gate.set()
+    assert s.wait(5)
+    assert s.latest("fresh") == "fresh"
+    assert s.stats()["discarded"] == 1
+
+
+class _SlowLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(0.3)
+        return AIMessage(content=f"summary #{self.calls}")
+
+
+class _Planner(MetaPlannerMixin):
+    preferred_language = "en"
+
+    def __init__(self):
+        self.llm = _SlowLLM()
+
+
+def test_meta_planner_summary_is_off_the_critical_path(monkeypatch):
+    monkeypatch.delenv("TRINITY_SYNC_SUMMARY", raising=False)
+    store = get_transcript_store()
+    msgs = [HumanMessage(content="task")] + [AIMessage(content=f"[VOICE] step {i}") for i in range(8)]
+    tid = store.create(msgs)
+    planner = _Planner()
+    state = {"summary": "", "step_count": 3, "transcript_id": tid}
+
+    t0 = time.perf_counter()
+    assert planner._update_periodic_summary(state, msgs) == ""
+    assert time.perf_counter() - t0 < 0.2
+
+    assert planner._get_summarizer().wait(5)
+    assert planner._update_periodic_summary({**state, "step_count": 4}, msgs) == "summary #1"
+    assert planner._get_summarizer().cursor == len(msgs)
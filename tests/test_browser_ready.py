@@ -0,0 +1,125 @@
+"""Tests for BrowserManager.wait_ready and the tools that use it."""
+
+import json
+import time
+
+import pytest
+
+import system_ai.tools.browser as browser
+from system_ai.tools.browser import BrowserManager
+
+
+class _TimeoutError(Exception):
+    pass
+
+
+class _Page:
+    """Fake page: each wait resolves after a scripted delay or times out."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = []
+        self.url = "file:///a.html"
+
+    def _wait(self, name, timeout_ms):
+        # Playwright treats timeout=0 as "no timeout"
+        assert timeout_ms > 0, f"{name} would wait forever"
+        self.calls.append((name, round(timeout_ms)))
+        delay = self.delays.get(name, 0.0)
+        if delay * 1000.0 > timeout_ms:
+            time.sleep(timeout_ms / 1000.0)
+            raise _TimeoutError(f"Timeout {timeout_ms:.0f}ms exceeded.\nlog")
+        if delay:
+            time.sleep(delay)
+
+    def wait_for_url(self, predicate, timeout=None):
+        self._wait("url_change", timeout)
+        assert predicate("file:///b.html")
+
+    def wait_for_load_state(self, state, timeout=None):
+        self._wait("network_idle", timeout)
+
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        self._wait("selector", timeout)
+        return object()
+
+    def wait_for_function(self, script, arg=None, timeout=None):
+        self._wait("text", timeout)
+
+    def evaluate(self, script, arg=None):
+        assert script == browser.SETTLE_JS
+        delay = self.delays.get("dom_settle", 0.0)
+        self.calls.append(("dom_settle", round(arg["timeoutMs"])))
+        if delay:
+            time.sleep(min(delay, arg["timeoutMs"] / 1000.0))
+        return {"settled": delay * 1000.0 <= arg["timeoutMs"], "mutations": 4}
+
+    def on(self, *args):
+        pass
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return BrowserManager()
+
+
+def test_stages_run_in_order_and_return_early(manager):
+    page = _Page({"network_idle": 0.05, "selector": 0.05})
+    res = manager.wait_ready(page, timeout=5, url_change_from="file:///a.html", selector="#r", text="done", quiet_ms=100)
+    assert res.ready and res.elapsed_ms < 1000
+    assert [c[0] for c in page.calls] == ["url_change", "network_idle", "selector", "text", "dom_settle"]
+    # Network idle is capped separately from the total budget
+    assert page.calls[1][1] <= 3000
+    assert res.to_dict()["stages"]["dom_settle"]["mutations"] == 4
+
+
+def test_one_total_budget_across_stages(manager):
+    page = _Page({"network_idle": 10, "selector": 10, "dom_settle": 10})
+    t0 = time.perf_counter()
+    res = manager.wait_ready(page, timeout=0.6, network_idle_timeout=0.3, selector="#never", quiet_ms=100)
+    elapsed = time.perf_counter() - t0
+    assert not res.ready and elapsed < 1.0
+    assert res.stages["network_idle"]["ok"] is False and res.stages["selector"]["ok"] is False
+    assert res.stages["selector"]["ms"] == pytest.approx(300, abs=150)
+    assert res.stages["dom_settle"]["ok"] is False
+
+
+def test_spent_budget_skips_remaining_stages(manager):
+    page = _Page({"selector": 10})
+    res = manager.wait_ready(page, timeout=0.2, network_idle_timeout=None, selector="#never", text="done", quiet_ms=100)
+    assert [c[0] for c in page.calls] == ["selector"]
+    assert res.stages["text"] == {"ok": False, "ms": 0.0, "error": "timeout budget exhausted"}
+    assert res.stages["dom_settle"]["ok"] is False and not res.ready
+
+
+def test_click_waits_for_readiness_instead_of_sleeping(manager, monkeypatch):
+    page = _Page({})
+    page.click = lambda selector, timeout=None: page.calls.append(("click", 0))
+    manager.get_page = lambda headless=None: page
+    monkeypatch.setattr(BrowserManager, "_instance", manager)
+    monkeypatch.setattr(browser.time, "sleep", lambda s: pytest.fail("fixed sleep"))
+    assert json.loads(browser.browser_click_element("#go"))["status"] == "success"
+    assert [c[0] for c in page.calls] == ["click", "network_idle", "dom_settle"]
+
+
+def test_open_url_waits_at_most_the_old_fixed_settle(manager, monkeypatch):
+    page = _Page({"network_idle": 10, "dom_settle": 10})
+    page.goto = lambda url, wait_until=None, timeout=None: None
+    manager.get_page = lambda headless=None: page
+    manager.page_snapshot = lambda p: type("Snap", (), {"has_captcha": False, "url": p.url, "title": "A"})()
+    monkeypatch.setattr(BrowserManager, "_instance", manager)
+    t0 = time.perf_counter()
+    out = json.loads(browser.browser_open_url("file:///a.html"))
+    assert out["status"] == "success" and out["ready"] is False
+    assert time.perf_counter() - t0 < 2.3
+
+
+def test_enter_submission_waits_for_the_new_url(manager, monkeypatch):
+    page = _Page({})
+    page.fill = lambda selector, text, timeout=None: None
+    page.press = lambda selector, key: page.calls.append(("press", 0))
+    manager.get_page = lambda headless=None: page
+    monkeypatch.setattr(BrowserManager, "_instance", manager)
+    assert json.loads(browser.browser_type_text("#q", "hello", press_enter=True))["status"] == "success"
+    assert [c[0] for c in page.calls] == ["press", "url_change", "network_idle", "dom_settle"]
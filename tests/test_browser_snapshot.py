@@ -0,0 +1,152 @@
+"""Tests for the single-evaluate page snapshot and its cache."""
+
+import json
+
+import pytest
+
+import system_ai.tools.browser as browser
+from system_ai.tools.browser import BrowserManager
+
+
+class _FakePage:
+    """Answers the snapshot script from a small in-memory page model."""
+
+    def __init__(self):
+        self.url = "file:///tmp/a.html"
+        self.title = "Page A"
+        self.body = "Hello world"
+        self.links = [{"text": "Next", "href": "file:///tmp/b.html"}]
+        self.mutations = 0
+        self.evaluates = []
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def evaluate(self, script, arg=None):
+        if script == browser.SETTLE_JS:
+            self.evaluates.append("settle")
+            return {"settled": True, "mutations": 0}
+        if script != browser.SNAPSHOT_JS:
+            self.evaluates.append("script")
+            self.mutations += 1
+            return None
+        self.evaluates.append("probe" if arg["probe"] else "full")
+        if arg["probe"]:
+            return {"url": self.url, "mutations": self.mutations}
+        return {
+            "url": self.url,
+            "title": self.title,
+            "text": self.body,
+            "html": "<html><body>" + self.body + "</body></html>" if arg["html"] else None,
+            "links": self.links,
+            "captcha": False,
+            "captcha_hint": "captcha" in self.body.lower(),
+            "mutations": self.mutations,
+        }
+
+    def click(self, selector, timeout=None):
+        self.mutations += 3
+
+    def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    def navigate(self, url):
+        self.url = url
+        self.mutations = 0
+        for handler in self.handlers.get("framenavigated", []):
+            handler(type("Frame", (), {"parent_frame": None})())
+
+
+@pytest.fixture
+def fake(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    page = _FakePage()
+    manager = BrowserManager()
+    manager.get_page = lambda headless=None: (manager._watch_page(page), page)[1]
+    monkeypatch.setattr(BrowserManager, "_instance", manager)
+    monkeypatch.setattr(browser.time, "sleep", lambda s: None)
+    return manager, page
+
+
+def test_tools_share_one_snapshot_until_dom_changes(fake):
+    manager, page = fake
+    content = json.loads(browser.browser_get_content())
+    assert content["content"] == "Hello world" and content["title"] == "Page A"
+    links = json.loads(browser.browser_get_links())
+    assert links["links"] == page.links
+    assert page.evaluates == ["full", "probe"]
+
+    # The page changed on its own: the probe sees the counter move
+    page.mutations += 1
+    page.body = "Updated"
+    assert json.loads(browser.browser_get_content())["content"] == "Updated"
+    assert page.evaluates[-2:] == ["probe", "full"]
+    assert manager.snapshot_stats == {"hits": 1, "misses": 2}
+
+
+def test_actions_and_navigation_invalidate(fake):
+    manager, page = fake
+    browser.browser_get_content()
+    browser.browser_click_element("#next")
+    browser.browser_get_content()
+    # Invalidated by the click tool: no probe, straight to a full snapshot
+    assert page.evaluates == ["full", "settle", "full"]
+
+    page.navigate("file:///tmp/b.html")
+    page.title = "Page B"
+    assert json.loads(browser.browser_get_content())["title"] == "Page B"
+    assert page.evaluates[-1] == "full"
+
+    # html is only collected when asked for, then reused
+    snap = json.loads(browser.browser_snapshot())
+    assert snap["content_preview"].startswith("<html>")
+    browser.browser_get_content()
+    assert page.evaluates[-2:] == ["full", "probe"]
+
+
+@pytest.fixture(scope="module")
+def chromium():
+    sync_api = pytest.importorskip("playwright.sync_api")
+    if getattr(sync_api, "sync_playwright", None) is None:
+        pytest.skip("playwright unavailable")
+    try:
+        pw = sync_api.sync_playwright().start()
+    except Exception as e:
+        pytest.skip(f"playwright unavailable: {e}")
+    try:
+        b = pw.chromium.launch(headless=True)
+    except Exception as e:
+        pw.stop()
+        pytest.skip(f"Chromium unavailable: {e}")
+    yield b
+    b.close()
+    pw.stop()
+
+
+def test_snapshot_against_local_pages(chromium, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / "b.html").write_text("<title>B</title><p>Second page</p>")
+    (tmp_path / "a.html").write_text(
+        "<title>A</title><p id='p'>First page</p><a href='b.html'>To B</a>"
+        "<a href='javascript:void(0)'>skip</a><div hidden>secret</div>"
+    )
+    page = chromium.new_page()
+    manager = BrowserManager()
+    manager.get_page = lambda headless=None: (manager._watch_page(page), page)[1]
+    page.goto((tmp_path / "a.html").as_uri())
+
+    first = manager.page_snapshot()
+    assert first.title == "A" and "First page" in first.text and "secret" not in first.text
+    assert [l["text"] for l in first.links] == ["To B"]
+    assert manager.page_snapshot() is first
+
+    page.evaluate("document.getElementById('p').textContent = 'Changed'")
+    second = manager.page_snapshot()
+    assert second is not first and "Changed" in second.text and second.mutations > 0
+
+    page.click("a")
+    page.wait_for_load_state()
+    third = manager.page_snapshot()
+    assert third.title == "B" and third.url.endswith("b.html")
+    page.close()
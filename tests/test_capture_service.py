@@ -0,0 +1,144 @@
+"""Tests for the persistent capture service and continuous capture ring."""
+
+import time
+
+import numpy as np
+
+import system_ai.tools.screenshot as ss
+from system_ai.tools.capture import CaptureService, ContinuousCapture
+
+
+class _Shot:
+    def __init__(self, width, height, value):
+        self.width, self.height = width, height
+        arr = np.full((height, width, 4), value % 256, dtype=np.uint8)
+        self.raw = bytearray(arr.tobytes())
+
+
+class FakeMSS:
+    opened = 0
+
+    def __init__(self, monitors=None):
+        FakeMSS.opened += 1
+        self.monitors = monitors or [
+            {"left": 0, "top": 0, "width": 32, "height": 16},
+            {"left": 0, "top": 0, "width": 16, "height": 16},
+            {"left": 16, "top": 0, "width": 16, "height": 16},
+        ]
+        self.grabs = 0
+        self.closed = False
+
+    def grab(self, region):
+        self.grabs += 1
+        return _Shot(region["width"], region["height"], self.grabs)
+
+    def close(self):
+        self.closed = True
+
+
+def _service(signature=lambda: None):
+    FakeMSS.opened = 0
+    return CaptureService(factory=FakeMSS, signature=signature)
+
+
+def test_session_and_geometry_are_reused():
+    svc = _service()
+    for _ in range(5):
+        frame = svc.grab(monitor=1)
+    assert frame.size == (16, 16)
+    assert svc.monitor_count == 2
+    assert FakeMSS.opened == 1
+    assert svc.stats()["grabs"] == 5
+
+
+def test_display_change_invalidates_geometry():
+    layout = {"sig": ("one",)}
+    svc = _service(signature=lambda: layout["sig"])
+    svc.SIGNATURE_CHECK_INTERVAL = 0.0
+    svc.grab(monitor=0)
+    assert FakeMSS.opened == 1
+
+    layout["sig"] = ("one", "two")
+    svc.grab(monitor=0)
+    assert FakeMSS.opened == 2
+
+
+def test_grab_error_reopens_and_retries():
+    svc = _service()
+    svc.grab()
+    svc._sct.grab = lambda region: (_ for _ in ()).throw(RuntimeError("display gone"))
+    frame = svc.grab()
+    assert frame.size == (32, 16)
+    assert svc.errors == 1 and FakeMSS.opened == 2
+
+
+def test_burst_keeps_fixed_schedule():
+    svc = _service()
+    t0 = time.perf_counter()
+    frames = svc.burst(4, interval=0.02)
+    elapsed = time.perf_counter() - t0
+    assert len(frames) == 4
+    assert 0.055 <= elapsed < 0.5
+    assert [int(f.pixels[0, 0, 0]) for f in frames] == [1, 2, 3, 4]
+
+
+def test_continuous_capture_ring_buffer():
+    svc = _service()
+    with ContinuousCapture(fps=200, monitor=1, ring_size=3, service_factory=lambda: svc) as cap:
+        first = cap.latest(timeout=1.0)
+        assert first is not None and first.size == (16, 16)
+        seen = []
+        for frame in cap.frames(timeout=1.0):
+            seen.append(int(frame.pixels[0, 0, 0]))
+            if len(seen) == 3:
+                break
+        # Copies by default; ring views only on request
+        assert not any(b is not None and np.shares_memory(first.pixels, b) for b in cap._ring)
+        assert any(cap.latest(copy=False).pixels is b for b in cap._ring)
+    assert seen == sorted(seen) and len(set(seen)) == 3
+    # Ring slots are reused buffers
+    assert len([b for b in cap._ring if b is not None]) == 3
+    assert cap.error is None
+
+
+def test_take_burst_screenshot_uses_capture_service(monkeypatch, tmp_path):
+    svc = _service()
+    monkeypatch.setattr(ss, "get_capture_service", lambda: svc)
+    monkeypatch.setattr(ss.VisionDiffManager, "process_screenshot", lambda self, frame, fid: {"path": f"/tmp/{int(frame.pixels[0, 0, 0])}.jpg", "mode": "initial", "bbox": None})
+    res = ss.take_burst_screenshot(count=3, interval=0.0)
+    assert res["status"] == "success"
+    assert res["paths"] == ["/tmp/1.jpg", "/tmp/2.jpg", "/tmp/3.jpg"]
+    assert FakeMSS.opened == 1
+
+
+def test_sessions_are_closed_when_their_thread_exits(monkeypatch):
+    import threading
+
+    import system_ai.tools.capture as capture
+
+    monkeypatch.setattr(capture, "_default_factory", FakeMSS)
+    monkeypatch.setattr(capture, "_display_signature", lambda: None)
+    monkeypatch.setattr(capture, "_services", {})
+    monkeypatch.setattr(capture._local, "service", None, raising=False)
+    sessions = []
+
+    def worker():
+        capture.get_capture_service().grab(monitor=1)
+        sessions.append(capture.get_capture_service()._sct)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert not sessions[0].closed
+    capture.get_capture_service()  # a later caller reaps the exited thread's session
+    assert sessions[0].closed and list(capture._services) == [threading.current_thread()]
+
+    with ContinuousCapture(fps=200, monitor=1) as cap:
+        assert cap.latest(timeout=1.0) is not None
+        ring_session = capture._services[cap._thread]._sct
+    assert ring_session.closed and cap._thread not in capture._services
+
+    capture.get_capture_service().grab(monitor=1)
+    own = capture.get_capture_service()._sct
+    capture.close_capture_services()
+    assert own.closed and capture._services == {}
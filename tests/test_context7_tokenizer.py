@@ -0,0 +1,139 @@
+"""Tests for tokenizer-based budgeting in Context7."""
+
+import os
+
+import core.tokenizer as tokenizer
+from core.context7 import Context7
+from core.tokenizer import HeuristicTokenizer, TokenCounter, truncate_to_tokens
+
+
+class CountingTokenizer(HeuristicTokenizer):
+    """Heuristic tokenizer that records how often it is called."""
+
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text):
+        self.calls += 1
+        return super().count(text)
+
+
+class MockMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+def test_cyrillic_costs_more_than_char_estimate():
+    tok = HeuristicTokenizer()
+    uk = "Відкрий браузер і знайди відео про котів, потім увімкни повноекранний режим."
+    en = "Open the browser and find a video about cats, then enable full screen mode."
+    assert tok.count(uk) > len(uk) // 4
+    assert tok.count(uk) > tok.count(en)
+
+
+def test_counts_are_memoized_by_content():
+    tok = CountingTokenizer()
+    counter = TokenCounter(tok)
+    text = "same section content\n" * 10
+    first = counter.count(text)
+    assert counter.count(text) == first
+    assert tok.calls == 1
+    assert counter.stats()["hits"] == 1
+
+
+def test_default_tokenizer_loads_on_first_count(monkeypatch):
+    loads = []
+    monkeypatch.setattr(tokenizer, "get_tokenizer", lambda spec=None: loads.append(spec) or CountingTokenizer())
+    c7 = Context7()
+    assert loads == [] and c7.token_counter.stats()["tokenizer"] is None
+    assert c7.count_tokens("hello world") > 0
+    assert c7.count_tokens("again") > 0
+    assert len(loads) == 1 and c7.token_counter.stats()["tokenizer"] == "counting"
+
+    warm = Context7()
+    warm.warm_up()
+    assert warm.token_counter.loaded and len(loads) == 2
+
+
+def test_truncation_cuts_on_line_boundaries():
+    counter = TokenCounter(HeuristicTokenizer())
+    text = "".join(f"line number {i} with some words\n" for i in range(100))
+    head, cut = truncate_to_tokens(text, 50, counter)
+    assert cut > 0
+    assert counter.count(head) <= 50
+    assert head.endswith("\n")
+    assert head.startswith("line number 0 ")
+
+    tail, _ = truncate_to_tokens(text, 50, counter, keep="tail")
+    assert counter.count(tail) <= 50
+    assert tail.endswith("line number 99 with some words\n")
+    assert tail.startswith("line number ")
+
+
+def test_truncation_cuts_on_sentence_boundaries():
+    counter = TokenCounter(HeuristicTokenizer())
+    text = "Перше речення. Друге речення трохи довше. Третє речення найдовше з усіх трьох."
+    out, cut = truncate_to_tokens(text, 12, counter)
+    assert cut > 0
+    assert out.startswith("Перше речення.")
+    assert out.rstrip().endswith(".")
+
+
+def test_metrics_record_counted_and_estimated_tokens():
+    c7 = Context7(tokenizer=HeuristicTokenizer())
+    c7.prepare_with_window(
+        messages=[MockMessage("[VOICE] Крок виконано")],
+        original_task="Знайди файл конфігурації",
+        rag_context="Контекст " * 50,
+        project_structure="src/\n  main.py\n",
+        meta_config={},
+    )
+    m = c7.get_last_metrics()
+    assert m.counted_tokens > 0
+    assert m.estimated_tokens == m.total_chars // 4
+    assert m.tokenizer == "heuristic"
+    assert set(m.section_tokens) == set(m.sections_included)
+    assert "estimate_ratio" in m.to_dict()
+
+
+def test_window_respects_token_budget():
+    c7 = Context7(tokenizer=HeuristicTokenizer())
+    structure = "".join(f"dir_{i}/file_{i}.py\n" for i in range(5000))
+    c7.prepare_with_window(
+        messages=[],
+        original_task="Task",
+        rag_context="",
+        project_structure=structure,
+        meta_config={},
+        max_tokens=1000,
+    )
+    m = c7.get_last_metrics()
+    assert m.section_tokens["structure"] <= int(1000 * Context7.PRIORITY_WEIGHTS["structure"]) + 10
+    assert m.truncations["structure"] > 0
+
+
+def test_tiktoken_uses_a_persistent_cache_and_warns_once_on_fallback(monkeypatch, tmp_path, caplog):
+    import sys
+    import types
+
+    seen = []
+
+    def get_encoding(name):
+        seen.append(os.environ.get("TIKTOKEN_CACHE_DIR"))
+        raise OSError("no network")
+
+    monkeypatch.setitem(sys.modules, "tiktoken", types.SimpleNamespace(get_encoding=get_encoding))
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", "")  # restored after the test
+    monkeypatch.delenv("TIKTOKEN_CACHE_DIR")
+    monkeypatch.setattr(tokenizer, "TIKTOKEN_CACHE_DIR", str(tmp_path / "tiktoken"))
+    monkeypatch.setattr(tokenizer, "_tokenizers", {})
+    monkeypatch.setattr(tokenizer, "_fallback_warned", False)
+
+    with caplog.at_level("WARNING", logger="core.tokenizer"):
+        assert isinstance(tokenizer.get_tokenizer("tiktoken"), HeuristicTokenizer)
+        assert isinstance(tokenizer.get_tokenizer("tiktoken:cl100k_base"), HeuristicTokenizer)
+    assert seen == [str(tmp_path / "tiktoken")] * 2 and (tmp_path / "tiktoken").is_dir()
+    warnings = [r for r in caplog.records if "heuristic estimates" in r.getMessage()]
+    assert len(warnings) == 1 and "no network" in warnings[0].getMessage()
@@ -0,0 +1,78 @@
+"""Tests for the queue-backed file loggers."""
+
+import builtins
+import os
+import time
+
+import pytest
+
+import system_ai.tools.browser as browser
+import system_ai.tools.file_log as file_log
+from system_ai.tools.browser import BrowserManager
+from system_ai.tools.file_log import flush_file_logs, get_file_logger
+
+
+@pytest.fixture(autouse=True)
+def _close_listeners():
+    yield
+    file_log.close_file_logs()
+
+
+def test_lines_keep_ctime_format_and_share_one_listener(tmp_path):
+    path = tmp_path / "logs" / "debug.log"
+    a = get_file_logger("test.file_log.a", str(path))
+    b = get_file_logger("test.file_log.b", str(path))
+    assert len(file_log._listeners) == 1
+
+    a.debug("value=%s", 42)
+    b.debug("from b")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        a.exception("failed")
+    flush_file_logs()
+
+    lines = path.read_text().splitlines()
+    stamp, _, msg = lines[0].rpartition(": ")
+    assert msg == "value=42" and len(stamp.split()) == 5
+    time.strptime(stamp, file_log.CTIME_FORMAT)
+    assert lines[1].endswith(": from b") and lines[2].endswith(": failed")
+    assert "ValueError: boom" in lines[-1]
+
+
+def test_rotation_and_batched_flushes(tmp_path):
+    path = tmp_path / "rot.log"
+    log = get_file_logger("test.file_log.rot", str(path), max_bytes=2000, backup_count=2)
+    for i in range(200):
+        log.debug("line %03d %s", i, "x" * 20)
+    flush_file_logs()
+
+    assert (tmp_path / "rot.log.1").exists() and (tmp_path / "rot.log.2").exists()
+    assert not (tmp_path / "rot.log.3").exists()
+    assert all(os.path.getsize(p) <= 2000 for p in tmp_path.iterdir())
+    assert path.read_text().splitlines()[-1].endswith("line 199 " + "x" * 20)
+    assert file_log._listeners[str(path)].batches < 200
+
+
+def test_browser_get_page_does_no_file_io(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(browser, "_debug_log", None)
+    manager = BrowserManager()
+    manager.pw = manager.browser = object()
+    manager.page = type("Page", (), {"on": lambda self, *a: None})()
+    manager._last_headless = True
+    manager.get_page(headless=True)
+    flush_file_logs()
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("filesystem call on the logging path")
+
+    monkeypatch.setattr(builtins, "open", forbidden)
+    monkeypatch.setattr(os, "makedirs", forbidden)
+    for _ in range(50):
+        manager.get_page(headless=True)
+    monkeypatch.undo()
+
+    flush_file_logs()
+    log = tmp_path / ".system_cli" / "logs" / "browser_debug.log"
+    assert log.read_text().count("get_page called with headless=True (last=True)") == 51
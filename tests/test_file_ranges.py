@@ -0,0 +1,87 @@
+"""Tests for ranged file reads, the line index and search_files."""
+
+import os
+
+import system_ai.tools.file_index as file_index
+from system_ai.tools.filesystem import list_files, read_file, search_files
+
+
+def _log(tmp_path, n=1000, trailing=True):
+    path = tmp_path / "app.log"
+    text = "\n".join(f"line {i} ok" for i in range(1, n + 1)) + ("\n" if trailing else "")
+    path.write_text(text, encoding="utf-8")
+    return str(path), text.splitlines(keepends=True)
+
+
+def test_line_ranges_head_tail_and_bytes(tmp_path):
+    path, lines = _log(tmp_path)
+    res = read_file(path, start_line=10, end_line=12)
+    assert res["content"] == "".join(lines[9:12]) and res["total_lines"] == 1000
+    assert read_file(path, start_line=999)["content"] == "".join(lines[998:])
+    assert read_file(path, start_line=2000)["content"] == ""
+    assert read_file(path, head=3)["content"] == "".join(lines[:3])
+    assert read_file(path, tail=2)["content"] == "".join(lines[-2:])
+    assert read_file(path, offset=5, length=3)["content"] == "1 o"
+    assert read_file(path, offset=-8)["content"] == "1000 ok\n"
+    assert read_file(path)["content"] == "".join(lines)
+
+    unterminated, ulines = _log(tmp_path, 5, trailing=False)
+    assert read_file(unterminated, tail=1)["content"] == "line 5 ok"
+    assert read_file(unterminated, start_line=5)["content"] == "line 5 ok"
+    assert read_file(unterminated, start_line=1, end_line=99)["total_lines"] == 5
+
+
+def test_line_index_is_cached_and_extended_on_append(tmp_path, monkeypatch):
+    path, _ = _log(tmp_path)
+    scans = []
+    real = file_index._newlines
+    monkeypatch.setattr(file_index, "_newlines", lambda mm, s, e: scans.append((s, e)) or real(mm, s, e))
+
+    first = file_index.get_line_index(path)
+    assert file_index.get_line_index(path) is first and len(scans) == 1
+
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write("appended\n")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert read_file(path, start_line=1001)["content"] == "appended\n"
+    # Only the appended bytes were scanned
+    assert scans[-1] == (first.size, first.size + 9)
+
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("x\n" * 3000)
+    assert read_file(path, start_line=3000)["content"] == "x\n"
+    assert scans[-1][0] == 0
+
+
+def test_large_file_without_range_is_truncated(tmp_path, monkeypatch):
+    monkeypatch.setenv("READ_FILE_MAX_BYTES", "100")
+    path, _ = _log(tmp_path)
+    res = read_file(path)
+    assert res["truncated"] is True and len(res["content"]) == 100
+
+
+def test_list_files_uses_scandir(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("a")
+    res = list_files(str(tmp_path))
+    assert res["total_count"] == 2
+    assert sorted((i["name"], i["is_dir"]) for i in res["items"]) == [("a.txt", False), ("sub", True)]
+
+
+def test_search_files_offsets_and_early_stop(tmp_path):
+    for i in range(30):
+        (tmp_path / f"f{i:02d}.txt").write_text("nothing\nПомилка: disk full\nok\n", encoding="utf-8")
+    (tmp_path / "skip.bin").write_bytes(b"\0" + "помилка".encode())
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "x.txt").write_text("помилка")
+
+    res = search_files("помилка", str(tmp_path), max_matches=5)
+    assert res["status"] == "success" and len(res["matches"]) == 5 and res["truncated"] is True
+    m = res["matches"][0]
+    assert (m["line"], m["column"], m["offset"]) == (2, 1, 8)
+    assert m["preview"] == "Помилка: disk full" and "content" not in m
+
+    full = search_files("DISK\\s+full", str(tmp_path), regex=True, include=["f0*.txt"], max_matches=100)
+    assert len(full["matches"]) == 10 and full["truncated"] is False
+    assert search_files("DISK", str(tmp_path), case_sensitive=True)["matches"] == []
@@ -0,0 +1,113 @@
+"""Tests for the perceptual-hash frame cache."""
+
+import time
+
+import numpy as np
+
+import system_ai.tools.vision as vision
+from core.vision_context import VisionContextManager
+from system_ai.tools.frame import Frame, register_frame
+from system_ai.tools.frame_cache import PerceptualFrameCache, dhash, hamming, phash
+
+
+def _screen(seed=0, w=800, h=500):
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, (h // 20, w // 20, 3), dtype=np.uint8)
+    return np.ascontiguousarray(np.repeat(np.repeat(base, 20, axis=0), 20, axis=1))
+
+
+def test_hashes_are_stable_under_noise_and_differ_across_screens():
+    a = _screen(0)
+    noisy = np.clip(a.astype(np.int16) + np.random.default_rng(3).integers(-2, 3, a.shape), 0, 255).astype(np.uint8)
+    other = _screen(1)
+    for fn in (dhash, phash):
+        ha = fn(Frame.from_array(a).thumbnail(128))
+        assert ha.shape == (4,)
+        assert hamming(ha, fn(Frame.from_array(noisy).thumbnail(128))) <= 6
+        assert hamming(ha, fn(Frame.from_array(other).thumbnail(128))) > 40
+
+
+def test_lookup_lru_and_metrics():
+    cache = PerceptualFrameCache(max_entries=2, threshold=6)
+    h0 = cache.hash_frame(Frame.from_array(_screen(0)))
+    h1 = cache.hash_frame(Frame.from_array(_screen(1)))
+    h2 = cache.hash_frame(Frame.from_array(_screen(2)))
+    e0 = cache.put(h0, {"ocr": "zero"})
+    cache.put(h1, {"ocr": "one"})
+
+    entry, dist = cache.lookup(h0)
+    assert entry is e0 and dist == 0
+    cache.put(h2, {"ocr": "two"})  # evicts h1 (least recently used)
+    assert cache.lookup(h1)[0] is None
+
+    t0 = time.perf_counter()
+    for _ in range(100):
+        cache.lookup(h2)
+    assert (time.perf_counter() - t0) / 100 < 0.001
+    stats = cache.stats()
+    assert stats["hits"] == 101 and stats["misses"] == 1 and stats["entries"] == 2
+
+
+def test_analyze_frame_reuses_ocr_for_unchanged_screen(tmp_path, monkeypatch):
+    cache = PerceptualFrameCache()
+    monkeypatch.setattr(vision, "get_frame_cache", lambda: cache)
+    calls = []
+
+    def fake_ocr(path):
+        calls.append(path)
+        return {"status": "success", "full_text": f"text {len(calls)}", "regions": []}
+
+    analyzer = vision.DifferentialVisionAnalyzer()
+    analyzer._perform_ocr_analysis = fake_ocr
+    screen = _screen(0)
+    paths = []
+    for i, arr in enumerate([screen, screen.copy(), _screen(5)]):
+        path = str(tmp_path / f"f{i}.png")
+        register_frame(Frame.from_array(arr), path)
+        paths.append(path)
+
+    first = analyzer.analyze_frame(paths[0])
+    second = analyzer.analyze_frame(paths[1])
+    third = analyzer.analyze_frame(paths[2])
+    assert len(calls) == 2
+    assert second["frame_cache"]["hit"] is True
+    assert second["ocr"]["full_text"] == first["ocr"]["full_text"] == "text 1"
+    assert third["frame_cache"]["hit"] is False
+
+    ctx = VisionContextManager()
+    ctx.update_context(second)
+    api = ctx.get_context_for_api()
+    assert api["history_summary"][-1]["cache_hit"] is True
+    assert "hits" in api["frame_cache"]
+
+
+def test_hash_hit_is_refreshed_when_diff_sees_a_change(tmp_path, monkeypatch):
+    cache = PerceptualFrameCache(threshold=64)  # hash alone would always hit
+    monkeypatch.setattr(vision, "get_frame_cache", lambda: cache)
+    analyzer = vision.DifferentialVisionAnalyzer()
+    analyzer._perform_ocr_analysis = lambda p: {"status": "success", "full_text": p, "regions": []}
+
+    before = _screen(0)
+    after = before.copy()
+    after[100:140, 100:400] = 255
+    register_frame(Frame.from_array(before), str(tmp_path / "a.png"))
+    register_frame(Frame.from_array(after), str(tmp_path / "b.png"))
+    analyzer.analyze_frame(str(tmp_path / "a.png"))
+    res = analyzer.analyze_frame(str(tmp_path / "b.png"))
+    assert res["frame_cache"]["hit"] is False
+    assert res["ocr"]["full_text"].endswith("b.png")
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_entries_keep_only_a_tile_grid_that_still_sees_one_typed_glyph():
+    cache = PerceptualFrameCache(threshold=64)  # hash alone would always hit
+    screen = np.full((2880, 5120, 3), 235, np.uint8)
+    frame = Frame.from_array(screen)
+    entry = cache.put(cache.hash_frame(frame), {"ocr": "text"}, frame=frame)
+    assert entry.grid.shape == (288, 512) and entry.grid.nbytes < 200_000
+
+    assert cache.match(Frame.from_array(screen.copy()))[0] is entry
+    typed = screen.copy()
+    typed[1400:1416, 2000:2009] = 20  # one character at 5K
+    assert cache.match(Frame.from_array(typed))[0] is None
+    assert cache.stats()["invalidations"] == 1
@@ -0,0 +1,62 @@
+"""Tests for tile-grid frame differencing and monitor assignment."""
+
+import numpy as np
+
+from system_ai.tools.frame_diff import assign_monitors, diff_frames
+from system_ai.tools.vision import DifferentialVisionAnalyzer
+
+
+def _frames(w=1920, h=1080):
+    rng = np.random.default_rng(1)
+    prev = rng.integers(0, 200, (h, w, 3), dtype=np.uint8)
+    return prev, prev.copy()
+
+
+def test_regions_and_stats_match_changed_areas():
+    prev, curr = _frames()
+    curr[100:200, 1000:1300] = 255
+    curr[700:701, 200:900] = 255  # thin 1px line
+    res = diff_frames(prev, curr)
+    boxes = sorted((r["bbox"]["x"], r["bbox"]["y"], r["bbox"]["width"], r["bbox"]["height"]) for r in res.regions)
+    assert len(boxes) == 2
+    # Regions are grown by the merge kernel (2px on each side)
+    assert boxes[0] == (198, 698, 704, 5)
+    assert boxes[1] == (998, 98, 304, 104)
+    assert all(r["color_intensity"] > 0 for r in res.regions)
+    assert res.candidate_tiles < res.total_tiles // 10
+    left, upper, right, lower = res.bbox
+    assert left <= 200 and upper <= 100 and right >= 1300 and lower >= 701
+
+
+def test_identical_frames_have_no_regions():
+    prev, curr = _frames()
+    res = diff_frames(prev, curr)
+    assert res.regions == [] and res.change_percentage == 0.0 and res.candidate_tiles == 0
+    assert res.bbox is None
+
+
+def test_assign_monitors_uses_real_bounds():
+    bounds = [
+        {"left": 0, "top": 0, "width": 1440, "height": 900},
+        {"left": 1440, "top": -200, "width": 2560, "height": 1440},
+    ]
+    # Frame covers the union (4000x1440 points) captured at 2x
+    pts = np.array([[100, 900], [2879, 500], [2881, 500], [3000, 2800]])
+    idx = assign_monitors(pts, bounds, frame_size=(8000, 2880))
+    assert idx.tolist() == [0, 0, 1, 1]
+
+
+def test_analyzer_maps_regions_to_monitors():
+    analyzer = DifferentialVisionAnalyzer()
+    analyzer._monitor_count = 2
+    analyzer._monitor_bounds = [
+        {"left": 0, "top": 0, "width": 960, "height": 1080},
+        {"left": 960, "top": 0, "width": 960, "height": 1080},
+    ]
+    prev, curr = _frames()
+    curr[10:60, 50:150] = 255
+    curr[500:560, 1500:1600] = 0
+    out = analyzer._calculate_frame_diff(prev, curr)
+    monitors = sorted((r["bbox"]["x"], r["monitor"]) for r in out["changed_regions"])
+    assert [m for _, m in monitors] == [0, 1]
+    assert out["global_change_percentage"] > 0
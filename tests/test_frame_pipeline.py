@@ -0,0 +1,96 @@
+"""Tests for the in-memory frame pipeline (capture -> diff -> LLM payload)."""
+
+import base64
+import io
+import os
+
+import numpy as np
+from PIL import Image
+
+import system_ai.tools.frame as frame_mod
+import system_ai.tools.screenshot as ss
+from system_ai.tools.frame import Frame, ensure_file, fit_size, get_frame, register_frame
+from system_ai.tools.vision import DifferentialVisionAnalyzer, load_image_png_b64
+
+
+class _Shot:
+    """Minimal stand-in for an mss ScreenShot (raw BGRA buffer)."""
+
+    def __init__(self, bgra: np.ndarray):
+        self.height, self.width = bgra.shape[:2]
+        self.raw = bytearray(bgra.tobytes())
+
+
+def _bgra(w=64, h=48, color=(10, 20, 30)):
+    arr = np.zeros((h, w, 4), dtype=np.uint8)
+    arr[:, :, :3] = color
+    arr[:, :, 3] = 255
+    return arr
+
+
+def test_from_mss_is_zero_copy_view_with_cached_derivatives():
+    shot = _Shot(_bgra(color=(10, 20, 30)))
+    frame = Frame.from_mss(shot)
+    assert frame.size == (64, 48)
+    assert not frame.pixels.flags.owndata  # view of the capture buffer
+    assert tuple(frame.rgb[0, 0]) == (30, 20, 10)
+    assert frame.bgr is frame.bgr
+    assert frame.thumbnail(16).shape == (12, 16)
+    assert frame.encode("PNG") is frame.encode("PNG")
+
+
+def test_png_payload_matches_load_image_sizing(tmp_path):
+    frame = Frame.from_array(np.zeros((300, 5000, 3), dtype=np.uint8))
+    assert fit_size(5000, 300, 1024, 3800) == (1024, 61)
+    png = base64.b64decode(frame.png_b64())
+    assert Image.open(io.BytesIO(png)).size == (1024, 61)
+
+    path = str(tmp_path / "wide.png")
+    Image.new("RGB", (5000, 300)).save(path)
+    b64 = load_image_png_b64(path)
+    assert Image.open(io.BytesIO(base64.b64decode(b64))).size == (1024, 61)
+
+
+def test_registered_frame_is_used_without_disk(tmp_path):
+    path = str(tmp_path / "never_written.png")
+    frame = Frame.from_array(np.full((40, 40, 3), 200, dtype=np.uint8))
+    register_frame(frame, path)
+    assert get_frame(path) is frame
+    assert not os.path.exists(path)
+    b64 = load_image_png_b64(path)
+    assert Image.open(io.BytesIO(base64.b64decode(b64))).size == (40, 40)
+
+    analyzer = DifferentialVisionAnalyzer()
+    analyzer._perform_ocr_analysis = lambda p: {"status": "error", "error": "no ocr"}
+    res = analyzer.analyze_frame(path)
+    assert res["status"] == "success"
+    assert analyzer.previous_frame is frame.bgr
+
+
+def test_background_persist_and_ensure_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("VISION_ASYNC_PERSIST", "1")
+    path = str(tmp_path / "snap.jpg")
+    frame = Frame.from_mss(_Shot(_bgra()))
+    frame.persist(path, "JPEG")
+    assert ensure_file(path)
+    assert frame.persisted
+    assert Image.open(path).size == (64, 48)
+
+
+def test_process_screenshot_diff_bbox(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".agent" / "workflows" / "data").mkdir(parents=True)
+    monkeypatch.setattr(frame_mod, "async_persist_enabled", lambda: False)
+    manager = ss.VisionDiffManager()
+    first = _bgra()
+    second = first.copy()
+    second[5:9, 20:31, :3] = 255
+
+    r1 = manager.process_screenshot(Frame.from_mss(_Shot(first)), "FULL")
+    r2 = manager.process_screenshot(Frame.from_mss(_Shot(second)), "FULL")
+    r3 = manager.process_screenshot(Image.fromarray(second[:, :, 2::-1].copy()), "FULL")
+
+    assert r1["mode"] == "initial" and os.path.exists(r1["path"])
+    assert r2["mode"] == "update"
+    assert r2["bbox"] == (20, 5, 31, 9)
+    assert r3["mode"] == "no_change"
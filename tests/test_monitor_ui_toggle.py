@@ -61,3 +61,36 @@ def test_monitor_mode_hint_in_menu():
     from tui.i18n import tr
     hint = tr("menu.monitor.mode_hint", st.ui_lang)
     assert any(hint in t for t in texts)
+
+
+def test_active_monitor_view_lists_top_cpu_processes(monkeypatch):
+    import tui.monitoring as monitoring
+    from tui.menu import _render_monitor_control_menu
+
+    monkeypatch.setattr(
+        monitoring,
+        "monitor_top_processes",
+        lambda limit=5: [{"pid": 42, "name": "Safari", "cpu_percent": 37.5}, {"pid": 7, "name": "kernel_task", "cpu_percent": None}],
+    )
+    st = SimpleNamespace(
+        monitor_active=True,
+        monitor_source="fs_usage",
+        monitor_mode="auto",
+        monitor_use_sudo=True,
+        monitor_targets=set(),
+        ui_lang="en",
+    )
+    ctx = {
+        "state": st,
+        "make_click": lambda i: (lambda ev: None),
+        "MONITOR_EVENTS_DB_PATH": "/tmp/db",
+        "MenuLevel": type("ML", (), {"MAIN": "MAIN"}),
+        "tr": lambda k, l: k,
+        "force_ui_update": lambda: None,
+    }
+    text = "".join(it[1] for it in _render_monitor_control_menu(ctx))
+    assert "Top CPU:" in text
+    assert "Safari (42): 37.5%" in text and "kernel_task (7): n/a" in text
+
+    st.monitor_active = False
+    assert "Top CPU:" not in "".join(it[1] for it in _render_monitor_control_menu(ctx))
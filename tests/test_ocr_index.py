@@ -0,0 +1,141 @@
+"""Tests for the OCR text index and its users."""
+
+import random
+
+import numpy as np
+
+import system_ai.tools.vision as vision
+from core.trinity.nodes.grisha import GrishaMixin
+from system_ai.tools.frame import Frame, register_frame
+from system_ai.tools.frame_cache import PerceptualFrameCache
+from system_ai.tools.ocr_index import KeywordSet, OcrTextIndex, index_for, normalize
+
+
+def _region(text, x, y, w, h, conf=0.9):
+    return {"text": text, "confidence": conf, "bbox": [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]}
+
+
+OCR = {
+    "status": "success",
+    "regions": [
+        _region("Відтворити фільм", 100, 40, 320, 20),
+        _region("Sign in to continue", 100, 200, 380, 24),
+        _region("Volume ▶ Pause", 600, 900, 280, 18),
+    ],
+    "full_text": "",
+}
+
+
+def test_keyword_set_matches_substring_semantics():
+    groups = {
+        "a": ["play", "відтворити", "повний екран"],
+        "b": ["layer", "ер"],
+        "c": ["she", "he", "hers"],
+        "d": ["zzz"],
+    }
+    ks = KeywordSet(groups)
+    rng = random.Random(1)
+    alphabet = "playerhsвідтворитиповнийекран ZЕ"
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        expected = {g for g, words in groups.items() if any(normalize(w) in normalize(text) for w in words)}
+        assert ks.matches(text) == expected, text
+
+
+def test_find_exact_fuzzy_and_click_points():
+    index = OcrTextIndex.from_ocr(OCR, origin=(-1440.0, 0.0), scale=0.5)
+    exact = index.find("sign in")
+    assert exact[0].score == 1.0 and exact[0].text == "Sign in to continue"
+    x, y = exact[0].center
+    # "sign in" covers the first 7 of 19 characters of the line
+    assert abs(x - (-1440 + (100 + 380 * 3.5 / 19) * 0.5)) <= 1 and y == 106
+
+    fuzzy = index.find("Sing in", fuzzy=True)
+    assert fuzzy and fuzzy[0].score >= 0.75 and "Sign in" in fuzzy[0].text
+    assert index.find("Sing in", fuzzy=False) == []
+    assert index.click_point("ВІДТВОРИТИ") is not None
+    assert len(index.boxes("pause")) == 1
+    assert [r["text"] for r in index.in_region(-1440 + 250, 400, 300, 100)] == ["Volume ▶ Pause"]
+
+
+def test_index_is_built_once_per_result():
+    assert index_for(OCR) is index_for(OCR)
+    assert index_for(dict(OCR)) is not index_for(OCR)
+
+
+def test_media_analysis_reads_ocr_regions_in_one_pass():
+    data = {"ocr": OCR, "context": "Stable: 0.0% (trend: stable)"}
+    res = GrishaMixin._enhance_media_vision_analysis(object(), data, "подивитись фільм")
+    ind = res["media_indicators"]
+    assert ind["play_button"] and ind["pause_button"] and ind["volume_control"]
+    assert ind["movie_title"] is True
+    assert not ind["fullscreen"] and not ind["progress_bar"]
+
+
+def test_find_text_on_screen_reuses_cached_ocr(tmp_path, monkeypatch):
+    cache = PerceptualFrameCache()
+    monkeypatch.setattr(vision, "get_frame_cache", lambda: cache)
+    calls = []
+    analyzer = vision.EnhancedVisionTools.get_analyzer()
+    monkeypatch.setattr(analyzer, "_perform_ocr_analysis", lambda p: calls.append(p) or OCR)
+    arr = np.random.default_rng(0).integers(0, 255, (1000, 1000, 3), dtype=np.uint8)
+    path = str(tmp_path / "screen.png")
+    register_frame(Frame.from_array(arr), path)
+
+    first = vision.find_text_on_screen("Sign in", image_path=path)
+    second = vision.find_text_on_screen("Pause", image_path=path)
+    assert first["found"] and not first["ocr_cached"]
+    assert second["found"] and second["ocr_cached"] and len(calls) == 1
+    assert (first["x"], first["y"]) == (100 + round(380 * 3.5 / 19), 212)
+
+
+def test_changed_screen_is_ocrd_again(tmp_path, monkeypatch):
+    import system_ai.tools.capture as capture
+    import system_ai.tools.screenshot as screenshot
+
+    cache = PerceptualFrameCache(threshold=256)  # the hash alone would always hit
+    monkeypatch.setattr(vision, "get_frame_cache", lambda: cache)
+    monkeypatch.setattr(vision, "_screen_geometry", lambda frame: ((0.0, 0.0), 1.0))
+    calls = []
+    analyzer = vision.EnhancedVisionTools.get_analyzer()
+    monkeypatch.setattr(analyzer, "_perform_ocr_analysis", lambda p: calls.append(p) or {**OCR, "full_text": p})
+    arr = np.random.default_rng(0).integers(0, 255, (1000, 1000, 3), dtype=np.uint8)
+    typed = arr.copy()
+    typed[880:920, 600:700] = 0  # new text in the "Volume" line
+    frames = {}
+    for name, pixels in [("a", arr), ("b", typed)]:
+        frames[name] = Frame.from_array(np.ascontiguousarray(pixels))
+        register_frame(frames[name], str(tmp_path / f"{name}.png"))
+
+    assert not vision.find_text_on_screen("Pause", image_path=str(tmp_path / "a.png"))["ocr_cached"]
+    screen = {"pixels": arr}
+    grabs = []
+
+    class _Capture:
+        def monitor(self, index=0):
+            return {"left": 0, "top": 0, "width": 1000, "height": 1000}
+
+        def grab(self, region=None, monitor=0):
+            grabs.append(region)
+            l, t, w, h = region["left"], region["top"], region["width"], region["height"]
+            return Frame.from_array(np.ascontiguousarray(screen["pixels"][t:t + h, l:l + w]))
+
+    def save(frame):
+        path = str(tmp_path / f"crop{len(grabs)}.png")
+        register_frame(frame, path)
+        return path
+
+    monkeypatch.setattr(capture, "get_capture_service", lambda: _Capture())
+    monkeypatch.setattr(screenshot, "save_region_frame", save)
+    cached = vision.ocr_region(551, 881, 298, 98)
+    assert cached["cached"] and cached["text"] == "Volume ▶ Pause" and len(calls) == 1
+    # Only the region is captured, widened to the cached entry's tile grid
+    assert grabs == [{"left": 550, "top": 880, "width": 300, "height": 100}]
+
+    screen["pixels"] = typed
+    fresh = vision.ocr_region(551, 881, 298, 98)
+    assert "cached" not in fresh and fresh["text"].endswith("crop2.png") and len(calls) == 2
+    assert len(grabs) == 2 and vision.load_frame(fresh["image_path"]).size == (298, 98)
+    res = vision.find_text_on_screen("Pause", image_path=str(tmp_path / "b.png"))
+    assert not res["ocr_cached"] and calls[-1].endswith("b.png")
+    assert vision.find_text_on_screen("Pause", image_path=str(tmp_path / "b.png"))["ocr_cached"]
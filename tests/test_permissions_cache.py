@@ -0,0 +1,125 @@
+"""Tests for cached permission probes in PermissionsManager."""
+
+import system_ai.tools.permissions_manager as pm
+from system_ai.tools.permissions_manager import Frameworks, MacPermissionProbes, PermissionStatus, PermissionsManager
+
+
+class _Probes:
+    def __init__(self, granted):
+        self.granted = dict(granted)
+        self.calls = {}
+
+    def _probe(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return PermissionStatus(name, self.granted[name])
+
+    def accessibility(self):
+        return self._probe("accessibility")
+
+    def screen_recording(self):
+        return self._probe("screen_recording")
+
+    def automation(self):
+        return self._probe("automation")
+
+    def request_accessibility(self):
+        self.calls["request_accessibility"] = 1
+        self.granted["accessibility"] = True
+        return True
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_statuses_cached_with_ttl_and_invalidated(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(pm.time, "monotonic", clock)
+    monkeypatch.setattr(pm.subprocess, "run", lambda *a, **k: None)
+    probes = _Probes({"accessibility": False, "screen_recording": True, "automation": True})
+    manager = PermissionsManager(probes=probes, ttl=60, denied_ttl=5)
+
+    for _ in range(10):
+        manager.check_all()
+        assert manager.get_missing_permissions(["accessibility", "screen_recording", "microphone"]) == ["accessibility"]
+    assert probes.calls == {"accessibility": 1, "screen_recording": 1, "automation": 1}
+
+    # Denied statuses expire sooner than granted ones
+    clock.now += 6
+    manager.check_all()
+    assert probes.calls == {"accessibility": 2, "screen_recording": 1, "automation": 1}
+    clock.now += 60
+    manager.check_all()
+    assert probes.calls == {"accessibility": 3, "screen_recording": 2, "automation": 2}
+
+    assert manager.request_permission("accessibility") is True
+    assert manager.check_accessibility().granted and probes.calls["accessibility"] == 4
+    assert manager.open_settings("automation") is True
+    manager.check_automation()
+    assert probes.calls["automation"] == 3
+    manager.check_screen_recording(refresh=True)
+    assert probes.calls["screen_recording"] == 3
+
+
+class _Func:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.result
+
+
+class _Lib:
+    def __init__(self, symbols):
+        self.symbols = symbols
+        self.lookups = []
+
+    def __getattr__(self, name):
+        self.lookups.append(name)
+        if name not in self.symbols:
+            raise AttributeError(name)
+        return self.symbols[name]
+
+
+def test_framework_handles_resolved_once():
+    trusted = _Func(1)
+    libs = {
+        pm.FRAMEWORK_PATHS["ApplicationServices"]: _Lib({"AXIsProcessTrusted": trusted}),
+        pm.FRAMEWORK_PATHS["CoreGraphics"]: _Lib({}),
+    }
+    loads = []
+
+    def loader(path):
+        loads.append(path)
+        return libs[path]
+
+    probes = MacPermissionProbes(Frameworks(loader))
+    for _ in range(5):
+        assert probes.accessibility().granted
+        status = probes.screen_recording()
+        assert not status.granted and status.error_message == "Cannot check screen recording permission"
+
+    assert trusted.calls == 5 and trusted.argtypes == []
+    assert sorted(loads) == sorted(libs)
+    assert [lib.lookups for lib in libs.values()] == [["AXIsProcessTrusted"], ["CGPreflightScreenCaptureAccess"]]
+
+
+def test_load_errors_are_reported_not_cached():
+    attempts = []
+
+    def loader(path):
+        attempts.append(path)
+        raise OSError("image not found")
+
+    probes = MacPermissionProbes(Frameworks(loader))
+    status = probes.accessibility()
+    assert not status.granted and "image not found" in status.error_message
+    assert status.settings_url == pm.PRIVACY_URLS["accessibility"]
+    probes.accessibility()
+    assert len(attempts) == 2
@@ -0,0 +1,165 @@
+"""Tests for manifest-based lazy plugin loading."""
+
+import json
+import logging
+import time
+
+import pytest
+
+import plugins
+from core.startup import BackgroundWarmup, StartupProfiler
+
+SLOW_IMPORT_S = 0.8
+
+SLOW_PLUGIN = f'''
+import time
+time.sleep({SLOW_IMPORT_S})
+
+IMPORTS = []
+IMPORTS.append(1)
+
+
+def echo(text: str) -> dict:
+    return {{"tool": "slow_echo", "status": "success", "text": text, "imports": len(IMPORTS)}}
+
+
+def register(registry):
+    registry.register_tool("slow_echo", echo, description="Echo text")
+    registry.register_tool("slow_hidden", echo, description="Not in the manifest")
+'''
+
+EAGER_PLUGIN = '''
+def ping() -> dict:
+    return {"tool": "eager_ping", "status": "success"}
+
+
+def register(registry):
+    registry.register_tool("eager_ping", ping, description="Ping")
+'''
+
+
+class _Registry:
+    def __init__(self):
+        self._tools = {}
+
+    def register_tool(self, name, func, description):
+        self._tools[name] = func
+
+
+@pytest.fixture
+def plugins_dir(tmp_path, monkeypatch):
+    slow = tmp_path / "slow_plugin"
+    slow.mkdir()
+    (slow / "plugin.py").write_text(SLOW_PLUGIN)
+    (slow / "plugin.json").write_text(json.dumps({
+        "name": "Slow Plugin",
+        "tools": [
+            {"name": "slow_echo", "description": "Echo text. Args: text (str)",
+             "parameters": {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]}},
+            {"name": "slow_missing", "description": "Declared but never registered"},
+        ],
+    }))
+    eager = tmp_path / "eager_plugin"
+    eager.mkdir()
+    (eager / "plugin.py").write_text(EAGER_PLUGIN)
+    monkeypatch.setattr(plugins, "PLUGINS_DIR", tmp_path)
+    monkeypatch.setattr(plugins, "_lazy_plugins", {})
+    monkeypatch.setattr(plugins, "_import_records", {})
+    monkeypatch.setenv("TRINITY_PLUGIN_IMPORT_BUDGET_MS", "200")
+    return tmp_path
+
+
+def test_manifest_tools_import_on_first_call(plugins_dir, caplog):
+    registry = _Registry()
+    t0 = time.perf_counter()
+    results = plugins.load_all_plugins(registry)
+    assert time.perf_counter() - t0 < SLOW_IMPORT_S / 2
+    assert results == {"slow_plugin": True, "eager_plugin": True}
+    assert sorted(registry._tools) == ["eager_ping", "slow_echo", "slow_missing"]
+    assert plugins.plugin_import_stats()["pending"] == ["slow_plugin"]
+    assert registry._tools["slow_echo"].schema["required"] == ["text"]
+    assert [m["name"] for m in plugins.discover_plugins(plugins_dir) if m["name"] == "Slow Plugin"]
+
+    with caplog.at_level(logging.WARNING, logger="plugins"):
+        t0 = time.perf_counter()
+        assert registry._tools["slow_echo"](text="hi")["text"] == "hi"
+        assert time.perf_counter() - t0 >= SLOW_IMPORT_S
+        t0 = time.perf_counter()
+        assert registry._tools["slow_echo"](text="again")["imports"] == 1
+        assert time.perf_counter() - t0 < 0.05
+
+    record = plugins.plugin_import_stats()["loaded"]["slow_plugin"]
+    assert record["ok"] and record["ms"] >= SLOW_IMPORT_S * 1000 and not record["background"]
+    assert "budget 200 ms" in caplog.text and "slow_hidden" in caplog.text
+    with pytest.raises(AttributeError):
+        registry._tools["slow_missing"]()
+
+
+def test_registry_construction_does_not_import_plugins(plugins_dir):
+    from core.mcp_registry import MCPToolRegistry
+
+    t0 = time.perf_counter()
+    MCPToolRegistry()
+    baseline = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    registry = MCPToolRegistry()
+    elapsed = time.perf_counter() - t0
+    assert elapsed < baseline + SLOW_IMPORT_S / 2
+    assert registry.plugin_import_stats()["pending"] == ["slow_plugin"]
+
+    out = json.loads(registry.execute("slow_echo", {"text": "hi"}))
+    assert out["status"] == "success" and out["text"] == "hi"
+    assert registry.plugin_import_stats()["pending"] == []
+
+
+def test_manifest_schema_reaches_the_registry(plugins_dir):
+    from core.mcp_registry import MCPToolRegistry
+
+    registry = MCPToolRegistry()
+    schema = registry.get_tool_schema("slow_echo")
+    assert schema["properties"] == {"text": {"type": "string"}}
+    defs = {d["name"]: d for d in registry.get_all_tool_definitions()}
+    assert defs["slow_echo"]["parameters"] is schema
+    assert "parameters" not in defs["slow_missing"] and registry.get_tool_schema("slow_missing") is None
+    assert registry.plugin_import_stats()["pending"] == ["slow_plugin"]
+
+
+def test_describe_tool_summarizes_parameters():
+    tool = {
+        "name": "t",
+        "description": "Process JSON.",
+        "parameters": {
+            "type": "object",
+            "properties": {"data": {"type": "string"}, "limit": {"type": "integer"}, "raw": {}},
+            "required": ["data"],
+        },
+    }
+    assert plugins.describe_tool(tool) == "Process JSON. Args: data (str), limit (int, optional), raw (optional)"
+    # Descriptions that already document their args are kept as written
+    assert plugins.describe_tool(dict(tool, description="Echo. Args: data (str)")) == "Echo. Args: data (str)"
+    assert plugins.describe_tool({"name": "t", "description": "No schema"}) == "No schema"
+    assert plugins.describe_tool({"name": "t", "parameters": {"properties": {}}}) == "Args: none"
+
+
+def test_background_warm_up(plugins_dir):
+    registry = _Registry()
+    plugins.load_all_plugins(registry)
+    warmup = BackgroundWarmup(profiler=StartupProfiler()).add("plugins", plugins.warm_up_plugins).start()
+    assert warmup.wait(5) and not warmup.errors
+    assert plugins.plugin_import_stats()["loaded"]["slow_plugin"]["background"] is True
+    t0 = time.perf_counter()
+    assert registry._tools["slow_echo"](text="x")["status"] == "success"
+    assert time.perf_counter() - t0 < 0.05
+
+
+def test_manifest_without_tools_loads_eagerly(plugins_dir):
+    from plugins.plugin_creator import write_manifest
+
+    (plugins_dir / "eager_plugin").rename(plugins_dir / "scaffold_plugin")
+    write_manifest(plugins_dir / "scaffold_plugin", "Scaffold Plugin")
+    registry = _Registry()
+    results = plugins.load_all_plugins(registry)
+    assert results["scaffold_plugin"] is True
+    assert registry._tools["eager_ping"]()["status"] == "success"
+    assert plugins.plugin_import_stats()["pending"] == ["slow_plugin"]
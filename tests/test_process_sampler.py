@@ -0,0 +1,146 @@
+"""Tests for the background process sampler."""
+
+import subprocess
+import sys
+import time
+
+import psutil
+
+from system_ai.tools.process_sampler import ProcessSampler
+
+
+class _FakeProcess:
+    def __init__(self, pid, cpu, mem, name=None, cmdline=None):
+        self.pid = pid
+        self._cpu = cpu
+        self._mem = mem
+        self._name = name or f"proc{pid}"
+        self._cmdline = cmdline
+
+    def oneshot(self):
+        import contextlib
+
+        return contextlib.nullcontext()
+
+    def name(self):
+        return self._name
+
+    def cmdline(self):
+        if self._cmdline is None:
+            raise psutil.AccessDenied(self.pid)
+        return self._cmdline
+
+    def username(self):
+        if self.pid % 2:
+            raise psutil.AccessDenied(self.pid)
+        return "user"
+
+    def cpu_percent(self, interval=None):
+        return self._cpu
+
+    def memory_percent(self):
+        if self._mem is None:
+            raise psutil.AccessDenied(self.pid)
+        return self._mem
+
+
+def test_handles_persist_and_top_k_is_ranked():
+    alive = list(range(1, 201))
+    created = []
+
+    def factory(pid):
+        created.append(pid)
+        return _FakeProcess(pid, cpu=float(pid % 37), mem=None if pid == 7 else pid / 10.0, name="Safari" if pid == 42 else None)
+
+    sampler = ProcessSampler(interval=60, top_k=10, process_factory=factory, pids=lambda: list(alive))
+    first = sampler.sample_once()
+    assert not first.cpu_valid and len(created) == 200
+    assert all(p["cpu_percent"] == 0.0 for p in first.processes)
+
+    alive.remove(5)
+    alive.append(500)
+    snap = sampler.sample_once()
+    # Only the new pid got a new handle; the gone one was dropped
+    assert len(created) == 201 and 5 not in sampler._handles
+    assert snap.cpu_valid and snap.count == 200
+    assert [p["cpu_percent"] for p in snap.top_cpu] == sorted((float(p % 37) for p in alive if p != 500), reverse=True)[:10]
+    assert snap.top(3, "memory")[0]["pid"] == 500
+    assert next(p for p in snap.processes if p["pid"] == 7)["memory_percent"] is None
+    assert len(snap.top(150, "cpu")) == 150
+    assert snap.find_pids("safari") == [42] and snap.find_pids("proc19") == [19]
+    assert snap.find_pids("OC19") == [19, 190, 191, 192, 193, 194, 195, 196, 197, 198, 199]
+
+
+def _trace_snapshot():
+    cmdlines = {
+        10: ["/usr/bin/python3", "foo.py", "--watch"],
+        11: ["/usr/bin/python3", "-m", "http.server"],
+        12: None,  # argv unreadable: the name is matched instead
+    }
+    names = {10: "python3", 11: "python3", 12: "fs_helper"}
+    sampler = ProcessSampler(
+        interval=60,
+        process_factory=lambda pid: _FakeProcess(pid, 0.0, 0.1, name=names[pid], cmdline=cmdlines[pid]),
+        pids=lambda: [10, 11, 12],
+    )
+    return sampler.sample_once()
+
+
+def test_cmdline_lookup_matches_like_pgrep_f():
+    snap = _trace_snapshot()
+    # The process name alone does not attribute scripts run by an interpreter
+    assert snap.find_pids("foo.py") == []
+    assert snap.match_cmdline("foo.py") == [10]
+    assert snap.match_cmdline("python3") == [10, 11]
+    assert snap.match_cmdline(r"-m\s+http") == [11]
+    assert snap.match_cmdline("fs_helper") == [12]
+    assert snap.match_cmdline("foo.py (") == []  # invalid regex, matched as text
+    assert snap.match_cmdline("") == []
+
+
+def test_proc_trace_attributes_lines_by_command_line(monkeypatch):
+    import system_ai.tools.process_sampler as process_sampler
+    import tui.monitoring_service as monitoring_service
+
+    snap = _trace_snapshot()
+    monkeypatch.setattr(process_sampler, "get_process_sampler", lambda: type("S", (), {"snapshot": lambda self: snap})())
+    inserted = []
+    monkeypatch.setattr(monitoring_service, "monitor_db_insert", lambda _db, **kw: inserted.append(kw))
+
+    svc = monitoring_service.ProcTraceService("opensnoop", ["opensnoop"])
+    svc._parse_and_insert("open /tmp/out.txt foo.py")
+    assert inserted[-1]["pid"] == 10 and inserted[-1]["process"] == "foo.py"
+
+
+def test_real_cpu_delta_and_non_blocking_reads():
+    busy = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+    sampler = ProcessSampler(interval=0.2, idle_stop_s=0)
+    try:
+        snap = sampler.snapshot(wait_ready=2.0)
+        assert snap is not None and snap.cpu_valid
+        time.sleep(0.5)
+        t0 = time.perf_counter()
+        latest = sampler.snapshot()
+        assert time.perf_counter() - t0 < 0.05
+        row = next(p for p in latest.processes if p["pid"] == busy.pid)
+        assert row["cpu_percent"] > 20
+        assert busy.pid in [p["pid"] for p in latest.top(5, "cpu")]
+    finally:
+        busy.kill()
+        busy.wait()
+        sampler.stop()
+
+
+def test_idle_sampler_stops_unless_held():
+    sampler = ProcessSampler(interval=0.05, idle_stop_s=0.1, pids=lambda: [])
+    sampler.acquire()
+    time.sleep(0.4)
+    assert sampler.running
+    sampler.release()
+    deadline = time.monotonic() + 2
+    while sampler.running and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not sampler.running
+    # A later read restarts it
+    assert sampler.snapshot() is not None and sampler.running
+    sampler.stop()
@@ -0,0 +1,115 @@
+"""Tests for stable-prefix prompt assembly and the planner response cache."""
+
+from langchain_core.messages import AIMessage
+
+from core.agents.atlas import get_atlas_plan_prompt
+from core.context7 import Context7
+from core.prompt_cache import PromptCache, prompt_hash
+from core.tokenizer import HeuristicTokenizer
+
+
+class MockMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+def _parts(c7, step: int, record: bool = True):
+    return c7.prepare_parts(
+        messages=[MockMessage(f"[VOICE] Step {i} done") for i in range(step)],
+        original_task="Open the project and run tests",
+        rag_context=f"retrieved snippet #{step}",
+        project_structure="src/\n  app.py\ntests/\n",
+        meta_config={"strategy": "linear"},
+        record=record,
+    )
+
+
+def test_prefix_is_byte_stable_across_steps():
+    c7 = Context7(tokenizer=HeuristicTokenizer())
+    first, second = _parts(c7, 1), _parts(c7, 5)
+    assert first.prefix == second.prefix
+    assert first.prefix_hash == second.prefix_hash
+    assert first.suffix != second.suffix
+    assert "PROJECT STRUCTURE" in first.prefix
+    assert "RETRIEVED KNOWLEDGE" in first.suffix
+    assert c7.stats()["prefix_reuse"] == 1
+    assert c7.get_last_metrics().prefix_hash == second.prefix_hash
+
+    # Speculative prompts leave the stats alone
+    assert _parts(c7, 6, record=False).prefix == first.prefix
+    assert c7.stats()["prefix_reuse"] == 1 and c7.stats()["metrics_history_size"] == 2
+
+
+def test_prepare_with_window_puts_volatile_sections_last():
+    c7 = Context7(tokenizer=HeuristicTokenizer())
+    text = c7.prepare_with_window(
+        messages=[MockMessage("[VOICE] Step")],
+        original_task="Task",
+        rag_context="RAG",
+        project_structure="Structure",
+        meta_config={},
+    )
+    assert text.index("PROJECT STRUCTURE") < text.index("RECENT EXECUTION HISTORY") < text.index("RETRIEVED KNOWLEDGE")
+
+
+def test_atlas_system_message_excludes_per_step_content():
+    a = get_atlas_plan_prompt("step 1", tools_desc="- t: d", context="rag 1", vision_context="v1", stable_context="POLICY")
+    b = get_atlas_plan_prompt(
+        "step 2", tools_desc="- t: d", context="rag 2", vision_context="v2", stable_context="POLICY",
+        forbidden_actions="FAILED APPROACH: step 1",
+    )
+    ma, mb = a.format_messages(), b.format_messages()
+    assert ma[0].content == mb[0].content
+    assert "POLICY" in ma[0].content
+    assert "v1" in ma[1].content
+    assert "FAILED APPROACH: step 1" in mb[1].content and "FORBIDDEN ACTIONS" not in mb[0].content
+    assert prompt_hash(ma[:1]) == prompt_hash(mb[:1])
+    assert prompt_hash(ma) != prompt_hash(mb)
+
+
+def test_prompt_cache_hits_and_expires():
+    cache = PromptCache(enabled=True, max_entries=2, ttl=0)
+    key = prompt_hash([AIMessage(content="x")], model="m")
+    assert cache.get(key) is None
+    cache.put(key, '{"steps": []}')
+    assert cache.get(key) == '{"steps": []}'
+    cache.put("b", "1")
+    cache.put("c", "2")
+    assert cache.get(key) is None  # evicted (LRU)
+    assert cache.stats()["hits"] == 1
+
+    disabled = PromptCache(enabled=False)
+    disabled.put(key, "x")
+    assert disabled.get(key) is None
+
+
+def test_identical_replan_skips_llm(monkeypatch):
+    import core.trinity.nodes.atlas as atlas_mod
+
+    calls = []
+
+    class _LLM:
+        def __init__(self, model_name=None):
+            pass
+
+        def invoke_with_stream(self, messages, on_delta=None):
+            calls.append(messages)
+            return AIMessage(content='{"steps": [{"id": 1, "description": "run tests"}]}')
+
+    monkeypatch.setattr(atlas_mod, "CopilotLLM", _LLM)
+
+    class _Atlas(atlas_mod.AtlasMixin):
+        verbose = False
+        prompt_cache = PromptCache(enabled=True)
+
+        def _deduplicated_stream(self, agent_name, content):
+            pass
+
+    atlas = _Atlas()
+    prompt = get_atlas_plan_prompt("same", tools_desc="- t: d", stable_context="POLICY")
+    first = atlas._execute_atlas_planning_request(prompt)
+    second = atlas._execute_atlas_planning_request(prompt)
+    assert first == second
+    assert len(calls) == 1
+    stats = atlas.prompt_cache.stats()
+    assert stats["hits"] == 1 and stats["prefix_reuse"] == 1
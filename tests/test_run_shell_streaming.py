@@ -0,0 +1,81 @@
+"""Tests for streaming, bounded run_shell execution."""
+
+import os
+import sys
+import time
+
+from system_ai.tools.automation import run_shell
+from system_ai.tools.shell_stream import LineEmitter, OutputBuffer, run_streaming
+
+
+def _alive(pid):
+    # A killed child reparented to an init that doesn't reap stays a zombie
+    try:
+        with open(f"/proc/{pid}/stat") as fh:
+            return fh.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+
+
+def test_output_buffer_keeps_head_and_tail():
+    buf = OutputBuffer(head_bytes=4, tail_bytes=4)
+    for i in range(1000):
+        buf.write(f"{i:04d}".encode())
+    assert buf.total == 4000 and buf.dropped == 3992
+    assert buf.text() == "0000\n... [3992 bytes omitted] ...\n0999"
+    assert len(buf._tail) <= 8
+
+    small = OutputBuffer(4, 4)
+    small.write(b"abcdefg")
+    assert small.text() == "abcdefg" and small.dropped == 0
+
+
+def test_large_output_is_bounded():
+    cmd = f"{sys.executable} -c \"import sys; [sys.stdout.write('x' * 1023 + chr(10)) for _ in range(50 * 1024)]; print('END')\""
+    res = run_shell(cmd, allow=True)
+    assert res["status"] == "success" and res["returncode"] == 0
+    assert res["stdout_bytes"] > 50 * 1024 * 1024 and res["truncated"] is True
+    assert res["stdout"].startswith("x") and res["stdout"].rstrip().endswith("END")
+    assert len(res["stdout"]) < 9000
+
+
+def test_hung_command_is_killed_with_its_children(tmp_path):
+    marker = tmp_path / "child.pid"
+    started = time.monotonic()
+    res = run_shell(f"sleep 60 & echo $! > {marker}; echo started; sleep 60", allow=True, timeout=1, idle_timeout=0)
+    assert time.monotonic() - started < 5
+    assert res["status"] == "error" and res["timed_out"] == "timeout"
+    assert "started" in res["stdout"]
+    child = int(marker.read_text())
+    time.sleep(0.2)
+    assert not _alive(child)
+
+
+def test_idle_timeout_and_stdin_closed():
+    res = run_shell("echo waiting; sleep 30", allow=True, timeout=0, idle_timeout=0.5)
+    assert res["timed_out"] == "idle_timeout" and res["duration_s"] < 5
+
+    # Reads from stdin get EOF instead of blocking on the terminal
+    res = run_shell("read answer; echo got:$answer", allow=True, timeout=5)
+    assert res["status"] == "success" and res["stdout"].strip() == "got:"
+
+
+def test_chunks_stream_to_callback_as_lines():
+    lines = []
+    emitter = LineEmitter(lambda stream, line: lines.append((stream, line)), max_lines=3)
+    result = run_streaming("for i in 1 2 3 4 5; do echo out$i; done; printf tail; echo oops >&2", on_chunk=emitter)
+    assert result.returncode == 0 and result.chunks >= 1
+    out = [line for stream, line in lines if stream == "stdout"]
+    assert out == ["out1", "out2", "out3", "... (further output not shown)"]
+    assert ("stderr", "oops") in lines
+
+
+def test_permission_errors_are_still_classified():
+    res = run_shell("echo 'ls: /x: Permission denied' >&2; exit 1", allow=True)
+    assert res["status"] == "error" and res["permission"] == "files_and_folders"
@@ -0,0 +1,105 @@
+"""Tests for the event-driven screen watcher."""
+
+import time
+
+import numpy as np
+
+from system_ai.tools.screen_watch import ScreenWatcher, settle_screen, wait_for_screen
+from system_ai.tools.vision import DifferentialVisionAnalyzer
+
+
+class _Screen:
+    """Frame source whose content changes on a schedule."""
+
+    def __init__(self, w=800, h=600):
+        rng = np.random.default_rng(0)
+        self.base = rng.integers(0, 200, (h, w, 3), dtype=np.uint8)
+        self.events = []  # (time offset, callable(array))
+        self.start = time.monotonic()
+        self.calls = 0
+
+    def at(self, offset, fn):
+        self.events.append((offset, fn))
+        return self
+
+    def __call__(self):
+        self.calls += 1
+        arr = self.base.copy()
+        t = time.monotonic() - self.start
+        for offset, fn in self.events:
+            if t >= offset:
+                fn(arr)
+        return arr
+
+
+def _box(arr):
+    arr[100:160, 200:400] = 255
+
+
+def _watcher(screen, **kw):
+    return ScreenWatcher(grab=screen, analyzer=DifferentialVisionAnalyzer(), **kw)
+
+
+def test_change_is_reported_soon_after_it_happens():
+    screen = _Screen().at(0.3, _box)
+    res = _watcher(screen).wait("change", timeout=3.0)
+    assert res.event == "changed" and res.changed
+    assert 300 <= res.elapsed_ms < 900
+    left, upper, right, lower = res.bbox
+    assert (left, upper, right, lower) == (200, 100, 400, 160)
+    assert res.change_percentage > 0
+
+
+def test_small_repaints_do_not_count_as_change():
+    def caret(arr):
+        if int(time.monotonic() * 10) % 2:
+            arr[300:318, 50:51] = 255
+
+    screen = _Screen().at(0.0, caret)
+    res = _watcher(screen).wait("change", timeout=0.6)
+    assert res.event == "timeout" and not res.changed
+
+
+def test_stable_waits_for_quiet_window_and_backs_off():
+    counter = {"n": 0}
+
+    def animate(arr):
+        # Moves every sample for the first 0.4 s
+        if time.monotonic() - screen.start < 0.4:
+            counter["n"] += 1
+            arr[:50, counter["n"] * 20 % 700:counter["n"] * 20 % 700 + 60] = 255
+
+    screen = _Screen().at(0.0, animate)
+    res = _watcher(screen).wait("stable", timeout=3.0, stable_ms=300)
+    assert res.event == "stable" and res.changed
+    assert 600 <= res.elapsed_ms < 1500
+
+    idle = _Screen()
+    res = _watcher(idle, min_interval=0.02, max_interval=0.4).wait("change", timeout=1.5)
+    assert res.event == "timeout"
+    # Geometric back-off: far fewer samples than 1.5 s / 20 ms
+    assert res.samples < 20
+
+
+def test_change_then_stable_and_timeout():
+    screen = _Screen().at(0.2, _box)
+    res = _watcher(screen).wait("change_then_stable", timeout=3.0, stable_ms=200)
+    assert res.event == "stable" and res.changed and res.elapsed_ms >= 400
+
+    res = _watcher(_Screen()).wait("change_then_stable", timeout=0.3, stable_ms=100)
+    assert res.event == "timeout" and not res.changed
+
+
+def test_settle_screen_falls_back_to_sleep_on_capture_error():
+    def broken():
+        raise RuntimeError("no display")
+
+    t0 = time.monotonic()
+    res = settle_screen(0.2, grab=broken)
+    assert res.event == "error" and "no display" in res.error
+    assert time.monotonic() - t0 >= 0.2
+
+
+def test_wait_for_screen_tool_reports_errors():
+    out = wait_for_screen(until="bogus", timeout=0.1)
+    assert out["status"] == "error" and out["tool"] == "wait_for_screen"
@@ -0,0 +1,89 @@
+"""Tests for background screenshot persistence and rotation in VisionDiffManager."""
+
+import os
+
+import numpy as np
+
+import system_ai.tools.frame as frame_mod
+import system_ai.tools.screenshot as ss
+from system_ai.tools.frame import Frame, ensure_file, flush_writes
+
+
+def _screen(w=1600, h=900, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 200, (h, w, 3), dtype=np.uint8)
+
+
+def _manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".agent" / "workflows" / "data").mkdir(parents=True)
+    manager = ss.VisionDiffManager()
+    manager.set_session_id("s1")
+    return manager
+
+
+def test_rotation_uses_in_memory_index(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    monkeypatch.setattr(frame_mod, "async_persist_enabled", lambda: True)
+    listings = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(ss.os, "listdir", lambda p: listings.append(p) or real_listdir(p))
+
+    small = _screen(64, 48)
+    paths = [manager.process_screenshot(Frame.from_array(small), "FULL")["path"] for _ in range(ss.FILE_LIMIT + 7)]
+    assert flush_writes(timeout=10)
+
+    # Sessions and the session folder are listed once, not per save
+    assert len(listings) <= 3
+    session_dir = os.path.dirname(paths[-1])
+    kept = sorted(os.path.join(session_dir, f) for f in real_listdir(session_dir))
+    assert kept == sorted(paths[-ss.FILE_LIMIT:])
+    assert list(manager._session_files) == paths[-ss.FILE_LIMIT:]
+
+
+def test_index_resumes_existing_session_files(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    monkeypatch.setattr(frame_mod, "async_persist_enabled", lambda: False)
+    session_dir = tmp_path / ".agent" / "workflows" / "data" / "screenshots" / "s1"
+    session_dir.mkdir(parents=True)
+    for i in range(ss.FILE_LIMIT + 3):
+        p = session_dir / f"snap_{i}.jpg"
+        p.write_bytes(b"x")
+        os.utime(p, (1000 + i, 1000 + i))
+
+    path = manager.process_screenshot(Frame.from_array(_screen(64, 48)), "FULL")["path"]
+    assert flush_writes(timeout=10)
+    files = sorted(os.listdir(session_dir))
+    assert len(files) == ss.FILE_LIMIT
+    assert os.path.basename(path) in files
+    assert "snap_3.jpg" not in files and f"snap_{ss.FILE_LIMIT + 2}.jpg" in files
+
+
+def test_async_write_is_visible_through_ensure_file(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    monkeypatch.setattr(frame_mod, "async_persist_enabled", lambda: True)
+    res = manager.process_screenshot(Frame.from_array(_screen()), "FULL")
+    assert ensure_file(res["path"], timeout=10)
+    assert os.path.getsize(res["path"]) > 0
+
+
+def test_thumbnail_detection_with_refined_bbox(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    monkeypatch.setattr(frame_mod, "async_persist_enabled", lambda: True)
+    first = _screen()
+    second = first.copy()
+    second[400:420, 700:760] = 255
+
+    manager.process_screenshot(Frame.from_array(first), "FULL")
+    exact = manager.process_screenshot(Frame.from_array(second), "FULL")
+    assert exact["mode"] == "update" and exact["bbox"] == (700, 400, 760, 420)
+
+    manager.process_screenshot(Frame.from_array(first), "FULL")
+    coarse = manager.process_screenshot(Frame.from_array(second), "FULL", refine=False)
+    left, upper, right, lower = coarse["bbox"]
+    assert left <= 700 and upper <= 400 and right >= 760 and lower >= 420
+    assert (right - left) * (lower - upper) < 1600 * 900 // 50
+
+    same = manager.process_screenshot(Frame.from_array(second.copy()), "FULL")
+    assert same["mode"] == "no_change" and same["bbox"] is None
+    flush_writes(timeout=10)
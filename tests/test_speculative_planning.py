@@ -0,0 +1,183 @@
+"""Tests for speculative Atlas pre-planning during Grisha verification."""
+
+import time
+
+from langchain_core.messages import AIMessage
+
+from core.prompt_cache import prompt_hash
+from core.trinity.nodes.atlas import AtlasMixin
+from core.trinity.planning.speculation import SpeculativePlanner
+
+
+def test_take_commits_matching_key_and_discards_others():
+    sp = SpeculativePlanner()
+    key = ("run", 3, "continuation", "open page")
+    assert sp.start(key, lambda: {"steps": [1]})
+    assert sp.take(key, timeout=5) == {"steps": [1]}
+
+    sp.start(key, lambda: {"steps": [2]})
+    assert sp.take(("run", 3, "repair", "open page"), timeout=5) is None
+    assert sp.take(key) is None  # already discarded
+
+    stats = sp.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    sp.shutdown()
+
+
+class _VisionContext:
+    current_context = "No visual context available"
+
+
+class _Atlas(AtlasMixin):
+    verbose = False
+    speculative_planning = True
+
+    def __init__(self):
+        self.speculator = SpeculativePlanner()
+        self.vision_context_manager = _VisionContext()
+        self.prompts = []
+
+    def _prepare_atlas_prompt(self, state, last_msg, meta_config, record_metrics=True, vision_context=None):
+        self.prompts.append((state["last_step_status"], dict(meta_config), record_metrics, vision_context))
+        return None
+
+    def _execute_atlas_planning_request(self, prompt, stream=True, calls=None):
+        assert stream is False and calls == []
+        time.sleep(0.2)
+        return {"steps": [{"id": 1, "description": "next"}]}
+
+
+def _grisha_state(status):
+    return {
+        "transcript_id": "t1",
+        "step_count": 4,
+        "plan": [{"id": 1, "description": "click play"}],
+        "messages": [AIMessage(content="tetyana result")],
+        "last_step_status": status,
+        "meta_config": {"recovery_mode": "local_fix"},
+        "history_plan_execution": [],
+    }
+
+
+def _take(atlas, state, meta):
+    return atlas._take_speculative_plan(state, meta, atlas._planning_inputs_hash(state, meta))
+
+
+def test_continuation_is_committed_after_success_verdict():
+    atlas = _Atlas()
+    state = _grisha_state("success")
+    assert atlas._start_speculative_planning(state)
+
+    # What Atlas sees after Grisha succeeded and the meta-planner consumed the step
+    after = {**state, "plan": [], "history_plan_execution": ["SUCCESS: click play"]}
+    t0 = time.perf_counter()
+    data = _take(atlas, after, {"recovery_mode": "local_fix", "repair_mode": False})
+    assert data == {"steps": [{"id": 1, "description": "next"}]}
+    assert time.perf_counter() - t0 < 0.2 + 0.1
+    assert atlas.speculator.stats()["hits"] == 1
+    assert atlas.prompts[0][2] is False  # the speculative prompt records no Context7 metrics
+
+
+def test_repair_speculation_discarded_when_verdict_differs():
+    atlas = _Atlas()
+    state = _grisha_state("failed")
+    assert atlas._start_speculative_planning(state)
+    assert atlas.speculator._current.key == ("t1", 4, "repair", "click play")
+
+    # Grisha overruled Tetyana: the step succeeded, so the repair plan is useless
+    after = {**state, "last_step_status": "success", "plan": [], "history_plan_execution": ["SUCCESS: click play"]}
+    assert _take(atlas, after, {"repair_mode": False}) is None
+    assert atlas.speculator.stats()["misses"] == 1
+
+
+def test_failure_mid_plan_speculates_repair_but_changed_inputs_discard_it():
+    atlas = _Atlas()
+    state = {**_grisha_state("failed"), "plan": [{"id": 1, "description": "click play"}, {"id": 2, "description": "wait"}]}
+    assert atlas._start_speculative_planning(state)
+    assert atlas.speculator._current.key == ("t1", 4, "repair", "click play")
+    assert atlas._start_speculative_planning({**state, "last_step_status": "success"}) is False
+
+    # The meta-planner forbade an action after the speculation started
+    after = {**state, "plan": state["plan"][1:], "history_plan_execution": ["FAILED: click play (Try #1)"]}
+    meta = {"recovery_mode": "local_fix", "repair_mode": True, "failed_step": "click play"}
+    assert _take(atlas, {**after, "forbidden_actions": ["AVOID: click"]}, meta) is None
+    stats = atlas.speculator.stats()
+    assert stats["hits"] == 0 and stats["misses"] == 1
+
+    atlas._start_speculative_planning(state)
+    assert _take(atlas, after, meta) == {"steps": [{"id": 1, "description": "next"}]}
+
+
+class _DummyLLM:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def invoke(self, _messages):
+        return AIMessage(content=self.content)
+
+    def invoke_with_stream(self, _messages, on_delta=None):
+        self.calls += 1
+        time.sleep(0.1)
+        return AIMessage(content=self.content)
+
+
+def test_speculation_is_committed_through_real_grisha_and_atlas_nodes(monkeypatch):
+    from core.trinity import TrinityRuntime
+    import core.trinity.nodes.atlas as atlas_node
+
+    monkeypatch.setenv("COPILOT_API_KEY", "dummy")
+    rt = TrinityRuntime(verbose=False, speculative_planning=True)
+    rt.llm = _DummyLLM("Verification passed. [VERIFIED]")
+    planner = _DummyLLM('{"steps": [{"id": 1, "type": "execute", "description": "open the next episode", "agent": "tetyana"}]}')
+    monkeypatch.setattr(atlas_node, "CopilotLLM", lambda model_name=None: planner)
+    monkeypatch.setattr(rt, "_get_repo_changes", lambda: {"ok": True, "changed_files": []})
+
+    def vision_pass(state, last_msg):
+        # Grisha's vision check refreshes the context the Atlas prompt embeds
+        rt.vision_context_manager.current_context = "Video page is open and playing"
+        return None
+
+    monkeypatch.setattr(rt, "_perform_smart_vision", vision_pass)
+    prompts = []
+    prepare = rt._prepare_atlas_prompt
+
+    def spy_prepare(*args, **kwargs):
+        prompt = prepare(*args, **kwargs)
+        prompts.append(prompt_hash(prompt.format_messages()))
+        return prompt
+
+    monkeypatch.setattr(rt, "_prepare_atlas_prompt", spy_prepare)
+
+    state = {
+        "original_task": "watch a movie",
+        "step_count": 4,
+        "plan": [{"id": 1, "description": "click play", "tools": ["browser_click"]}],
+        "messages": [AIMessage(content="Clicked the play button")],
+        "last_step_status": "success",
+        "meta_config": rt._prepare_meta_config({}, "watch a movie"),
+        "history_plan_execution": [],
+        "task_type": "GENERAL",
+        "gui_mode": "off",
+        "execution_mode": "native",
+    }
+    for node in (rt._grisha_node, rt._meta_planner_node):
+        out = node(state)
+        state = {**state, **out, "messages": state["messages"] + list(out.get("messages") or [])}
+    assert state["current_agent"] == "atlas"
+
+    out = rt._atlas_node(state)
+    assert planner.calls == 1  # only the speculative request reached the LLM
+    assert rt.speculator.stats()["hits"] == 1
+    assert len(prompts) == 2 and prompts[0] != prompts[1]  # verdict and vision context differ
+    assert out["plan"][0]["description"] == "open the next episode"
+    assert [c["name"] for c in rt.prompt_cache.calls()] == ["atlas"]  # recorded once, on commit
+    rt.speculator.shutdown()
+
+
+def test_speculation_is_opt_in():
+    atlas = _Atlas()
+    atlas.speculative_planning = False
+    assert atlas._start_speculative_planning(_grisha_state("success")) is False
+    assert atlas.speculator.stats()["started"] == 0
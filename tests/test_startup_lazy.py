@@ -0,0 +1,113 @@
+"""Tests for staged startup helpers (core.startup)."""
+
+import inspect
+import os
+import subprocess
+import sys
+import threading
+
+from core.startup import BackgroundWarmup, LazyCallable, LazyProxy, StartupProfiler
+
+
+class _Heavy:
+    def __init__(self):
+        self.value = 42
+        self.flag = False
+
+    def ping(self):
+        return "pong"
+
+
+def test_lazy_proxy_builds_once_on_first_use():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return _Heavy()
+
+    profiler = StartupProfiler()
+    proxy = LazyProxy("heavy", factory, profiler)
+    assert not proxy.is_resolved
+    assert calls == []
+
+    assert proxy.ping() == "pong"
+    assert proxy.value == 42
+    proxy.flag = True
+    assert proxy.resolve().flag is True
+    assert calls == [1]
+    assert [r.name for r in profiler.records()] == ["heavy"]
+
+
+def test_lazy_proxy_concurrent_resolution_is_single():
+    calls = []
+    gate = threading.Event()
+
+    def factory():
+        gate.wait(1.0)
+        calls.append(1)
+        return _Heavy()
+
+    proxy = LazyProxy("heavy", factory, StartupProfiler())
+    threads = [threading.Thread(target=lambda: proxy.value) for _ in range(8)]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join()
+    assert calls == [1]
+
+
+def test_lazy_callable_defers_import_and_exposes_signature():
+    fn = LazyCallable("json", "dumps")
+    assert fn._func is None
+    sig = inspect.signature(fn)
+    assert "obj" in sig.parameters
+    assert fn({"a": 1}) == '{"a": 1}'
+
+
+def test_lazy_callable_fallback_on_import_error():
+    fn = LazyCallable("__no_such_module__", "x", fallback=lambda e: (lambda **_: {"status": "error", "error": str(e)}))
+    out = fn()
+    assert out["status"] == "error"
+
+
+def test_background_warmup_records_background_stages():
+    profiler = StartupProfiler()
+    ran = []
+    warmup = BackgroundWarmup(profiler=profiler)
+    warmup.add("a", lambda: ran.append("a"))
+    warmup.add("boom", lambda: 1 / 0)
+    warmup.start()
+    assert warmup.wait(5.0)
+    assert ran == ["a"]
+    assert "boom" in warmup.errors
+    rep = profiler.report()
+    assert {s["name"] for s in rep["stages"]} == {"warmup:a", "warmup:boom"}
+    assert all(s["background"] for s in rep["stages"])
+
+
+def test_profiler_nested_stages_not_double_counted():
+    profiler = StartupProfiler()
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            pass
+    rep = profiler.report()
+    outer = next(s for s in rep["stages"] if s["name"] == "outer")
+    inner = next(s for s in rep["stages"] if s["name"] == "inner")
+    assert inner["depth"] == 1
+    assert rep["foreground_ms"] == outer["ms"]
+    assert "inner" in profiler.format_report()
+
+
+def test_registry_import_does_not_load_heavy_tool_modules():
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys\n"
+        "import core.mcp_registry\n"
+        "heavy = [m for m in ('system_ai.tools.desktop', 'system_ai.tools.browser', 'system_ai.tools.screenshot', "
+        "'system_ai.tools.vision', 'mcp') if m in sys.modules]\n"
+        "print(','.join(heavy))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=repo_root, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
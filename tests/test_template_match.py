@@ -0,0 +1,93 @@
+"""Tests for the cached, coarse-to-fine template matching engine."""
+
+import os
+
+import cv2
+import numpy as np
+
+from system_ai.tools.frame import Frame
+from system_ai.tools.template_match import TemplateCache, TemplateMatcher
+from system_ai.tools.vision import find_image_on_screen, find_images_on_screen
+
+
+def _screen(w=640, h=400, seed=0):
+    rng = np.random.default_rng(seed)
+    # Smooth texture: distinctive at every pyramid level
+    noise = rng.integers(0, 255, (h // 8, w // 8, 3), dtype=np.uint8)
+    return cv2.resize(noise, (w, h), interpolation=cv2.INTER_CUBIC)
+
+
+def _write(path, arr):
+    cv2.imwrite(str(path), arr)
+    return str(path)
+
+
+def test_coarse_to_fine_finds_exact_location(tmp_path):
+    screen = _screen()
+    tpl = _write(tmp_path / "tpl.png", screen[123:187, 301:381])
+    matcher = TemplateMatcher()
+    res = matcher.match(Frame.from_array(screen), tpl, 0.9)
+    assert res["found"] is True
+    assert res["match"] == {"x": 301, "y": 123, "width": 80, "height": 64}
+    assert (res["x"], res["y"]) == (341, 155)
+    assert res["confidence"] > 0.99
+    assert matcher.full_searches == 0  # no full-resolution pass was needed
+
+
+def test_template_cache_reuses_and_reloads_on_change(tmp_path):
+    screen = _screen()
+    path = _write(tmp_path / "tpl.png", screen[10:50, 10:50])
+    cache = TemplateCache()
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert cache.stats()["hits"] == 1
+
+    _write(path, screen[60:100, 60:100])
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.get(path) is not first
+    assert cache.stats()["entries"] == 1
+
+
+def test_last_match_and_roi_hints(tmp_path):
+    screen = _screen()
+    tpl = _write(tmp_path / "tpl.png", screen[200:260, 100:180])
+    matcher = TemplateMatcher()
+    frame = Frame.from_array(screen)
+    assert matcher.match(frame, tpl, 0.9)["source"] == "full"
+    assert matcher.match(frame, tpl, 0.9)["source"] == "last_match"
+
+    roi = {"x": 80, "y": 180, "width": 160, "height": 120}
+    res = TemplateMatcher().match(frame, tpl, 0.9, roi=roi)
+    assert res["source"] == "roi" and res["match"]["x"] == 100
+
+
+def test_multi_scale_matches_hidpi_capture(tmp_path):
+    screen = _screen()
+    tpl = _write(tmp_path / "tpl.png", screen[100:160, 200:280])
+    retina = cv2.resize(screen, (screen.shape[1] * 2, screen.shape[0] * 2), interpolation=cv2.INTER_LINEAR)
+    frame = Frame.from_array(retina)
+
+    single = TemplateMatcher().match(frame, tpl, 0.9)
+    assert single["found"] is False
+
+    res = TemplateMatcher().match(frame, tpl, 0.9, scales=(1.0, 2.0))
+    assert res["found"] is True and res["scale"] == 2.0
+    assert abs(res["match"]["x"] - 400) <= 2 and abs(res["match"]["y"] - 200) <= 2
+
+
+def test_miss_and_batch_on_saved_screenshot(tmp_path):
+    screen = _screen()
+    shot = _write(tmp_path / "screen.png", screen)
+    a = _write(tmp_path / "a.png", screen[20:70, 30:90])
+    b = _write(tmp_path / "b.png", _screen(60, 50, seed=7))
+
+    out = find_image_on_screen(a, 0.9, screenshot_path=shot)
+    assert out["status"] == "success" and out["found"] is True
+    assert out["match"]["x"] == 30 and out["match"]["y"] == 20
+
+    batch = find_images_on_screen([a, b, str(tmp_path / "missing.png")], 0.9, screenshot_path=shot)
+    assert batch["status"] == "success"
+    assert batch["found"] == [a]
+    assert batch["results"][b]["found"] is False
+    assert batch["results"][str(tmp_path / "missing.png")]["status"] == "error"
@@ -0,0 +1,168 @@
+"""Tests for the CPU-bound tool process pool."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import core.tool_pool as tool_pool
+import plugins
+from core.tool_pool import ToolProcessPool, ToolTimeoutError
+
+POOL_PLUGIN = '''
+import os
+import time
+
+_HOLD = []
+
+
+def info():
+    return {"pid": os.getpid()}
+
+
+def nap(seconds: float):
+    time.sleep(seconds)
+    return {"pid": os.getpid()}
+
+
+def grow(mb: int):
+    _HOLD.append(bytearray(mb * 1024 * 1024))
+    return {"pid": os.getpid()}
+
+
+def double(arr):
+    return {"out": arr * 2, "view": arr, "pid": os.getpid()}
+
+
+def register(registry):
+    for func in (info, nap, grow, double):
+        registry.register_tool("pool_" + func.__name__, func, description=func.__name__)
+'''
+
+
+class _Registry:
+    def __init__(self):
+        self._tools = {}
+
+    def register_tool(self, name, func, description):
+        self._tools[name] = func
+
+
+@pytest.fixture
+def tools(tmp_path, monkeypatch):
+    plugin = tmp_path / "pool_plugin"
+    plugin.mkdir()
+    (plugin / "plugin.py").write_text(POOL_PLUGIN)
+    names = ["info", "nap", "grow", "double"]
+    (plugin / "plugin.json").write_text(json.dumps({
+        "name": "Pool Plugin",
+        "tools": [{"name": f"pool_{n}", "description": n, "cpu_bound": True} for n in names],
+    }))
+    monkeypatch.setattr(plugins, "PLUGINS_DIR", tmp_path)
+    monkeypatch.setattr(plugins, "_lazy_plugins", {})
+    monkeypatch.setattr(plugins, "_import_records", {})
+    registry = _Registry()
+    plugins.load_all_plugins(registry)
+    return registry._tools
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        kwargs.setdefault("workers", 1)
+        kwargs.setdefault("max_rss_mb", 0)
+        pools.append(ToolProcessPool(**kwargs))
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_workers_are_reused_then_recycled_after_n_calls(tools, make_pool):
+    pool = make_pool(max_calls=2)
+    pids = [pool.call(tools["pool_info"])["pid"] for _ in range(4)]
+    assert os.getpid() not in pids
+    assert pids[0] == pids[1] and pids[1] != pids[2] and pids[2] == pids[3]
+
+
+def test_worker_recycled_over_memory_threshold(tools, make_pool):
+    pool = make_pool(max_calls=0)
+    base = pool.warm_up()[0]
+    assert pool.call(tools["pool_info"])["pid"] == base
+    pool.max_rss_mb = 100
+    assert pool.call(tools["pool_grow"], {"mb": 150})["pid"] == base
+    assert pool.call(tools["pool_info"])["pid"] != base
+    assert pool.stats()["recycles"] == 1
+
+
+def test_timeout_kills_worker_and_pool_recovers(tools, make_pool):
+    pool = make_pool(timeout=0.5)
+    first = pool.call(tools["pool_info"])["pid"]
+    t0 = time.perf_counter()
+    with pytest.raises(ToolTimeoutError):
+        pool.call(tools["pool_nap"], {"seconds": 30})
+    assert time.perf_counter() - t0 < 5
+    assert pool.stats()["timeouts"] == 1
+    assert pool.call(tools["pool_info"])["pid"] != first
+
+
+def test_calls_beside_a_timeout_are_resubmitted(tools, make_pool):
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = make_pool(workers=2, timeout=10)
+    first = set(pool.warm_up())
+    with ThreadPoolExecutor(3) as threads:
+        stuck = threads.submit(pool.call, tools["pool_nap"], {"seconds": 30}, 0.5)
+        time.sleep(0.1)
+        running = threads.submit(pool.call, tools["pool_nap"], {"seconds": 1.0})
+        time.sleep(0.1)
+        queued = threads.submit(pool.call, tools["pool_info"])
+        with pytest.raises(ToolTimeoutError):
+            stuck.result(timeout=5)
+        # Killing the stuck call's workers does not fail its neighbours
+        assert running.result(timeout=15)["pid"] not in first
+        assert queued.result(timeout=15)["pid"] not in first
+    stats = pool.stats()
+    assert stats["timeouts"] == 1 and stats["errors"] == 0 and stats["resubmits"] >= 1
+    assert stats["calls"] == 3
+
+
+def test_large_arrays_use_shared_memory(tools, make_pool):
+    def blocks():
+        return {n for n in os.listdir("/dev/shm") if n.startswith("psm_")} if os.path.isdir("/dev/shm") else set()
+
+    before = blocks()
+    pool = make_pool()
+    arr = np.arange(512 * 1024, dtype=np.float64)
+    out = pool.call(tools["pool_double"], {"arr": arr})
+    assert np.array_equal(out["out"], arr * 2) and np.array_equal(out["view"], arr)
+    assert pool.stats()["shm_bytes"] >= arr.nbytes
+    small = pool.call(tools["pool_double"], {"arr": np.ones(4)})
+    assert small["out"].tolist() == [2.0] * 4
+    assert blocks() == before
+
+
+def test_registry_offloads_cpu_bound_tools(tools, make_pool, monkeypatch):
+    from core.mcp_registry import MCPToolRegistry
+
+    pool = make_pool()
+    monkeypatch.setattr(tool_pool, "_pool", pool)
+    registry = MCPToolRegistry()
+    for name, func in tools.items():
+        registry.register_tool(name, func, name)
+    plugins.register_lazy_plugin("example_data_processor", registry, plugins_dir=Path(plugins.__file__).parent)
+    assert {"pool_info", "example_process_json"} <= registry._cpu_bound
+
+    assert json.loads(registry.execute("pool_info", {}))["pid"] != os.getpid()
+    out = json.loads(registry.execute("example_process_json", {"data": '{"a": 1, "b": 2}'}))
+    assert out["status"] == "success" and out["keys"] == ["a", "b"]
+    assert pool.stats()["calls"] == 2
+
+    monkeypatch.setenv("TRINITY_TOOL_POOL", "0")
+    assert json.loads(registry.execute("pool_info", {}))["pid"] == os.getpid()
@@ -0,0 +1,99 @@
+"""Tests for the bounded message window and transcript store."""
+
+from typing import Annotated, List, TypedDict
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.graph import END, StateGraph
+
+from core.trinity.transcript import (
+    TranscriptStore,
+    new_messages,
+    trim_window,
+    window_messages,
+)
+
+
+def test_reducer_appends_delta_and_trims():
+    task = HumanMessage(content="task")
+    window = [task]
+    for i in range(50):
+        window = window_messages(window, [AIMessage(content=f"m{i}")])
+    assert len(window) == 16
+    assert window[0] is task
+    assert window[-1].content == "m49"
+
+
+def test_reducer_accepts_legacy_full_history_update():
+    task = HumanMessage(content="task")
+    a = AIMessage(content="a")
+    window = [task, a]
+    b = AIMessage(content="b")
+    # Old-style node output: whole window plus the new message
+    assert new_messages(window, list(window) + [b]) == [b]
+    assert window_messages(window, list(window) + [b]) == [task, a, b]
+    # Returning the window unchanged adds nothing
+    assert window_messages(window, list(window)) == [task, a]
+    assert window_messages(window, []) == [task, a]
+
+
+def test_trim_window_keeps_first_message():
+    msgs = [AIMessage(content=str(i)) for i in range(10)]
+    trimmed = trim_window(msgs, size=4)
+    assert [m.content for m in trimmed] == ["0", "7", "8", "9"]
+
+
+def test_transcript_store_is_append_only_and_bounded():
+    store = TranscriptStore(max_transcripts=2)
+    first = store.create([HumanMessage(content="t")])
+    assert store.append(first, [AIMessage(content="a")]) == 2
+    assert store.append(first, AIMessage(content="b")) == 3
+    assert [m.content for m in store.read(first)] == ["t", "a", "b"]
+    assert [m.content for m in store.tail(first, 2)] == ["a", "b"]
+    assert store.append("missing", [AIMessage(content="x")]) == 0
+
+    store.create()
+    store.create()
+    assert store.length(first) == 0  # evicted as the oldest run
+
+
+class _State(TypedDict, total=False):
+    messages: Annotated[List[BaseMessage], window_messages]
+    n: int
+
+
+def test_graph_state_stays_bounded():
+    def step(state: _State):
+        n = state.get("n", 0) + 1
+        return {"messages": [AIMessage(content=f"step {n}")], "n": n}
+
+    def route(state: _State):
+        return END if state["n"] >= 40 else "step"
+
+    graph = StateGraph(_State)
+    graph.add_node("step", step)
+    graph.set_entry_point("step")
+    graph.add_conditional_edges("step", route)
+    app = graph.compile()
+
+    final = app.invoke({"messages": [HumanMessage(content="task")], "n": 0}, config={"recursion_limit": 100})
+    assert len(final["messages"]) == 16
+    assert final["messages"][0].content == "task"
+    assert final["messages"][-1].content == "step 40"
+
+
+def test_meta_planner_returns_its_voice_message(monkeypatch):
+    from core.trinity import TrinityRuntime
+
+    monkeypatch.setenv("COPILOT_API_KEY", "dummy")
+    rt = TrinityRuntime(verbose=False, preferred_language="en")
+    rt.llm = type("LLM", (), {"invoke": lambda self, messages: AIMessage(content="no config")})()
+    state = {
+        "messages": [HumanMessage(content="task")],
+        "plan": [],
+        "meta_config": {"strategy": "hybrid"},
+        "last_step_status": "success",
+    }
+    out = rt._meta_planner_node(state)
+    assert out["current_agent"] == "atlas"
+    assert [m.content for m in out["messages"]] == ["[VOICE] Previous approach failed, developing new plan."]
+    assert len(state["messages"]) == 1
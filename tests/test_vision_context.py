@@ -0,0 +1,72 @@
+"""Tests for VisionContextManager's ring buffer, heat map and trend sums."""
+
+import random
+
+from core.vision_context import HEAT_COLS, VisionContextManager
+
+
+def _update(manager, pct=0.0, regions=(), ts=None):
+    data = {
+        "diff": {
+            "global_change_percentage": pct,
+            "has_significant_changes": pct > 5,
+            "changed_regions": [
+                {"bbox": {"x": x, "y": y, "width": 10, "height": 10}, "area": 100.0} for x, y in regions
+            ],
+        },
+        "ocr": {"status": "success", "full_text": "text"},
+    }
+    if ts:
+        data["timestamp"] = ts
+    manager.update_context(data)
+
+
+def _reference_trend(values):
+    # The previous list-based implementation
+    if len(values) < 2:
+        return "unknown"
+    half = len(values) // 2
+    diff = sum(values[half:]) / max(1, len(values) - half) - sum(values[:half]) / max(1, half)
+    return "increasing" if diff > 2 else ("decreasing" if diff < -2 else "stable")
+
+
+def test_trend_matches_full_recomputation():
+    rng = random.Random(7)
+    manager = VisionContextManager()
+    seen = []
+    for _ in range(200):
+        pct = rng.choice([0.0, 1.0, 3.0, 10.0, 40.0]) * rng.random()
+        _update(manager, pct)
+        seen.append(pct)
+        assert manager.get_trend() == _reference_trend(seen[-5:])
+
+
+def test_history_is_a_bounded_ring():
+    manager = VisionContextManager(max_history=3)
+    for i in range(10):
+        _update(manager, float(i), ts=f"2025-01-01T00:00:{i:02d}")
+    assert len(manager.history) == 3
+    assert [f.clock for f in manager.history] == ["00:00:07", "00:00:08", "00:00:09"]
+    assert manager.current_context.startswith("[00:00:09]")
+    api = manager.get_context_for_api()
+    assert len(api["history_summary"]) == 3 and api["analysis_count"] == 3
+    assert manager.get_diff_summary_for_step(0).startswith("Visual verification at 2025-01-01T00:00:07")
+
+
+def test_heat_map_ranks_and_decays_regions():
+    manager = VisionContextManager()
+    for _ in range(5):
+        _update(manager, 10.0, [(250, 120), (1900, 40)])
+    _update(manager, 10.0, [(250, 120)])
+    active = manager.get_most_active_regions(3)
+    assert [a["grid_location"] for a in active] == ["2_1", "19_0"]
+    assert active[0]["frequency_score"] > active[1]["frequency_score"]
+    # Far outside the grid lands on the edge cell
+    _update(manager, 10.0, [(10 ** 6, 0)])
+    assert f"{HEAT_COLS - 1}_0" in [a["grid_location"] for a in manager.get_most_active_regions(5)]
+
+    for _ in range(100):
+        _update(manager, 0.0)
+    assert manager.get_most_active_regions() == []
+    manager.clear()
+    assert len(manager.history) == 0 and manager.get_trend() == "unknown"
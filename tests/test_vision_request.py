@@ -0,0 +1,163 @@
+"""Tests for batched vision LLM requests against a local stub endpoint."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import numpy as np
+import pytest
+
+import system_ai.tools.vision as vision
+from system_ai.tools.frame import Frame, register_frame
+from system_ai.tools.frame_cache import PerceptualFrameCache
+from system_ai.tools.vision_request import VisionRequest, merge_boxes, tile_boxes
+
+
+def _screen(w=1920, h=1080, seed=0):
+    """UI-like frame: flat panels with rows of glyph-like noise."""
+    rng = np.random.default_rng(seed)
+    arr = np.full((h, w, 3), 236, dtype=np.uint8)
+    arr[:, : w // 5] = (60, 60, 70)  # sidebar
+    for y in range(40, h - 20, 28):
+        x0 = int(rng.integers(w // 5 + 20, w // 2))
+        width = min(int(rng.integers(200, w // 2)), w - x0)
+        glyphs = rng.integers(0, 2, (12, width // 3 + 1), dtype=np.uint8) * 200
+        arr[y : y + 12, x0 : x0 + width] = np.repeat(glyphs, 3, axis=1)[:, :width, None]
+    return arr
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    requests_seen = []
+    reply = {"text": "ok"}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            requests_seen.append({"path": self.path, "bytes": len(body), "json": json.loads(body)})
+            out = json.dumps({"choices": [{"message": {"content": reply["text"]}}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("VISION_LLM_ENDPOINT", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(vision, "get_frame_cache", lambda: cache)
+    cache = PerceptualFrameCache()
+    yield requests_seen, reply
+    server.shutdown()
+
+
+def _images(req):
+    return [p for p in req["json"]["messages"][0]["content"] if p["type"] == "image_url"]
+
+
+def test_compare_images_sends_only_changed_regions(tmp_path, stub):
+    seen, _ = stub
+    before = _screen()
+    after = before.copy()
+    after[300:360, 800:1100] = 255
+    p1, p2 = str(tmp_path / "a.png"), str(tmp_path / "b.png")
+    register_frame(Frame.from_array(before), p1)
+    register_frame(Frame.from_array(after), p2)
+
+    res = vision.compare_images(p1, p2)
+    assert res["status"] == "success" and res["analysis"] == "ok"
+    assert len(seen) == 1 and seen[0]["path"] == "/v1/chat/completions"
+    # before crop, after overview, after crop
+    assert len(_images(seen[0])) == 3
+    naive = len(vision.load_image_png_b64(p1)) + len(vision.load_image_png_b64(p2))
+    assert seen[0]["bytes"] < naive / 8
+    assert res["payload"]["image_bytes"] < naive / 8
+
+
+def test_compare_images_diffs_the_pair_once(tmp_path, stub, monkeypatch):
+    import system_ai.tools.frame_diff as frame_diff
+
+    seen, _ = stub
+    calls = []
+    real = frame_diff.diff_frames
+    monkeypatch.setattr(frame_diff, "diff_frames", lambda a, b, **kw: calls.append(1) or real(a, b, **kw))
+    before = _screen()
+    after = before.copy()
+    after[300:302, 800:806] = 0  # below the region size; still a change
+    p1, p2 = str(tmp_path / "a.png"), str(tmp_path / "b.png")
+    register_frame(Frame.from_array(before), p1)
+    register_frame(Frame.from_array(after), p2)
+
+    res = vision.compare_images(p1, p2)
+    assert res["status"] == "success" and calls == [1]
+    # The candidate tiles' bbox stands in for the missing region
+    assert len(seen) == 1 and len(_images(seen[0])) == 3
+
+
+def test_identical_images_skip_the_model(tmp_path, stub):
+    seen, _ = stub
+    arr = _screen()
+    register_frame(Frame.from_array(arr), str(tmp_path / "a.png"))
+    register_frame(Frame.from_array(arr.copy()), str(tmp_path / "b.png"))
+    res = vision.compare_images(str(tmp_path / "a.png"), str(tmp_path / "b.png"))
+    assert res["identical"] is True and seen == []
+
+
+def test_questions_are_batched_and_cached(tmp_path, stub):
+    seen, reply = stub
+    reply["text"] = "### Q1\nA login form\n### Q2: No errors"
+    path = str(tmp_path / "s.png")
+    register_frame(Frame.from_array(_screen(seed=3)), path)
+
+    res = vision.analyze_with_copilot(path, prompts=["What is shown?", "Any errors?"])
+    assert res["answers"] == ["A login form", "No errors"]
+    assert len(seen) == 1 and len(_images(seen[0])) == 1
+    assert "Q2: Any errors?" in seen[0]["json"]["messages"][0]["content"][0]["text"]
+
+    again = vision.analyze_with_copilot(path, prompt="Any errors?")
+    assert again["cached"] is True and again["analysis"] == "No errors"
+    assert len(seen) == 1
+
+
+def test_small_change_is_not_answered_from_cache(tmp_path, stub):
+    seen, reply = stub
+    before = _screen(seed=4)
+    after = before.copy()
+    after[700:712, 900:1000] = 30  # a saved-message toast the thumbnail hash barely sees
+    cache = vision.get_frame_cache()
+    register_frame(Frame.from_array(before), str(tmp_path / "a.png"))
+    register_frame(Frame.from_array(after), str(tmp_path / "b.png"))
+    register_frame(Frame.from_array(after.copy()), str(tmp_path / "c.png"))
+
+    reply["text"] = "Editing"
+    assert vision.analyze_with_copilot(str(tmp_path / "a.png"))["analysis"] == "Editing"
+    near, _ = cache.lookup(cache.hash_frame(Frame.from_array(after)))
+    assert near is not None  # the hash alone would have reused "Editing"
+
+    reply["text"] = "Saved successfully"
+    res = vision.analyze_with_copilot(str(tmp_path / "b.png"))
+    assert res["analysis"] == "Saved successfully" and "cached" not in res
+    again = vision.analyze_with_copilot(str(tmp_path / "c.png"))
+    assert again["cached"] is True and again["analysis"] == "Saved successfully"
+    assert len(seen) == 2 and cache.stats()["invalidations"] == 1
+
+
+def test_wide_captures_are_tiled_and_identical_tiles_deduplicated():
+    half = _screen(2560, 1440, seed=1)
+    frame = Frame.from_array(np.ascontiguousarray(np.hstack([half, half])))
+    assert tile_boxes(frame.size) == [(0, 0, 2560, 1440), (2560, 0, 5120, 1440)]
+    req = VisionRequest()
+    req.add_frame(frame, "desktop")
+    req.ask("Describe")
+    stats = req.stats()
+    assert stats["images"] == 1 and stats["deduplicated"] == 1
+    assert "identical to Image 1" in req.prompt_text()
+    assert len([p for p in req.content() if p["type"] == "image_url"]) == 1
+
+
+def test_merge_boxes_pads_and_joins_overlaps():
+    boxes = merge_boxes([(10, 10, 20, 20), (25, 10, 40, 20), (500, 500, 510, 510)], 4, (600, 520))
+    assert boxes == [(6, 6, 44, 24), (496, 496, 514, 514)]
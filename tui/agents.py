@@ -31,11 +31,23 @@ except Exception:
 
 try:
     from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
-    from providers.copilot import CopilotLLM
 except Exception:
-    CopilotLLM = None
     HumanMessage = SystemMessage = AIMessage = ToolMessage = None
 
+_copilot_llm_class: Any = None
+
+
+def get_copilot_llm_class() -> Any:
+    """Import the Copilot provider on first use (it pulls in the LangChain model stack)."""
+    global _copilot_llm_class
+    if _copilot_llm_class is None:
+        try:
+            from providers.copilot import CopilotLLM
+            _copilot_llm_class = CopilotLLM
+        except Exception:
+            return None
+    return _copilot_llm_class
+
 
 @dataclass
 class AgentTool:
@@ -113,6 +125,7 @@ def get_llm_signature() -> str:
 
 def ensure_agent_ready() -> Tuple[bool, str]:
     """Ensure the agent LLM is initialized and ready."""
+    CopilotLLM = get_copilot_llm_class()
     if CopilotLLM is None or SystemMessage is None or HumanMessage is None:
         return False, "LLM недоступний (нема langchain_core або providers/copilot.py)"
 
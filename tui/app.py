@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Any, Callable, Optional
+
+from core.startup import get_startup_profiler
 
 
 @dataclass
@@ -15,6 +17,7 @@ class TuiRuntime:
     load_llm_settings: Callable[[], None]
     apply_default_monitor_targets: Callable[[], None]
     save_ui_settings: Optional[Callable[[], bool]] = None
+    warmup: Any = None
 
 
 def run_tui(runtime: TuiRuntime) -> None:
@@ -25,8 +28,15 @@ def run_tui(runtime: TuiRuntime) -> None:
     runtime.load_env()
     runtime.load_llm_settings()
     runtime.apply_default_monitor_targets()
+
+    def _on_ready() -> None:
+        # The prompt is interactive from here on; heavy subsystems warm up in the background.
+        get_startup_profiler().mark_ready()
+        if runtime.warmup is not None:
+            runtime.warmup.start()
+
     try:
-        runtime.app.run()
+        runtime.app.run(pre_run=_on_ready)
     finally:
         if runtime.save_ui_settings:
             runtime.save_ui_settings()
@@ -43,7 +43,7 @@ from i18n import TOP_LANGS, lang_name, normalize_lang, tr
 from tui.state import AppState, MenuLevel, state
 # Use unified core logging
 from core.logging_config import setup_global_logging, setup_logging, get_logger, log_exception
-from core.mcp import get_mcp_client_manager
+from core.startup import BackgroundWarmup, get_startup_profiler
 
 from prompt_toolkit.buffer import Buffer
 from prompt_toolkit.data_structures import Point
@@ -296,19 +296,6 @@ try:
 except Exception:
     load_dotenv = None
 
-# LLM provider (optional)
-try:
-    from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage  # type: ignore
-
-    from providers.copilot import CopilotLLM  # type: ignore
-except Exception:
-    CopilotLLM = None  # type: ignore
-    HumanMessage = SystemMessage = AIMessage = ToolMessage = None  # type: ignore
-
-try:
-    from system_ai.recorder import RecorderService  # type: ignore
-except Exception:
-    RecorderService = None  # type: ignore
 
 
 
@@ -404,18 +391,33 @@ def _load_ui_settings() -> None:
         rl = int(data.get("recursion_limit", 100))
         state.ui_recursion_limit = max(1, rl)
         
-        # Load MCP Client State
-        try:
-            from core.mcp import get_mcp_client_manager
-            mgr = get_mcp_client_manager()
-            state.mcp_client_type = mgr.active_client.value
-        except ImportError:
-            pass
-            
     except Exception:
         pass
 
 
+def _load_mcp_client_state() -> None:
+    """Load MCP client state (imports the MCP SDK, so it runs in the background warm-up)."""
+    try:
+        from core.mcp import get_mcp_client_manager
+        mgr = get_mcp_client_manager()
+        state.mcp_client_type = mgr.active_client.value
+    except Exception:
+        pass
+
+
+def _warm_up_agent_llm() -> None:
+    """Import the LLM provider stack ahead of the first agent message."""
+    from tui.agents import get_copilot_llm_class
+    get_copilot_llm_class()
+
+
+def _build_tui_warmup() -> BackgroundWarmup:
+    warmup = BackgroundWarmup(name="tui-warmup")
+    warmup.add("mcp_client_state", _load_mcp_client_state)
+    warmup.add("agent_llm", _warm_up_agent_llm)
+    return warmup
+
+
 def _save_ui_settings() -> bool:
     try:
         os.makedirs(SYSTEM_CLI_DIR, exist_ok=True)
@@ -562,7 +564,12 @@ def _open_in_finder(path: str) -> Tuple[bool, str]:
 
 
 def _get_recorder_service() -> Optional[Any]:
-    return RecorderService() if RecorderService else None
+    # Imported lazily: the recorder pulls in mss/PIL and is not needed to show the prompt.
+    try:
+        from system_ai.recorder import RecorderService  # type: ignore
+    except Exception:
+        return None
+    return RecorderService()
 
 
 def _monitor_summary_start_if_needed() -> None:
@@ -1163,6 +1170,7 @@ def run_tui() -> None:
         load_llm_settings=_load_llm_settings,
         apply_default_monitor_targets=_apply_default_monitor_targets,
         save_ui_settings=_save_ui_settings,
+        warmup=_build_tui_warmup(),
     )
     tui_run_tui(runtime)
 
@@ -1413,6 +1421,10 @@ def _build_cli_parser() -> Tuple[argparse.ArgumentParser, Any]:
     sub.add_parser("agent-on", help="Enable agent chat")
     sub.add_parser("agent-off", help="Disable agent chat")
 
+    p_startup = sub.add_parser("startup-profile", help="Report startup time spent per subsystem")
+    p_startup.add_argument("--wait-warmup", action="store_true", help="Also wait for background warm-up (ChromaDB, MCP, embeddings)")
+    p_startup.add_argument("--json", action="store_true", help="Print the report as JSON")
+
     return parser, sub
 
 
@@ -1476,6 +1488,7 @@ def cli_main(argv: List[str]) -> None:
         "vibe-cancel": lambda: _handle_vibe_command(logger, "cancel"),
         "vibe-help": lambda: _handle_vibe_command(logger, "help"),
         "eternal-engine": lambda: _handle_eternal_engine(args, logger),
+        "startup-profile": lambda: _handle_startup_profile(args, logger),
     }
 
     if args.command in sec_dispatch:
@@ -1606,6 +1619,22 @@ def _handle_eternal_engine(args: Any, logger: Any):
     engine = EternalEngine()
     asyncio.run(engine.run_forever())
 
+def _handle_startup_profile(args: Any, logger: Any):
+    logger.info("Profiling TrinityRuntime startup")
+    profiler = get_startup_profiler()
+    with profiler.stage("import:core.trinity"):
+        from core.trinity import TrinityRuntime
+    with profiler.stage("TrinityRuntime()"):
+        rt = TrinityRuntime(verbose=False, enable_self_healing=False)
+    profiler.mark_ready()
+    if getattr(args, "wait_warmup", False):
+        rt.warmup.wait(timeout=120.0)
+    if getattr(args, "json", False):
+        print(json.dumps(profiler.report(), indent=2, ensure_ascii=False))
+    else:
+        print(profiler.format_report())
+    rt.cleanup()
+
 def _handle_screenshots_command(args: Any):
     if args.action == "list":
         from tui.tools import tool_list_screenshots
@@ -545,6 +545,18 @@ def _render_monitor_control_menu(ctx: dict) -> List[Tuple[str, str]]:
     action = "STOP" if state.monitor_active else "START"
     # Start/Stop is selectable as index 1
     result.append((STYLE_MENU_SELECTED, f" > {action}\n", make_click(1)))
+
+    if state.monitor_active:
+        # Live CPU ranking from the shared process sampler (never blocks the render)
+        from tui.monitoring import monitor_top_processes
+
+        top = monitor_top_processes()
+        if top:
+            result.append((STYLE_MENU_ITEM, "\n Top CPU:\n"))
+            for p in top:
+                cpu = p.get("cpu_percent")
+                cpu_text = "n/a" if cpu is None else f"{cpu:.1f}%"
+                result.append((STYLE_MENU_ITEM, f"   {p.get('name')} ({p.get('pid')}): {cpu_text}\n"))
     
     notes = {
         "watchdog": "Note: watchdog monitors directories (no process attribution).",
@@ -832,9 +832,25 @@ def tool_monitor_status() -> Dict[str, Any]:
         "use_sudo": bool(state.monitor_use_sudo),
         "targets_count": len(state.monitor_targets),
         "db": MONITOR_EVENTS_DB_PATH,
+        "top_processes": monitor_top_processes(),
     }
 
 
+def monitor_top_processes(limit: int = 5) -> List[Dict[str, Any]]:
+    """Top CPU processes from the shared sampler (latest snapshot, no waiting).
+
+    Used by monitor_status and the monitoring control view while monitoring
+    is active.
+    """
+    try:
+        from system_ai.tools.process_sampler import get_process_sampler
+
+        snap = get_process_sampler().snapshot()
+        return snap.top(limit, "cpu") if snap is not None else []
+    except Exception:
+        return []
+
+
 def tool_monitor_set_source(args: Dict[str, Any]) -> Dict[str, Any]:
     """Set monitoring source."""
     src = str(args.get("source") or "").strip().lower()
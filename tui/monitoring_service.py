@@ -70,14 +70,10 @@ class ProcTraceService:
             if m_proc:
                 process = m_proc.group(1)
 
-            # If pid wasn't found, try to resolve by process name using pgrep
+            # If pid wasn't found, match the name against full command lines
+            # (pgrep -f semantics, so `python foo.py` resolves from "foo.py")
             if not pid and process:
-                try:
-                    out = subprocess.check_output(["pgrep", "-f", process], text=True).strip().splitlines()
-                    if out:
-                        pid = int(out[0])
-                except Exception:
-                    pass
+                pid = self._resolve_pid(process)
 
             # Insert into DB using existing utility
             try:
@@ -98,6 +94,27 @@ class ProcTraceService:
         except Exception:
             return
 
+    @staticmethod
+    def _resolve_pid(process: str) -> int:
+        """First pid whose command line matches `process`, from the shared sampler snapshot.
+
+        Falls back to `pgrep -f` when no snapshot is available.
+        """
+        try:
+            from system_ai.tools.process_sampler import get_process_sampler
+
+            snap = get_process_sampler().snapshot()
+            if snap is not None:
+                pids = snap.match_cmdline(process)
+                return int(pids[0]) if pids else 0
+        except Exception:
+            pass
+        try:
+            out = subprocess.check_output(["pgrep", "-f", process], text=True).strip().splitlines()
+            return int(out[0]) if out else 0
+        except Exception:
+            return 0
+
     def _reader(self, stream: Any) -> None:
         try:
             for ln in iter(stream.readline, ""):
@@ -152,6 +169,7 @@ class ProcTraceService:
             if self.proc.stdout:
                 self.thread = threading.Thread(target=self._reader, args=(self.proc.stdout,), daemon=True)
                 self.thread.start()
+            self._hold_sampler(True)
             self.running = True
             return True, f"{self.cmd_name} started"
         except Exception as e:
@@ -171,7 +189,20 @@ class ProcTraceService:
                 except Exception:
                     pass
         finally:
+            if self.running:
+                self._hold_sampler(False)
             self.proc = None
             self.thread = None
             self.running = False
         return True, f"{self.cmd_name} stopped"
+
+    @staticmethod
+    def _hold_sampler(hold: bool) -> None:
+        """Keep the process sampler alive while tracing (pid attribution)."""
+        try:
+            from system_ai.tools.process_sampler import get_process_sampler
+
+            sampler = get_process_sampler()
+            sampler.acquire() if hold else sampler.release()
+        except Exception:
+            pass
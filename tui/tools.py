@@ -313,14 +313,21 @@ def tool_run_shell(args: Dict[str, Any], allow_shell: bool) -> Dict[str, Any]:
     if not allow_shell:
         return {"ok": False, "error": "Shell commands require unsafe mode or CONFIRM_SHELL"}
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
-        return {
-            "ok": result.returncode == 0,
+        from system_ai.tools.shell_stream import LineEmitter, run_streaming
+        from tui.cli import log
+
+        emitter = LineEmitter(lambda stream, line: log(f"[Shell] {line}", "error" if stream == "stderr" else "info"))
+        result = run_streaming(command, timeout=30, head_bytes=2000, tail_bytes=3000, on_chunk=emitter)
+        res = {
+            "ok": result.returncode == 0 and not result.timed_out,
             "command": command,
             "returncode": result.returncode,
-            "stdout": result.stdout[:5000],
-            "stderr": result.stderr[:2000],
+            "stdout": result.stdout.text(),
+            "stderr": result.stderr.text()[-2000:],
         }
+        if result.error:
+            res["error"] = result.error
+        return res
     except Exception as e:
         return {"ok": False, "error": str(e)}
 